@@ -0,0 +1,287 @@
+"""Weighted fair-queue admission control for searches.
+
+The global search bulkhead used to be a plain ``asyncio.Semaphore``: waiters
+are served FIFO, so one chatty client could fill every slot and the queue
+behind it, starving everybody else.  :class:`FairScheduler` keeps the same
+concurrency cap but orders waiters with two-level deficit round robin:
+
+- across priority classes, weighted by :data:`PRIORITY_WEIGHTS` (interactive
+  requests get most slots, batch and background/warmup work still progress)
+- within a class, round robin across clients (bearer token or IP, as chosen
+  by the HTTP bridge), so every active client gets an equal share
+
+The queue is bounded.  A request is rejected up front with
+:class:`AdmissionRejected` (HTTP 503 + ``Retry-After`` in the bridge) when
+the queue is full or when its estimated wait would exceed the time left on
+its :class:`~deadline.Deadline`; a request still queued when its deadline
+expires is rejected the same way.
+
+In-memory and process-local, like the circuit breaker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Mapping, Optional
+
+try:
+    from src.deadline import Deadline
+except Exception:  # pragma: no cover
+    from deadline import Deadline
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITY_BACKGROUND = "background"
+
+# Slots per DRR round for each class.
+PRIORITY_WEIGHTS: Mapping[str, int] = {
+    PRIORITY_INTERACTIVE: 8,
+    PRIORITY_BATCH: 2,
+    PRIORITY_BACKGROUND: 1,
+}
+
+_HOLD_EWMA_ALPHA = 0.2
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when a search is not admitted; carries a Retry-After hint."""
+
+    def __init__(self, reason: str, retry_after_s: float) -> None:
+        super().__init__(f"Server busy: {reason}")
+        self.reason = reason
+        self.retry_after_s = max(0.0, float(retry_after_s))
+
+
+class FairScheduler:
+    """Concurrency limiter with per-class weighted, per-client fair queuing."""
+
+    def __init__(
+        self,
+        capacity: int,
+        *,
+        max_queue: int = 100,
+        weights: Optional[Mapping[str, int]] = None,
+        clock=time.monotonic,
+    ) -> None:
+        self._capacity = max(1, int(capacity))
+        self._max_queue = max(0, int(max_queue))
+        self._weights: Dict[str, int] = {
+            k: max(1, int(v)) for k, v in (weights or PRIORITY_WEIGHTS).items()
+        }
+        self._order = list(self._weights)
+        self._clock = clock
+
+        self._in_use = 0
+        self._queued = 0
+        # class -> client -> waiters (FIFO per client)
+        self._queues: Dict[str, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            c: OrderedDict() for c in self._order
+        }
+        self._deficit: Dict[str, int] = {c: 0 for c in self._order}
+        self._turn = 0
+        self._hold_s: Optional[float] = None
+
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_deadline = 0
+        self.total_wait_s = 0.0
+
+    # -- public API ---------------------------------------------------------
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        client: str = "-",
+        priority: str = PRIORITY_INTERACTIVE,
+        deadline: Optional[Deadline] = None,
+    ):
+        """Hold one search slot for the duration of the ``async with`` block."""
+        await self.acquire(client, priority, deadline)
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.release(self._clock() - started)
+
+    async def acquire(
+        self,
+        client: str = "-",
+        priority: str = PRIORITY_INTERACTIVE,
+        deadline: Optional[Deadline] = None,
+    ) -> None:
+        cls = priority if priority in self._weights else PRIORITY_INTERACTIVE
+        if self._in_use < self._capacity and self._queued == 0:
+            self._in_use += 1
+            self.admitted += 1
+            return
+
+        if self._queued >= self._max_queue:
+            self.rejected_full += 1
+            raise AdmissionRejected("queue full", self._drain_estimate(self._queued))
+
+        estimate = self._wait_estimate(cls, client)
+        left = None if deadline is None else deadline.remaining()
+        if estimate is not None and left is not None and estimate > left:
+            self.rejected_deadline += 1
+            raise AdmissionRejected("queue wait exceeds deadline", estimate)
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._queues[cls].setdefault(client, deque()).append(fut)
+        self._queued += 1
+        enqueued = self._clock()
+        try:
+            if left is None:
+                await fut
+            else:
+                await asyncio.wait_for(asyncio.shield(fut), timeout=left)
+        except asyncio.TimeoutError:
+            if not (fut.done() and not fut.cancelled()):
+                fut.cancel()
+                self._discard(cls, client, fut)
+                self.rejected_deadline += 1
+                raise AdmissionRejected(
+                    "deadline expired while queued",
+                    self._drain_estimate(self._queued),
+                ) from None
+            # Granted just as the deadline hit: keep the slot.
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Granted, but the caller went away: hand the slot on.
+                self.release()
+            else:
+                fut.cancel()
+                self._discard(cls, client, fut)
+            raise
+        self.admitted += 1
+        self.total_wait_s += self._clock() - enqueued
+
+    def release(self, held_s: Optional[float] = None) -> None:
+        """Free one slot and hand it to the next waiter, if any.
+
+        *held_s* (how long the slot was used) feeds the wait estimate.
+        """
+        if held_s is not None:
+            self._observe_hold(held_s)
+        while True:
+            fut = self._next_waiter()
+            if fut is None:
+                self._in_use = max(0, self._in_use - 1)
+                return
+            if not fut.done():
+                # Slot ownership moves to the waiter; in_use is unchanged.
+                fut.set_result(None)
+                return
+
+    def snapshot(self) -> Dict[str, object]:
+        per_class = {
+            c: sum(len(q) for q in self._queues[c].values()) for c in self._order
+        }
+        return {
+            "capacity": self._capacity,
+            "in_use": self._in_use,
+            "queued": self._queued,
+            "queued_by_class": per_class,
+            "active_clients": sum(len(self._queues[c]) for c in self._order),
+            "max_queue": self._max_queue,
+            "admitted": self.admitted,
+            "rejected_full": self.rejected_full,
+            "rejected_deadline": self.rejected_deadline,
+            "avg_hold_s": None if self._hold_s is None else round(self._hold_s, 4),
+        }
+
+    # -- internals ----------------------------------------------------------
+
+    def _observe_hold(self, seconds: float) -> None:
+        if seconds < 0:
+            return
+        if self._hold_s is None:
+            self._hold_s = seconds
+        else:
+            a = _HOLD_EWMA_ALPHA
+            self._hold_s = (1 - a) * self._hold_s + a * seconds
+
+    def _drain_estimate(self, ahead: float) -> float:
+        hold = self._hold_s if self._hold_s is not None else 1.0
+        return (ahead + 1) / self._capacity * hold
+
+    def _wait_estimate(self, cls: str, client: str) -> Optional[float]:
+        """Expected queue wait for a new request of *client* in *cls*.
+
+        Under DRR the request is served after ``own + 1`` rounds of its
+        class; in each round every other client of the class gets one slot
+        and other classes get slots in proportion to their weight.  None
+        until a hold time has been observed.
+        """
+        if self._hold_s is None:
+            return None
+        clients = self._queues[cls]
+        rounds = len(clients.get(client, ())) + 1
+        ahead_in_class = sum(
+            min(len(q), rounds) for c, q in clients.items() if c != client
+        ) + rounds - 1
+        ahead = float(ahead_in_class)
+        w = self._weights[cls]
+        for other in self._order:
+            if other == cls:
+                continue
+            other_queued = sum(len(q) for q in self._queues[other].values())
+            share = math.ceil((ahead_in_class + 1) * self._weights[other] / w)
+            ahead += min(other_queued, share)
+        return self._drain_estimate(ahead)
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """Deficit round robin over classes, round robin over clients."""
+        if self._queued == 0:
+            return None
+        n = len(self._order)
+        for _ in range(2 * n + 1):
+            cls = self._order[self._turn]
+            clients = self._queues[cls]
+            if clients and self._deficit[cls] >= 1:
+                self._deficit[cls] -= 1
+                return self._pop(clients)
+            if not clients:
+                self._deficit[cls] = 0
+            self._turn = (self._turn + 1) % n
+            nxt = self._order[self._turn]
+            if self._queues[nxt]:
+                self._deficit[nxt] += self._weights[nxt]
+        return None
+
+    def _pop(self, clients: "OrderedDict[str, Deque[asyncio.Future]]") -> asyncio.Future:
+        client, q = next(iter(clients.items()))
+        fut = q.popleft()
+        self._queued -= 1
+        if q:
+            clients.move_to_end(client)
+        else:
+            del clients[client]
+        return fut
+
+    def _discard(self, cls: str, client: str, fut: asyncio.Future) -> None:
+        q = self._queues[cls].get(client)
+        if q is None:
+            return
+        try:
+            q.remove(fut)
+        except ValueError:
+            return
+        self._queued -= 1
+        if not q:
+            del self._queues[cls][client]
@@ -5,11 +5,19 @@
 """
 
 import hashlib
+import heapq
 import time
-import json
 import logging
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from typing import Any, List, Dict, Optional, Tuple
+from dataclasses import dataclass, asdict, fields
+
+try:
+    from src import cache_codec
+    from src.ttl_policy import TTLPolicy
+except Exception:  # pragma: no cover
+    import cache_codec
+    from ttl_policy import TTLPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -23,59 +31,89 @@ class CacheEntry:
     results: List[Dict]
     timestamp: float
     hits: int = 0
+    ttl: Optional[float] = None  # 条目自身的软 TTL；None 表示使用缓存默认值
 
     def to_dict(self) -> Dict:
         """转换为字典"""
         return asdict(self)
 
-    def is_expired(self, ttl: int) -> bool:
-        """检查是否过期"""
-        return time.time() - self.timestamp > ttl
+    def ttl_or(self, default_ttl: float) -> float:
+        """条目的软 TTL（未记录时使用 default_ttl）"""
+        return self.ttl if self.ttl is not None else default_ttl
+
+    def is_expired(self, default_ttl: float, grace: float = 0) -> bool:
+        """检查是否超过条目 TTL（+ grace 秒）"""
+        return time.time() - self.timestamp > self.ttl_or(default_ttl) + grace
+
+
+_ENTRY_FIELDS = frozenset(f.name for f in fields(CacheEntry))
 
 
 class SearchCache:
-    """搜索结果缓存管理器"""
+    """搜索结果缓存管理器
 
-    def __init__(self, ttl: int = 3600, max_size: int = 1000):
+    条目保存在 OrderedDict 中（最久未使用的在前），命中、写入与 LRU 淘汰
+    均为 O(1)。另有按硬过期时间排序的小顶堆（惰性删除：条目被覆盖或删除后
+    旧的堆项在弹出时跳过），清理过期条目只需处理已到期的部分。
+    """
+
+    def __init__(
+        self,
+        ttl: int = 3600,
+        max_size: int = 1000,
+        stale_ttl: int = 0,
+        ttl_policy: Optional[TTLPolicy] = None,
+    ):
         """
         初始化缓存管理器
 
         Args:
-            ttl: 缓存过期时间（秒），默认1小时
+            ttl: 默认缓存过期时间（秒，软 TTL），默认1小时
             max_size: 最大缓存条目数，默认1000
+            stale_ttl: 过期后继续保留的秒数（硬 TTL = 条目 TTL + stale_ttl），
+                期间条目可经 :meth:`lookup` 作为陈旧结果使用，默认0
+            ttl_policy: 写入时决定条目 TTL 的策略，默认固定 TTL
+                （空结果使用短的负缓存 TTL）
         """
         self.ttl = ttl
         self.max_size = max_size
-        self._cache: Dict[str, CacheEntry] = {}
-        self._access_order: List[str] = []  # LRU 访问顺序
+        self.stale_ttl = max(0, stale_ttl)
+        self.ttl_policy = ttl_policy or TTLPolicy()
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._expiry: List[Tuple[float, str]] = []  # (硬过期时间, key)
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
         logger.info(
             f"Search cache initialized: ttl={ttl}s, "
             f"max_size={max_size}"
         )
 
-    def _generate_key(
-        self, query: str, engine: str, num_results: int
-    ) -> str:
+    def _generate_key(self, query: str, engine: str) -> str:
         """
         生成缓存键
 
+        键不包含 num_results：为 k=N 缓存的结果截断后可服务任意 k≤N 的请求
+        （条目本身记录 num_results）。
+
         Args:
             query: 搜索查询
             engine: 搜索引擎
-            num_results: 结果数量
 
         Returns:
             缓存键（MD5哈希）
         """
         normalized = " ".join(query.strip().lower().split())
-        key_str = f"{normalized}|{engine}|{num_results}"
+        key_str = f"{normalized}|{engine}"
         return hashlib.md5(key_str.encode()).hexdigest()
 
-    def get(
+    def lookup(
         self, query: str, engine: str, num_results: int
-    ) -> Optional[List[Dict]]:
+    ) -> Optional[Tuple[List[Dict], float]]:
         """
-        从缓存获取结果
+        查找缓存结果（包括过了软 TTL、仍在硬 TTL 内的陈旧条目）
 
         Args:
             query: 搜索查询
@@ -83,35 +121,156 @@ class SearchCache:
             num_results: 结果数量
 
         Returns:
-            缓存的结果，如果不存在或已过期则返回None
+            (截断到 num_results 的结果, 超出软 TTL 的秒数)，秒数 <= 0 表示
+            新鲜；不存在、超过硬 TTL 或条目结果数少于 num_results 则返回None。
+            只有新鲜命中计入 hits / LRU
         """
-        key = self._generate_key(query, engine, num_results)
+        key = self._generate_key(query, engine)
 
-        if key not in self._cache:
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
             logger.debug(f"Cache miss: {query[:50]}...")
             return None
 
-        entry = self._cache[key]
-
-        # 检查是否过期
-        if entry.is_expired(self.ttl):
+        overdue = time.time() - entry.timestamp - entry.ttl_or(self.ttl)
+        if overdue > self.stale_ttl:
             logger.debug(f"Cache expired: {query[:50]}...")
             del self._cache[key]
-            if key in self._access_order:
-                self._access_order.remove(key)
+            self.expirations += 1
+            self.misses += 1
             return None
 
+        if entry.num_results < num_results:
+            self.misses += 1
+            logger.debug(
+                f"Cache entry too small ({entry.num_results} < {num_results}): "
+                f"{query[:50]}..."
+            )
+            return None
+
+        if overdue > 0:
+            self.stale_hits += 1
+            logger.debug(f"Cache stale ({int(overdue)}s): {query[:50]}...")
+            return entry.results[:num_results], overdue
+
         # 更新访问信息
         entry.hits += 1
-        if key in self._access_order:
-            self._access_order.remove(key)
-        self._access_order.append(key)
+        self.hits += 1
+        self._cache.move_to_end(key)
 
         logger.info(
             f"Cache hit: {query[:50]}... "
             f"(hits={entry.hits}, age={int(time.time() - entry.timestamp)}s)"
         )
-        return entry.results
+        return entry.results[:num_results], overdue
+
+    def get(
+        self, query: str, engine: str, num_results: int
+    ) -> Optional[List[Dict]]:
+        """
+        从缓存获取结果
+
+        Args:
+            query: 搜索查询
+            engine: 搜索引擎
+            num_results: 结果数量
+
+        Returns:
+            缓存的结果（截断到 num_results），如果不存在、已过期或条目
+            结果数少于 num_results 则返回None
+        """
+        hit = self.lookup(query, engine, num_results)
+        if hit is None or hit[1] > 0:
+            return None
+        return hit[0]
+
+    def peek(
+        self, query: str, engine: str, num_results: int
+    ) -> Optional[float]:
+        """
+        条目超出软 TTL 的秒数（<= 0 表示新鲜）；不存在、超过硬 TTL 或
+        结果数不足时为 None。不计命中、不更新 LRU（供预热判断是否需要刷新）
+        """
+        entry = self._cache.get(self._generate_key(query, engine))
+        if entry is None or entry.num_results < num_results:
+            return None
+        overdue = time.time() - entry.timestamp - entry.ttl_or(self.ttl)
+        return None if overdue > self.stale_ttl else overdue
+
+    def top_queries(self, limit: int) -> List[Dict]:
+        """命中次数最多的条目（query / engine / num_results / hits），用于预热"""
+        return [
+            {
+                "query": e.query,
+                "engine": e.engine,
+                "num_results": e.num_results,
+                "hits": e.hits,
+            }
+            for e in heapq.nlargest(
+                max(0, limit), self._cache.values(), key=lambda e: e.hits
+            )
+        ]
+
+    def refresh_candidates(
+        self, window: float, min_hits: int, limit: int
+    ) -> List[Dict]:
+        """
+        即将过期的热点条目（供 refresh-ahead）
+
+        软 TTL 在 window 秒内到期（或已过期但仍在硬 TTL 内）且自写入以来
+        命中至少 min_hits 次的条目，按命中次数降序，最多 limit 个。
+
+        Returns:
+            [{query, engine, num_results, hits, expires_in}]
+        """
+        now = time.time()
+        found = []
+        for e in self._cache.values():
+            expires_in = e.timestamp + e.ttl_or(self.ttl) - now
+            if e.hits >= min_hits and -self.stale_ttl <= expires_in <= window:
+                found.append({
+                    "query": e.query,
+                    "engine": e.engine,
+                    "num_results": e.num_results,
+                    "hits": e.hits,
+                    "expires_in": expires_in,
+                })
+        return heapq.nlargest(max(0, limit), found, key=lambda r: r["hits"])
+
+    # 与 PersistentCache 一致的异步接口（内存操作，直接执行）
+    async def arefresh_candidates(
+        self, window: float, min_hits: int, limit: int
+    ) -> List[Dict]:
+        return self.refresh_candidates(window, min_hits, limit)
+
+    async def apeek(
+        self, query: str, engine: str, num_results: int
+    ) -> Optional[float]:
+        return self.peek(query, engine, num_results)
+
+    async def atop_queries(self, limit: int) -> List[Dict]:
+        return self.top_queries(limit)
+
+    async def alookup(
+        self, query: str, engine: str, num_results: int
+    ) -> Optional[Tuple[List[Dict], float]]:
+        return self.lookup(query, engine, num_results)
+
+    async def aget(
+        self, query: str, engine: str, num_results: int
+    ) -> Optional[List[Dict]]:
+        return self.get(query, engine, num_results)
+
+    async def aset(
+        self,
+        query: str,
+        engine: str,
+        num_results: int,
+        results: List[Dict],
+        ttl_override: Optional[int] = None,
+    ) -> None:
+        self.set(query, engine, num_results, results, ttl_override)
 
     def set(
         self,
@@ -129,33 +288,61 @@ class SearchCache:
             engine: 搜索引擎
             num_results: 结果数量
             results: 搜索结果
-            ttl_override: 自定义TTL（秒），用于短TTL负缓存
+            ttl_override: 自定义TTL（秒）；为 None 时由 ttl_policy 决定
         """
-        # 检查缓存大小，如果满了则删除最老的条目（LRU）
-        if len(self._cache) >= self.max_size:
-            if self._access_order:
-                oldest_key = self._access_order.pop(0)
-                if oldest_key in self._cache:
-                    del self._cache[oldest_key]
-                    logger.debug(f"Cache evicted (LRU): {oldest_key}")
-
-        key = self._generate_key(query, engine, num_results)
-        effective_ttl = ttl_override if ttl_override is not None else self.ttl
+        key = self._generate_key(query, engine)
+        self._sweep()
+        existing = self._cache.get(key)
+        if (
+            existing is not None
+            and existing.results
+            and not existing.is_expired(self.ttl, self.stale_ttl)
+        ):
+            if not results:
+                # 空结果（多为上游失败）不覆盖仍可陈旧服务的条目
+                logger.debug(f"Cache set skipped (keep stale): {query[:50]}...")
+                return
+            if existing.num_results > num_results and not existing.is_expired(
+                self.ttl
+            ):
+                # 仍有效的更大条目已覆盖本次请求，不用子集覆盖它
+                logger.debug(
+                    f"Cache set skipped (superset cached): {query[:50]}..."
+                )
+                return
+
+        # 检查缓存大小，如果满了则删除最久未使用的条目（LRU）
+        if existing is None and self._cache and len(self._cache) >= self.max_size:
+            oldest_key, _ = self._cache.popitem(last=False)
+            self.evictions += 1
+            logger.debug(f"Cache evicted (LRU): {oldest_key}")
+
+        if ttl_override is not None:
+            effective_ttl = float(ttl_override)
+        else:
+            previous = None
+            if existing is not None and existing.results:
+                previous = (existing.results, existing.ttl_or(self.ttl))
+            effective_ttl = self.ttl_policy.ttl_for(
+                query, results, default_ttl=self.ttl, previous=previous
+            )
         entry = CacheEntry(
             query=query,
             engine=engine,
             num_results=num_results,
             results=results,
             timestamp=time.time(),
-            hits=0
+            hits=0,
+            ttl=effective_ttl,
         )
 
         self._cache[key] = entry
-        self._access_order.append(key)
+        self._cache.move_to_end(key)
+        self._schedule_expiry(key, entry)
 
         logger.debug(
             f"Cache set: {query[:50]}... "
-            f"(size={len(self._cache)}/{self.max_size})"
+            f"(ttl={int(effective_ttl)}s, size={len(self._cache)}/{self.max_size})"
         )
 
     def clear(self) -> int:
@@ -166,31 +353,51 @@ class SearchCache:
         """
         size = len(self._cache)
         self._cache.clear()
-        self._access_order.clear()
+        self._expiry.clear()
         logger.info(f"Cache cleared: {size} entries removed")
         return size
 
     def remove_expired(self) -> int:
         """
-        删除所有过期的缓存条目
+        删除所有过期（超过硬 TTL）的缓存条目
+
+        只处理过期堆中已到期的部分，代价与过期条目数成正比。
 
         Returns:
             删除的条目数
         """
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if entry.is_expired(self.ttl)
-        ]
-
-        for key in expired_keys:
-            del self._cache[key]
-            if key in self._access_order:
-                self._access_order.remove(key)
-
-        if expired_keys:
-            logger.info(f"Removed {len(expired_keys)} expired cache entries")
-
-        return len(expired_keys)
+        removed = self._sweep()
+        if removed:
+            logger.info(f"Removed {removed} expired cache entries")
+        return removed
+
+    def _hard_deadline(self, entry: CacheEntry) -> float:
+        """条目的硬过期时间（条目 TTL + stale_ttl）"""
+        return entry.timestamp + entry.ttl_or(self.ttl) + self.stale_ttl
+
+    def _schedule_expiry(self, key: str, entry: CacheEntry) -> None:
+        heapq.heappush(self._expiry, (self._hard_deadline(entry), key))
+        # 覆盖/删除留下的失效堆项过多时重建，保持堆大小 O(条目数)
+        if len(self._expiry) > 2 * len(self._cache) + 64:
+            self._expiry = [
+                (self._hard_deadline(e), k) for k, e in self._cache.items()
+            ]
+            heapq.heapify(self._expiry)
+
+    def _sweep(self) -> int:
+        """弹出已到期的堆项并删除确实已过硬 TTL 的条目，返回删除数"""
+        now = time.time()
+        heap = self._expiry
+        removed = 0
+        while heap and heap[0][0] <= now:
+            _, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # 条目可能已被覆盖（新的堆项更晚）或已删除
+            if entry is not None and self._hard_deadline(entry) <= now:
+                del self._cache[key]
+                removed += 1
+        self.expirations += removed
+        return removed
 
     def get_stats(self) -> Dict:
         """
@@ -208,70 +415,107 @@ class SearchCache:
                 for entry in self._cache.values()
             ) / len(self._cache)
 
+        lookups = self.hits + self.misses + self.stale_hits
         return {
             "type": "memory",
             "size": len(self._cache),
             "max_size": self.max_size,
             "total_hits": total_hits,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
             "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "ttl_policy": self.ttl_policy.name,
             "avg_age_seconds": int(avg_age)
         }
 
     # Backward/forward-compatible aliases (manage_cache expects these names)
-    def export_to_json(self, filepath: str) -> int:
-        self.export_to_file(filepath)
-        return len(self._cache)
+    def export_to_json(self, filepath: str, **filters: Any) -> int:
+        return self.export_to_file(filepath, **filters)
 
-    def import_from_json(self, filepath: str) -> int:
-        return self.import_from_file(filepath)
+    def import_from_json(self, filepath: str, **filters: Any) -> int:
+        return self.import_from_file(filepath, **filters)
 
-    def export_to_file(self, filepath: str) -> None:
+    def export_to_file(
+        self,
+        filepath: str,
+        engine: Optional[str] = None,
+        since: Optional[float] = None,
+        max_age: Optional[float] = None,
+    ) -> int:
         """
-        导出缓存到文件
+        导出缓存到文件（逐条写出，格式由扩展名决定，见 :mod:`cache_codec`）
 
         Args:
             filepath: 导出文件路径
+            engine: 只导出该引擎（模式）的条目
+            since: 增量导出：只导出写入时间晚于该时间戳的条目
+            max_age: 只导出最近 max_age 秒内写入的条目
+
+        Returns:
+            导出的条目数
         """
-        data = {
+        now = time.time()
+        header = {
             "ttl": self.ttl,
             "max_size": self.max_size,
-            "entries": [
-                entry.to_dict()
-                for entry in self._cache.values()
-            ]
+            "export_time": now,
+            "since": since,
         }
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
-        logger.info(f"Cache exported to {filepath}")
-
-    def import_from_file(self, filepath: str) -> int:
+        with cache_codec.ExportWriter(filepath, header) as writer:
+            for entry in list(self._cache.values()):
+                if engine and entry.engine != engine:
+                    continue
+                if since is not None and entry.timestamp <= since:
+                    continue
+                if max_age is not None and now - entry.timestamp > max_age:
+                    continue
+                writer.write(entry.to_dict())
+
+        logger.info(f"Cache exported to {filepath}: {writer.count} entries")
+        return writer.count
+
+    def import_from_file(
+        self,
+        filepath: str,
+        engine: Optional[str] = None,
+        max_age: Optional[float] = None,
+    ) -> int:
         """
-        从文件导入缓存
+        从文件导入缓存（任意导出格式，按文件内容识别，逐条读取）
 
         Args:
             filepath: 导入文件路径
+            engine: 只导入该引擎（模式）的条目
+            max_age: 只导入最近 max_age 秒内写入的条目
 
         Returns:
             导入的条目数
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
+            now = time.time()
             count = 0
-            for entry_dict in data.get('entries', []):
-                entry = CacheEntry(**entry_dict)
+            for entry_dict in cache_codec.iter_export(filepath):
+                entry = CacheEntry(**{
+                    k: v for k, v in entry_dict.items() if k in _ENTRY_FIELDS
+                })
+                if engine and entry.engine != engine:
+                    continue
+                if max_age is not None and now - entry.timestamp > max_age:
+                    continue
                 if not entry.is_expired(self.ttl):
-                    key = self._generate_key(
-                        entry.query,
-                        entry.engine,
-                        entry.num_results
-                    )
+                    key = self._generate_key(entry.query, entry.engine)
                     self._cache[key] = entry
-                    self._access_order.append(key)
+                    self._cache.move_to_end(key)
+                    self._schedule_expiry(key, entry)
                     count += 1
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+                self.evictions += 1
 
             logger.info(f"Cache imported from {filepath}: {count} entries")
             return count
@@ -279,3 +523,100 @@ class SearchCache:
         except Exception as e:
             logger.error(f"Failed to import cache: {e}")
             return 0
+
+
+class EngineResultCache:
+    """单引擎原始结果缓存（位于合并结果缓存之下）
+
+    合并结果缓存的键包含模式（auto/all/brave...），不同模式之间无法共享；
+    但它们最终都调用同一个 ``XxxSearch.search(query, n)``。本缓存按
+    (引擎, 规范化查询) 保存引擎返回的原始排序列表，以 n 条请求得到的条目
+    可截断后服务任意 ≤ n 的请求，从而在切换模式时复用上游结果、节省配额。
+    """
+
+    def __init__(self, ttl: float = 600, max_size: int = 2000):
+        """
+        Args:
+            ttl: 条目有效期（秒）
+            max_size: 最大条目数（超出时淘汰最久未使用的条目）
+        """
+        self.ttl = ttl
+        self.max_size = max(1, max_size)
+        # (engine, normalized query) -> (timestamp, fetched count, results)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, int, List[Any]]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(engine: str, query: str) -> Tuple[str, str]:
+        return engine, " ".join(query.strip().lower().split())
+
+    def get(self, engine: str, query: str, count: int) -> Optional[List[Any]]:
+        """
+        获取引擎原始结果
+
+        Returns:
+            截断到 count 的结果列表；不存在、已过期或条目请求数小于 count
+            时返回None
+        """
+        key = self._key(engine, query)
+        item = self._entries.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        timestamp, fetched, results = item
+        if time.time() - timestamp > self.ttl:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        if fetched < count:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        logger.debug(f"Engine cache hit: {engine} {query[:50]}...")
+        return results[:count]
+
+    def set(self, engine: str, query: str, count: int, results: List[Any]) -> None:
+        """
+        保存引擎原始结果（空结果不缓存）
+
+        Args:
+            engine: 引擎类型
+            query: 发送给引擎的查询
+            count: 向引擎请求的结果数
+            results: 引擎返回的排序列表
+        """
+        if not results:
+            return
+        key = self._key(engine, query)
+        item = self._entries.get(key)
+        if (
+            item is not None
+            and item[1] > count
+            and time.time() - item[0] <= self.ttl
+        ):
+            # 仍有效的更大条目已覆盖本次请求
+            return
+        self._entries[key] = (time.time(), count, list(results))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> int:
+        """清空缓存，返回删除的条目数"""
+        size = len(self._entries)
+        self._entries.clear()
+        return size
+
+    def get_stats(self) -> Dict:
+        """获取统计信息"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
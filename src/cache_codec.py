@@ -0,0 +1,283 @@
+"""Compact storage codecs for cached result lists.
+
+An encoded value is one codec-id byte followed by the codec's payload, so a
+reader can decode every format it knows regardless of which codec wrote it.
+Legacy values (plain JSON TEXT, written before codecs existed) are still
+decoded.
+
+- ``json`` (id 0x00): compact UTF-8 JSON, uncompressed
+- ``zlib`` (id 0x01, default): the list in a column layout (one key list
+  shared by all rows, each row a list of values) as compact JSON,
+  zlib-compressed
+
+Other formats (msgpack, zstd, ...) plug in through :func:`register_codec`;
+the cache only stores the bytes.
+
+Export files are written and read one entry at a time (:class:`ExportWriter`,
+:func:`iter_export`), so exporting or importing a large cache never holds the
+whole table in memory. The format follows the file name:
+
+- ``*.ndjson`` / ``*.jsonl``: a header line, then one JSON entry per line
+- ``*.json``: a single JSON document (``{..., "entries": [...]}``)
+- anything else: ``EXPORT_MAGIC`` followed by length-prefixed encoded chunks
+
+A trailing ``.gz`` gzip-compresses any of them. Readers detect the format
+from the content, including exports written by earlier versions.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import struct
+import zlib
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Union
+
+# Magic prefix of binary export files (followed by length-prefixed chunks,
+# each an encoded list of entries).
+EXPORT_MAGIC = b"C4AC\x02"
+# Earlier binary exports: the magic followed by a single encoded list.
+_EXPORT_MAGIC_V1 = b"C4AC\x01"
+_CHUNK_LEN = struct.Struct(">I")
+
+EXPORT_FORMAT = "crawl4ai-cache"
+
+DEFAULT_CODEC = "zlib"
+
+
+class Codec:
+    """Base codec: compact JSON of the list as-is."""
+
+    name = "json"
+    codec_id = 0x00
+
+    def encode_payload(self, items: Sequence[Any]) -> bytes:
+        return _dumps(list(items))
+
+    def decode_payload(self, payload: bytes) -> List[Any]:
+        return json.loads(bytes(payload).decode("utf-8"))
+
+
+class ZlibCodec(Codec):
+    """Column layout + zlib."""
+
+    name = "zlib"
+    codec_id = 0x01
+
+    def __init__(self, level: int = 6) -> None:
+        self.level = level
+
+    def encode_payload(self, items: Sequence[Any]) -> bytes:
+        return zlib.compress(_dumps(pack_rows(items)), self.level)
+
+    def decode_payload(self, payload: bytes) -> List[Any]:
+        return unpack_rows(json.loads(zlib.decompress(payload).decode("utf-8")))
+
+
+_BY_ID: Dict[int, Codec] = {}
+_BY_NAME: Dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec) -> None:
+    """Make *codec* available for encoding (by name) and decoding (by id)."""
+    if not 0 <= codec.codec_id <= 0xFF:
+        raise ValueError(f"codec id out of range: {codec.codec_id}")
+    _BY_ID[codec.codec_id] = codec
+    _BY_NAME[codec.name] = codec
+
+
+def get_codec(name: str = DEFAULT_CODEC) -> Codec:
+    try:
+        return _BY_NAME[(name or DEFAULT_CODEC).strip().lower()]
+    except KeyError:
+        raise ValueError(
+            f"unknown cache codec {name!r} (available: {', '.join(sorted(_BY_NAME))})"
+        ) from None
+
+
+def encode(items: Sequence[Any], codec: Union[Codec, str, None] = None) -> bytes:
+    """Encode a list (of result dicts) with *codec* (default ``zlib``)."""
+    if not isinstance(codec, Codec):
+        codec = get_codec(codec or DEFAULT_CODEC)
+    return bytes((codec.codec_id,)) + codec.encode_payload(items)
+
+
+def decode(value: Union[bytes, bytearray, memoryview, str]) -> List[Any]:
+    """Decode a value written by :func:`encode`, or a legacy JSON string."""
+    if isinstance(value, str):
+        return json.loads(value)
+    data = memoryview(value)
+    if not data:
+        raise ValueError("empty cache value")
+    codec = _BY_ID.get(data[0])
+    if codec is None:
+        raise ValueError(f"unknown cache codec id 0x{data[0]:02x}")
+    return codec.decode_payload(data[1:])
+
+
+def pack_rows(items: Sequence[Any]) -> List[Any]:
+    """``[keys, rows]``: rows with exactly the first row's keys become lists.
+
+    Other rows (and non-dict items) are kept as they are.
+    """
+    if not items or not isinstance(items[0], dict):
+        return [None, list(items)]
+    keys = tuple(items[0])
+    rows: List[Any] = []
+    for item in items:
+        if isinstance(item, dict) and tuple(item) == keys:
+            rows.append([item[k] for k in keys])
+        else:
+            rows.append(item)
+    return [list(keys), rows]
+
+
+def unpack_rows(packed: List[Any]) -> List[Any]:
+    keys, rows = packed
+    if keys is None:
+        return rows
+    return [dict(zip(keys, row)) if isinstance(row, list) else row for row in rows]
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def export_kind(path: Union[str, Path]) -> str:
+    """``ndjson``, ``json`` or ``binary``, from the file name (``.gz`` ignored)."""
+    suffixes = [s.lower() for s in Path(path).suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes.pop()
+    suffix = suffixes[-1] if suffixes else ""
+    if suffix in (".ndjson", ".jsonl"):
+        return "ndjson"
+    if suffix == ".json":
+        return "json"
+    return "binary"
+
+
+class ExportWriter:
+    """Write export entries one at a time (context manager).
+
+    Binary exports buffer ``chunk_size`` entries per encoded chunk; the other
+    formats write each entry as it arrives.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        header: Optional[Dict[str, Any]] = None,
+        codec: Union[Codec, str, None] = None,
+        chunk_size: int = 500,
+    ) -> None:
+        self.path = Path(path)
+        self.kind = export_kind(self.path)
+        self.codec = codec
+        self.chunk_size = max(1, chunk_size)
+        self.count = 0
+        self._chunk: List[Any] = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.suffix.lower() == ".gz":
+            self._file: IO[bytes] = gzip.open(self.path, "wb", compresslevel=6)
+        else:
+            self._file = open(self.path, "wb")
+        header = {"format": EXPORT_FORMAT, **(header or {})}
+        if self.kind == "ndjson":
+            self._file.write(_dumps(header) + b"\n")
+        elif self.kind == "json":
+            self._file.write(_dumps(header)[:-1] + b',"entries":[')
+        else:
+            self._file.write(EXPORT_MAGIC)
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        if self.kind == "ndjson":
+            self._file.write(_dumps(entry) + b"\n")
+        elif self.kind == "json":
+            self._file.write((b"," if self.count else b"") + _dumps(entry))
+        else:
+            self._chunk.append(entry)
+            if len(self._chunk) >= self.chunk_size:
+                self._write_chunk()
+        self.count += 1
+
+    def _write_chunk(self) -> None:
+        if self._chunk:
+            blob = encode(self._chunk, self.codec)
+            self._file.write(_CHUNK_LEN.pack(len(blob)) + blob)
+            self._chunk = []
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        try:
+            if self.kind == "json":
+                self._file.write(b"]}")
+            else:
+                self._write_chunk()
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> "ExportWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def iter_export(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield the entries of an export file written by any version.
+
+    NDJSON and binary exports are streamed; single-document JSON exports are
+    parsed as a whole.
+    """
+    with open(path, "rb") as raw:
+        gzipped = raw.read(2) == b"\x1f\x8b"
+    with (gzip.open(path, "rb") if gzipped else open(path, "rb")) as f:
+        head = f.read(len(EXPORT_MAGIC))
+        if head == EXPORT_MAGIC:
+            while True:
+                size = f.read(_CHUNK_LEN.size)
+                if len(size) < _CHUNK_LEN.size:
+                    return
+                yield from decode(f.read(_CHUNK_LEN.unpack(size)[0]))
+        if head == _EXPORT_MAGIC_V1:
+            yield from decode(f.read())
+            return
+
+        first = head + f.readline()
+        try:
+            doc = json.loads(first)
+        except ValueError:
+            # Indented single-document export.
+            doc = json.loads(first + f.read())
+        if isinstance(doc, dict) and "entries" in doc:
+            yield from doc["entries"]
+            return
+        if isinstance(doc, dict) and "query" in doc:
+            yield doc
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+register_codec(Codec())
+register_codec(ZlibCodec())
+
+
+__all__ = [
+    "Codec",
+    "DEFAULT_CODEC",
+    "EXPORT_FORMAT",
+    "EXPORT_MAGIC",
+    "ExportWriter",
+    "ZlibCodec",
+    "decode",
+    "encode",
+    "export_kind",
+    "iter_export",
+    "get_codec",
+    "pack_rows",
+    "register_codec",
+    "unpack_rows",
+]
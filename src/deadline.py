@@ -0,0 +1,109 @@
+"""Per-search deadline carried through every layer of a search.
+
+``CRAWL4AI_SEARCH_DEADLINE_S`` used to be enforced only by an outer
+``asyncio.timeout`` around the whole search, while the inner layers
+(retry backoff, direct→proxy fallbacks, rate-limit waits) did not know how
+much time was left.  A late retry could therefore cancel the whole search
+and discard results other engines had already returned.
+
+A :class:`Deadline` is an absolute point on the monotonic clock created once
+per search and passed down explicitly:
+
+- :meth:`Deadline.remaining` / :meth:`Deadline.cap` bound timeouts
+- :meth:`Deadline.fits` lets a layer skip a retry or fallback that cannot
+  finish in the remaining budget, so the caller still gets a partial merge
+
+Passing ``None`` (or a deadline built from ``None`` seconds) means
+"unbounded"; the module-level helpers accept either.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+DEFAULT_MIN_ATTEMPT_S = 0.3
+
+
+class Deadline:
+    """Absolute monotonic deadline with a minimum useful attempt time."""
+
+    __slots__ = ("_at", "_clock", "min_attempt_s")
+
+    def __init__(
+        self,
+        at: Optional[float],
+        *,
+        min_attempt_s: float = DEFAULT_MIN_ATTEMPT_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._at = at
+        self._clock = clock
+        self.min_attempt_s = max(0.0, float(min_attempt_s))
+
+    @classmethod
+    def after(
+        cls,
+        seconds: Optional[float],
+        *,
+        min_attempt_s: float = DEFAULT_MIN_ATTEMPT_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> "Deadline":
+        """Deadline *seconds* from now; unbounded when *seconds* is None."""
+        at = None if seconds is None else clock() + max(0.0, float(seconds))
+        return cls(at, min_attempt_s=min_attempt_s, clock=clock)
+
+    @property
+    def bounded(self) -> bool:
+        return self._at is not None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (>= 0), or None when unbounded."""
+        if self._at is None:
+            return None
+        return max(0.0, self._at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        r = self.remaining()
+        return r is not None and r <= 0.0
+
+    def fits(self, estimate_s: Optional[float] = None) -> bool:
+        """True when an attempt expected to take *estimate_s* can finish.
+
+        Defaults to ``min_attempt_s``: below that an upstream call is not
+        worth starting.
+        """
+        r = self.remaining()
+        if r is None:
+            return True
+        need = self.min_attempt_s if estimate_s is None else max(0.0, estimate_s)
+        return r > 0.0 and r >= need
+
+    def cap(self, timeout_s: Optional[float]) -> Optional[float]:
+        """``min(timeout_s, remaining)``; None only when both are unbounded."""
+        r = self.remaining()
+        if r is None:
+            return timeout_s
+        if timeout_s is None:
+            return r
+        return min(float(timeout_s), r)
+
+    def __repr__(self) -> str:
+        r = self.remaining()
+        return "Deadline(unbounded)" if r is None else f"Deadline(remaining={r:.3f}s)"
+
+
+def remaining(deadline: Optional[Deadline]) -> Optional[float]:
+    """``deadline.remaining()`` tolerating ``None``."""
+    return None if deadline is None else deadline.remaining()
+
+
+def fits(deadline: Optional[Deadline], estimate_s: Optional[float] = None) -> bool:
+    """``deadline.fits()`` tolerating ``None`` (always fits)."""
+    return True if deadline is None else deadline.fits(estimate_s)
+
+
+def cap(deadline: Optional[Deadline], timeout_s: Optional[float]) -> Optional[float]:
+    """``deadline.cap()`` tolerating ``None``."""
+    return timeout_s if deadline is None else deadline.cap(timeout_s)
@@ -0,0 +1,201 @@
+"""Per-engine health statistics for adaptive auto-mode ordering.
+
+``_initialize_engines`` produces a fixed priority order.  An engine that is
+slow or keeps returning nothing (but does not raise) stays first until the
+circuit breaker trips on hard errors.  This module keeps lightweight EWMA
+statistics per engine so the search manager can reorder candidates on every
+request:
+
+- latency: smoothed mean and mean deviation (TCP RTO style)
+- empty rate: share of successful calls that returned no results
+- error rate: share of calls that raised / timed out
+
+Cost model (lower is better)::
+
+    expected_time = latency / max(p_useful, 0.05)
+    p_useful      = (1 - error_rate) * (1 - empty_rate)
+    cost          = expected_time / engine_weight / quota_factor
+
+``quota_factor`` only kicks in once less than ``QUOTA_RESERVE`` of an
+engine's rate-limit tokens are left, so free/self-hosted engines are
+preferred when a paid quota is running out.  Engines without enough samples
+are costed at a prior latency, so untried engines can overtake a degraded
+primary.
+
+The same statistics drive the early-return grace window: we wait for a
+pending engine only as long as it is expected to still answer.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+EWMA_ALPHA = 0.2
+QUOTA_RESERVE = 0.2
+_MIN_USEFUL = 0.05
+
+
+@dataclass
+class EngineHealth:
+    samples: int = 0
+    latency_s: float = 0.0
+    latency_dev_s: float = 0.0
+    empty_rate: float = 0.0
+    error_rate: float = 0.0
+
+    @property
+    def useful_rate(self) -> float:
+        return (1.0 - self.error_rate) * (1.0 - self.empty_rate)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "samples": self.samples,
+            "latency_ewma_s": round(self.latency_s, 4),
+            "latency_dev_s": round(self.latency_dev_s, 4),
+            "empty_rate": round(self.empty_rate, 4),
+            "error_rate": round(self.error_rate, 4),
+        }
+
+
+class EngineHealthTracker:
+    """Thread-safe EWMA health table keyed by engine type."""
+
+    def __init__(self, alpha: float = EWMA_ALPHA) -> None:
+        self._alpha = min(1.0, max(0.01, float(alpha)))
+        self._stats: Dict[str, EngineHealth] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        engine_type: str,
+        *,
+        latency_s: Optional[float] = None,
+        num_results: int = 0,
+        error: bool = False,
+    ) -> None:
+        a = self._alpha
+        with self._lock:
+            h = self._stats.get(engine_type)
+            if h is None:
+                h = self._stats[engine_type] = EngineHealth()
+            first = h.samples == 0
+            h.samples += 1
+
+            err = 1.0 if error else 0.0
+            h.error_rate = err if first else (1 - a) * h.error_rate + a * err
+
+            if latency_s is not None and latency_s >= 0:
+                if first or h.latency_s <= 0:
+                    h.latency_s = latency_s
+                    h.latency_dev_s = latency_s / 2.0
+                else:
+                    h.latency_dev_s = (1 - a) * h.latency_dev_s + a * abs(
+                        latency_s - h.latency_s
+                    )
+                    h.latency_s = (1 - a) * h.latency_s + a * latency_s
+
+            if not error:
+                empty = 1.0 if num_results <= 0 else 0.0
+                h.empty_rate = empty if first else (1 - a) * h.empty_rate + a * empty
+
+    def get(self, engine_type: str) -> Optional[EngineHealth]:
+        with self._lock:
+            h = self._stats.get(engine_type)
+            return None if h is None else EngineHealth(**vars(h))
+
+    def cost(
+        self,
+        engine_type: str,
+        *,
+        weight: float = 1.0,
+        quota_remaining: Optional[float] = None,
+        min_samples: int = 1,
+    ) -> Optional[float]:
+        """Expected cost of trying *engine_type* first; None when unknown."""
+        h = self.get(engine_type)
+        if h is None or h.samples < max(1, min_samples) or h.latency_s <= 0:
+            return None
+        cost = h.latency_s / max(h.useful_rate, _MIN_USEFUL)
+        cost /= max(float(weight), 0.01)
+        if quota_remaining is not None and quota_remaining < QUOTA_RESERVE:
+            cost /= max(quota_remaining / QUOTA_RESERVE, _MIN_USEFUL)
+        return cost
+
+    def order(
+        self,
+        engine_types: Sequence[str],
+        *,
+        weights: Optional[Mapping[str, float]] = None,
+        quota: Optional[Mapping[str, float]] = None,
+        min_samples: int = 1,
+        prior_latency_s: float = 1.0,
+    ) -> List[int]:
+        """Return indices of *engine_types* sorted by ascending cost.
+
+        Until some engine has ``min_samples`` observations the static order
+        is kept.  After that, engines without enough samples are assumed to
+        answer usefully in ``prior_latency_s``, so a degraded primary is
+        overtaken by engines that have not been tried yet.  Ties keep the
+        static order.
+        """
+        weights = weights or {}
+        quota = quota or {}
+        costs: List[Optional[float]] = [
+            self.cost(
+                t,
+                weight=weights.get(t, 1.0),
+                quota_remaining=quota.get(t),
+                min_samples=min_samples,
+            )
+            for t in engine_types
+        ]
+        if all(c is None for c in costs):
+            return list(range(len(engine_types)))
+
+        def _prior(t: str) -> float:
+            cost = max(prior_latency_s, 1e-3) / max(float(weights.get(t, 1.0)), 0.01)
+            q = quota.get(t)
+            if q is not None and q < QUOTA_RESERVE:
+                cost /= max(q / QUOTA_RESERVE, _MIN_USEFUL)
+            return cost
+
+        keys = [
+            (_prior(t) if c is None else c, i)
+            for i, (t, c) in enumerate(zip(engine_types, costs))
+        ]
+        return [i for _, i in sorted(keys)]
+
+    def grace_window(
+        self,
+        pending: Iterable[str],
+        *,
+        elapsed_s: float,
+        remaining_s: float,
+        max_grace_s: float = 1.0,
+        min_samples: int = 1,
+    ) -> Optional[float]:
+        """How long to keep waiting for *pending* engines after early return.
+
+        Uses ``latency + 2 * deviation`` as the point by which an engine
+        should have answered.  Engines that are rarely useful, or that are
+        not expected to answer within ``min(max_grace_s, remaining_s)``, are
+        not waited for.  Returns None when there are no statistics for any
+        pending engine, so callers can fall back to a fixed heuristic.
+        """
+        limit = max(0.0, min(max_grace_s, remaining_s))
+        best: Optional[float] = None
+        for t in pending:
+            h = self.get(t)
+            if h is None or h.samples < max(1, min_samples) or h.latency_s <= 0:
+                continue
+            eta = max(0.0, h.latency_s + 2.0 * h.latency_dev_s - elapsed_s)
+            if h.useful_rate < 0.5 or eta > limit:
+                eta = 0.0
+            best = eta if best is None else max(best, eta)
+        return best
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {k: v.to_dict() for k, v in self._stats.items()}
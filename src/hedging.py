@@ -0,0 +1,89 @@
+"""Hedged engine requests for ``engine="auto"``.
+
+The serial auto path waits for each engine before trying the next one, so a
+slow primary (e.g. Brave/Google behind a proxy) dictates the tail latency.
+Hedging fires the next engine in parallel once the primary has been
+outstanding longer than its observed p90/p95 latency.
+
+- :class:`LatencyWindow` keeps a bounded window of recent per-engine
+  latencies and answers percentile queries
+- :class:`HedgeBudget` caps extra upstream calls to a fraction of primary
+  searches (token bucket: each search deposits ``ratio`` tokens, each hedge
+  spends one)
+
+Both are in-memory and process-local, like the circuit breaker.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class LatencyWindow:
+    """Sliding window of recent latency samples (seconds)."""
+
+    def __init__(self, maxlen: int = 256) -> None:
+        self._samples: Deque[float] = deque(maxlen=max(1, int(maxlen)))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        if seconds >= 0:
+            self._samples.append(float(seconds))
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile; None when no samples were recorded."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        pct = min(100.0, max(0.0, float(pct)))
+        idx = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+        return ordered[idx]
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        return {
+            "samples": len(self._samples),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p95": self.percentile(95),
+        }
+
+
+class HedgeBudget:
+    """Token bucket bounding hedged calls to ``ratio`` x primary searches."""
+
+    def __init__(self, max_tokens: float = 10.0) -> None:
+        self._max_tokens = max(1.0, float(max_tokens))
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+        self.primary = 0
+        self.hedged = 0
+        self.denied = 0
+
+    def deposit(self, ratio: float) -> None:
+        """Account for one primary search."""
+        with self._lock:
+            self.primary += 1
+            self._tokens = min(self._max_tokens, self._tokens + max(0.0, float(ratio)))
+
+    def try_spend(self) -> bool:
+        """Take one token for a hedged call; False when the budget is exhausted."""
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self.hedged += 1
+                return True
+            self.denied += 1
+            return False
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "primary": self.primary,
+                "hedged": self.hedged,
+                "denied": self.denied,
+                "tokens": round(self._tokens, 3),
+            }
@@ -8,7 +8,7 @@ import psutil
 import os
 import httpx
 import socket
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urlsplit
@@ -21,11 +21,20 @@ from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
 # Use relative import or direct import depending on context
 try:
     from .search import SearchManager
+    from .admission import AdmissionRejected
     from .utils import rewrite_local_proxy_url, get_http_proxy_from_env
 except ImportError:
     from search import SearchManager
+    from admission import AdmissionRejected
     from utils import rewrite_local_proxy_url, get_http_proxy_from_env
 
+# Shared settings snapshot: always resolve the same module object that
+# search.py/utils.py use, regardless of how this file was imported.
+try:  # pragma: no cover
+    from src.settings import get_settings
+except Exception:  # pragma: no cover
+    from settings import get_settings
+
 mcp = FastMCP("Crawl4AI")
 
 crawler = None
@@ -50,6 +59,11 @@ async def initialize_search_manager():
                 "Search manager initialized with engines:",
                 [type(e).__name__ for e in search_manager.engines]
             )
+            if get_settings().cache_warmup_on_start and search_manager.cache:
+                # Re-fetch the most-hit cached queries in the background.
+                search_manager.start_cache_warmup()
+            if get_settings().refresh_ahead:
+                search_manager.start_refresh_ahead()
 
 
 def _config_path() -> Path:
@@ -121,99 +135,46 @@ def _resolve_crawler_proxy_url() -> str | None:
     return _env_proxy_http_https()
 
 
-def _parse_bool_env(value: str | None) -> bool | None:
-    if value is None:
-        return None
-    v = str(value).strip().lower()
-    if v in {"1", "true", "yes", "y", "on"}:
-        return True
-    if v in {"0", "false", "no", "n", "off"}:
-        return False
-    return None
-
-
-def _parse_int_env(value: str | None) -> int | None:
-    if value is None:
-        return None
-    try:
-        return int(str(value).strip())
-    except Exception:
-        return None
-
-
-def _parse_float_env(value: str | None) -> float | None:
-    if value is None:
-        return None
-    try:
-        return float(str(value).strip())
-    except Exception:
-        return None
-
+# read_url guard settings are parsed once into the shared settings snapshot
+# (see settings.py); these accessors are plain attribute reads.
 
 def _read_url_security_enabled() -> bool:
     # Default: enabled (safe baseline)
-    v = _parse_bool_env(os.environ.get("CRAWL4AI_READ_URL_SSRF_PROTECTION"))
-    return True if v is None else bool(v)
+    return get_settings().read_url_ssrf_protection
 
 
 def _read_url_allow_private() -> bool:
     # Default: block private/loopback
-    v = _parse_bool_env(os.environ.get("CRAWL4AI_READ_URL_ALLOW_PRIVATE"))
-    return False if v is None else bool(v)
+    return get_settings().read_url_allow_private
 
 
-def _read_url_allowed_hosts() -> set[str]:
-    raw = (os.environ.get("CRAWL4AI_READ_URL_ALLOWED_HOSTS") or "").strip()
-    if not raw:
-        return set()
-    return {h.strip().lower() for h in raw.split(",") if h.strip()}
+def _read_url_allowed_hosts() -> frozenset[str]:
+    return get_settings().read_url_allowed_hosts
 
 
 def _read_url_max_url_length() -> int:
-    v = _parse_int_env(os.environ.get("CRAWL4AI_READ_URL_MAX_URL_LENGTH"))
-    if v is None:
-        return 4096
-    return max(256, v)
+    return get_settings().read_url_max_url_length
 
 
 def _read_url_preflight_enabled() -> bool:
     # Default: disabled to avoid extra network calls / false negatives.
-    v = _parse_bool_env(os.environ.get("CRAWL4AI_READ_URL_PREFLIGHT"))
-    return False if v is None else bool(v)
+    return get_settings().read_url_preflight
 
 
 def _read_url_preflight_timeout_s() -> float:
-    v = _parse_float_env(os.environ.get("CRAWL4AI_READ_URL_PREFLIGHT_TIMEOUT_S"))
-    if v is None:
-        return 5.0
-    return max(0.5, v)
+    return get_settings().read_url_preflight_timeout_s
 
 
 def _read_url_max_redirects() -> int:
-    v = _parse_int_env(os.environ.get("CRAWL4AI_READ_URL_MAX_REDIRECTS"))
-    if v is None:
-        return 5
-    return max(0, v)
+    return get_settings().read_url_max_redirects
 
 
 def _read_url_preflight_max_bytes() -> int:
-    v = _parse_int_env(os.environ.get("CRAWL4AI_READ_URL_PREFLIGHT_MAX_BYTES"))
-    if v is None:
-        return 2 * 1024 * 1024
-    return max(0, v)
+    return get_settings().read_url_preflight_max_bytes
 
 
 def _read_url_allowed_content_type_prefixes() -> tuple[str, ...]:
-    raw = (os.environ.get("CRAWL4AI_READ_URL_ALLOWED_CONTENT_TYPES") or "").strip()
-    if not raw:
-        return (
-            "text/html",
-            "application/xhtml+xml",
-            "text/plain",
-            "application/json",
-        )
-    parts = [p.strip().lower() for p in raw.split(",") if p.strip()]
-    return tuple(parts)
+    return get_settings().read_url_allowed_content_types
 
 
 def _is_public_ip(ip: str) -> bool:
@@ -617,6 +578,12 @@ async def search(
             error_msg = f"Error encoding search results: {str(e)}"
             print(error_msg)
             return json.dumps({"error": error_msg}, ensure_ascii=False)
+    except AdmissionRejected as e:
+        # Overloaded: tell the caller when to come back (HTTP bridge -> 503).
+        return json.dumps(
+            {"error": str(e), "retry_after_s": round(e.retry_after_s, 3)},
+            ensure_ascii=False,
+        )
     except Exception as e:
         error_msg = f"Search error: {str(e)}"
         print(error_msg)  # 添加错误日志
@@ -627,6 +594,122 @@ async def search(
             return f"Error: {error_msg}. JSON encoding failed: {str(json_e)}"
 
 
+def _batch_row(
+    query: str,
+    results: List[Dict[str, Any]],
+    rejected: Optional[AdmissionRejected] = None,
+    **extra: Any,
+) -> Dict[str, Any]:
+    """One batch result row; refused queries carry ``error``/``retry_after_s``."""
+    row: Dict[str, Any] = {**extra, "query": query, "results": results}
+    if rejected is not None:
+        row["error"] = str(rejected)
+        row["retry_after_s"] = round(rejected.retry_after_s, 3)
+    return row
+
+
+def _validate_batch_queries(queries: Any) -> str | None:
+    if not isinstance(queries, list) or not queries:
+        return "queries must be a non-empty list of strings"
+    if not all(isinstance(q, str) for q in queries):
+        return "queries must be a non-empty list of strings"
+    max_queries = get_settings().batch_max_queries
+    if len(queries) > max_queries:
+        return f"Too many queries: {len(queries)} (max {max_queries})"
+    return None
+
+
+async def search_batch_stream(
+    queries: List[str], num_results: int = 10, engine: str = "auto"
+):
+    """Yield ``{"index", "query", "results"}`` rows as batch queries complete.
+
+    Used by the HTTP bridge for streaming (NDJSON) batch responses; input is
+    expected to be validated by the caller.
+    """
+    if num_results < 1:
+        num_results = 10
+    await initialize_search_manager()
+    rejections: Dict[int, AdmissionRejected] = {}
+    async for i, results in search_manager.search_many_iter(
+        queries, num_results, engine, rejections=rejections
+    ):
+        yield _batch_row(queries[i], results, rejections.get(i), index=i)
+
+
+async def search_stream_events(
+    query: str, num_results: int = 10, engine: str = "auto"
+):
+    """Yield provisional/final ranking events for one query (HTTP streaming).
+
+    See ``SearchManager.search_stream`` for the event format.
+    """
+    if num_results < 1:
+        num_results = 10
+    await initialize_search_manager()
+    if not search_manager or not search_manager.engines:
+        yield {"type": "final", "results": [], "error": "No search engines available"}
+        return
+    async for event in search_manager.search_stream(query, num_results, engine):
+        yield event
+
+
+@mcp.tool()
+async def search_batch(
+    queries: List[str], num_results: int = 10, engine: str = "auto"
+) -> str:
+    """批量执行网络搜索（最多 50 条查询，可通过 CRAWL4AI_BATCH_MAX_QUERIES 调整）。
+
+    相同/仅大小写空白不同的查询只搜索一次；缓存命中立即返回；未命中的查询
+    按输入顺序在引擎限流与并发限制下统一调度。
+
+    Args:
+        queries: 搜索查询字符串列表
+        num_results: 每条查询返回的结果数量,默认为10
+        engine: 使用的搜索引擎（同 search 工具）
+
+    Returns:
+        JSON 数组，按输入顺序，每项为 {"query": ..., "results": [...]}；
+        因服务过载被拒绝的查询另带 "error" 与 "retry_after_s"。
+        全部查询均被拒绝时返回 {"error": ..., "retry_after_s": ...}
+    """
+    error = _validate_batch_queries(queries)
+    if error:
+        return json.dumps({"error": error}, ensure_ascii=False)
+    if num_results < 1:
+        num_results = 10
+
+    try:
+        await initialize_search_manager()
+        if not search_manager or not search_manager.engines:
+            return json.dumps(
+                {"error": "No search engines available"}, ensure_ascii=False
+            )
+
+        rejections: Dict[int, AdmissionRejected] = {}
+        batch = await search_manager.search_many(
+            queries, num_results, engine, rejections=rejections
+        )
+        return json.dumps(
+            [
+                _batch_row(q, r, rejections.get(i))
+                for i, (q, r) in enumerate(zip(queries, batch))
+            ],
+            ensure_ascii=False,
+            indent=2,
+        )
+    except AdmissionRejected as e:
+        # The whole batch was refused (HTTP bridge -> 503 + Retry-After).
+        return json.dumps(
+            {"error": str(e), "retry_after_s": round(e.retry_after_s, 3)},
+            ensure_ascii=False,
+        )
+    except Exception as e:
+        error_msg = f"Batch search error: {str(e)}"
+        print(error_msg)
+        return json.dumps({"error": error_msg}, ensure_ascii=False)
+
+
 @mcp.tool()
 async def system_status(check_type: str = "health") -> str:
     """系统状态检查 - 统一的监控端点
@@ -912,6 +995,14 @@ async def system_status(check_type: str = "health") -> str:
                     "engines": engine_stats,
                     "recent_searches_count": len(monitor.recent_searches)
                 }
+                if hasattr(search_manager, "get_hedge_stats"):
+                    monitor_data["hedging"] = search_manager.get_hedge_stats()
+                if hasattr(search_manager, "get_engine_health"):
+                    monitor_data["engine_health"] = search_manager.get_engine_health()
+                if hasattr(search_manager, "get_admission_stats"):
+                    monitor_data["admission"] = search_manager.get_admission_stats()
+                if hasattr(search_manager, "get_scoring_stats"):
+                    monitor_data["scoring"] = search_manager.get_scoring_stats()
             
             metrics_data = {
                 "service": {
@@ -965,20 +1056,38 @@ async def system_status(check_type: str = "health") -> str:
 @mcp.tool()
 async def manage_cache(
     action: str,
-    export_path: str = "output/cache_export.json"
+    export_path: str = "output/cache_export.ndjson.gz",
+    engine: str = "",
+    since: float = 0,
+    max_age_s: float = 0,
+    queries: List[str] | None = None,
+    top_n: int = 0
 ) -> str:
     """缓存管理工具。
     
     支持的操作：
     - stats: 获取缓存统计信息
     - clear: 清空所有缓存
-    - export: 导出缓存到 JSON 文件
+    - export: 流式导出缓存（.ndjson/.jsonl 每行一条，.json 单个文档，
+      其他扩展名为二进制；再加 .gz 压缩）
+    - import: 从导出文件导入缓存（分批写入，自动识别格式）
     - cleanup: 清理过期的缓存条目
     - vacuum: 优化数据库（仅持久化缓存）
+    - warmup: 后台预热缓存（queries 或命中最多的 top_n 个已缓存查询），
+      以后台优先级运行，立即返回进度
+    - warmup_status: 查看预热进度
     
     Args:
-        action: 操作类型 (stats/clear/export/cleanup/vacuum)
-        export_path: 导出路径（仅用于 export 操作）
+        action: 操作类型 (stats/clear/export/import/cleanup/vacuum/
+            warmup/warmup_status)
+        export_path: 导出/导入文件路径（仅用于 export/import 操作）
+        engine: 只导出/导入该引擎（模式）的条目，空表示全部
+        since: 增量导出：只导出该时间戳之后写入的条目（上次导出返回的
+            next_since），0 表示全量
+        max_age_s: 只导出/导入最近 N 秒内写入的条目，0 表示不限
+        queries: 要预热的查询（仅 warmup；引擎取 engine，默认 auto）
+        top_n: 不给 queries 时预热命中最多的 N 个查询，0 表示使用
+            CRAWL4AI_CACHE_WARMUP_TOP_N
     
     Returns:
         操作结果信息
@@ -993,6 +1102,11 @@ async def manage_cache(
             }, ensure_ascii=False, indent=2)
         
         cache = search_manager.cache
+        filters = {}
+        if engine:
+            filters["engine"] = engine
+        if max_age_s > 0:
+            filters["max_age"] = max_age_s
         
         if action == "stats":
             # 获取统计信息
@@ -1023,12 +1137,19 @@ async def manage_cache(
         elif action == "export":
             # 导出缓存
             if hasattr(cache, 'export_to_json'):
-                count = cache.export_to_json(export_path)
+                # 记录导出开始时间：下次以它作为 since 做增量导出不会漏掉
+                # 导出期间写入的条目
+                started = time.time()
+                # 流式导出（含等待写回队列落盘）是阻塞 I/O，放到线程里执行
+                count = await asyncio.to_thread(
+                    cache.export_to_json, export_path, since=since or None, **filters
+                )
                 result = {
                     "success": True,
                     "action": "export",
                     "message": f"Exported {count} entries",
                     "export_path": export_path,
+                    "next_since": started,
                     "timestamp": datetime.now().isoformat()
                 }
             else:
@@ -1037,6 +1158,25 @@ async def manage_cache(
                     "error": "Export operation not supported"
                 }
                 
+        elif action == "import":
+            # 导入缓存
+            if hasattr(cache, 'import_from_json'):
+                count = await asyncio.to_thread(
+                    cache.import_from_json, export_path, **filters
+                )
+                result = {
+                    "success": True,
+                    "action": "import",
+                    "message": f"Imported {count} entries",
+                    "export_path": export_path,
+                    "timestamp": datetime.now().isoformat()
+                }
+            else:
+                result = {
+                    "success": False,
+                    "error": "Import operation not supported"
+                }
+                
         elif action == "cleanup":
             # 清理过期条目
             if hasattr(cache, 'remove_expired'):
@@ -1068,11 +1208,35 @@ async def manage_cache(
                     "success": False,
                     "error": "Vacuum operation not supported (only for persistent cache)"
                 }
+        elif action == "warmup":
+            # 后台预热（已在运行时返回当前进度）
+            status = search_manager.start_cache_warmup(
+                queries=queries or None,
+                top_n=top_n or None,
+                engine=engine or "auto",
+            )
+            result = {
+                "success": True,
+                "action": "warmup",
+                "warmup": status,
+                "timestamp": datetime.now().isoformat()
+            }
+                
+        elif action == "warmup_status":
+            result = {
+                "success": True,
+                "action": "warmup_status",
+                "warmup": search_manager.cache_warmup_status(),
+                "timestamp": datetime.now().isoformat()
+            }
         else:
             result = {
                 "success": False,
                 "error": f"Unknown action: {action}",
-                "available_actions": ["stats", "clear", "export", "cleanup", "vacuum"]
+                "available_actions": [
+                    "stats", "clear", "export", "import", "cleanup", "vacuum",
+                    "warmup", "warmup_status"
+                ]
             }
         
         return json.dumps(result, ensure_ascii=False, indent=2)
@@ -0,0 +1,181 @@
+"""Near-duplicate detection for fused result lists.
+
+Fusion used to drop near-duplicate titles by comparing every result with
+every kept title through ``difflib.SequenceMatcher``: O(n²) ratio
+computations on candidate pools of 80+ results.  This module keeps the same
+similarity test but only runs it on likely matches:
+
+- each text (lowercased, whitespace collapsed) becomes a set of character
+  3-gram shingles, and a MinHash signature of ``BANDS`` x ``ROWS`` values is
+  built in one pass over them (one-permutation hashing with densification)
+- signatures are bucketed per band (LSH); a result is only compared with
+  kept results sharing a bucket
+- candidates are confirmed with ``SequenceMatcher.ratio() >= threshold``
+  (after the cheap length and ``quick_ratio`` bounds, reusing one matcher per
+  kept text), so the 0.85 threshold means exactly what it did before
+
+Results are scanned in rank order and a result is dropped when it matches a
+result already kept, as before.  The only difference from the pairwise scan
+is that LSH can miss a pair near the threshold (a few percent of pairs at
+ratio 0.85, well under 1% above 0.9).
+"""
+
+from __future__ import annotations
+
+import zlib
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+SHINGLE_CHARS = 3
+BANDS = 12
+ROWS = 2
+
+# Snippets shorter than this are too generic to mark a page as a mirror.
+SNIPPET_MIN_CHARS = 60
+
+_BINS = BANDS * ROWS
+_PRIME = (1 << 61) - 1
+_MUL = 0x5BD1E9955BD1E995 % _PRIME
+_ADD = 0x27D4EB2F165667C5 % _PRIME
+
+
+def normalize_text(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def signature(text: str) -> List[Tuple[int, int]]:
+    """MinHash signature of normalized *text* (``BANDS * ROWS`` values).
+
+    Every shingle is hashed once (CRC32, stable across processes) and falls
+    into one bin by its permuted value; each bin keeps its minimum.  Empty
+    bins borrow the next filled bin's value, tagged with the distance.
+    """
+    if len(text) <= SHINGLE_CHARS:
+        grams = {text} if text else set()
+    else:
+        grams = {text[i:i + SHINGLE_CHARS] for i in range(len(text) - SHINGLE_CHARS + 1)}
+    if not grams:
+        return []
+    mins: List[Optional[int]] = [None] * _BINS
+    for gram in grams:
+        value, slot = divmod((zlib.crc32(gram.encode()) * _MUL + _ADD) % _PRIME, _BINS)
+        current = mins[slot]
+        if current is None or value < current:
+            mins[slot] = value
+    sig = []
+    for i in range(_BINS):
+        for d in range(_BINS):
+            value = mins[(i + d) % _BINS]
+            if value is not None:
+                sig.append((value, d))
+                break
+    return sig
+
+
+def band_keys(sig: Sequence[Tuple[int, int]]) -> List[tuple]:
+    return [(band,) + tuple(sig[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+
+def similar(a: str, b: str, threshold: float, matcher: Optional[SequenceMatcher] = None) -> bool:
+    """``SequenceMatcher(None, a, b).ratio() >= threshold``, bounds first.
+
+    *matcher* may be a reusable ``SequenceMatcher`` whose seq2 is already *b*.
+    """
+    la, lb = len(a), len(b)
+    if 2.0 * min(la, lb) < threshold * (la + lb):
+        return False
+    if matcher is None:
+        matcher = SequenceMatcher(None, a, b)
+    else:
+        matcher.set_seq1(a)
+    return matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
+
+
+class NearDuplicateIndex:
+    """LSH buckets over the signatures of kept texts."""
+
+    def __init__(self, threshold: float = 0.85) -> None:
+        self.threshold = float(threshold)
+        self._texts: List[str] = []
+        # One matcher per kept text, built lazily; seq2 indexing is reused.
+        self._matchers: List[Optional[SequenceMatcher]] = []
+        self._buckets: Dict[tuple, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def find(self, text: str) -> Tuple[Optional[int], List[tuple]]:
+        """(position of a kept text similar to *text* or None, its band keys).
+
+        *text* must already be normalized (:func:`normalize_text`).
+        """
+        if not text:
+            return None, []
+        keys = band_keys(signature(text))
+        seen = set()
+        for key in keys:
+            for idx in self._buckets.get(key, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                kept = self._texts[idx]
+                matcher = self._matchers[idx]
+                if matcher is None:
+                    matcher = self._matchers[idx] = SequenceMatcher(None, text, kept)
+                if similar(text, kept, self.threshold, matcher):
+                    return idx, keys
+        return None, keys
+
+    def add(self, text: str, keys: Sequence[tuple]) -> None:
+        if not text:
+            return
+        idx = len(self._texts)
+        self._texts.append(text)
+        self._matchers.append(None)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(idx)
+
+
+def near_duplicate_mask(
+    results: Sequence[Mapping[str, Any]],
+    threshold: float = 0.85,
+    snippets: bool = False,
+) -> List[bool]:
+    """Keep-flags for *results* in rank order (True = not a near-duplicate).
+
+    A result is a duplicate when its title matches a kept title, or, with
+    *snippets*, when its snippet (at least ``SNIPPET_MIN_CHARS`` long)
+    matches a kept snippet, which catches mirror pages under other titles.
+    """
+    titles = NearDuplicateIndex(threshold)
+    bodies = NearDuplicateIndex(threshold) if snippets else None
+    keep: List[bool] = []
+    for r in results:
+        title = normalize_text(r.get("title"))
+        match, title_keys = titles.find(title)
+        dup = match is not None
+
+        body, body_keys = "", []
+        if bodies is not None and not dup:
+            body = normalize_text(r.get("snippet"))
+            if len(body) < SNIPPET_MIN_CHARS:
+                body = ""
+            match, body_keys = bodies.find(body)
+            dup = match is not None
+
+        keep.append(not dup)
+        if not dup:
+            titles.add(title, title_keys)
+            if bodies is not None:
+                bodies.add(body, body_keys)
+    return keep
+
+
+__all__ = [
+    "NearDuplicateIndex",
+    "SNIPPET_MIN_CHARS",
+    "near_duplicate_mask",
+    "normalize_text",
+    "signature",
+    "similar",
+]
@@ -4,68 +4,170 @@
 提供基于 SQLite 的持久化缓存，支持跨会话缓存共享和预热。
 """
 
+import asyncio
 import sqlite3
 import hashlib
 import time
 import json
 import logging
+import queue
 import threading
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 from contextlib import contextmanager
 
+try:
+    from src import cache_codec
+    from src.ttl_policy import TTLPolicy
+except Exception:  # pragma: no cover
+    import cache_codec
+    from ttl_policy import TTLPolicy
+
 logger = logging.getLogger(__name__)
 
-_local = threading.local()
+_STOP = object()  # 写线程退出标记
+
+# 插入或整行更新。不用 INSERT OR REPLACE：REPLACE 的隐式删除不触发
+# DELETE 触发器，会使 cache_meta 中的条目计数偏大。
+_UPSERT_SQL = """
+    INSERT INTO search_cache
+    (key, query, engine, num_results, results,
+     timestamp, hits, created_at, updated_at, ttl)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+        query = excluded.query,
+        engine = excluded.engine,
+        num_results = excluded.num_results,
+        results = excluded.results,
+        timestamp = excluded.timestamp,
+        hits = excluded.hits,
+        created_at = excluded.created_at,
+        updated_at = excluded.updated_at,
+        ttl = excluded.ttl
+"""
 
 
 @dataclass
 class CacheEntry:
-    """缓存条目"""
+    """内存层缓存条目（保存解码后的结果，命中时无需 json.loads）"""
     key: str
     query: str
     engine: str
     num_results: int
-    results: str  # JSON 字符串
+    results: List[Dict]
     timestamp: float
     hits: int = 0
+    ttl: Optional[float] = None  # 条目自身的软 TTL；None 表示使用缓存默认值
+    size: int = 0  # 结果估算大小，用于内存层容量统计
     
     def get_results(self) -> List[Dict]:
         """获取结果列表"""
-        return json.loads(self.results)
+        return self.results
+
+    def ttl_or(self, default_ttl: float) -> float:
+        """条目的软 TTL（未记录时使用 default_ttl）"""
+        return self.ttl if self.ttl is not None else default_ttl
     
-    def is_expired(self, ttl: int) -> bool:
-        """检查是否过期"""
-        return time.time() - self.timestamp > ttl
+    def is_expired(self, default_ttl: float, grace: float = 0) -> bool:
+        """检查是否超过条目 TTL（+ grace 秒）"""
+        return time.time() - self.timestamp > self.ttl_or(default_ttl) + grace
+
+
+def _results_size(results: List[Dict]) -> int:
+    """内存层容量估算：各字段键、值的字符数之和（与 JSON 长度同量级）"""
+    return sum(
+        len(str(k)) + len(str(v)) + 6
+        for r in results if isinstance(r, dict)
+        for k, v in r.items()
+    ) + 2
 
 
 class PersistentCache:
-    """持久化搜索结果缓存管理器（基于 SQLite）"""
+    """持久化搜索结果缓存管理器（基于 SQLite）
+
+    结果以 :mod:`cache_codec` 编码（默认列式 + zlib，带编码 id 字节）存为
+    BLOB；旧版 JSON TEXT 行照常读取，重写或 :meth:`vacuum` 时转换。
+
+    内存层是按结果估算大小计量、有字节上限的 LRU；数据库条目数由触发器
+    维护在 ``cache_meta`` 表中，写满时按最近访问时间（``updated_at``）淘汰。
+
+    同步方法直接在调用线程上访问数据库。事件循环中应使用异步方法
+    （:meth:`alookup` / :meth:`aget` / :meth:`aset`）：读取在小型读线程池中
+    执行，写入与命中计数进入队列，由单个写线程按批提交（每
+    ``write_batch_interval`` 秒或每 ``write_batch_size`` 个操作一次）。
+    缓存调用占用事件循环的时间记录在 ``get_stats()["io"]`` 中。
+    """
 
     def __init__(
         self,
         db_path: str = "cache/search_cache.db",
         ttl: int = 3600,
         max_size: int = 10000,
-        enable_memory_cache: bool = True
+        enable_memory_cache: bool = True,
+        stale_ttl: int = 0,
+        ttl_policy: Optional[TTLPolicy] = None,
+        reader_threads: int = 2,
+        write_batch_size: int = 100,
+        write_batch_interval: float = 0.05,
+        memory_max_bytes: int = 32 * 1024 * 1024,
+        codec: str = cache_codec.DEFAULT_CODEC,
     ):
         """
         初始化持久化缓存管理器
 
         Args:
             db_path: SQLite 数据库路径
-            ttl: 缓存过期时间（秒），默认1小时
+            ttl: 默认缓存过期时间（秒，软 TTL），默认1小时
             max_size: 最大缓存条目数，默认10000
             enable_memory_cache: 是否启用内存缓存（加速访问）
+            stale_ttl: 过期后继续保留的秒数（硬 TTL = 条目 TTL + stale_ttl），
+                期间条目可经 :meth:`lookup` 作为陈旧结果使用，默认0
+            ttl_policy: 写入时决定条目 TTL 的策略，默认固定 TTL
+                （空结果使用短的负缓存 TTL）
+            reader_threads: 异步读取使用的线程数
+            write_batch_size: 写线程每批最多提交的操作数
+            write_batch_interval: 写线程收集一批操作的最长等待（秒）
+            memory_max_bytes: 内存层容量上限（按结果估算大小计）
+            codec: 结果存储编码（见 :mod:`cache_codec`），默认 zlib
         """
         self.db_path = Path(db_path)
         self.ttl = ttl
+        self.stale_ttl = max(0, stale_ttl)
+        self.ttl_policy = ttl_policy or TTLPolicy()
         self.max_size = max_size
         self.enable_memory_cache = enable_memory_cache
+        self.codec = cache_codec.get_codec(codec)
         
-        # 内存缓存（可选）
-        self._memory_cache: Dict[str, CacheEntry] = {}
+        # 内存缓存（可选）：LRU，最久未使用的在前；读写线程共享，加锁访问
+        self.memory_max_bytes = max(0, int(memory_max_bytes))
+        self._memory_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        self._memory_evictions = 0
+        self._memory_lock = threading.Lock()
+
+        # 每个实例、每个线程一个连接（WAL：读线程与写线程可并发）
+        self._local = threading.local()
+        self._io_lock = threading.Lock()
+        self._reader_threads = max(1, int(reader_threads))
+        self._readers: Optional[ThreadPoolExecutor] = None
+        self._write_batch_size = max(1, int(write_batch_size))
+        self._write_batch_interval = max(0.0, float(write_batch_interval))
+        self._writes: "queue.Queue[object]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        # 已排队、尚未提交的非空写入：key -> (timestamp, num_results, results)
+        self._pending: Dict[str, Tuple[float, int, List[Dict]]] = {}
+        self._pending_lock = threading.Lock()
+        self._io_stats: Dict[str, float] = {
+            "loop_calls": 0,
+            "loop_stall_s": 0.0,
+            "loop_stall_max_s": 0.0,
+            "write_batches": 0,
+            "write_ops": 0,
+            "write_errors": 0,
+        }
         
         # 确保数据库目录存在
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -79,16 +181,21 @@ class PersistentCache:
             f"memory_cache={enable_memory_cache}"
         )
 
-    @contextmanager
-    def _get_connection(self):
-        """获取数据库连接（上下文管理器，thread-local 复用）"""
-        conn = getattr(_local, 'conn', None)
+    def _connection(self) -> sqlite3.Connection:
+        """当前线程的数据库连接（按实例、按线程复用）"""
+        conn = getattr(self._local, 'conn', None)
         if conn is None:
             conn = sqlite3.connect(self.db_path)
             conn.row_factory = sqlite3.Row
             conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("PRAGMA synchronous=NORMAL")
-            _local.conn = conn
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _get_connection(self):
+        """获取数据库连接（上下文管理器，thread-local 复用）"""
+        conn = self._connection()
         try:
             yield conn
             conn.commit()
@@ -96,7 +203,7 @@ class PersistentCache:
             conn.rollback()
             logger.error(f"Database error: {e}")
             # Discard broken connection so next call creates a fresh one
-            _local.conn = None
+            self._local.conn = None
             try:
                 conn.close()
             except Exception:
@@ -115,13 +222,58 @@ class PersistentCache:
                     query TEXT NOT NULL,
                     engine TEXT NOT NULL,
                     num_results INTEGER NOT NULL,
-                    results TEXT NOT NULL,
+                    results BLOB NOT NULL,
                     timestamp REAL NOT NULL,
                     hits INTEGER DEFAULT 0,
                     created_at REAL NOT NULL,
-                    updated_at REAL NOT NULL
+                    updated_at REAL NOT NULL,
+                    ttl REAL
                 )
             """)
+
+            # 旧库迁移：补充条目 TTL 列（NULL 表示使用默认 TTL）
+            columns = {
+                row['name']
+                for row in cursor.execute("PRAGMA table_info(search_cache)")
+            }
+            if 'ttl' not in columns:
+                cursor.execute("ALTER TABLE search_cache ADD COLUMN ttl REAL")
+                logger.info("Database migrated: added search_cache.ttl")
+
+            # 条目计数（写入时无需 COUNT(*) 全表扫描），由触发器维护；
+            # 旧库首次打开时统计一次
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cache_meta (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            cursor.execute("""
+                INSERT OR IGNORE INTO cache_meta (name, value)
+                SELECT 'entry_count', COUNT(*) FROM search_cache
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_search_cache_insert
+                AFTER INSERT ON search_cache
+                BEGIN
+                    UPDATE cache_meta SET value = value + 1
+                    WHERE name = 'entry_count';
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_search_cache_delete
+                AFTER DELETE ON search_cache
+                BEGIN
+                    UPDATE cache_meta SET value = value - 1
+                    WHERE name = 'entry_count';
+                END
+            """)
+
+            # 按最近访问淘汰
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_updated_at
+                ON search_cache(updated_at)
+            """)
             
             # 创建索引
             cursor.execute("""
@@ -136,29 +288,31 @@ class PersistentCache:
             
             logger.debug("Database initialized successfully")
 
-    def _generate_key(
-        self, query: str, engine: str, num_results: int
-    ) -> str:
+    def _generate_key(self, query: str, engine: str) -> str:
         """
         生成缓存键
 
+        键不包含 num_results：为 k=N 缓存的结果截断后可服务任意 k≤N 的请求
+        （num_results 列记录条目覆盖的数量）。
+
         Args:
             query: 搜索查询
             engine: 搜索引擎
-            num_results: 结果数量
 
         Returns:
             缓存键（MD5哈希）
         """
         normalized = " ".join(query.strip().lower().split())
-        key_str = f"{normalized}|{engine}|{num_results}"
+        key_str = f"{normalized}|{engine}"
         return hashlib.md5(key_str.encode()).hexdigest()
 
-    def get(
+    def lookup(
         self, query: str, engine: str, num_results: int
-    ) -> Optional[List[Dict]]:
+    ) -> Optional[Tuple[List[Dict], float]]:
         """
-        从缓存获取结果
+        查找缓存结果（包括过了软 TTL、仍在硬 TTL 内的陈旧条目）
+
+        同步版本：在调用线程上执行 SQLite I/O。事件循环中请使用 :meth:`alookup`。
 
         Args:
             query: 搜索查询
@@ -166,86 +320,295 @@ class PersistentCache:
             num_results: 结果数量
 
         Returns:
-            缓存的结果，如果不存在或已过期则返回None
+            (截断到 num_results 的结果, 超出软 TTL 的秒数)，秒数 <= 0 表示
+            新鲜；不存在、超过硬 TTL 或条目结果数少于 num_results 则返回None。
+            只有新鲜命中计入 hits
         """
-        key = self._generate_key(query, engine, num_results)
-        
-        # 先检查内存缓存
-        if self.enable_memory_cache and key in self._memory_cache:
-            entry = self._memory_cache[key]
-            if not entry.is_expired(self.ttl):
-                logger.debug(f"Memory cache hit: {query[:50]}...")
-                return entry.get_results()
-            else:
-                # 过期，从内存缓存删除
-                del self._memory_cache[key]
-        
-        # 从数据库查询
+        started = time.perf_counter()
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    SELECT * FROM search_cache 
-                    WHERE key = ? 
-                    LIMIT 1
-                    """,
-                    (key,)
-                )
-                row = cursor.fetchone()
-                
-                if not row:
-                    logger.debug(f"Cache miss: {query[:50]}...")
-                    return None
-                
-                # 检查是否过期
-                timestamp = row['timestamp']
-                if time.time() - timestamp > self.ttl:
-                    logger.debug(f"Cache expired: {query[:50]}...")
-                    # 删除过期条目
-                    cursor.execute(
-                        "DELETE FROM search_cache WHERE key = ?",
-                        (key,)
-                    )
-                    return None
-                
-                # 更新访问计数
-                cursor.execute(
-                    """
-                    UPDATE search_cache 
-                    SET hits = hits + 1, updated_at = ? 
-                    WHERE key = ?
-                    """,
-                    (time.time(), key)
-                )
-                
-                results = json.loads(row['results'])
-                
-                # 更新内存缓存
-                if self.enable_memory_cache:
-                    entry = CacheEntry(
-                        key=key,
-                        query=row['query'],
-                        engine=row['engine'],
-                        num_results=row['num_results'],
-                        results=row['results'],
-                        timestamp=timestamp,
-                        hits=row['hits'] + 1
-                    )
-                    self._memory_cache[key] = entry
-                
-                logger.info(
-                    f"Cache hit: {query[:50]}... "
-                    f"(hits={row['hits'] + 1}, "
-                    f"age={int(time.time() - timestamp)}s)"
-                )
-                
-                return results
-                
+            key = self._generate_key(query, engine)
+            found, hit = self._local_lookup(key, query, num_results)
+            if found:
+                return hit
+            try:
+                with self._get_connection() as conn:
+                    row = self._fetch_row(conn, key)
+                    hit, op = self._resolve_row(key, row, query, num_results)
+                    if op is not None:
+                        self._apply(conn.cursor(), op)
+                    return hit
+            except Exception as e:
+                logger.error(f"Failed to get from cache: {e}")
+                return None
+        finally:
+            self._note_loop_time(started)
+
+    async def alookup(
+        self, query: str, engine: str, num_results: int
+    ) -> Optional[Tuple[List[Dict], float]]:
+        """
+        :meth:`lookup` 的异步版本
+
+        数据库读取在读线程池中执行；命中计数、过期删除交给写线程批量提交，
+        事件循环上只做内存查找与结果截断。
+        """
+        started = time.perf_counter()
+        key = self._generate_key(query, engine)
+        found, hit = self._local_lookup(key, query, num_results, touch=True)
+        self._note_loop_time(started)
+        if found:
+            return hit
+
+        try:
+            row = await asyncio.get_running_loop().run_in_executor(
+                self._reader_pool(), self._read_row, key
+            )
         except Exception as e:
             logger.error(f"Failed to get from cache: {e}")
             return None
 
+        started = time.perf_counter()
+        try:
+            hit, op = self._resolve_row(key, row, query, num_results)
+            if op is not None:
+                self._enqueue(op)
+            return hit
+        finally:
+            self._note_loop_time(started)
+
+    async def apeek(
+        self, query: str, engine: str, num_results: int
+    ) -> Optional[float]:
+        """
+        条目超出软 TTL 的秒数（<= 0 表示新鲜）；不存在、超过硬 TTL 或
+        结果数不足时为 None
+
+        与 :meth:`alookup` 不同：不计命中、不更新 LRU、不解码结果（供预热
+        判断是否需要刷新）
+        """
+        key = self._generate_key(query, engine)
+        pending = self._pending.get(key)
+        if pending is not None and pending[1] >= num_results:
+            return time.time() - pending[0] - self._pending_ttl(pending)
+        with self._memory_lock:
+            entry = self._memory_cache.get(key)
+        if entry is not None:
+            timestamp, ttl, size = entry.timestamp, entry.ttl, entry.num_results
+        else:
+            try:
+                row = await asyncio.get_running_loop().run_in_executor(
+                    self._reader_pool(), self._peek_row, key
+                )
+            except Exception as e:
+                logger.error(f"Failed to peek cache: {e}")
+                return None
+            if row is None:
+                return None
+            timestamp, ttl, size = row
+        if size < num_results:
+            return None
+        overdue = time.time() - timestamp - (ttl if ttl is not None else self.ttl)
+        return None if overdue > self.stale_ttl else overdue
+
+    def _peek_row(self, key: str) -> Optional[tuple]:
+        """读线程入口：只读条目元数据 (timestamp, ttl, num_results)"""
+        row = self._connection().execute(
+            "SELECT timestamp, ttl, num_results FROM search_cache WHERE key = ?",
+            (key,)
+        ).fetchone()
+        return tuple(row) if row is not None else None
+
+    def top_queries(self, limit: int) -> List[Dict]:
+        """命中次数最多的条目（query / engine / num_results / hits），用于预热"""
+        rows = self._connection().execute(
+            "SELECT query, engine, num_results, hits FROM search_cache "
+            "ORDER BY hits DESC, updated_at DESC LIMIT ?",
+            (max(0, limit),)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    async def atop_queries(self, limit: int) -> List[Dict]:
+        """:meth:`top_queries` 的异步版本（在读线程池中执行）"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._reader_pool(), self.top_queries, limit
+        )
+
+    def refresh_candidates(
+        self, window: float, min_hits: int, limit: int
+    ) -> List[Dict]:
+        """
+        即将过期的热点条目（供 refresh-ahead）
+
+        软 TTL 在 window 秒内到期（或已过期但仍在硬 TTL 内）且自写入以来
+        命中至少 min_hits 次的条目，按命中次数降序，最多 limit 个。
+
+        Returns:
+            [{query, engine, num_results, hits, expires_in}]
+        """
+        now = time.time()
+        rows = self._connection().execute(
+            """
+            SELECT query, engine, num_results, hits,
+                   timestamp + COALESCE(ttl, ?) - ? AS expires_in
+            FROM search_cache
+            WHERE hits >= ? AND expires_in BETWEEN ? AND ?
+            ORDER BY hits DESC LIMIT ?
+            """,
+            (self.ttl, now, min_hits, -self.stale_ttl, window,
+             max(0, limit))
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    async def arefresh_candidates(
+        self, window: float, min_hits: int, limit: int
+    ) -> List[Dict]:
+        """:meth:`refresh_candidates` 的异步版本（在读线程池中执行）"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._reader_pool(), self.refresh_candidates, window, min_hits, limit
+        )
+
+    def _pending_ttl(self, pending: tuple) -> float:
+        """待提交写入的 TTL：有 ttl_override 用它，否则按默认 TTL 估算"""
+        ttl_override = pending[3]
+        return float(ttl_override) if ttl_override is not None else self.ttl
+
+    def _local_lookup(
+        self, key: str, query: str, num_results: int, touch: bool = False
+    ) -> Tuple[bool, Optional[Tuple[List[Dict], float]]]:
+        """
+        不访问数据库的查找：先查待提交的写入，再查内存缓存
+
+        Args:
+            touch: 内存层新鲜命中时把命中计数（hits / updated_at）交给写线程，
+                否则热点条目在数据库中看起来从未被访问，会先被淘汰
+
+        Returns:
+            (是否已得出结论, lookup 的返回值)
+        """
+        pending = self._pending.get(key)
+        if pending is not None and pending[1] >= num_results:
+            timestamp, _, results, _ = pending
+            logger.debug(f"Pending write hit: {query[:50]}...")
+            overdue = time.time() - timestamp - self._pending_ttl(pending)
+            return True, (results[:num_results], overdue)
+
+        entry = self._memory_get(key)
+        if entry is None:
+            return False, None
+        overdue = time.time() - entry.timestamp - entry.ttl_or(self.ttl)
+        if overdue > self.stale_ttl:
+            # 过期，从内存缓存删除
+            self._memory_discard(key)
+            return False, None
+        if entry.num_results < num_results:
+            logger.debug(f"Cache entry too small: {query[:50]}...")
+            return True, None
+        logger.debug(f"Memory cache hit: {query[:50]}...")
+        if touch and overdue <= 0:
+            self._enqueue(("hit", key, time.time()))
+        return True, (entry.get_results()[:num_results], overdue)
+
+    @staticmethod
+    def _fetch_row(conn: sqlite3.Connection, key: str) -> Optional[Dict]:
+        """读取一行并解码结果（可在任意线程执行）"""
+        row = conn.execute(
+            "SELECT * FROM search_cache WHERE key = ? LIMIT 1", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        data = dict(row)
+        data['decoded'] = cache_codec.decode(row['results'])
+        return data
+
+    def _read_row(self, key: str) -> Optional[Dict]:
+        """读线程入口：只读，无需提交"""
+        return self._fetch_row(self._connection(), key)
+
+    def _resolve_row(
+        self, key: str, row: Optional[Dict], query: str, num_results: int
+    ) -> Tuple[Optional[Tuple[List[Dict], float]], Optional[tuple]]:
+        """
+        根据数据库行得出 lookup 结果，以及需要写回的操作
+
+        Returns:
+            (lookup 的返回值, 写操作)；写操作为 ("hit", ...) 或
+            ("delete", ...)，无需写回时为 None
+        """
+        if row is None:
+            logger.debug(f"Cache miss: {query[:50]}...")
+            return None, None
+
+        # 检查是否过期（超过硬 TTL 才删除）
+        timestamp = row['timestamp']
+        entry_ttl = row['ttl']
+        overdue = time.time() - timestamp - (
+            entry_ttl if entry_ttl is not None else self.ttl
+        )
+        if overdue > self.stale_ttl:
+            logger.debug(f"Cache expired: {query[:50]}...")
+            return None, ("delete", key, timestamp)
+
+        if row['num_results'] < num_results:
+            logger.debug(f"Cache entry too small: {query[:50]}...")
+            return None, None
+
+        op = None
+        hits = row['hits']
+        if overdue <= 0:
+            op = ("hit", key, time.time())
+            hits += 1
+            logger.info(
+                f"Cache hit: {query[:50]}... "
+                f"(hits={hits}, "
+                f"age={int(time.time() - timestamp)}s)"
+            )
+        else:
+            logger.debug(f"Cache stale ({int(overdue)}s): {query[:50]}...")
+
+        # 更新内存缓存
+        self._memory_put(CacheEntry(
+            key=key,
+            query=row['query'],
+            engine=row['engine'],
+            num_results=row['num_results'],
+            results=row['decoded'],
+            timestamp=timestamp,
+            hits=hits,
+            ttl=entry_ttl,
+            size=_results_size(row['decoded']),
+        ))
+
+        return (row['decoded'][:num_results], overdue), op
+
+    def get(
+        self, query: str, engine: str, num_results: int
+    ) -> Optional[List[Dict]]:
+        """
+        从缓存获取结果
+
+        Args:
+            query: 搜索查询
+            engine: 搜索引擎
+            num_results: 结果数量
+
+        Returns:
+            缓存的结果（截断到 num_results），如果不存在、已过期或条目
+            结果数少于 num_results 则返回None
+        """
+        hit = self.lookup(query, engine, num_results)
+        if hit is None or hit[1] > 0:
+            return None
+        return hit[0]
+
+    async def aget(
+        self, query: str, engine: str, num_results: int
+    ) -> Optional[List[Dict]]:
+        """:meth:`get` 的异步版本"""
+        hit = await self.alookup(query, engine, num_results)
+        if hit is None or hit[1] > 0:
+            return None
+        return hit[0]
+
     def set(
         self,
         query: str,
@@ -255,72 +618,343 @@ class PersistentCache:
         ttl_override: Optional[int] = None,
     ) -> None:
         """
-        存储结果到缓存
+        存储结果到缓存（同步提交；事件循环中请使用 :meth:`aset`）
 
         Args:
             query: 搜索查询
             engine: 搜索引擎
             num_results: 结果数量
             results: 搜索结果
-            ttl_override: 自定义TTL（秒），用于短TTL负缓存
+            ttl_override: 自定义TTL（秒）；为 None 时由 ttl_policy 决定
         """
-        key = self._generate_key(query, engine, num_results)
-        results_json = json.dumps(results, ensure_ascii=False)
-        current_time = time.time()
-        
+        started = time.perf_counter()
         try:
             with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # 检查缓存大小
-                cursor.execute(
-                    "SELECT COUNT(*) as count FROM search_cache"
+                self._write_entry(
+                    conn.cursor(), query, engine, num_results, results, ttl_override
                 )
-                count = cursor.fetchone()['count']
-                
-                if count >= self.max_size:
-                    # 删除最老的条目
-                    cursor.execute(
-                        """
-                        DELETE FROM search_cache 
-                        WHERE key IN (
-                            SELECT key FROM search_cache 
-                            ORDER BY timestamp ASC 
-                            LIMIT 100
-                        )
-                        """
-                    )
-                    logger.debug("Cache evicted: 100 oldest entries")
-                
-                # 插入或更新
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO search_cache 
-                    (key, query, engine, num_results, results, 
-                     timestamp, hits, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)
-                    """,
-                    (key, query, engine, num_results, results_json,
-                     current_time, current_time, current_time)
-                )
-                
-                # 更新内存缓存
-                if self.enable_memory_cache:
-                    entry = CacheEntry(
-                        key=key,
-                        query=query,
-                        engine=engine,
-                        num_results=num_results,
-                        results=results_json,
-                        timestamp=current_time,
-                        hits=0
-                    )
-                    self._memory_cache[key] = entry
-                
-                logger.debug(f"Cache set: {query[:50]}...")
-                
         except Exception as e:
             logger.error(f"Failed to set cache: {e}")
+        finally:
+            self._note_loop_time(started)
+
+    async def aset(
+        self,
+        query: str,
+        engine: str,
+        num_results: int,
+        results: List[Dict],
+        ttl_override: Optional[int] = None,
+    ) -> None:
+        """
+        :meth:`set` 的异步版本（write-behind）
+
+        写入放入队列后立即返回，由写线程按批提交。提交前非空结果即可被
+        本实例的 lookup 读到；需要确保已落盘时调用 :meth:`flush`。
+        """
+        started = time.perf_counter()
+        key = self._generate_key(query, engine)
+        results = list(results)
+        pending = (time.time(), num_results, results, ttl_override)
+        if results:
+            with self._pending_lock:
+                self._pending[key] = pending
+        self._enqueue(("set", query, engine, num_results, results, ttl_override, pending))
+        self._note_loop_time(started)
+
+    def _write_entry(
+        self,
+        cursor: sqlite3.Cursor,
+        query: str,
+        engine: str,
+        num_results: int,
+        results: List[Dict],
+        ttl_override: Optional[int] = None,
+    ) -> None:
+        """在给定游标上写入一个条目（不提交）"""
+        key = self._generate_key(query, engine)
+        encoded = cache_codec.encode(results, self.codec)
+        current_time = time.time()
+
+        # 仍有效的更大条目已覆盖本次请求，不用子集覆盖它
+        cursor.execute(
+            """
+            SELECT num_results, timestamp, results, ttl FROM search_cache
+            WHERE key = ?
+            """,
+            (key,)
+        )
+        existing = cursor.fetchone()
+        existing_results: List[Dict] = []
+        existing_ttl = self.ttl
+        if existing is not None:
+            existing_results = cache_codec.decode(existing['results'])
+            if existing['ttl'] is not None:
+                existing_ttl = existing['ttl']
+        if (
+            existing_results
+            and current_time - existing['timestamp']
+            <= existing_ttl + self.stale_ttl
+        ):
+            if not results:
+                # 空结果（多为上游失败）不覆盖仍可陈旧服务的条目
+                logger.debug(
+                    f"Cache set skipped (keep stale): {query[:50]}..."
+                )
+                return
+            if (
+                existing['num_results'] > num_results
+                and current_time - existing['timestamp'] <= existing_ttl
+            ):
+                logger.debug(
+                    f"Cache set skipped (superset cached): {query[:50]}..."
+                )
+                return
+
+        if ttl_override is not None:
+            effective_ttl = float(ttl_override)
+        else:
+            previous = None
+            if existing_results:
+                previous = (existing_results, existing_ttl)
+            effective_ttl = self.ttl_policy.ttl_for(
+                query, results, default_ttl=self.ttl, previous=previous
+            )
+
+        # 检查缓存大小：新键写满时淘汰最久未访问的条目
+        if existing is None:
+            overflow = self._entry_count(cursor) - self.max_size + 1
+            if overflow > 0:
+                self._evict_lru(cursor, overflow)
+
+        # 插入或更新
+        cursor.execute(
+            _UPSERT_SQL,
+            (key, query, engine, num_results, encoded, current_time, 0,
+             current_time, current_time, effective_ttl)
+        )
+
+        # 更新内存缓存
+        self._memory_put(CacheEntry(
+            key=key,
+            query=query,
+            engine=engine,
+            num_results=num_results,
+            results=results,
+            timestamp=current_time,
+            hits=0,
+            ttl=effective_ttl,
+            size=_results_size(results),
+        ))
+
+        logger.debug(
+            f"Cache set: {query[:50]}... (ttl={int(effective_ttl)}s)"
+        )
+
+    @staticmethod
+    def _entry_count(cursor: sqlite3.Cursor) -> int:
+        """数据库条目数（读 cache_meta，O(1)）"""
+        row = cursor.execute(
+            "SELECT value FROM cache_meta WHERE name = 'entry_count'"
+        ).fetchone()
+        return int(row[0]) if row is not None else 0
+
+    def _evict_lru(self, cursor: sqlite3.Cursor, count: int) -> None:
+        """删除 count 个最久未访问（updated_at 最小）的条目"""
+        keys = [
+            row[0]
+            for row in cursor.execute(
+                "SELECT key FROM search_cache ORDER BY updated_at ASC LIMIT ?",
+                (count,)
+            )
+        ]
+        cursor.executemany(
+            "DELETE FROM search_cache WHERE key = ?", [(k,) for k in keys]
+        )
+        for k in keys:
+            self._memory_discard(k)
+        logger.debug(f"Cache evicted (LRU): {len(keys)} entries")
+
+    # -- 内存层 --------------------------------------------------------------
+
+    def _memory_get(self, key: str) -> Optional[CacheEntry]:
+        if not self.enable_memory_cache:
+            return None
+        with self._memory_lock:
+            entry = self._memory_cache.get(key)
+            if entry is not None:
+                self._memory_cache.move_to_end(key)
+            return entry
+
+    def _memory_put(self, entry: CacheEntry) -> None:
+        """
+        放入内存层，超过字节上限时淘汰最久未使用的条目
+
+        内存中已有更新（timestamp 更大）的同键条目时保留它：读线程读到的
+        旧数据库行不能覆盖期间写入的新结果
+        """
+        if not self.enable_memory_cache:
+            return
+        with self._memory_lock:
+            old = self._memory_cache.get(entry.key)
+            if old is not None and old.timestamp > entry.timestamp:
+                return
+            old = self._memory_cache.pop(entry.key, None)
+            if old is not None:
+                self._memory_bytes -= old.size
+            if entry.size > self.memory_max_bytes:
+                return
+            self._memory_cache[entry.key] = entry
+            self._memory_bytes += entry.size
+            while self._memory_bytes > self.memory_max_bytes:
+                _, evicted = self._memory_cache.popitem(last=False)
+                self._memory_bytes -= evicted.size
+                self._memory_evictions += 1
+
+    def _memory_discard(self, key: str) -> None:
+        with self._memory_lock:
+            old = self._memory_cache.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= old.size
+
+    # -- 后台读写 ------------------------------------------------------------
+
+    def _apply(self, cursor: sqlite3.Cursor, op: tuple) -> None:
+        """执行一个写操作（不提交）"""
+        kind = op[0]
+        if kind == "hit":
+            _, key, when = op
+            cursor.execute(
+                """
+                UPDATE search_cache 
+                SET hits = hits + 1, updated_at = ? 
+                WHERE key = ?
+                """,
+                (when, key)
+            )
+        elif kind == "delete":
+            # 只删除读到的那一版，期间被重新写入的条目保留
+            _, key, timestamp = op
+            cursor.execute(
+                "DELETE FROM search_cache WHERE key = ? AND timestamp = ?",
+                (key, timestamp)
+            )
+        elif kind == "set":
+            _, query, engine, num_results, results, ttl_override, pending = op
+            try:
+                self._write_entry(
+                    cursor, query, engine, num_results, results, ttl_override
+                )
+            finally:
+                key = self._generate_key(query, engine)
+                with self._pending_lock:
+                    if self._pending.get(key) is pending:
+                        del self._pending[key]
+
+    def _reader_pool(self) -> ThreadPoolExecutor:
+        if self._readers is None:
+            with self._io_lock:
+                if self._readers is None:
+                    self._readers = ThreadPoolExecutor(
+                        max_workers=self._reader_threads,
+                        thread_name_prefix="persistent-cache-reader",
+                    )
+        return self._readers
+
+    def _enqueue(self, op: object) -> None:
+        if self._writer is None or not self._writer.is_alive():
+            with self._io_lock:
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(
+                        target=self._writer_loop,
+                        name="persistent-cache-writer",
+                        daemon=True,
+                    )
+                    self._writer.start()
+        self._writes.put(op)
+
+    def _writer_loop(self) -> None:
+        """写线程：收集一批操作（最多 N 个或等待一个批间隔）后一次提交"""
+        while True:
+            batch = [self._writes.get()]
+            stop = batch[0] is _STOP
+            deadline = time.monotonic() + self._write_batch_interval
+            while not stop and len(batch) < self._write_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._writes.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                stop = batch[-1] is _STOP
+            self._commit_batch(batch)
+            if stop:
+                return
+
+    def _commit_batch(self, batch: List[object]) -> None:
+        ops = [op for op in batch if isinstance(op, tuple)]
+        if ops:
+            try:
+                with self._get_connection() as conn:
+                    cursor = conn.cursor()
+                    for op in ops:
+                        try:
+                            self._apply(cursor, op)
+                        except sqlite3.Error as e:
+                            self._io_stats["write_errors"] += 1
+                            logger.error(f"Cache write failed ({op[0]}): {e}")
+                self._io_stats["write_batches"] += 1
+                self._io_stats["write_ops"] += len(ops)
+            except Exception as e:
+                self._io_stats["write_errors"] += len(ops)
+                logger.error(f"Failed to commit cache writes: {e}")
+        for op in batch:
+            if isinstance(op, Future) and not op.done():
+                op.set_result(None)
+
+    async def flush(self) -> None:
+        """等待此前排队的写入全部提交"""
+        if self._writer is None or not self._writer.is_alive():
+            return
+        done: Future = Future()
+        self._writes.put(done)
+        await asyncio.wrap_future(done)
+
+    def _flush_sync(self, timeout: float = 5.0) -> None:
+        if self._writer is None or not self._writer.is_alive():
+            return
+        done: Future = Future()
+        self._writes.put(done)
+        done.result(timeout=timeout)
+
+    def close(self) -> None:
+        """提交排队的写入并停止读写线程"""
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._writes.put(_STOP)
+            writer.join(timeout=5.0)
+        self._writer = None
+        if self._readers is not None:
+            self._readers.shutdown(wait=True)
+            self._readers = None
+
+    async def aclose(self) -> None:
+        """:meth:`close` 的异步版本（在线程中等待，不阻塞事件循环）"""
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def _note_loop_time(self, started: float) -> None:
+        """在事件循环线程上执行时，累计缓存调用占用循环的时间"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        elapsed = time.perf_counter() - started
+        stats = self._io_stats
+        stats["loop_calls"] += 1
+        stats["loop_stall_s"] += elapsed
+        if elapsed > stats["loop_stall_max_s"]:
+            stats["loop_stall_max_s"] = elapsed
 
     def clear(self) -> int:
         """
@@ -330,14 +964,19 @@ class PersistentCache:
             删除的条目数
         """
         try:
+            # 先提交排队的写入，避免清空后又被写回
+            self._flush_sync()
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) as count FROM search_cache")
-                count = cursor.fetchone()['count']
+                count = self._entry_count(cursor)
                 cursor.execute("DELETE FROM search_cache")
                 
             # 清空内存缓存
-            self._memory_cache.clear()
+            with self._memory_lock:
+                self._memory_cache.clear()
+                self._memory_bytes = 0
+            with self._pending_lock:
+                self._pending.clear()
             
             logger.info(f"Cache cleared: {count} entries removed")
             return count
@@ -348,35 +987,37 @@ class PersistentCache:
 
     def remove_expired(self) -> int:
         """
-        删除所有过期的缓存条目
+        删除所有过期（超过硬 TTL）的缓存条目
 
         Returns:
             删除的条目数
         """
         try:
-            expiry_time = time.time() - self.ttl
+            # 硬 TTL 按条目计算：timestamp + 条目 TTL + stale_ttl
+            where = "WHERE timestamp + COALESCE(ttl, ?) + ? < ?"
+            params = (self.ttl, self.stale_ttl, time.time())
             
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    "SELECT COUNT(*) as count FROM search_cache "
-                    "WHERE timestamp < ?",
-                    (expiry_time,)
+                    f"SELECT COUNT(*) as count FROM search_cache {where}",
+                    params
                 )
                 count = cursor.fetchone()['count']
                 
                 cursor.execute(
-                    "DELETE FROM search_cache WHERE timestamp < ?",
-                    (expiry_time,)
+                    f"DELETE FROM search_cache {where}",
+                    params
                 )
             
             # 清理内存缓存中的过期条目
-            expired_keys = [
-                k for k, v in self._memory_cache.items()
-                if v.is_expired(self.ttl)
-            ]
+            with self._memory_lock:
+                expired_keys = [
+                    k for k, v in self._memory_cache.items()
+                    if v.is_expired(self.ttl, self.stale_ttl)
+                ]
             for key in expired_keys:
-                del self._memory_cache[key]
+                self._memory_discard(key)
             
             if count > 0:
                 logger.info(
@@ -402,10 +1043,7 @@ class PersistentCache:
                 cursor = conn.cursor()
                 
                 # 总条目数
-                cursor.execute(
-                    "SELECT COUNT(*) as count FROM search_cache"
-                )
-                total_count = cursor.fetchone()['count']
+                total_count = self._entry_count(cursor)
                 
                 # 总命中数
                 cursor.execute(
@@ -442,122 +1080,204 @@ class PersistentCache:
                     "max_size": self.max_size,
                     "total_hits": total_hits,
                     "ttl": self.ttl,
+                    "stale_ttl": self.stale_ttl,
+                    "ttl_policy": self.ttl_policy.name,
                     "avg_age_seconds": int(avg_age),
                     "memory_cache_size": len(self._memory_cache),
+                    "memory_cache_bytes": self._memory_bytes,
+                    "memory_cache_max_bytes": self.memory_max_bytes,
+                    "memory_cache_evictions": self._memory_evictions,
                     "memory_cache_enabled": self.enable_memory_cache,
-                    "engines": engine_counts
+                    "engines": engine_counts,
+                    "io": self.get_io_stats(),
                 }
                 
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
             return {}
 
-    def export_to_json(self, filepath: str) -> int:
+    def get_io_stats(self) -> Dict:
         """
-        导出缓存到 JSON 文件
+        后台读写与事件循环占用统计
+
+        Returns:
+            loop_calls / loop_stall_ms_total / loop_stall_ms_max：缓存调用在
+            事件循环线程上的次数与耗时；write_*：写线程批量提交情况
+        """
+        stats = self._io_stats
+        return {
+            "loop_calls": int(stats["loop_calls"]),
+            "loop_stall_ms_total": round(stats["loop_stall_s"] * 1000, 3),
+            "loop_stall_ms_max": round(stats["loop_stall_max_s"] * 1000, 3),
+            "reader_threads": self._reader_threads,
+            "write_queue_depth": self._writes.qsize(),
+            "write_batches": int(stats["write_batches"]),
+            "write_ops": int(stats["write_ops"]),
+            "write_errors": int(stats["write_errors"]),
+            "pending_sets": len(self._pending),
+        }
+
+    @staticmethod
+    def _export_filter(
+        engine: Optional[str],
+        since: Optional[float],
+        max_age: Optional[float],
+        now: float,
+    ) -> Tuple[str, tuple]:
+        """导出/导入过滤条件 → (WHERE 子句, 参数)"""
+        clauses, params = [], []
+        if engine:
+            clauses.append("engine = ?")
+            params.append(engine)
+        if since is not None:
+            clauses.append("timestamp > ?")
+            params.append(since)
+        if max_age is not None:
+            clauses.append("timestamp >= ?")
+            params.append(now - max_age)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), tuple(params)
+
+    def export_to_json(
+        self,
+        filepath: str,
+        engine: Optional[str] = None,
+        since: Optional[float] = None,
+        max_age: Optional[float] = None,
+    ) -> int:
+        """
+        导出缓存到文件（游标逐行读取、逐条写出，不把整表读入内存）
+
+        格式由扩展名决定（见 :mod:`cache_codec`）：``.ndjson``/``.jsonl``
+        每行一个条目，``.json`` 为单个紧凑 JSON 文档，其他扩展名为二进制
+        分块格式；末尾再加 ``.gz`` 则 gzip 压缩。
 
         Args:
             filepath: 导出文件路径
+            engine: 只导出该引擎（模式）的条目
+            since: 增量导出：只导出写入时间晚于该时间戳的条目
+            max_age: 只导出最近 max_age 秒内写入的条目
 
         Returns:
             导出的条目数
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM search_cache")
-                rows = cursor.fetchall()
-                
-                entries = []
-                for row in rows:
-                    entries.append({
+            self._flush_sync()
+            now = time.time()
+            where, params = self._export_filter(engine, since, max_age, now)
+            header = {
+                "ttl": self.ttl,
+                "max_size": self.max_size,
+                "export_time": now,
+                "since": since,
+            }
+            with self._get_connection() as conn, cache_codec.ExportWriter(
+                filepath, header, codec=self.codec
+            ) as writer:
+                for row in conn.execute(
+                    "SELECT * FROM search_cache" + where, params
+                ):
+                    writer.write({
                         "key": row['key'],
                         "query": row['query'],
                         "engine": row['engine'],
                         "num_results": row['num_results'],
-                        "results": json.loads(row['results']),
+                        "results": cache_codec.decode(row['results']),
                         "timestamp": row['timestamp'],
                         "hits": row['hits'],
                         "created_at": row['created_at'],
-                        "updated_at": row['updated_at']
+                        "updated_at": row['updated_at'],
+                        "ttl": row['ttl']
                     })
-                
-                data = {
-                    "ttl": self.ttl,
-                    "max_size": self.max_size,
-                    "export_time": time.time(),
-                    "entries": entries
-                }
-                
-                output_path = Path(filepath)
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-                
-                logger.info(
-                    f"Cache exported to {filepath}: {len(entries)} entries"
-                )
-                return len(entries)
-                
+
+            logger.info(
+                f"Cache exported to {filepath}: {writer.count} entries"
+            )
+            return writer.count
+
         except Exception as e:
             logger.error(f"Failed to export cache: {e}")
             return 0
 
-    def import_from_json(self, filepath: str) -> int:
+    def import_from_json(
+        self,
+        filepath: str,
+        engine: Optional[str] = None,
+        max_age: Optional[float] = None,
+        batch_size: int = 500,
+    ) -> int:
         """
-        从 JSON 文件导入缓存
+        从导出文件导入缓存（任意导出格式，按文件内容识别）
+
+        条目逐条读取，每 batch_size 条 ``executemany`` 写入并提交一次；
+        导入后超出 max_size 的部分按 LRU 淘汰。
 
         Args:
             filepath: 导入文件路径
+            engine: 只导入该引擎（模式）的条目
+            max_age: 只导入最近 max_age 秒内写入的条目
+            batch_size: 每批写入的条目数
 
         Returns:
             导入的条目数
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
+            self._flush_sync()
+            now = time.time()
             count = 0
+            batch: List[tuple] = []
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                
-                for entry_dict in data.get('entries', []):
-                    # 检查是否过期
-                    if time.time() - entry_dict['timestamp'] > self.ttl:
+
+                def write_batch() -> None:
+                    cursor.executemany(_UPSERT_SQL, batch)
+                    conn.commit()
+                    for row in batch:
+                        self._memory_discard(row[0])
+                    batch.clear()
+
+                for entry_dict in cache_codec.iter_export(filepath):
+                    if engine and entry_dict['engine'] != engine:
                         continue
-                    
-                    results_json = json.dumps(
-                        entry_dict['results'],
-                        ensure_ascii=False
-                    )
-                    
-                    cursor.execute(
-                        """
-                        INSERT OR REPLACE INTO search_cache 
-                        (key, query, engine, num_results, results, 
-                         timestamp, hits, created_at, updated_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            entry_dict['key'],
-                            entry_dict['query'],
-                            entry_dict['engine'],
-                            entry_dict['num_results'],
-                            results_json,
-                            entry_dict['timestamp'],
-                            entry_dict['hits'],
-                            entry_dict.get('created_at', entry_dict['timestamp']),
-                            entry_dict.get('updated_at', time.time())
-                        )
-                    )
+                    timestamp = entry_dict['timestamp']
+                    if max_age is not None and now - timestamp > max_age:
+                        continue
+                    # 检查是否过期（旧版导出没有条目 TTL）
+                    entry_ttl = entry_dict.get('ttl')
+                    if now - timestamp > (
+                        entry_ttl if entry_ttl is not None else self.ttl
+                    ):
+                        continue
+
+                    batch.append((
+                        # 重新生成键：旧版导出的键包含 num_results
+                        self._generate_key(
+                            entry_dict['query'], entry_dict['engine']
+                        ),
+                        entry_dict['query'],
+                        entry_dict['engine'],
+                        entry_dict['num_results'],
+                        cache_codec.encode(entry_dict['results'], self.codec),
+                        timestamp,
+                        entry_dict.get('hits', 0),
+                        entry_dict.get('created_at', timestamp),
+                        entry_dict.get('updated_at', now),
+                        entry_ttl,
+                    ))
                     count += 1
-            
+                    if len(batch) >= batch_size:
+                        write_batch()
+                if batch:
+                    write_batch()
+
+                excess = self._entry_count(cursor) - self.max_size
+                if excess > 0:
+                    self._evict_lru(cursor, excess)
+
             logger.info(
                 f"Cache imported from {filepath}: {count} entries"
             )
             return count
-            
+
         except Exception as e:
             logger.error(f"Failed to import cache: {e}")
             return 0
@@ -622,13 +1342,45 @@ class PersistentCache:
         
         return stats
 
+    def migrate_storage(self, batch_size: int = 500) -> int:
+        """
+        将旧版 JSON TEXT 结果行转换为当前编码
+
+        Returns:
+            转换的行数
+        """
+        self._flush_sync()
+        converted = 0
+        while True:
+            with self._get_connection() as conn:
+                rows = conn.execute(
+                    "SELECT key, results FROM search_cache "
+                    "WHERE typeof(results) = 'text' LIMIT ?",
+                    (batch_size,)
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE search_cache SET results = ? WHERE key = ?",
+                    [
+                        (cache_codec.encode(json.loads(r['results']), self.codec),
+                         r['key'])
+                        for r in rows
+                    ]
+                )
+            converted += len(rows)
+            if len(rows) < batch_size:
+                break
+        if converted:
+            logger.info(f"Cache storage migrated: {converted} rows re-encoded")
+        return converted
+
     def vacuum(self) -> None:
         """
         优化数据库（VACUUM）
 
-        清理已删除的数据，压缩数据库文件
+        先转换旧格式的行，再清理已删除的数据，压缩数据库文件
         """
         try:
+            self.migrate_storage()
             with self._get_connection() as conn:
                 conn.execute("VACUUM")
             logger.info("Database vacuumed successfully")
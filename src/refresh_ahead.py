@@ -0,0 +1,80 @@
+"""Refresh-ahead budget for hot cache entries.
+
+The refresh-ahead scheduler (``SearchManager.refresh_ahead_once``) re-runs
+frequently hit queries shortly before their cache entry expires, so popular
+queries keep hitting the cache instead of missing once per TTL.  Those
+refreshes spend real upstream quota, so they are bounded separately from
+user traffic:
+
+- :class:`RefreshBudget` gives every engine its own token bucket holding
+  ``share`` of the engine's :class:`~utils.RateLimitConfig` (e.g. 10% of
+  Google's 100/day); a refresh runs only if every engine it would call can
+  pay for it
+- :data:`FREE_ENGINES` are preferred for ``auto`` refreshes when the policy
+  is ``free`` (see ``CRAWL4AI_REFRESH_AHEAD_ENGINES``)
+
+Entry hit counters reset whenever an entry is rewritten, so "hot" means hit
+at least ``min_hits`` times during the current entry's lifetime; queries
+that stop being asked for stop being refreshed.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Iterable, Mapping
+
+# Engines without a paid quota (self-hosted SearXNG, DuckDuckGo).
+FREE_ENGINES = ("searxng", "duckduckgo")
+
+
+class RefreshBudget:
+    """Per-engine token buckets holding ``share`` of each rate limit.
+
+    *configs* maps engine type to an object with ``max_requests`` and
+    ``time_window`` (a ``RateLimitConfig``).  Engines without a config are
+    not limited.
+    """
+
+    def __init__(self, configs: Mapping[str, Any], share: float = 0.1) -> None:
+        self.share = min(1.0, max(0.0, float(share)))
+        self._buckets: Dict[str, list] = {}
+        now = time.monotonic()
+        for engine, config in configs.items():
+            capacity = float(config.max_requests) * self.share
+            rate = capacity / float(config.time_window) if config.time_window else 0.0
+            # [tokens, capacity, tokens per second, last update]
+            self._buckets[engine.lower()] = [capacity, capacity, rate, now]
+
+    def _refill(self, bucket: list, now: float) -> None:
+        bucket[0] = min(bucket[1], bucket[0] + (now - bucket[3]) * bucket[2])
+        bucket[3] = now
+
+    def try_spend(self, engines: Iterable[str]) -> bool:
+        """Take one token from each engine's bucket, or none if any is short."""
+        now = time.monotonic()
+        buckets = []
+        for engine in set(e.lower() for e in engines):
+            bucket = self._buckets.get(engine)
+            if bucket is None:
+                continue
+            self._refill(bucket, now)
+            if bucket[0] < 1.0:
+                return False
+            buckets.append(bucket)
+        for bucket in buckets:
+            bucket[0] -= 1.0
+        return True
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        now = time.monotonic()
+        out = {}
+        for engine, bucket in self._buckets.items():
+            self._refill(bucket, now)
+            out[engine] = {
+                "available": round(bucket[0], 2),
+                "capacity": round(bucket[1], 2),
+            }
+        return out
+
+
+__all__ = ["FREE_ENGINES", "RefreshBudget"]
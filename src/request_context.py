@@ -2,6 +2,9 @@
 
 This module provides a lightweight request-id propagation mechanism using
 `contextvars`, which works across async tasks and is compatible with FastAPI.
+It also carries the caller identity and priority class used by search
+admission control (see ``admission.py``), and an optional engine allow-list
+that background refreshes use to steer ``auto`` searches to free engines.
 
 Design goals:
 - stdlib-only
@@ -13,6 +16,7 @@ from __future__ import annotations
 
 import contextlib
 import contextvars
+from typing import FrozenSet, Iterable, Optional
 from uuid import uuid4
 
 
@@ -20,6 +24,22 @@ _request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar(
     "crawl4ai_request_id", default="-"
 )
 
+# Caller identity for fair queuing (e.g. "token:..." / "ip:..." from the HTTP
+# bridge); "-" for local/MCP callers.
+_client_id_var: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "crawl4ai_client_id", default="-"
+)
+
+# Admission priority class: "interactive" (default), "batch" or "background".
+_priority_var: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "crawl4ai_priority", default="interactive"
+)
+
+# Engine types ``auto`` searches may use in this context; None = all.
+_engine_allowlist_var: contextvars.ContextVar[Optional[FrozenSet[str]]] = (
+    contextvars.ContextVar("crawl4ai_engine_allowlist", default=None)
+)
+
 
 def new_request_id() -> str:
     """Generate a new request id."""
@@ -65,3 +85,65 @@ def request_id_context(request_id: str | None = None):
         yield
     finally:
         reset_request_id(token)
+
+
+def get_client_id() -> str:
+    """Return the current caller identity, or '-' if not set."""
+
+    return _client_id_var.get() or "-"
+
+
+def set_client_id(client_id: str) -> contextvars.Token:
+    """Set the caller identity in current context; returns a reset token."""
+
+    return _client_id_var.set((client_id or "").strip() or "-")
+
+
+def reset_client_id(token: contextvars.Token) -> None:
+    try:
+        _client_id_var.reset(token)
+    except Exception:
+        pass
+
+
+def get_priority() -> str:
+    """Return the admission priority class of the current context."""
+
+    return _priority_var.get() or "interactive"
+
+
+def set_priority(priority: str) -> contextvars.Token:
+    """Set the admission priority class; returns a reset token."""
+
+    return _priority_var.set((priority or "").strip().lower() or "interactive")
+
+
+def reset_priority(token: contextvars.Token) -> None:
+    try:
+        _priority_var.reset(token)
+    except Exception:
+        pass
+
+
+@contextlib.contextmanager
+def priority_context(priority: str):
+    """Context manager to temporarily run work in another priority class."""
+
+    token = set_priority(priority)
+    try:
+        yield
+    finally:
+        reset_priority(token)
+
+
+def get_engine_allowlist() -> Optional[FrozenSet[str]]:
+    """Engine types ``auto`` searches are restricted to, or None."""
+
+    return _engine_allowlist_var.get()
+
+
+def set_engine_allowlist(engines: Optional[Iterable[str]]) -> contextvars.Token:
+    """Restrict ``auto`` searches in this context; None lifts the restriction."""
+
+    value = None if engines is None else frozenset(e.lower() for e in engines)
+    return _engine_allowlist_var.set(value or None)
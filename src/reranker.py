@@ -5,7 +5,8 @@ RRF fusion. Enabled via ``CRAWL4AI_RERANKER`` env var.
 
 Supported backends:
 - ``none`` (default): no reranking
-- ``token``: lightweight token-overlap scoring (stdlib only)
+- ``token``: lightweight token-overlap scoring (stdlib only, shares the
+  request's :class:`scoring.ScoringPipeline` records via :meth:`Reranker.rerank_with`)
 - ``cross-encoder``: uses sentence-transformers if installed
 """
 
@@ -17,25 +18,12 @@ import os
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
-logger = logging.getLogger(__name__)
-
+try:  # pragma: no cover
+    from src.scoring import ScoringPipeline
+except Exception:  # pragma: no cover
+    from scoring import ScoringPipeline
 
-def _token_relevance(query: str, result: Dict[str, Any]) -> float:
-    """Token-overlap relevance score (title=3, snippet=1)."""
-    terms = set(query.strip().lower().split())
-    if not terms:
-        return 0.0
-    title = (result.get("title") or "").lower()
-    snippet = (result.get("snippet") or "").lower()
-    score = 0.0
-    for t in terms:
-        if len(t) < 2:
-            continue
-        if t in title:
-            score += 3.0
-        if t in snippet:
-            score += 1.0
-    return score
+logger = logging.getLogger(__name__)
 
 
 class Reranker(ABC):
@@ -51,6 +39,15 @@ class Reranker(ABC):
         """Rerank *results* for *query*, return top *top_k*."""
         ...
 
+    async def rerank_with(
+        self,
+        pipeline: ScoringPipeline,
+        results: List[Dict[str, Any]],
+        top_k: int,
+    ) -> List[Dict[str, Any]]:
+        """Rerank using the request's scoring pipeline (defaults to :meth:`rerank`)."""
+        return await self.rerank(pipeline.query, results, top_k)
+
 
 class NoopReranker(Reranker):
     """Pass-through reranker — no-op."""
@@ -72,12 +69,20 @@ class TokenReranker(Reranker):
         query: str,
         results: List[Dict[str, Any]],
         top_k: int,
+    ) -> List[Dict[str, Any]]:
+        return await self.rerank_with(ScoringPipeline(query), results, top_k)
+
+    async def rerank_with(
+        self,
+        pipeline: ScoringPipeline,
+        results: List[Dict[str, Any]],
+        top_k: int,
     ) -> List[Dict[str, Any]]:
         if not results:
             return results[:top_k]
 
         scored = [
-            (_token_relevance(query, r), r) for r in results
+            (pipeline.relevance(r), r) for r in results
         ]
         scored.sort(key=lambda x: -x[0])
         return [r for _, r in scored[:top_k]]
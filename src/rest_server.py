@@ -5,15 +5,15 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import os
+import math
 import sys
 import time
 from uuid import uuid4
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 import importlib
@@ -25,9 +25,24 @@ except Exception:  # pragma: no cover
     from compat import *  # noqa: F401,F403
 
 try:  # pragma: no cover
-    from src.request_context import reset_request_id, set_request_id
+    from src.request_context import (
+        reset_client_id,
+        reset_request_id,
+        set_client_id,
+        set_request_id,
+    )
+except Exception:  # pragma: no cover
+    from request_context import (
+        reset_client_id,
+        reset_request_id,
+        set_client_id,
+        set_request_id,
+    )
+
+try:  # pragma: no cover
+    from src.settings import get_settings, reload_settings
 except Exception:  # pragma: no cover
-    from request_context import reset_request_id, set_request_id
+    from settings import get_settings, reload_settings
 
 try:  # pragma: no cover - attempt absolute import when package context is available
     index = importlib.import_module("src.index")
@@ -60,35 +75,6 @@ def _request_id_from_scope(scope: dict) -> str:
     return uuid4().hex
 
 
-def _parse_bool_env(value: Optional[str]) -> Optional[bool]:
-    if value is None:
-        return None
-    v = str(value).strip().lower()
-    if v in {"1", "true", "yes", "y", "on"}:
-        return True
-    if v in {"0", "false", "no", "n", "off"}:
-        return False
-    return None
-
-
-def _parse_int_env(value: Optional[str]) -> Optional[int]:
-    if value is None:
-        return None
-    try:
-        return int(str(value).strip())
-    except Exception:
-        return None
-
-
-def _parse_float_env(value: Optional[str]) -> Optional[float]:
-    if value is None:
-        return None
-    try:
-        return float(str(value).strip())
-    except Exception:
-        return None
-
-
 def _extract_bearer_token(auth_header: Optional[str]) -> Optional[str]:
     if not auth_header:
         return None
@@ -102,81 +88,39 @@ def _extract_bearer_token(auth_header: Optional[str]) -> Optional[str]:
 
 
 def _get_auth_tokens_from_env() -> Optional[Tuple[str, ...]]:
-    # Supports single token or a comma-separated list for rotation.
-    raw = (
-        os.environ.get("CRAWL4AI_HTTP_AUTH_TOKEN")
-        or os.environ.get("HTTP_AUTH_TOKEN")
-        or ""
-    ).strip()
-    raw_list = (os.environ.get("CRAWL4AI_HTTP_AUTH_TOKENS") or "").strip()
-    tokens = []
-    if raw:
-        tokens.append(raw)
-    if raw_list:
-        for t in raw_list.split(","):
-            t = t.strip()
-            if t:
-                tokens.append(t)
-    # De-dupe while preserving order
-    seen = set()
-    out = []
-    for t in tokens:
-        if t not in seen:
-            seen.add(t)
-            out.append(t)
-    return tuple(out) if out else None
+    # Supports single token or a comma-separated list for rotation; parsed
+    # once into the settings snapshot.
+    return get_settings().http_auth_tokens
 
 
 def _auth_is_required_for_path(path: str) -> bool:
     # Keep /health open by default (for docker health checks), but allow opt-in.
-    protect_health = _parse_bool_env(
-        os.environ.get("CRAWL4AI_HTTP_PROTECT_HEALTH")
-    )
     if path == "/health":
-        return bool(protect_health)
-    # Protect core compute endpoints.
-    return path in {"/search", "/read_url"}
+        return get_settings().http_protect_health
+    # Protect core compute endpoints (warmup runs real engine searches).
+    return path in {
+        "/search",
+        "/search/batch",
+        "/search/stream",
+        "/read_url",
+        "/cache/warmup",
+    }
 
 
 def _get_max_body_bytes() -> int:
     # Default: 1 MiB, enough for typical JSON payloads.
-    raw = os.environ.get("CRAWL4AI_HTTP_MAX_BODY_BYTES") or os.environ.get(
-        "HTTP_MAX_BODY_BYTES"
-    )
-    v = _parse_int_env(raw)
-    if v is None:
-        return 1 * 1024 * 1024
-    return max(0, v)
+    return get_settings().http_max_body_bytes
 
 
 def _get_request_timeout_s() -> Optional[float]:
-    raw = os.environ.get("CRAWL4AI_HTTP_REQUEST_TIMEOUT_S") or os.environ.get(
-        "HTTP_REQUEST_TIMEOUT_S"
-    )
-    v = _parse_float_env(raw)
-    if v is None:
-        return 60.0
-    if v <= 0:
-        return None
-    return v
+    # Default 60s; <=0 disables the timeout (None).
+    return get_settings().http_request_timeout_s
 
 
 def _get_rate_limit_config() -> Tuple[Optional[float], Optional[int]]:
     # Token bucket: rps + burst. If rps is unset/<=0 => disabled.
-    raw_rps = os.environ.get("CRAWL4AI_HTTP_RATE_LIMIT_RPS") or os.environ.get(
-        "HTTP_RATE_LIMIT_RPS"
-    )
-    raw_burst = os.environ.get("CRAWL4AI_HTTP_RATE_LIMIT_BURST") or os.environ.get(
-        "HTTP_RATE_LIMIT_BURST"
-    )
-    rps = _parse_float_env(raw_rps)
-    if rps is None or rps <= 0:
-        return None, None
-    burst = _parse_int_env(raw_burst)
-    if burst is None:
-        burst = 5
-    burst = max(1, burst)
-    return rps, burst
+    settings = get_settings()
+    return settings.http_rate_limit_rps, settings.http_rate_limit_burst
 
 
 def _get_rate_limit_key(request: Request) -> str:
@@ -319,6 +263,7 @@ async def _security_and_timeout_middleware(request: Request, call_next):
     # Request id: accept client-provided X-Request-Id or generate one.
     rid = _get_or_create_request_id(request)
     token = set_request_id(rid)
+    client_token = None
 
     try:
         # Auth (optional): enabled when a token is configured.
@@ -335,10 +280,10 @@ async def _security_and_timeout_middleware(request: Request, call_next):
                     },
                 )
 
-        # HTTP rate limiting (optional)
-        allowed, retry_after = await _HTTP_RATE_LIMITER.check(
-            _get_rate_limit_key(request)
-        )
+        # HTTP rate limiting (optional). The same identity is the fair-queuing
+        # key for search admission (set below for the downstream handlers).
+        client_key = _get_rate_limit_key(request)
+        allowed, retry_after = await _HTTP_RATE_LIMITER.check(client_key)
         if not allowed:
             headers = {"X-Request-Id": rid}
             if retry_after is not None:
@@ -355,6 +300,7 @@ async def _security_and_timeout_middleware(request: Request, call_next):
         except Exception:
             pass
 
+        client_token = set_client_id(client_key)
         timeout_s = _get_request_timeout_s()
         if timeout_s is None:
             resp = await call_next(request)
@@ -373,6 +319,8 @@ async def _security_and_timeout_middleware(request: Request, call_next):
                 headers={"X-Request-Id": rid},
             )
     finally:
+        if client_token is not None:
+            reset_client_id(client_token)
         reset_request_id(token)
 
 
@@ -385,6 +333,23 @@ class SearchRequest(BaseModel):
     )
 
 
+class BatchSearchRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, description="Search query strings")
+    num_results: int = Field(10, ge=1, le=50)
+    engine: str = Field("auto", description="Engine to use for every query")
+    stream: bool = Field(
+        False, description="Stream NDJSON rows as queries complete"
+    )
+
+
+class WarmupRequest(BaseModel):
+    queries: Optional[List[str]] = Field(
+        None, description="Queries to warm; default: the most-hit cached queries"
+    )
+    top_n: int = Field(0, ge=0, description="How many top queries (0 = configured default)")
+    engine: str = Field("auto", description="Engine for the given queries")
+
+
 class ReadRequest(BaseModel):
     url: str = Field(..., description="URL to crawl")
     format: str = Field("markdown_with_citations", description="Desired output format")
@@ -392,6 +357,9 @@ class ReadRequest(BaseModel):
 
 @app.on_event("startup")
 async def _startup() -> None:
+    # Snapshot env-driven settings once for the lifetime of the process.
+    reload_settings()
+
     # Warm-up search manager to reduce first-request latency.
     await index.initialize_search_manager()
 
@@ -410,6 +378,21 @@ async def _shutdown() -> None:
         await index.cleanup()
 
 
+def _raise_for_search_error(data: Any) -> None:
+    """Map a search tool error payload to an HTTP error (no-op for results)."""
+    if not (isinstance(data, dict) and data.get("error")):
+        return
+    if data.get("retry_after_s") is not None:
+        # Admission control rejected the search: overloaded, not bad input.
+        retry_after = max(1, math.ceil(float(data["retry_after_s"])))
+        raise HTTPException(
+            status_code=503,
+            detail=data["error"],
+            headers={"Retry-After": str(retry_after)},
+        )
+    raise HTTPException(status_code=400, detail=data["error"])
+
+
 @app.get("/health")
 async def health() -> Dict[str, Any]:
     """Return overall health/readiness information."""
@@ -424,11 +407,89 @@ async def search_endpoint(payload: SearchRequest) -> Dict[str, Any]:
         payload.query, payload.num_results, payload.engine
     )
     data = json.loads(results_json)
-    if isinstance(data, dict) and data.get("error"):
-        raise HTTPException(status_code=400, detail=data["error"])
+    _raise_for_search_error(data)
     return {"results": data, "count": len(data)}
 
 
+@app.post("/search/stream")
+async def search_stream_endpoint(payload: SearchRequest, request: Request):
+    """Stream provisional rankings as engines complete, then the final ranking.
+
+    Responds with Server-Sent Events when the client sends
+    ``Accept: text/event-stream``; NDJSON otherwise.
+    """
+    events = index.search_stream_events(
+        payload.query, payload.num_results, payload.engine
+    )
+
+    if "text/event-stream" in (request.headers.get("accept") or ""):
+        async def _sse():
+            async for event in events:
+                data = json.dumps(event, ensure_ascii=False)
+                yield f"event: {event.get('type', 'message')}\ndata: {data}\n\n"
+
+        return StreamingResponse(
+            _sse(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    async def _ndjson():
+        async for event in events:
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+
+@app.post("/search/batch")
+async def search_batch_endpoint(payload: BatchSearchRequest):
+    """Run several searches with shared scheduling (input order or NDJSON stream)."""
+    error = index._validate_batch_queries(payload.queries)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    if payload.stream:
+        async def _rows():
+            async for row in index.search_batch_stream(
+                payload.queries, payload.num_results, payload.engine
+            ):
+                yield json.dumps(row, ensure_ascii=False) + "\n"
+
+        return StreamingResponse(_rows(), media_type="application/x-ndjson")
+
+    results_json = await index.search_batch(
+        payload.queries, payload.num_results, payload.engine
+    )
+    data = json.loads(results_json)
+    _raise_for_search_error(data)
+    return {"results": data, "count": len(data)}
+
+
+@app.post("/cache/warmup")
+async def cache_warmup_endpoint(payload: WarmupRequest) -> Dict[str, Any]:
+    """Start a background cache warmup; returns its progress immediately."""
+    data = json.loads(
+        await index.manage_cache(
+            "warmup",
+            engine=payload.engine,
+            queries=payload.queries,
+            top_n=payload.top_n,
+        )
+    )
+    if not data.get("success"):
+        raise HTTPException(status_code=503, detail=data.get("error"))
+    return data["warmup"]
+
+
+@app.get("/cache/warmup")
+async def cache_warmup_status_endpoint() -> Dict[str, Any]:
+    """Progress of the current (or last) cache warmup."""
+    data = json.loads(await index.manage_cache("warmup_status"))
+    if not data.get("success"):
+        raise HTTPException(status_code=503, detail=data.get("error"))
+    return data["warmup"]
+
+
 @app.post("/read_url")
 async def read_url_endpoint(payload: ReadRequest) -> Dict[str, Any]:
     """Crawl a URL and return markdown or other requested format."""
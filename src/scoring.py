@@ -0,0 +1,221 @@
+"""Single-pass result scoring shared by fusion, reranking and term boosts.
+
+One search used to lowercase and substring-scan the same title and snippet
+strings in several places (relevance blend, token reranker, fusion-term
+boost), and none of them tokenized CJK text.  A :class:`ScoringPipeline` is
+created per request instead:
+
+- the query is tokenized once (:func:`tokenize`: words, with CJK runs split
+  into character bigrams, so ``磁约束聚变`` matches ``磁约束`` in a title)
+- each result becomes a :class:`ResultFeatures` record once: lowercased
+  fields, query-term hits per field, host, canonical URL and domain boost
+- the stages (domain boost, RRF, title dedup, lexical relevance, reranking,
+  fusion-term boosts) read those records; :meth:`ScoringPipeline.stage`
+  adds each stage's CPU time to :data:`SCORING_METRICS`
+
+Fusion-term matching goes through a :class:`TermIndex` built once per term
+list: terms are looked up by their first token, so a result is checked
+against the few terms that can start at one of its tokens rather than the
+whole vocabulary.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+try:  # pragma: no cover
+    from src.utils import get_domain_boosts, host_from_url, result_link_key
+except Exception:  # pragma: no cover
+    from utils import get_domain_boosts, host_from_url, result_link_key
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_TOKEN_RE = re.compile(rf"[{_CJK}]+|[^\W_{_CJK}]+")
+_CJK_RE = re.compile(rf"[{_CJK}]")
+
+# Lexical relevance weights per query-term hit.
+TITLE_WEIGHT = 3.0
+SNIPPET_WEIGHT = 1.0
+
+STAGES = ("features", "domain_boost", "rrf", "dedup", "relevance", "rerank", "fusion_terms")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased word tokens; CJK runs become overlapping character bigrams."""
+    out: List[str] = []
+    for run in _TOKEN_RE.findall((text or "").lower()):
+        if len(run) > 1 and _CJK_RE.match(run):
+            out.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            out.append(run)
+    return out
+
+
+def query_terms(
+    query: Optional[str], *, min_len: int = 2, stopwords: Iterable[str] = ()
+) -> Tuple[str, ...]:
+    """Distinct scoring terms of *query* in order.
+
+    Non-CJK terms shorter than *min_len* are dropped unless numeric; CJK
+    bigrams (and single CJK characters) are always kept.
+    """
+    stop = frozenset(stopwords)
+    seen: Dict[str, None] = {}
+    for token in tokenize(query):
+        if token in stop:
+            continue
+        if len(token) < min_len and not token.isdigit() and not _CJK_RE.match(token):
+            continue
+        seen.setdefault(token, None)
+    return tuple(seen)
+
+
+class ScoringMetrics:
+    """Process-wide CPU time per scoring stage."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stages: Dict[str, List[float]] = {}
+
+    def record(self, stage: str, cpu_s: float) -> None:
+        with self._lock:
+            entry = self._stages.setdefault(stage, [0, 0.0])
+            entry[0] += 1
+            entry[1] += cpu_s
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            items = [(name, list(v)) for name, v in self._stages.items()]
+        order = {name: i for i, name in enumerate(STAGES)}
+        items.sort(key=lambda kv: order.get(kv[0], len(order)))
+        return {
+            name: {
+                "runs": int(runs),
+                "cpu_ms_total": round(total * 1e3, 3),
+                "cpu_us_avg": round(total / runs * 1e6, 1) if runs else 0.0,
+            }
+            for name, (runs, total) in items
+        }
+
+
+SCORING_METRICS = ScoringMetrics()
+
+
+class ResultFeatures:
+    """Per-result record shared by every scoring stage."""
+
+    __slots__ = (
+        "title", "snippet", "host", "key", "title_hits", "snippet_hits", "boost", "_tokens",
+    )
+
+    def __init__(self, result: Mapping[str, Any], terms: Sequence[str]) -> None:
+        self.title = (result.get("title") or "").lower()
+        self.snippet = (result.get("snippet") or "").lower()
+        self.host = result.get("host") or host_from_url(result.get("link"))
+        self.key = result_link_key(result)
+        self.title_hits = sum(1 for t in terms if t in self.title)
+        self.snippet_hits = sum(1 for t in terms if t in self.snippet)
+        self.boost: Optional[float] = None
+        self._tokens: Optional[frozenset] = None
+
+    @property
+    def text(self) -> str:
+        return f"{self.title} {self.snippet}"
+
+    @property
+    def tokens(self) -> frozenset:
+        """Token set of title and snippet (built on first use)."""
+        if self._tokens is None:
+            self._tokens = frozenset(tokenize(self.text))
+        return self._tokens
+
+
+class TermIndex:
+    """Terms (lowercased, ``min_len``+ chars) keyed by their first token."""
+
+    def __init__(self, terms: Iterable[str], min_len: int = 3) -> None:
+        self._by_first: Dict[str, List[str]] = {}
+        size = 0
+        for term in {str(t).lower() for t in terms if t and len(str(t)) >= min_len}:
+            tokens = tokenize(term)
+            if tokens:
+                self._by_first.setdefault(tokens[0], []).append(term)
+                size += 1
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def count(self, features: ResultFeatures, limit: int = 0) -> int:
+        """Number of distinct terms contained in the result (capped at *limit*)."""
+        text = features.text
+        hits = 0
+        for token in features.tokens:
+            for term in self._by_first.get(token, ()):
+                if term in text:
+                    hits += 1
+                    if limit and hits >= limit:
+                        return hits
+        return hits
+
+
+class ScoringPipeline:
+    """Per-request scoring state: query terms plus one record per result."""
+
+    def __init__(
+        self, query: Optional[str] = "", *, metrics: Optional[ScoringMetrics] = None
+    ) -> None:
+        self.query = query or ""
+        self.terms = query_terms(self.query)
+        self.metrics = SCORING_METRICS if metrics is None else metrics
+        # id(result) -> (result, record); the result reference keeps ids stable.
+        self._records: Dict[int, Tuple[Mapping[str, Any], ResultFeatures]] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.metrics.record(name, time.thread_time() - start)
+
+    def features(self, result: Mapping[str, Any]) -> ResultFeatures:
+        entry = self._records.get(id(result))
+        if entry is None or entry[0] is not result:
+            entry = (result, ResultFeatures(result, self.terms))
+            self._records[id(result)] = entry
+        return entry[1]
+
+    def prepare(self, results: Iterable[Mapping[str, Any]], boosts: Any = None) -> None:
+        """Build records (stage ``features``) and domain boosts (``domain_boost``)."""
+        with self.stage("features"):
+            records = [self.features(r) for r in results]
+        with self.stage("domain_boost"):
+            index = get_domain_boosts() if boosts is None else boosts
+            for rec in records:
+                if rec.boost is None:
+                    rec.boost = index.multiplier(rec.host)
+
+    def relevance(self, result: Mapping[str, Any]) -> float:
+        """Lexical relevance: weighted query-term hits in title and snippet."""
+        rec = self.features(result)
+        return TITLE_WEIGHT * rec.title_hits + SNIPPET_WEIGHT * rec.snippet_hits
+
+
+__all__ = [
+    "SCORING_METRICS",
+    "STAGES",
+    "ResultFeatures",
+    "ScoringMetrics",
+    "ScoringPipeline",
+    "TermIndex",
+    "query_terms",
+    "tokenize",
+]
@@ -1,4 +1,15 @@
-from typing import List, Dict, Optional, Any
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 import inspect
 import asyncio
 import httpx
@@ -29,25 +40,57 @@ except Exception:  # pragma: no cover - fallback for environments without ddgs
 # Prefer absolute imports for tooling; fall back to direct imports for
 # ad-hoc script execution contexts.
 try:
-    from src.cache import SearchCache
+    from src.cache import EngineResultCache, SearchCache
     from src.persistent_cache import PersistentCache
+    from src.ttl_policy import build_ttl_policy
     from src.utils import (
         MultiRateLimiter,
+        RRF_METHODS,
+        RRFAccumulator,
+        canonicalize_url,
+        host_from_url,
         merge_and_deduplicate,
+        reload_domain_boosts,
         rewrite_local_proxy_url,
         get_http_proxy_from_env,
     )
     from src.monitor import SearchMetrics, get_monitor
     from src.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
-    from src.request_context import get_request_id
+    from src.request_context import (
+        get_client_id,
+        get_engine_allowlist,
+        get_priority,
+        get_request_id,
+        set_engine_allowlist,
+        set_priority,
+    )
+    from src.refresh_ahead import FREE_ENGINES, RefreshBudget
     from src.reranker import Reranker, get_reranker
+    from src.scoring import SCORING_METRICS, ScoringPipeline, TermIndex, query_terms
     from src.fusion_terms import FusionTermsProvider, get_fusion_terms_provider
+    from src.settings import get_settings
+    from src.hedging import HedgeBudget, LatencyWindow
+    from src.engine_health import EngineHealthTracker
+    from src.deadline import Deadline, cap as cap_to_deadline, fits as fits_deadline
+    from src.admission import (
+        PRIORITY_BACKGROUND,
+        PRIORITY_BATCH,
+        PRIORITY_INTERACTIVE,
+        AdmissionRejected,
+        FairScheduler,
+    )
 except Exception:  # pragma: no cover
-    from cache import SearchCache
+    from cache import EngineResultCache, SearchCache
     from persistent_cache import PersistentCache
+    from ttl_policy import build_ttl_policy
     from utils import (
         MultiRateLimiter,
+        RRF_METHODS,
+        RRFAccumulator,
+        canonicalize_url,
+        host_from_url,
         merge_and_deduplicate,
+        reload_domain_boosts,
         rewrite_local_proxy_url,
         get_http_proxy_from_env
     )
@@ -55,9 +98,29 @@ except Exception:  # pragma: no cover
         SearchMetrics, get_monitor
     )
     from circuit_breaker import CircuitBreaker, CircuitBreakerConfig
-    from request_context import get_request_id
+    from request_context import (
+        get_client_id,
+        get_engine_allowlist,
+        get_priority,
+        get_request_id,
+        set_engine_allowlist,
+        set_priority,
+    )
+    from refresh_ahead import FREE_ENGINES, RefreshBudget
     from reranker import Reranker, get_reranker
+    from scoring import SCORING_METRICS, ScoringPipeline, TermIndex, query_terms
     from fusion_terms import FusionTermsProvider, get_fusion_terms_provider
+    from settings import get_settings
+    from hedging import HedgeBudget, LatencyWindow
+    from engine_health import EngineHealthTracker
+    from deadline import Deadline, cap as cap_to_deadline, fits as fits_deadline
+    from admission import (
+        PRIORITY_BACKGROUND,
+        PRIORITY_BATCH,
+        PRIORITY_INTERACTIVE,
+        AdmissionRejected,
+        FairScheduler,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -247,6 +310,14 @@ def _ddgs_text_backends_without_wikipedia() -> Optional[str]:
 
 
 class SearchResult:
+    """One engine result.
+
+    ``canonical_url`` (dedup/fusion key) and ``host`` (domain boosts) are
+    derived from ``link`` when the result is created.  They stay internal
+    attributes - :meth:`to_dict` keeps the public result shape - and warm the
+    URL memos, so merging looks the link up instead of re-parsing it.
+    """
+
     def __init__(
         self, title: str, link: str, snippet: str, source: str
     ):
@@ -254,17 +325,26 @@ class SearchResult:
         self.link = link
         self.snippet = snippet
         self.source = source
+        self.canonical_url = canonicalize_url(link)
+        self.host = host_from_url(link)
 
     def to_dict(self) -> Dict:
         return {
             "title": self.title,
             "link": self.link,
             "snippet": self.snippet,
-            "source": self.source
+            "source": self.source,
         }
 
 
 class SearchEngine(ABC):
+    """Search engine interface.
+
+    Implementations may also accept a keyword-only ``deadline``
+    (:class:`Deadline`); the manager passes it only to engines whose
+    ``search`` signature declares it.
+    """
+
     @abstractmethod
     async def search(
         self, query: str, num_results: int = 10
@@ -272,6 +352,101 @@ class SearchEngine(ABC):
         pass
 
 
+_ACCEPTS_DEADLINE: Dict[type, bool] = {}
+
+
+def _accepts_deadline(engine: SearchEngine) -> bool:
+    """Whether ``engine.search`` takes a ``deadline`` keyword (cached per class)."""
+    cls = type(engine)
+    ok = _ACCEPTS_DEADLINE.get(cls)
+    if ok is None:
+        try:
+            params = inspect.signature(engine.search).parameters
+            ok = "deadline" in params or any(
+                p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()
+            )
+        except (TypeError, ValueError):
+            ok = False
+        _ACCEPTS_DEADLINE[cls] = ok
+    return ok
+
+
+def _deadline_timeout(deadline: Optional[Deadline]) -> Dict[str, Any]:
+    """httpx per-request kwargs so a call never outlives *deadline*."""
+    left = None if deadline is None else deadline.remaining()
+    if left is None:
+        return {}
+    return {"timeout": max(0.001, left)}
+
+
+def _page_offsets(
+    num_results: int, page_size: int, *, max_results: Optional[int] = None
+) -> List[int]:
+    """0-based result offsets of the pages needed to cover *num_results*.
+
+    Capped by ``CRAWL4AI_ENGINE_MAX_PAGES`` and by the deepest result the
+    engine API can return (*max_results*).  Always at least one page.
+    """
+    page_size = max(1, int(page_size))
+    want = max(1, int(num_results))
+    if max_results is not None:
+        want = min(want, max(1, int(max_results)))
+    pages = min(get_settings().engine_max_pages, -(-want // page_size))
+    return [i * page_size for i in range(max(1, pages))]
+
+
+async def _fetch_pages(
+    fetch_page: Callable[[int], Awaitable[List[SearchResult]]],
+    offsets: Sequence[int],
+    *,
+    engine_type: str,
+    rate_limiter: Optional[MultiRateLimiter] = None,
+) -> List[SearchResult]:
+    """Fetch result pages concurrently and stitch them back in rank order.
+
+    The first page is the request the caller already took a rate-limit
+    token for; its errors propagate unchanged.  Every extra page takes its
+    own token without waiting (``try_acquire``) and is skipped when the
+    quota is exhausted or the request fails, so deep pages never block or
+    fail a search.  Stitching stops at the first missing or empty page to
+    keep ranks contiguous; a link repeated on a later page keeps its first
+    position.
+    """
+    async def _extra_page(offset: int) -> Optional[List[SearchResult]]:
+        if rate_limiter is not None and not await rate_limiter.try_acquire(engine_type):
+            logger.info("%s: no quota left for page at offset %d", engine_type, offset)
+            return None
+        try:
+            return await fetch_page(offset)
+        except Exception as e:
+            logger.warning(
+                "%s: page at offset %d failed: %s", engine_type, offset, str(e)
+            )
+            return None
+
+    extra = [asyncio.ensure_future(_extra_page(o)) for o in offsets[1:]]
+    try:
+        first = await fetch_page(offsets[0])
+        pages = await asyncio.gather(*extra) if (extra and first) else []
+    finally:
+        for t in extra:
+            if not t.done():
+                t.cancel()
+
+    results = list(first)
+    seen = {r.link for r in results if r.link}
+    for page in pages:
+        if not page:
+            break
+        for r in page:
+            if r.link and r.link in seen:
+                continue
+            if r.link:
+                seen.add(r.link)
+            results.append(r)
+    return results
+
+
 class DuckDuckGoSearch(SearchEngine):
     def __init__(
         self,
@@ -300,30 +475,14 @@ class DuckDuckGoSearch(SearchEngine):
 
     @staticmethod
     def _query_terms(query: str) -> List[str]:
-        # Lightweight tokenization for reranking; designed to work for typical
-        # English technical queries. We keep it conservative to avoid breaking
-        # non-English queries.
-        parts = re.split(r"[^a-zA-Z0-9]+", (query or "").lower())
+        # Lightweight tokenization for reranking (shared with the fusion
+        # scoring pipeline): words of 3+ chars or digits, CJK runs as
+        # character bigrams; de-duplicated in query order.
         stop = {
             "the", "a", "an", "and", "or", "for", "to", "in", "of",
             "with", "on", "at", "by", "from"
         }
-        out: List[str] = []
-        for p in parts:
-            if not p or p in stop:
-                continue
-            # keep short but meaningful tokens like 'n8n'
-            if len(p) <= 2 and not p.isdigit():
-                continue
-            out.append(p)
-        # de-dupe while preserving order
-        seen = set()
-        deduped: List[str] = []
-        for t in out:
-            if t not in seen:
-                seen.add(t)
-                deduped.append(t)
-        return deduped
+        return list(query_terms(query, min_len=3, stopwords=stop))
 
     @classmethod
     def _rerank_results(
@@ -363,7 +522,11 @@ class DuckDuckGoSearch(SearchEngine):
         return [r for _, _, r in scored]
 
     async def search(
-        self, query: str, num_results: int = 10
+        self,
+        query: str,
+        num_results: int = 10,
+        *,
+        deadline: Optional[Deadline] = None,
     ) -> List[SearchResult]:
         def _ddg_region() -> str:
             # Prefer explicit ctor override, then env vars; normalize to avoid
@@ -466,6 +629,11 @@ class DuckDuckGoSearch(SearchEngine):
 
         last_error: Optional[str] = None
         for mode, ddgs_client in candidates:
+            if last_error is not None and not fits_deadline(deadline):
+                logger.warning(
+                    "DuckDuckGo: no time left for %s attempt; giving up", mode
+                )
+                break
             try:
                 ddg_kwargs = {}
                 backend = _ddg_backend()
@@ -482,7 +650,10 @@ class DuckDuckGoSearch(SearchEngine):
                         **ddg_kwargs,
                     ))
 
-                raw_items = await asyncio.to_thread(_call_ddgs_text)
+                raw_items = await asyncio.wait_for(
+                    asyncio.to_thread(_call_ddgs_text),
+                    timeout=cap_to_deadline(deadline, None),
+                )
                 results = _collect(raw_items)
                 if results:
                     # Rerank to better respect multi-term technical queries.
@@ -528,6 +699,7 @@ class GoogleSearch(SearchEngine):
         cse_id: str,
         proxy: Optional[str] = None,
         client_pool: Optional[HttpClientPool] = None,
+        rate_limiter: Optional[MultiRateLimiter] = None,
     ):
         self.api_key = api_key
         self.cse_id = cse_id
@@ -535,118 +707,157 @@ class GoogleSearch(SearchEngine):
         # Optional proxy URL from config.json (has priority over env)
         self.proxy = proxy
         self._client_pool = client_pool
+        # Extra result pages draw from the same quota as the first request.
+        self._rate_limiter = rate_limiter
 
     async def search(
-        self, query: str, num_results: int = 10
+        self,
+        query: str,
+        num_results: int = 10,
+        *,
+        deadline: Optional[Deadline] = None,
     ) -> List[SearchResult]:
         if not self.api_key or not self.cse_id:
             logger.warning("Google search credentials not configured")
             return []
 
-        # Prepare request params once
-        params = {
-            'key': self.api_key,
-            'cx': self.cse_id,
-            'q': query,
-            'num': min(num_results, 10)
-        }
+        # Custom Search returns at most 10 results per request; deeper
+        # results are paged with the 1-based ``start`` (start + num <= 101).
+        page_size = min(max(1, num_results), 10)
+        offsets = _page_offsets(num_results, page_size, max_results=100)
+
+        def _page_params(offset: int) -> Dict[str, Any]:
+            params: Dict[str, Any] = {
+                'key': self.api_key,
+                'cx': self.cse_id,
+                'q': query,
+                'num': page_size,
+            }
+            if offset:
+                params['start'] = offset + 1
+            return params
 
         # Strategy: try direct first; on network error, retry via proxy
-        async def _request_with_proxy(proxy_url: Optional[str]):
+        async def _request_with_proxy(
+            proxy_url: Optional[str], params: Dict[str, Any]
+        ):
             if self._client_pool is not None:
                 client = await self._client_pool.get_client(proxy_url)
-                response = await client.get(self.base_url, params=params)
+                response = await client.get(
+                    self.base_url, params=params, **_deadline_timeout(deadline)
+                )
                 response.raise_for_status()
                 return response.json()
 
             async with httpx.AsyncClient(
                 timeout=30.0, proxy=proxy_url, trust_env=False
             ) as client:
-                response = await client.get(self.base_url, params=params)
+                response = await client.get(
+                    self.base_url, params=params, **_deadline_timeout(deadline)
+                )
                 response.raise_for_status()
                 return response.json()
 
         def _env_proxy() -> Optional[str]:
             return get_http_proxy_from_env()
 
-        try:
-            logger.info(f"Sending Google request (direct): {query}")
-            data = await _request_with_proxy(None)
-        except (httpx.RequestError, httpx.TimeoutException, ValueError) as e:
-            if self.proxy:
-                logger.warning(
-                    "Direct Google request failed (%s); retrying via proxy",
-                    e.__class__.__name__
-                )
-                try:
-                    data = await _request_with_proxy(self.proxy)
-                except Exception as e2:
-                    logger.error(f"Google search failed via proxy: {str(e2)}")
+        async def _fetch_page(offset: int) -> List[SearchResult]:
+            params = _page_params(offset)
+            try:
+                logger.info(f"Sending Google request (direct): {query}")
+                data = await _request_with_proxy(None, params)
+            except (httpx.RequestError, httpx.TimeoutException, ValueError) as e:
+                if not fits_deadline(deadline):
+                    logger.error(
+                        "Google search failed (%s); no time left for proxy fallback",
+                        e.__class__.__name__
+                    )
                     raise EngineSearchError(
-                        f"Google search failed via proxy: {str(e2)}",
-                        retriable=True,
+                        f"Google search failed (deadline): {str(e)}",
+                        retriable=False,
                     )
-            else:
-                # Try environment proxy as a fallback
-                env_p = _env_proxy()
-                if env_p:
+                if self.proxy:
                     logger.warning(
-                        "Direct Google request failed (%s); "
-                        "retrying via env proxy",
+                        "Direct Google request failed (%s); retrying via proxy",
                         e.__class__.__name__
                     )
                     try:
-                        data = await _request_with_proxy(env_p)
+                        data = await _request_with_proxy(self.proxy, params)
                     except Exception as e2:
+                        logger.error(f"Google search failed via proxy: {str(e2)}")
+                        raise EngineSearchError(
+                            f"Google search failed via proxy: {str(e2)}",
+                            retriable=True,
+                        )
+                else:
+                    # Try environment proxy as a fallback
+                    env_p = _env_proxy()
+                    if env_p:
+                        logger.warning(
+                            "Direct Google request failed (%s); "
+                            "retrying via env proxy",
+                            e.__class__.__name__
+                        )
+                        try:
+                            data = await _request_with_proxy(env_p, params)
+                        except Exception as e2:
+                            logger.error(
+                                "Google search failed via env proxy: %s",
+                                str(e2)
+                            )
+                            raise EngineSearchError(
+                                f"Google search failed via env proxy: {str(e2)}",
+                                retriable=True,
+                            )
+                    else:
                         logger.error(
-                            "Google search failed via env proxy: %s",
-                            str(e2)
+                            "Google search failed (no proxy configured): %s",
+                            str(e)
                         )
                         raise EngineSearchError(
-                            f"Google search failed via env proxy: {str(e2)}",
+                            f"Google search failed (no proxy configured): {str(e)}",
                             retriable=True,
                         )
-                else:
-                    logger.error(
-                        "Google search failed (no proxy configured): %s",
-                        str(e)
-                    )
-                    raise EngineSearchError(
-                        f"Google search failed (no proxy configured): {str(e)}",
-                        retriable=True,
-                    )
-        except httpx.HTTPStatusError as e:
-            # HTTP errors like 4xx/5xx won't be fixed by proxy; don't retry
-            logger.error(
-                "Google search HTTP error: %s - %s",
-                e.response.status_code,
-                e.response.text[:200]
-            )
-            code = int(getattr(e.response, "status_code", 0) or 0)
-            retriable = bool(code >= 500 or code == 429)
-            raise EngineSearchError(
-                f"Google search HTTP error: {code}",
-                retriable=retriable,
-                status_code=code,
-            )
-        except Exception as e:
-            logger.error(f"Google search failed: {str(e)}")
-            raise EngineSearchError(
-                f"Google search failed: {str(e)}",
-                retriable=True,
-            )
+            except httpx.HTTPStatusError as e:
+                # HTTP errors like 4xx/5xx won't be fixed by proxy; don't retry
+                logger.error(
+                    "Google search HTTP error: %s - %s",
+                    e.response.status_code,
+                    e.response.text[:200]
+                )
+                code = int(getattr(e.response, "status_code", 0) or 0)
+                retriable = bool(code >= 500 or code == 429)
+                raise EngineSearchError(
+                    f"Google search HTTP error: {code}",
+                    retriable=retriable,
+                    status_code=code,
+                )
+            except Exception as e:
+                logger.error(f"Google search failed: {str(e)}")
+                raise EngineSearchError(
+                    f"Google search failed: {str(e)}",
+                    retriable=True,
+                )
+
+            results = []
+            for item in data.get('items', []):
+                results.append(SearchResult(
+                    title=item.get('title', ''),
+                    link=item.get('link', ''),
+                    snippet=item.get('snippet', ''),
+                    source='google'
+                ))
 
-        results = []
-        for item in data.get('items', []):
-            results.append(SearchResult(
-                title=item.get('title', ''),
-                link=item.get('link', ''),
-                snippet=item.get('snippet', ''),
-                source='google'
-            ))
+            return results
 
+        results = await _fetch_pages(
+            _fetch_page,
+            offsets,
+            engine_type='google',
+            rate_limiter=self._rate_limiter,
+        )
         logger.info("Google search request successful")
-        return results
+        return results[:num_results]
 
 
 class BraveSearch(SearchEngine):
@@ -655,20 +866,27 @@ class BraveSearch(SearchEngine):
         api_key: str,
         proxy: Optional[str] = None,
         client_pool: Optional[HttpClientPool] = None,
+        rate_limiter: Optional[MultiRateLimiter] = None,
     ):
         """
         初始化 Brave Search 搜索引擎
 
         Args:
             api_key: Brave Search API 密钥
+            rate_limiter: 额外分页请求使用的限流器（与首个请求共享配额）
         """
         self.api_key = api_key
         self.base_url = "https://api.search.brave.com/res/v1/web/search"
         self.proxy = proxy
         self._client_pool = client_pool
+        self._rate_limiter = rate_limiter
 
     async def search(
-        self, query: str, num_results: int = 10
+        self,
+        query: str,
+        num_results: int = 10,
+        *,
+        deadline: Optional[Deadline] = None,
     ) -> List[SearchResult]:
         """
         使用 Brave Search API 进行搜索
@@ -676,6 +894,7 @@ class BraveSearch(SearchEngine):
         Args:
             query: 搜索查询字符串
             num_results: 需要返回的结果数量
+            deadline: 整个搜索的截止时间；请求超时受其限制，剩余时间不足时跳过代理回退
 
         Returns:
             搜索结果列表
@@ -690,72 +909,103 @@ class BraveSearch(SearchEngine):
                 'X-Subscription-Token': self.api_key
             }
 
-            params = {
-                'q': query,
-                'count': min(num_results, 20)
-            }
+            # count is capped at 20; deeper pages use ``offset``, which
+            # counts pages of ``count`` results (0-9).
+            page_size = min(max(1, num_results), 20)
+            offsets = _page_offsets(
+                num_results, page_size, max_results=page_size * 10
+            )
 
-            async def _do_request(proxy_url: Optional[str]):
+            async def _do_request(
+                proxy_url: Optional[str], params: Dict[str, Any]
+            ):
                 if self._client_pool is not None:
                     client = await self._client_pool.get_client(proxy_url)
                     return await client.get(
-                        self.base_url, headers=headers, params=params
+                        self.base_url,
+                        headers=headers,
+                        params=params,
+                        **_deadline_timeout(deadline),
                     )
 
                 async with httpx.AsyncClient(
                     timeout=30.0, proxy=proxy_url, trust_env=False
                 ) as client:
                     return await client.get(
-                        self.base_url, headers=headers, params=params
+                        self.base_url,
+                        headers=headers,
+                        params=params,
+                        **_deadline_timeout(deadline),
                     )
 
-            async def _do_request_json(proxy_url: Optional[str]) -> Dict[str, Any]:
-                resp = await _do_request(proxy_url)
+            async def _do_request_json(
+                proxy_url: Optional[str], params: Dict[str, Any]
+            ) -> Dict[str, Any]:
+                resp = await _do_request(proxy_url, params)
                 resp.raise_for_status()
                 return resp.json()
 
             def _env_proxy() -> Optional[str]:
                 return get_http_proxy_from_env()
 
-            logger.info(f"Sending request to Brave Search (direct): {query}")
-            try:
-                data = await _do_request_json(None)
-            except (httpx.RequestError, httpx.TimeoutException, ValueError) as e:
-                if self.proxy:
-                    logger.warning(
-                        "Direct Brave request failed (%s); "
-                        "retrying via proxy",
-                        e.__class__.__name__
-                    )
-                    data = await _do_request_json(self.proxy)
-                else:
-                    env_p = _env_proxy()
-                    if env_p:
+            async def _fetch_page(offset: int) -> List[SearchResult]:
+                params: Dict[str, Any] = {'q': query, 'count': page_size}
+                if offset:
+                    params['offset'] = offset // page_size
+
+                logger.info(f"Sending request to Brave Search (direct): {query}")
+                try:
+                    data = await _do_request_json(None, params)
+                except (httpx.RequestError, httpx.TimeoutException, ValueError) as e:
+                    if not fits_deadline(deadline):
                         logger.warning(
                             "Direct Brave request failed (%s); "
-                            "retrying via env proxy",
+                            "no time left for proxy fallback",
                             e.__class__.__name__
                         )
-                        data = await _do_request_json(env_p)
-                    else:
                         raise
+                    if self.proxy:
+                        logger.warning(
+                            "Direct Brave request failed (%s); "
+                            "retrying via proxy",
+                            e.__class__.__name__
+                        )
+                        data = await _do_request_json(self.proxy, params)
+                    else:
+                        env_p = _env_proxy()
+                        if env_p:
+                            logger.warning(
+                                "Direct Brave request failed (%s); "
+                                "retrying via env proxy",
+                                e.__class__.__name__
+                            )
+                            data = await _do_request_json(env_p, params)
+                        else:
+                            raise
+
+                web_results = data.get('web', {}).get('results', [])
+                return [
+                    SearchResult(
+                        title=item.get('title', ''),
+                        link=item.get('url', ''),
+                        snippet=item.get('description', ''),
+                        source='brave'
+                    )
+                    for item in web_results
+                ]
 
-            results = []
-            web_results = data.get('web', {}).get('results', [])
+            results = await _fetch_pages(
+                _fetch_page,
+                offsets,
+                engine_type='brave',
+                rate_limiter=self._rate_limiter,
+            )
             logger.info(
                 f"Brave Search successful, "
-                f"got {len(web_results)} results"
+                f"got {len(results)} results"
             )
 
-            for item in web_results[:num_results]:
-                results.append(SearchResult(
-                    title=item.get('title', ''),
-                    link=item.get('url', ''),
-                    snippet=item.get('description', ''),
-                    source='brave'
-                ))
-
-            return results
+            return results[:num_results]
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 401:
@@ -783,12 +1033,17 @@ class BraveSearch(SearchEngine):
 
 
 class SearXNGSearch(SearchEngine):
+    # Results per ``pageno`` vary with the enabled upstream engines; this is
+    # only used to decide how many pages to request.
+    PAGE_SIZE = 20
+
     def __init__(
         self,
         base_url: str = "http://localhost:28981",
         language: str = "zh-CN",
         proxy: Optional[str] = None,
         client_pool: Optional[HttpClientPool] = None,
+        rate_limiter: Optional[MultiRateLimiter] = None,
     ):
         """
         初始化 SearXNG 搜索引擎
@@ -798,14 +1053,20 @@ class SearXNGSearch(SearchEngine):
                 (例如: http://localhost:28981 或
                 https://searx.example.com)
             language: 搜索语言，默认为 zh-CN (中文)
+            rate_limiter: 额外分页请求使用的限流器（与首个请求共享配额）
         """
         self.base_url = base_url.rstrip('/')
         self.language = language
         self.proxy = proxy
         self._client_pool = client_pool
+        self._rate_limiter = rate_limiter
 
     async def search(
-        self, query: str, num_results: int = 10
+        self,
+        query: str,
+        num_results: int = 10,
+        *,
+        deadline: Optional[Deadline] = None,
     ) -> List[SearchResult]:
         """
         使用 SearXNG 进行搜索
@@ -813,17 +1074,13 @@ class SearXNGSearch(SearchEngine):
         Args:
             query: 搜索查询字符串
             num_results: 需要返回的结果数量
+            deadline: 整个搜索的截止时间；请求超时受其限制，剩余时间不足时跳过代理回退
 
         Returns:
             搜索结果列表
         """
         try:
-            params: Dict[str, str] = {
-                'q': query,
-                'format': 'json',
-                'language': self.language,
-                'pageno': '1'
-            }
+            offsets = _page_offsets(num_results, self.PAGE_SIZE)
 
             search_url = f"{self.base_url}/search"
             logger.info(
@@ -843,13 +1100,16 @@ class SearXNGSearch(SearchEngine):
                 'X-Real-IP': trusted_ip,
             }
 
-            async def _do_request(proxy_url: Optional[str]):
+            async def _do_request(
+                proxy_url: Optional[str], params: Dict[str, str]
+            ):
                 if self._client_pool is not None:
                     client = await self._client_pool.get_client(proxy_url)
                     return await client.get(
                         search_url,
                         params=params,
                         headers=default_headers,
+                        **_deadline_timeout(deadline),
                     )
 
                 async with httpx.AsyncClient(
@@ -858,54 +1118,77 @@ class SearXNGSearch(SearchEngine):
                     return await client.get(
                         search_url,
                         params=params,
-                        headers=default_headers
+                        headers=default_headers,
+                        **_deadline_timeout(deadline),
                     )
 
-            async def _do_request_json(proxy_url: Optional[str]) -> Dict[str, Any]:
-                resp = await _do_request(proxy_url)
+            async def _do_request_json(
+                proxy_url: Optional[str], params: Dict[str, str]
+            ) -> Dict[str, Any]:
+                resp = await _do_request(proxy_url, params)
                 resp.raise_for_status()
                 return resp.json()
 
             def _env_proxy() -> Optional[str]:
                 return get_http_proxy_from_env()
 
-            try:
-                data = await _do_request_json(None)
-            except (httpx.RequestError, httpx.TimeoutException, ValueError) as e:
-                if self.proxy:
-                    logger.warning(
-                        "Direct SearXNG request failed (%s); "
-                        "retrying via proxy",
-                        e.__class__.__name__
-                    )
-                    data = await _do_request_json(self.proxy)
-                else:
-                    env_p = _env_proxy()
-                    if env_p:
+            async def _fetch_page(offset: int) -> List[SearchResult]:
+                params: Dict[str, str] = {
+                    'q': query,
+                    'format': 'json',
+                    'language': self.language,
+                    'pageno': str(offset // self.PAGE_SIZE + 1)
+                }
+                try:
+                    data = await _do_request_json(None, params)
+                except (httpx.RequestError, httpx.TimeoutException, ValueError) as e:
+                    if not fits_deadline(deadline):
                         logger.warning(
                             "Direct SearXNG request failed (%s); "
-                            "retrying via env proxy",
+                            "no time left for proxy fallback",
                             e.__class__.__name__
                         )
-                        data = await _do_request_json(env_p)
-                    else:
                         raise
+                    if self.proxy:
+                        logger.warning(
+                            "Direct SearXNG request failed (%s); "
+                            "retrying via proxy",
+                            e.__class__.__name__
+                        )
+                        data = await _do_request_json(self.proxy, params)
+                    else:
+                        env_p = _env_proxy()
+                        if env_p:
+                            logger.warning(
+                                "Direct SearXNG request failed (%s); "
+                                "retrying via env proxy",
+                                e.__class__.__name__
+                            )
+                            data = await _do_request_json(env_p, params)
+                        else:
+                            raise
+
+                return [
+                    SearchResult(
+                        title=item.get('title', ''),
+                        link=item.get('url', ''),
+                        snippet=item.get('content', ''),
+                        source='searxng'
+                    )
+                    for item in data.get('results', [])
+                ]
 
-            results_count = len(data.get('results', []))
+            results = await _fetch_pages(
+                _fetch_page,
+                offsets,
+                engine_type='searxng',
+                rate_limiter=self._rate_limiter,
+            )
             logger.info(
-                f"SearXNG search successful, got {results_count} results"
+                f"SearXNG search successful, got {len(results)} results"
             )
 
-            results = []
-            for item in data.get('results', [])[:num_results]:
-                results.append(SearchResult(
-                    title=item.get('title', ''),
-                    link=item.get('url', ''),
-                    snippet=item.get('content', ''),
-                    source='searxng'
-                ))
-
-            return results
+            return results[:num_results]
 
         except httpx.HTTPStatusError as e:
             code = int(getattr(e.response, "status_code", 0) or 0)
@@ -938,10 +1221,18 @@ class SearXNGSearch(SearchEngine):
             )
 
 
+def normalize_query(query: Optional[str]) -> str:
+    """Case/whitespace-normalized query (matches the cache key normalization)."""
+    return " ".join(str(query or "").strip().lower().split())
+
+
 def _apply_fusion_relevance(
     results: List[Dict],
     query: str,
     provider,
+    *,
+    scoring: Optional[ScoringPipeline] = None,
+    term_index: Optional[TermIndex] = None,
 ) -> List[Dict]:
     """Enhance relevance scores using fusion terminology knowledge.
 
@@ -949,40 +1240,40 @@ def _apply_fusion_relevance(
     by multiplying their effective rank weight.  Also uses query-concept
     expansion to give extra weight to results that match concept aliases
     of the query terms.
+
+    Lowercased title/snippet text comes from the request's *scoring*
+    records; known terms are matched through *term_index* (built from
+    ``provider.get_known_terms()`` when not given), so a term only counts
+    when it starts at a token boundary.
     """
     if not results:
         return results
 
-    # Get query-concept expansions for smarter matching.
-    expanded_terms = provider.expand_query_terms(query)
-    known_terms = provider.get_known_terms()
-
-    if not known_terms:
+    if term_index is None:
+        term_index = TermIndex(provider.get_known_terms())
+    if not term_index:
         return results
+    if scoring is None:
+        scoring = ScoringPipeline(query)
+
+    # Get query-concept expansions for smarter matching.
+    expanded_terms = [
+        t.lower() for t in provider.expand_query_terms(query) if len(t) >= 3
+    ]
 
     scored: List[tuple[float, int, Dict]] = []
     for idx, r in enumerate(results):
-        title = (r.get("title") or "").lower()
-        snippet = (r.get("snippet") or "").lower()
-        combined = f"{title} {snippet}"
+        rec = scoring.features(r)
+        combined = rec.text
 
         # Base score: keep original position weight.
         base = 1.0 / (idx + 1)
 
         # Boost for containing query-expanded terms (concept aliases).
-        concept_hits = 0
-        for term in expanded_terms:
-            term_lower = term.lower()
-            if len(term_lower) >= 3 and term_lower in combined:
-                concept_hits += 1
+        concept_hits = sum(1 for term in expanded_terms if term in combined)
 
         # Boost for containing any known fusion terms.
-        fusion_hits = 0
-        for term in known_terms:
-            if len(term) >= 3 and term.lower() in combined:
-                fusion_hits += 1
-                if fusion_hits >= 20:
-                    break
+        fusion_hits = term_index.count(rec, limit=20)
 
         # Compute boost factor.
         boost = 1.0
@@ -1032,6 +1323,22 @@ class SearchManager:
         self.cache_backend = "none"
         self.cache = None
         if enable_cache:
+            # Entries are kept past their TTL for stale-while-revalidate and
+            # stale-if-error serving (hard TTL = ttl + the longer window).
+            settings = get_settings()
+            stale_ttl = int(
+                max(
+                    settings.cache_stale_while_revalidate_s,
+                    settings.cache_stale_if_error_s,
+                )
+            )
+            # Per-entry TTLs: short for empty results, adaptive by query kind
+            # and observed result churn (CRAWL4AI_CACHE_TTL_POLICY).
+            ttl_policy = build_ttl_policy(
+                settings.cache_ttl_policy,
+                negative_ttl=settings.cache_negative_ttl_s,
+                max_ttl=settings.cache_max_ttl_s,
+            )
             # Cache backend selection:
             # - default: in-memory SearchCache
             # - opt-in: PersistentCache (SQLite) via env
@@ -1078,6 +1385,17 @@ class SearchManager:
                         ttl=cache_ttl,
                         max_size=max_size,
                         enable_memory_cache=bool(mem_enabled),
+                        stale_ttl=stale_ttl,
+                        ttl_policy=ttl_policy,
+                        reader_threads=settings.persistent_cache_reader_threads,
+                        write_batch_size=settings.persistent_cache_write_batch_size,
+                        write_batch_interval=(
+                            settings.persistent_cache_write_batch_ms / 1000.0
+                        ),
+                        memory_max_bytes=int(
+                            settings.persistent_cache_memory_max_mb * 1024 * 1024
+                        ),
+                        codec=settings.persistent_cache_codec,
                     )
                     self.cache_backend = "persistent"
                 except Exception as e:
@@ -1087,7 +1405,9 @@ class SearchManager:
                         "falling back to in-memory cache",
                         str(e),
                     )
-                    self.cache = SearchCache(ttl=cache_ttl)
+                    self.cache = SearchCache(
+                        ttl=cache_ttl, stale_ttl=stale_ttl, ttl_policy=ttl_policy
+                    )
                     self.cache_backend = "memory"
             else:
                 try:
@@ -1098,9 +1418,25 @@ class SearchManager:
                     )
                 except Exception:
                     max_size = 1000
-                self.cache = SearchCache(ttl=cache_ttl, max_size=max_size)
+                self.cache = SearchCache(
+                    ttl=cache_ttl,
+                    max_size=max_size,
+                    stale_ttl=stale_ttl,
+                    ttl_policy=ttl_policy,
+                )
                 self.cache_backend = "memory"
         
+        # Per-engine raw result cache below the merged-result cache: shared by
+        # auto/all/specific modes, consulted before breaker/rate-limit budget.
+        # Never outlives the merged cache, so a refresh really re-fetches.
+        self._engine_cache: Optional[EngineResultCache] = None
+        engine_cache_ttl = min(get_settings().engine_cache_ttl_s, cache_ttl)
+        if enable_cache and engine_cache_ttl > 0:
+            self._engine_cache = EngineResultCache(
+                ttl=engine_cache_ttl,
+                max_size=get_settings().engine_cache_max_size,
+            )
+
         # 初始化限流器
         self.enable_rate_limit = enable_rate_limit
         self.rate_limiter = MultiRateLimiter() if enable_rate_limit else None
@@ -1116,6 +1452,11 @@ class SearchManager:
         self.fusion_terms: FusionTermsProvider = get_fusion_terms_provider()
         if self.fusion_terms.enabled:
             logger.info("Fusion terms provider enabled")
+        # Known terms indexed by first token, built on first fusion boost.
+        self._fusion_term_index: Optional[TermIndex] = None
+
+        # Compile domain boosts (facility domains, env, config.json) once.
+        reload_domain_boosts()
 
         # Timeout budgets & bulkheads (concurrency limits)
         def _parse_float_env(value: Optional[str]) -> Optional[float]:
@@ -1178,8 +1519,14 @@ class SearchManager:
         )
         per_engine_default = 5 if parsed_per_engine_default is None else parsed_per_engine_default
 
-        self._global_semaphore: Optional[asyncio.Semaphore] = (
-            asyncio.Semaphore(global_limit) if global_limit > 0 else None
+        # Global admission: weighted fair queuing per caller/priority class
+        # (see src/admission.py) instead of a FIFO semaphore.
+        self._admission: Optional[FairScheduler] = (
+            FairScheduler(
+                global_limit, max_queue=get_settings().admission_max_queue
+            )
+            if global_limit > 0
+            else None
         )
         self._engine_semaphores: Dict[str, asyncio.Semaphore] = {}
         for name in ("google", "brave", "searxng", "duckduckgo"):
@@ -1199,7 +1546,22 @@ class SearchManager:
             True if coalesce_flag is None else bool(coalesce_flag)
         )
         self._inflight_lock = asyncio.Lock()
-        self._inflight_searches: Dict[tuple[str, str, int], asyncio.Task] = {}
+        # (query, engine) -> {result count being computed: task}. A task for
+        # k=N serves any caller asking for k<=N (results are truncated).
+        self._inflight_searches: Dict[tuple[str, str], Dict[int, asyncio.Task]] = {}
+
+        # Background cache warmup (see start_cache_warmup); one at a time.
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._warmup_status: Dict[str, Any] = {"state": "idle"}
+
+        # Refresh-ahead of hot entries (see refresh_ahead_once).
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_budget: Optional[RefreshBudget] = None
+        # (query, mode) -> last refresh-ahead attempt (time.time())
+        self._refresh_attempts: Dict[tuple[str, str], float] = {}
+        self._refresh_stats: Dict[str, int] = {
+            "cycles": 0, "refreshed": 0, "failed": 0, "skipped_budget": 0,
+        }
 
         # Shared HTTP client pool (connection reuse) for httpx-based engines.
         self.http_client_pool = HttpClientPool()
@@ -1235,6 +1597,15 @@ class SearchManager:
                 open_seconds=_cb_open_seconds(name),
             )
             self._circuit_breakers[name] = CircuitBreaker(config=cfg)
+
+        # Hedged auto-mode requests: per-engine latency windows feed the hedge
+        # delay; the budget caps extra upstream calls (see src/hedging.py).
+        self._engine_latency: Dict[str, LatencyWindow] = {}
+        self._hedge_budget = HedgeBudget()
+
+        # Per-engine EWMA latency / empty / error rates for adaptive ordering
+        # and the early-return grace window (see src/engine_health.py).
+        self._engine_health = EngineHealthTracker()
         
         self._initialize_engines()
 
@@ -1257,11 +1628,26 @@ class SearchManager:
             )
 
     async def aclose(self) -> None:
-        """Close network resources held by this SearchManager."""
+        """Close network resources held by this SearchManager.
+
+        Also cancels a running cache warmup and the refresh-ahead loop,
+        flushes the persistent cache's queued writes and stops its
+        reader/writer threads.
+        """
+        for task in (self._warmup_task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
         try:
             await self.http_client_pool.aclose()
         except Exception:
             pass
+        close_cache = getattr(self.cache, "aclose", None)
+        if close_cache is not None:
+            try:
+                await close_cache()
+            except Exception as e:
+                logger.warning("Failed to close cache: %s", str(e))
 
     def _engine_timeout_budget(self, engine_type: str) -> Optional[float]:
         v = self.engine_timeout_s.get(engine_type)
@@ -1269,6 +1655,86 @@ class SearchManager:
             return v
         return self.engine_timeout_default_s
 
+    def _new_deadline(self) -> Deadline:
+        """Deadline for one search from ``CRAWL4AI_SEARCH_DEADLINE_S``."""
+        return Deadline.after(
+            self.search_deadline_s,
+            min_attempt_s=get_settings().deadline_min_attempt_s,
+        )
+
+    def _expected_attempt_s(
+        self, engine_type: Optional[str], deadline: Optional[Deadline]
+    ) -> float:
+        """Time one more attempt at *engine_type* is expected to need."""
+        floor = 0.0 if deadline is None else deadline.min_attempt_s
+        h = self._engine_health.get(engine_type) if engine_type else None
+        if h is None or h.samples == 0:
+            return floor
+        return max(floor, h.latency_s)
+
+    def _record_engine_latency(self, engine_type: str, seconds: float) -> None:
+        window = self._engine_latency.get(engine_type)
+        if window is None:
+            window = self._engine_latency[engine_type] = LatencyWindow()
+        window.observe(seconds)
+
+    def _record_engine_outcome(
+        self,
+        engine_type: str,
+        *,
+        latency_s: Optional[float],
+        num_results: int = 0,
+        error: bool = False,
+    ) -> None:
+        if latency_s is not None and not error:
+            self._record_engine_latency(engine_type, latency_s)
+        self._engine_health.record(
+            engine_type, latency_s=latency_s, num_results=num_results, error=error
+        )
+
+    def _order_engines(self, engines: List[SearchEngine]) -> List[SearchEngine]:
+        """Reorder auto-mode candidates by observed latency/usefulness/quota."""
+        settings = get_settings()
+        if not settings.adaptive_engine_order or len(engines) < 2:
+            return engines
+        types = [self._get_engine_type(e) for e in engines]
+        quota: Dict[str, float] = {}
+        if self.rate_limiter:
+            for t in types:
+                limiter = self.rate_limiter.limiters.get(t)
+                if limiter is None:
+                    continue
+                status = limiter.get_status()
+                max_tokens = float(status.get("max_tokens") or 0)
+                if max_tokens > 0:
+                    quota[t] = float(status.get("available_tokens", 0)) / max_tokens
+        order = self._engine_health.order(
+            types,
+            weights=settings.engine_weights,
+            quota=quota,
+            min_samples=settings.engine_health_min_samples,
+            prior_latency_s=settings.engine_prior_latency_s,
+        )
+        if order != list(range(len(engines))):
+            logger.debug(
+                "Adaptive engine order: %s", [types[i] for i in order]
+            )
+        return [engines[i] for i in order]
+
+    def _hedge_delay(self, engine_type: str) -> float:
+        """Seconds to wait on *engine_type* before firing a hedged request."""
+        settings = get_settings()
+        window = self._engine_latency.get(engine_type)
+        delay = None
+        if window is not None and len(window) >= settings.auto_hedge_min_samples:
+            delay = window.percentile(settings.auto_hedge_percentile)
+        if delay is None:
+            delay = settings.auto_hedge_delay_s
+        budget = self._engine_timeout_budget(engine_type)
+        if budget is not None:
+            delay = min(delay, budget)
+        return max(0.0, delay)
+
     @asynccontextmanager
     async def _bulkhead(
         self,
@@ -1276,12 +1742,23 @@ class SearchManager:
         *,
         use_global: bool = True,
         use_engine: bool = True,
+        deadline: Optional[Deadline] = None,
     ):
+        """Hold the global admission slot and/or the per-engine semaphore.
+
+        The global slot is granted fairly across callers and priority classes
+        (``request_context`` client id / priority) and raises
+        :class:`AdmissionRejected` when the queue is full or the wait would
+        outlive *deadline*.
+        """
         acquired: List[asyncio.Semaphore] = []
+        admitted_at: Optional[float] = None
         try:
-            if use_global and self._global_semaphore is not None:
-                await self._global_semaphore.acquire()
-                acquired.append(self._global_semaphore)
+            if use_global and self._admission is not None:
+                await self._admission.acquire(
+                    get_client_id(), get_priority(), deadline
+                )
+                admitted_at = time.monotonic()
             if use_engine and engine_type:
                 sem = self._engine_semaphores.get(engine_type)
                 if sem is not None:
@@ -1294,6 +1771,8 @@ class SearchManager:
                     sem.release()
                 except Exception:
                     pass
+            if admitted_at is not None and self._admission is not None:
+                self._admission.release(time.monotonic() - admitted_at)
 
     def _initialize_engines(self):
         config_path = os.path.join(
@@ -1346,6 +1825,7 @@ class SearchManager:
                 api_key=brave_api_key,
                 proxy=brave_proxy,
                 client_pool=self.http_client_pool,
+                rate_limiter=self.rate_limiter,
             )
             self.engines.append(brave_engine)
             logger.info("Brave Search engine initialized")
@@ -1371,6 +1851,7 @@ class SearchManager:
                 cse_id=google_cse_id,
                 proxy=google_proxy,
                 client_pool=self.http_client_pool,
+                rate_limiter=self.rate_limiter,
             )
             self.engines.append(google_engine)
             self.fallback_engines.append(google_engine)
@@ -1400,6 +1881,7 @@ class SearchManager:
                 language=language,
                 proxy=searxng_proxy,
                 client_pool=self.http_client_pool,
+                rate_limiter=self.rate_limiter,
             )
             self.engines.append(searxng_engine)
             self.fallback_engines.append(searxng_engine)
@@ -1488,52 +1970,9 @@ class SearchManager:
     # policy. Engines will try direct calls first and only use configured
     # proxies (config.json/env) or rewrites on network failure.
                 
-    async def _search_impl(
-        self,
-        query: str,
-        num_results: int = 10,
-        engine: str = "auto",
-    ) -> tuple[List[Dict], Optional[str]]:
-        """
-        执行搜索（不处理 cache hit 与 in-flight coalescing）。
-
-        返回 (results, error_msg)。results 为 List[Dict]。
-
-        Args:
-            query: 搜索查询字符串
-            num_results: 返回结果数量
-            engine: 搜索引擎选择 (auto/brave/google/duckduckgo/searxng/all)
-                   - auto: 自动选择，优先使用配置的引擎，失败时自动回退
-                   - brave/google/duckduckgo/searxng: 使用指定引擎
-                   - all: 使用所有可用引擎，自动去重和排序
-
-        Returns:
-            (搜索结果列表, 错误信息)
-        """
-        error_msg = None
-
-        # Fusion terminology: normalize query (forbidden→preferred corrections)
-        if self.fusion_terms.enabled:
-            normalized = self.fusion_terms.normalize_query(query)
-            if normalized != query:
-                logger.debug("Fusion-terms query normalized: %r → %r", query, normalized)
-                query = normalized
-
-        all_results: List[Dict] = []
-
-        if not self.engines and not self.fallback_engines:
-            logger.warning("No search engines available")
-            error_msg = "No search engines available"
-
-            return [], error_msg
-
-        logger.info(
-            f"Starting search with query: {query}, "
-            f"engine: {engine}, num_results: {num_results}"
-        )
-        
-        # 确定要使用的引擎列表
-        engines_to_try = []
+    def _resolve_engines(self, engine: str) -> List[SearchEngine]:
+        """Candidate engines for *engine* (auto/all/specific), in try order."""
+        engines_to_try = []
 
         if engine.lower() == "all":
             # 使用所有可用的引擎
@@ -1554,6 +1993,16 @@ class SearchManager:
                 ]
             else:
                 engines_to_try = self.fallback_engines
+            # 后台刷新可限定只用部分引擎（如免费引擎），无可用引擎时不限定
+            allowlist = get_engine_allowlist()
+            if allowlist:
+                allowed = [
+                    e for e in engines_to_try
+                    if self._get_engine_type(e) in allowlist
+                ]
+                engines_to_try = allowed or engines_to_try
+            # 根据各引擎近期延迟/空结果率/错误率/剩余配额动态调整尝试顺序
+            engines_to_try = self._order_engines(list(engines_to_try))
         else:
             # 指定引擎模式
             for search_engine in self.engines + self.fallback_engines:
@@ -1581,70 +2030,193 @@ class SearchManager:
             )
             engines_to_try = self.fallback_engines
 
+        return engines_to_try
+
+    async def _finalize_results(
+        self,
+        query: str,
+        engine: str,
+        num_results: int,
+        all_results: List[Dict],
+        *,
+        min_results: Optional[int] = None,
+        scoring: Optional[ScoringPipeline] = None,
+    ) -> List[Dict]:
+        """Post-merge stages shared by search paths: rerank, boost, cache.
+
+        *min_results* is the count the search was satisfied with (stop
+        thresholds); the cache entry then covers ``max(min_results,
+        min(num_results, len(all_results)))`` results.  *scoring* is the
+        request's pipeline (its per-result records are reused; one is
+        created for *query* when not given).
+        """
+        if scoring is None:
+            scoring = ScoringPipeline(query)
+
+        # Apply reranking if configured (after merge, before cache).
+        # Stage time is event-loop thread CPU: work a reranker offloads to a
+        # worker thread (cross-encoder inference) is not counted.
+        if self.reranker and all_results and len(all_results) > 1:
+            try:
+                with scoring.stage("rerank"):
+                    all_results = await self.reranker.rerank_with(
+                        scoring, all_results, num_results
+                    )
+            except Exception as e:
+                logger.warning("Reranker failed: %s; using unranked results", str(e))
+
+        # Fusion terminology: boost results containing known fusion terms.
+        if self.fusion_terms.enabled and all_results:
+            try:
+                with scoring.stage("fusion_terms"):
+                    all_results = _apply_fusion_relevance(
+                        all_results,
+                        query,
+                        self.fusion_terms,
+                        scoring=scoring,
+                        term_index=self._get_fusion_term_index(),
+                    )
+            except Exception as e:
+                logger.debug("Fusion relevance boost failed: %s", str(e))
+
+        # 缓存结果（空结果为负缓存，条目 TTL 由缓存的 TTL 策略决定）
+        if self.cache:
+            covers = num_results
+            if min_results is not None:
+                covers = max(min_results, min(num_results, len(all_results)))
+            await self.cache.aset(query, engine, covers, all_results)
+
+        return all_results
+
+    def _get_fusion_term_index(self) -> TermIndex:
+        """Known fusion terms indexed by first token (built once per manager)."""
+        index = self._fusion_term_index
+        if index is None:
+            index = self._fusion_term_index = TermIndex(
+                self.fusion_terms.get_known_terms()
+            )
+        return index
+
+    @staticmethod
+    def _new_fusion_state(
+        fusion_method: str,
+        rrf_k: int,
+        engine_weights: Optional[Mapping[str, float]],
+        scoring: Optional[ScoringPipeline] = None,
+    ) -> Optional[RRFAccumulator]:
+        """Incremental RRF state for *fusion_method*, or None for priority merge."""
+        if (fusion_method or "").strip().lower() not in RRF_METHODS:
+            return None
+        return RRFAccumulator(
+            rrf_k=rrf_k,
+            engine_weights=engine_weights,
+            canonicalize_links=True,
+            scoring=scoring,
+        )
+
+    @staticmethod
+    def _merge_engine_results(
+        all_engine_results: Dict[str, List[Dict]],
+        num_results: int,
+        *,
+        fusion_method: str,
+        rrf_k: int,
+        engine_weights: Optional[Mapping[str, float]],
+        fusion_state: Optional[RRFAccumulator] = None,
+        scoring: Optional[ScoringPipeline] = None,
+    ) -> List[Dict]:
+        """Final multi-engine merge; reuses *fusion_state* when it is in sync."""
+        if fusion_state is not None and fusion_state.engines == list(all_engine_results):
+            return fusion_state.ranking(num_results)
+        return merge_and_deduplicate(
+            all_engine_results,
+            num_results=num_results,
+            fusion_method=fusion_method,
+            rrf_k=rrf_k,
+            engine_weights=engine_weights,
+            canonicalize_links=True,
+            scoring=scoring,
+        )
+
+    async def _search_impl(
+        self,
+        query: str,
+        num_results: int = 10,
+        engine: str = "auto",
+        *,
+        deadline: Optional[Deadline] = None,
+        keep: Optional[int] = None,
+    ) -> tuple[List[Dict], Optional[str]]:
+        """
+        执行搜索（不处理 cache hit 与 in-flight coalescing）。
+
+        返回 (results, error_msg)。results 为 List[Dict]。
+
+        Args:
+            query: 搜索查询字符串
+            num_results: 返回结果数量
+            engine: 搜索引擎选择 (auto/brave/google/duckduckgo/searxng/all)
+                   - auto: 自动选择，优先使用配置的引擎，失败时自动回退
+                   - brave/google/duckduckgo/searxng: 使用指定引擎
+                   - all: 使用所有可用引擎，自动去重和排序
+            deadline: 整个搜索的截止时间。各层据此跳过来不及完成的重试/回退，
+                   到期时返回已收集结果的合并（而不是空结果）
+            keep: 合并后保留并缓存的结果数（>= num_results），使结果可服务
+                   更大的 k；“够数就停”/提前返回仍按 num_results 判断
+
+        Returns:
+            (搜索结果列表, 错误信息)
+        """
+        error_msg = None
+        keep = max(num_results, keep or 0)
+
+        # Fusion terminology: normalize query (forbidden→preferred corrections)
+        if self.fusion_terms.enabled:
+            normalized = self.fusion_terms.normalize_query(query)
+            if normalized != query:
+                logger.debug("Fusion-terms query normalized: %r → %r", query, normalized)
+                query = normalized
+
+        # One scoring pipeline per request: merge, rerank and term boosts
+        # share its per-result records.
+        scoring = ScoringPipeline(query)
+
+        all_results: List[Dict] = []
+
+        if not self.engines and not self.fallback_engines:
+            logger.warning("No search engines available")
+            error_msg = "No search engines available"
+
+            return [], error_msg
+
+        logger.info(
+            f"Starting search with query: {query}, "
+            f"engine: {engine}, num_results: {num_results}"
+        )
+        
+        # 确定要使用的引擎列表
+        engines_to_try = self._resolve_engines(engine)
+
         # 用于收集所有引擎的结果（all 模式）
         all_engine_results = {}
+        # Incremental RRF state built while engines complete (concurrent paths).
+        fusion_state: Optional[RRFAccumulator] = None
 
         # auto 模式质量增强（可选）：即使第一个引擎“够数”，也会再尝试
         # 若干个引擎并做 merge+去重+优先级排序，以避免单一引擎在某些网络/区域
         # 环境下返回“看似正常但质量很差”的结果。
+        settings = get_settings()
         auto_merge_enabled = False
-        auto_merge_min_engines = 2
-        auto_merge_max_engines = 3
+        auto_merge_min_engines = settings.auto_merge_min_engines
+        auto_merge_max_engines = settings.auto_merge_max_engines
         if engine.lower() == "auto":
-            v = os.environ.get("CRAWL4AI_AUTO_MERGE", "1").strip().lower()
-            auto_merge_enabled = v in {"1", "true", "yes", "y", "on"}
-            try:
-                auto_merge_min_engines = int(
-                    os.environ.get("CRAWL4AI_AUTO_MERGE_MIN_ENGINES", "2")
-                )
-            except Exception:
-                auto_merge_min_engines = 2
-            try:
-                auto_merge_max_engines = int(
-                    os.environ.get("CRAWL4AI_AUTO_MERGE_MAX_ENGINES", "3")
-                )
-            except Exception:
-                auto_merge_max_engines = 3
-            auto_merge_min_engines = max(1, auto_merge_min_engines)
-            auto_merge_max_engines = max(auto_merge_min_engines, auto_merge_max_engines)
+            auto_merge_enabled = settings.auto_merge
 
         # Merge/fusion strategy for multi-engine modes.
         # Default to RRF when merging results from multiple engines.
-        fusion_method = (os.environ.get("CRAWL4AI_FUSION_METHOD") or "").strip().lower()
-        if not fusion_method:
-            fusion_method = "rrf"
-        try:
-            rrf_k = int(os.environ.get("CRAWL4AI_RRF_K", "60"))
-        except Exception:
-            rrf_k = 60
-        engine_weights: Optional[Dict[str, float]] = None
-        raw_weights = (os.environ.get("CRAWL4AI_RRF_ENGINE_WEIGHTS") or "").strip()
-        if raw_weights:
-            try:
-                if raw_weights.lstrip().startswith("{"):
-                    parsed = json.loads(raw_weights)
-                    if isinstance(parsed, dict):
-                        engine_weights = {
-                            str(k).lower(): float(v)
-                            for k, v in parsed.items()
-                        }
-                else:
-                    engine_weights = {}
-                    for part in raw_weights.split(","):
-                        part = part.strip()
-                        if not part or "=" not in part:
-                            continue
-                        k, v = part.split("=", 1)
-                        engine_weights[str(k).strip().lower()] = float(v)
-            except Exception:
-                engine_weights = None
-        if engine_weights is None:
-            engine_weights = {
-                "google": 1.0,
-                "brave": 0.9,
-                "searxng": 0.7,
-                "duckduckgo": 0.4,
-            }
+        fusion_method = settings.fusion_method
+        rrf_k = settings.rrf_k
+        engine_weights = settings.engine_weights
         
         # all 模式：使用并发搜索
         if engine.lower() == "all":
@@ -1652,37 +2224,26 @@ class SearchManager:
                 f"Starting concurrent search with {len(engines_to_try)} "
                 f"engines"
             )
-            early_return = (
-                os.environ.get("CRAWL4AI_ALL_EARLY_RETURN", "0")
-                .strip().lower() in {"1", "true", "yes", "y", "on"}
-            )
-            try:
-                min_engines = int(
-                    os.environ.get("CRAWL4AI_ALL_EARLY_RETURN_MIN_ENGINES", "1")
+            if settings.all_early_return:
+                fusion_state = self._new_fusion_state(
+                    fusion_method, rrf_k, engine_weights, scoring
                 )
-            except Exception:
-                min_engines = 1
-            try:
-                grace_s = float(
-                    os.environ.get("CRAWL4AI_ALL_EARLY_RETURN_GRACE_S", "0")
-                )
-            except Exception:
-                grace_s = 0.0
-
-            if early_return:
                 all_engine_results = await self._concurrent_search_early_return(
                     engines_to_try,
                     query,
                     num_results,
-                    min_engines=max(1, min_engines),
-                    grace_s=max(0.0, grace_s),
+                    min_engines=settings.all_early_return_min_engines,
+                    grace_s=settings.all_early_return_grace_s,
                     fusion_method=fusion_method,
                     rrf_k=rrf_k,
                     engine_weights=engine_weights,
+                    accumulator=fusion_state,
+                    deadline=deadline,
+                    scoring=scoring,
                 )
             else:
                 all_engine_results = await self._concurrent_search(
-                    engines_to_try, query, num_results
+                    engines_to_try, query, num_results, deadline=deadline
                 )
         else:
             # auto 或指定引擎模式：串行搜索（支持早停）
@@ -1692,14 +2253,15 @@ class SearchManager:
             auto_merge_concurrent = False
             auto_merge_early_return = True
             if engine.lower() == "auto" and auto_merge_enabled:
-                v = os.environ.get("CRAWL4AI_AUTO_MERGE_CONCURRENT", "1").strip().lower()
-                auto_merge_concurrent = v in {"1", "true", "yes", "y", "on"}
-                v2 = os.environ.get("CRAWL4AI_AUTO_MERGE_EARLY_RETURN", "1").strip().lower()
-                auto_merge_early_return = v2 in {"1", "true", "yes", "y", "on"}
+                auto_merge_concurrent = settings.auto_merge_concurrent
+                auto_merge_early_return = settings.auto_merge_early_return
 
             if engine.lower() == "auto" and auto_merge_enabled and auto_merge_concurrent:
                 # Take up to max_engines candidates and run concurrently.
                 candidates = engines_to_try[:auto_merge_max_engines]
+                fusion_state = self._new_fusion_state(
+                    fusion_method, rrf_k, engine_weights, scoring
+                )
                 all_engine_results = await self._concurrent_search_early_return(
                     candidates,
                     query,
@@ -1709,19 +2271,62 @@ class SearchManager:
                     fusion_method=fusion_method,
                     rrf_k=rrf_k,
                     engine_weights=engine_weights,
+                    accumulator=fusion_state,
+                    deadline=deadline,
+                    scoring=scoring,
                 )
                 # Mark results as collected for later merge.
                 for _eng, _res in all_engine_results.items():
                     all_results.extend(_res)
+            elif engine.lower() == "auto" and settings.auto_hedge:
+                # Serial auto with hedging: fire the next engine early when the
+                # current one is slower than its observed tail latency.
+                all_results, hedged_engine_results, hedge_error = (
+                    await self._hedged_auto_search(
+                        engines_to_try,
+                        query,
+                        num_results,
+                        min_engines=auto_merge_min_engines if auto_merge_enabled else 1,
+                        max_engines=(
+                            auto_merge_max_engines if auto_merge_enabled else None
+                        ),
+                        deadline=deadline,
+                        keep=keep,
+                    )
+                )
+                if auto_merge_enabled:
+                    all_engine_results = hedged_engine_results
+                if hedge_error:
+                    error_msg = hedge_error
             else:
                 for search_engine in engines_to_try:
                     engine_name = search_engine.__class__.__name__
                     engine_type = self._get_engine_type(search_engine)
+                    # The first engine only needs time left; falling back to
+                    # another one must fit a minimal attempt.
+                    out_of_time = (
+                        not fits_deadline(deadline)
+                        if engines_tried
+                        else deadline is not None and deadline.expired
+                    )
+                    if out_of_time:
+                        logger.warning(
+                            "Search deadline reached after %s engine(s); "
+                            "returning what has been collected",
+                            engines_tried,
+                        )
+                        if not all_results:
+                            error_msg = "Search deadline exceeded"
+                        break
                     engines_tried += 1
 
+                    # Raw per-engine cache: an upstream answer fetched by any
+                    # mode is reused without spending breaker/rate-limit budget.
+                    cached = self._engine_cache_get(engine_type, query, keep)
+
                     # Circuit breaker: fail fast when an engine is OPEN.
                     breaker = self._circuit_breakers.get(engine_type)
-                    if breaker is not None:
+                    if breaker is not None and cached is None:
                         allowed, retry_after = await breaker.allow()
                         if not allowed:
                             logger.warning(
@@ -1732,43 +2337,63 @@ class SearchManager:
                             error_msg = f"{engine_type}: circuit_open"
                             continue
 
+                    t0: Optional[float] = None
                     try:
-                        # 检查限流
-                        if self.rate_limiter:
-                            await self.rate_limiter.acquire(engine_type)
-
-                        timeout_budget = self._engine_timeout_budget(engine_type)
-                        async with self._bulkhead(
-                            engine_type, use_global=False, use_engine=True
-                        ):
-                            # 执行搜索（自动重试）
-                            if timeout_budget is not None:
-                                results = await asyncio.wait_for(
-                                    self._search_with_retry(
-                                        search_engine, query, num_results
-                                    ),
-                                    timeout=timeout_budget,
+                        if cached is not None:
+                            results = cached
+                        else:
+                            # 检查限流
+                            if self.rate_limiter:
+                                await asyncio.wait_for(
+                                    self.rate_limiter.acquire(engine_type),
+                                    timeout=cap_to_deadline(deadline, None),
                                 )
-                            else:
-                                results = await self._search_with_retry(
-                                    search_engine, query, num_results
+
+                            timeout_budget = cap_to_deadline(
+                                deadline, self._engine_timeout_budget(engine_type)
+                            )
+                            async with self._bulkhead(
+                                engine_type, use_global=False, use_engine=True
+                            ):
+                                # 执行搜索（自动重试）
+                                t0 = time.monotonic()
+                                if timeout_budget is not None:
+                                    results = await asyncio.wait_for(
+                                        self._search_with_retry(
+                                            search_engine,
+                                            query,
+                                            keep,
+                                            deadline=deadline,
+                                            engine_type=engine_type,
+                                        ),
+                                        timeout=timeout_budget,
+                                    )
+                                else:
+                                    results = await self._search_with_retry(
+                                        search_engine,
+                                        query,
+                                        keep,
+                                        deadline=deadline,
+                                        engine_type=engine_type,
+                                    )
+                                self._record_engine_outcome(
+                                    engine_type,
+                                    latency_s=time.monotonic() - t0,
+                                    num_results=len(results),
                                 )
 
-                        if breaker is not None:
-                            await breaker.record_success()
-                        
+                            if breaker is not None:
+                                await breaker.record_success()
+                            self._engine_cache_set(engine_type, query, keep, results)
+
                         logger.info(
                             f"Got {len(results)} results from {engine_name}"
                         )
 
                         if results:
-                            converted_results = [r.to_dict() for r in results]
-                            
-                            # 为结果添加引擎标识
-                            for result in converted_results:
-                                if 'engine' not in result:
-                                    result['engine'] = engine_type
-                            
+                            converted_results = self._engine_result_dicts(
+                                results, engine_type
+                            )
                             all_results.extend(converted_results)
 
                             # auto merge 需要保留按引擎分组的结果以便后续 merge/sort
@@ -1815,6 +2440,11 @@ class SearchManager:
                                 break
 
                     except Exception as e:
+                        self._record_engine_outcome(
+                            engine_type,
+                            latency_s=None if t0 is None else time.monotonic() - t0,
+                            error=True,
+                        )
                         if breaker is not None:
                             try:
                                 await breaker.record_failure()
@@ -1825,6 +2455,8 @@ class SearchManager:
                             exc_info=True
                         )
                         error_msg = str(e)
+                        if deadline is not None and deadline.expired:
+                            error_msg = "Search deadline exceeded"
                         # 继续尝试下一个引擎
                         if engine.lower() == "auto":
                             logger.info(
@@ -1838,13 +2470,14 @@ class SearchManager:
                 logger.info(
                     f"Merging results from {len(all_engine_results)} engines"
                 )
-                all_results = merge_and_deduplicate(
+                all_results = self._merge_engine_results(
                     all_engine_results,
-                    num_results=num_results,
+                    keep,
                     fusion_method=fusion_method,
                     rrf_k=rrf_k,
                     engine_weights=engine_weights,
-                    canonicalize_links=True,
+                    fusion_state=fusion_state,
+                    scoring=scoring,
                 )
             else:
                 logger.warning("No results from any engine in all mode")
@@ -1856,47 +2489,142 @@ class SearchManager:
                         "Auto merge enabled: merging results from %s engine(s)",
                         len(all_engine_results),
                     )
-                    all_results = merge_and_deduplicate(
+                    all_results = self._merge_engine_results(
                         all_engine_results,
-                        num_results=num_results,
+                        keep,
                         fusion_method=fusion_method,
                         rrf_k=rrf_k,
                         engine_weights=engine_weights,
-                        canonicalize_links=True,
+                        fusion_state=fusion_state,
+                        scoring=scoring,
                     )
                 else:
                     all_results = []
             else:
                 # 非 all 模式：简单截取
-                final_results = all_results[:num_results]
+                final_results = all_results[:keep]
                 all_results = final_results
         
-        # 缓存结果（包括空结果的负缓存，短TTL）
-        # Apply reranking if configured (after merge, before cache).
-        if self.reranker and all_results and len(all_results) > 1:
-            try:
-                all_results = await self.reranker.rerank(
-                    query, all_results, num_results
+        all_results = await self._finalize_results(
+            query, engine, keep, all_results, min_results=num_results, scoring=scoring
+        )
+
+        return all_results, error_msg
+
+    async def _hedged_auto_search(
+        self,
+        engines: List[SearchEngine],
+        query: str,
+        num_results: int,
+        *,
+        min_engines: int = 1,
+        max_engines: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
+        keep: Optional[int] = None,
+    ) -> tuple[List[Dict], Dict[str, List[Dict]], Optional[str]]:
+        """Serial auto-mode search with hedged requests.
+
+        Engines are tried in order.  While an engine is outstanding for longer
+        than its hedge delay (observed p90/p95 latency), the next engine is
+        started in parallel if the hedge budget allows it.  Results are
+        collected in completion order; once there are enough results from at
+        least ``min_engines`` engines the remaining calls are cancelled.
+
+        No new engine (hedge or serial step) is started once *deadline*
+        leaves less than a minimal attempt.
+
+        Each engine is asked for *keep* results (``>= num_results``, the
+        pool the caller caches), like the serial path; the stop threshold
+        stays ``num_results``.
+
+        Returns (flat_results, per_engine_results, last_error).
+        """
+        settings = get_settings()
+        queue = list(engines if max_engines is None else engines[:max_engines])
+        fetch_count = max(num_results, keep or 0)
+        self._hedge_budget.deposit(settings.auto_hedge_budget)
+
+        all_results: List[Dict] = []
+        per_engine: Dict[str, List[Dict]] = {}
+        error_msg: Optional[str] = None
+        finished = 0
+
+        # task -> (engine_type, started_at)
+        pending: Dict[asyncio.Task, tuple[str, float]] = {}
+        hedging_allowed = True
+
+        def _launch() -> None:
+            eng = queue.pop(0)
+            task = asyncio.create_task(
+                self._search_single_engine(
+                    eng, query, num_results, fetch_count=fetch_count, deadline=deadline
                 )
-            except Exception as e:
-                logger.warning("Reranker failed: %s; using unranked results", str(e))
+            )
+            pending[task] = (self._get_engine_type(eng), time.monotonic())
 
-        # Fusion terminology: boost results containing known fusion terms.
-        if self.fusion_terms.enabled and all_results:
-            try:
-                all_results = _apply_fusion_relevance(
-                    all_results, query, self.fusion_terms
+        try:
+            _launch()
+            while pending:
+                timeout: Optional[float] = None
+                if queue and hedging_allowed and fits_deadline(deadline):
+                    newest_type, newest_start = max(
+                        pending.values(), key=lambda v: v[1]
+                    )
+                    timeout = max(
+                        0.0,
+                        newest_start
+                        + self._hedge_delay(newest_type)
+                        - time.monotonic(),
+                    )
+
+                done, _ = await asyncio.wait(
+                    set(pending),
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
-            except Exception as e:
-                logger.debug("Fusion relevance boost failed: %s", str(e))
 
-        if self.cache:
-            if all_results:
-                self.cache.set(query, engine, num_results, all_results)
-            else:
-                self.cache.set(query, engine, num_results, [], ttl_override=60)
+                if not done:
+                    if self._hedge_budget.try_spend():
+                        logger.info(
+                            "Hedging: %s slower than its hedge delay; starting %s",
+                            newest_type,
+                            self._get_engine_type(queue[0]),
+                        )
+                        _launch()
+                    else:
+                        logger.debug("Hedge budget exhausted; not hedging")
+                        hedging_allowed = False
+                    continue
 
-        return all_results, error_msg
+                for task in done:
+                    pending.pop(task, None)
+                    finished += 1
+                    try:
+                        engine_type, engine_results, err = task.result()
+                    except Exception as e:
+                        logger.error("Hedged engine task failed: %s", str(e))
+                        error_msg = str(e)
+                        continue
+                    if err:
+                        error_msg = err
+                    if engine_results:
+                        per_engine[engine_type] = engine_results
+                        all_results.extend(engine_results)
+
+                if len(all_results) >= num_results and finished >= max(1, min_engines):
+                    break
+
+                # Nothing left in flight: fall through to the next engine
+                # (a plain serial step, not a hedge).
+                if not pending and queue and fits_deadline(deadline):
+                    _launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        return all_results, per_engine, error_msg
 
     async def _concurrent_search_early_return(
         self,
@@ -1908,28 +2636,53 @@ class SearchManager:
         grace_s: float = 0.0,
         fusion_method: str = "priority",
         rrf_k: int = 60,
-        engine_weights: Optional[Dict[str, float]] = None,
+        engine_weights: Optional[Mapping[str, float]] = None,
+        accumulator: Optional[RRFAccumulator] = None,
+        deadline: Optional[Deadline] = None,
+        scoring: Optional[ScoringPipeline] = None,
     ) -> Dict[str, List[Dict]]:
         """Concurrent search with incremental merge and early return.
 
         Once we have enough merged results (>= num_results) and at least
         min_engines engines returned non-empty results, we will wait an optional
         grace period and then cancel remaining engine tasks.
+
+        With RRF fusion, engine lists are folded into *accumulator* as they
+        arrive (one is created when not supplied), so the unique-result count
+        is O(1) and the caller can take the final ranking from the same state.
         """
+        if accumulator is None:
+            accumulator = self._new_fusion_state(
+                fusion_method, rrf_k, engine_weights, scoring
+            )
 
         tasks: List[asyncio.Task] = []
+        task_types: Dict[asyncio.Task, str] = {}
         for eng in engines:
-            tasks.append(
-                asyncio.create_task(self._search_single_engine(eng, query, num_results))
+            task = asyncio.create_task(
+                self._search_single_engine(eng, query, num_results, deadline=deadline)
             )
+            tasks.append(task)
+            task_types[task] = self._get_engine_type(eng)
 
         all_engine_results: Dict[str, List[Dict]] = {}
         succeeded = 0
         _start_time = time.monotonic()
 
+        def _collect(engine_type: str, engine_results: List[Dict]) -> bool:
+            if engine_type in all_engine_results:
+                logger.debug("Ignoring duplicate results from %s", engine_type)
+                return False
+            all_engine_results[engine_type] = engine_results
+            if accumulator is not None:
+                accumulator.add(engine_type, engine_results)
+            return True
+
         async def _merged_len() -> int:
             if not all_engine_results:
                 return 0
+            if accumulator is not None:
+                return len(accumulator)
             merged = merge_and_deduplicate(
                 all_engine_results,
                 num_results=num_results,
@@ -1937,43 +2690,58 @@ class SearchManager:
                 rrf_k=rrf_k,
                 engine_weights=engine_weights,
                 canonicalize_links=True,
+                scoring=scoring,
             )
             return len(merged)
 
-        pending: set[asyncio.Future[Any]] = set(tasks)
+        # Wait on the engine tasks themselves so that ``pending`` only ever
+        # holds engines whose results have not been collected yet.
+        pending: set[asyncio.Task] = set(tasks)
         try:
-            for fut in asyncio.as_completed(tasks):
-                try:
-                    result = await fut
-                except asyncio.CancelledError:
-                    continue
-                except Exception as e:
-                    logger.error("Concurrent engine task failed: %s", str(e))
-                    continue
-
-                engine_type, engine_results, error = result
-                if error:
-                    logger.warning(
-                        "Engine %s failed during concurrent search: %s",
-                        engine_type,
-                        error,
-                    )
-                if engine_results:
-                    all_engine_results[engine_type] = engine_results
-                    succeeded += 1
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for fut in (t for t in tasks if t in done):
+                    try:
+                        result = fut.result()
+                    except asyncio.CancelledError:
+                        continue
+                    except Exception as e:
+                        logger.error("Concurrent engine task failed: %s", str(e))
+                        continue
 
-                pending.discard(fut)
+                    engine_type, engine_results, error = result
+                    if error:
+                        logger.warning(
+                            "Engine %s failed during concurrent search: %s",
+                            engine_type,
+                            error,
+                        )
+                    if engine_results and _collect(engine_type, engine_results):
+                        succeeded += 1
 
                 if succeeded >= max(1, min_engines):
                     try:
                         if await _merged_len() >= num_results:
-                            # Deadline-aware grace: if we have time budget
-                            # remaining, wait a bit for higher-quality results
-                            # from slower engines before cancelling.
+                            # Deadline-aware grace: wait for slower engines
+                            # only as long as their observed latency says they
+                            # will still answer (and are usually useful).
                             elapsed = time.monotonic() - _start_time
-                            deadline = self.search_deadline_s or 10.0
-                            remaining = max(0.0, deadline - elapsed)
-                            adaptive_grace = min(remaining * 0.3, 1.0)
+                            remaining = (
+                                deadline.remaining()
+                                if deadline is not None and deadline.bounded
+                                else max(0.0, (self.search_deadline_s or 10.0) - elapsed)
+                            )
+                            adaptive_grace = self._engine_health.grace_window(
+                                (task_types[t] for t in pending if not t.done()),
+                                elapsed_s=elapsed,
+                                remaining_s=remaining,
+                                min_samples=get_settings().engine_health_min_samples,
+                            )
+                            if adaptive_grace is None:
+                                # No statistics yet for the pending engines.
+                                adaptive_grace = min(remaining * 0.3, 1.0)
                             effective_grace = max(grace_s, adaptive_grace)
                             if effective_grace > 0 and pending:
                                 done, still = await asyncio.wait(
@@ -1981,14 +2749,14 @@ class SearchManager:
                                     timeout=effective_grace,
                                     return_when=asyncio.ALL_COMPLETED,
                                 )
-                                for d in done:
+                                for d in (t for t in tasks if t in done):
                                     try:
                                         r = d.result()
                                     except Exception:
                                         continue
                                     et, er, _err = r
                                     if er:
-                                        all_engine_results[et] = er
+                                        _collect(et, er)
                                 pending = still
 
                             # Cancel remaining.
@@ -2020,25 +2788,48 @@ class SearchManager:
 
     async def _coalesced_task(
         self,
-        inflight_key: tuple[str, str, int],
+        inflight_key: tuple[str, str],
         query: str,
         num_results: int,
         engine: str,
+        keep: Optional[int] = None,
     ) -> tuple[List[Dict], Optional[str]]:
-        """Run a single search computation and clean up inflight registry."""
+        """Run a single search computation and clean up inflight registry.
+
+        The task is registered under *num_results*: it keeps up to *keep*
+        results, but may stop early once it has *num_results*.
+
+        Raises :class:`AdmissionRejected` when the search is not admitted.
+        """
         try:
-            async with self._bulkhead(None, use_global=True, use_engine=False):
+            # The deadline starts before admission: queueing time counts.
+            deadline = self._new_deadline()
+            async with self._bulkhead(
+                None, use_global=True, use_engine=False, deadline=deadline
+            ):
                 if self.search_deadline_s is not None:
+                    # Every layer below honours the deadline and returns a
+                    # partial merge; the hard cap only catches work that
+                    # cannot be interrupted cooperatively.
+                    hard_cap = (deadline.remaining() or 0.0) + max(
+                        0.5, 0.25 * self.search_deadline_s
+                    )
                     try:
-                        async with asyncio.timeout(self.search_deadline_s):
+                        async with asyncio.timeout(hard_cap):
                             return await self._search_impl(
-                                query, num_results=num_results, engine=engine
+                                query,
+                                num_results=num_results,
+                                engine=engine,
+                                deadline=deadline,
+                                keep=keep,
                             )
                     except TimeoutError:
                         return [], "Search deadline exceeded"
                 return await self._search_impl(
-                    query, num_results=num_results, engine=engine
+                    query, num_results=num_results, engine=engine, keep=keep
                 )
+        except AdmissionRejected:
+            raise
         except Exception as e:
             logger.error("Search task failed: %s", str(e), exc_info=True)
             return [], str(e)
@@ -2046,11 +2837,410 @@ class SearchManager:
             try:
                 me = asyncio.current_task()
                 async with self._inflight_lock:
-                    if self._inflight_searches.get(inflight_key) is me:
-                        del self._inflight_searches[inflight_key]
+                    running = self._inflight_searches.get(inflight_key)
+                    if running is not None and running.get(num_results) is me:
+                        del running[num_results]
+                        if not running:
+                            del self._inflight_searches[inflight_key]
             except Exception:
                 pass
 
+    @staticmethod
+    def _coalesce_size(num_results: int) -> int:
+        """Result count to keep (and cache) for a request of *num_results*.
+
+        Small requests are promoted to ``CRAWL4AI_COALESCE_MIN_RESULTS`` so a
+        later k=10 request can be served from the k=5 entry.  Engines already
+        fetch ``max(2k, 20)`` candidates, so this costs no upstream calls;
+        stop thresholds still use the requested count.
+        """
+        return max(int(num_results), get_settings().coalesce_min_results)
+
+    @staticmethod
+    def _covering_task(
+        running: Mapping[int, asyncio.Task], num_results: int
+    ) -> Optional[asyncio.Task]:
+        """Smallest in-flight computation that covers *num_results*."""
+        sizes = [k for k in running if k >= num_results]
+        return running[min(sizes)] if sizes else None
+
+    async def _cache_lookup(
+        self,
+        query: str,
+        engine: str,
+        num_results: int,
+        start_time: float,
+    ) -> Optional[List[Dict]]:
+        """Return cached results (recording a cached search metric) or None.
+
+        An entry past its TTL but within ``CRAWL4AI_CACHE_STALE_WHILE_REVALIDATE_S``
+        is returned as-is while a single background refresh recomputes it.
+        """
+        if not self.cache:
+            return None
+        hit = await self.cache.alookup(query, engine, num_results)
+        if hit is None:
+            return None
+        cached_results, overdue = hit
+        if overdue > 0:
+            if overdue > get_settings().cache_stale_while_revalidate_s:
+                return None
+            self._schedule_refresh(query, engine, num_results)
+            logger.info("Returning stale cached results; refreshing in background")
+        else:
+            logger.info("Returning cached results")
+        if self.monitor:
+            metrics = SearchMetrics(
+                query=query,
+                engine=engine,
+                start_time=start_time,
+                end_time=time.time(),
+                request_id=get_request_id(),
+                success=True,
+                cached=True,
+                num_results=len(cached_results),
+                coalesced=False,
+            )
+            self.monitor.record_search(metrics)
+        return cached_results
+
+    def _schedule_refresh(
+        self,
+        query: str,
+        engine: str,
+        num_results: int,
+        engines: Optional[Sequence[str]] = None,
+    ) -> asyncio.Task:
+        """Start a background recompute of a stale cache entry.
+
+        Deduplicated through the in-flight map: while a computation covering
+        *num_results* is already running, that task is returned instead.
+        *engines* restricts an ``auto`` recompute to those engine types.
+        """
+        inflight_key = (query, engine)
+        running = self._inflight_searches.setdefault(inflight_key, {})
+        task = self._covering_task(running, num_results)
+        if task is None:
+            task = running[num_results] = asyncio.create_task(
+                self._background_refresh(
+                    inflight_key, query, num_results, engine,
+                    self._coalesce_size(num_results), engines,
+                )
+            )
+        return task
+
+    async def _background_refresh(
+        self,
+        inflight_key: tuple[str, str],
+        query: str,
+        num_results: int,
+        engine: str,
+        keep: int,
+        engines: Optional[Sequence[str]] = None,
+    ) -> tuple[List[Dict], Optional[str]]:
+        """Coalesced search at background priority; never raises."""
+        set_priority(PRIORITY_BACKGROUND)
+        if engines:
+            set_engine_allowlist(engines)
+        try:
+            return await self._coalesced_task(
+                inflight_key, query, num_results, engine, keep
+            )
+        except AdmissionRejected as e:
+            logger.info("Background cache refresh not admitted: %s", str(e))
+            return [], str(e)
+
+    # -- cache warmup ---------------------------------------------------------
+
+    def start_cache_warmup(
+        self,
+        queries: Optional[Sequence[Union[str, Mapping[str, Any]]]] = None,
+        top_n: Optional[int] = None,
+        num_results: int = 10,
+        engine: str = "auto",
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Start :meth:`warm_cache` in the background unless one is running.
+
+        Returns the warmup status (see :meth:`cache_warmup_status`).
+        """
+        if self._warmup_task is None or self._warmup_task.done():
+            status = self._new_warmup_status(queries)
+            self._warmup_task = asyncio.create_task(
+                self._run_warmup(
+                    status, queries, top_n, num_results, engine, concurrency
+                )
+            )
+        return self.cache_warmup_status()
+
+    def cache_warmup_status(self) -> Dict[str, Any]:
+        """Progress of the current (or last) cache warmup."""
+        status = dict(self._warmup_status)
+        if status.get("started_at"):
+            status["elapsed_s"] = round(
+                (status.get("finished_at") or time.time()) - status["started_at"], 3
+            )
+        return status
+
+    async def warm_cache(
+        self,
+        queries: Optional[Sequence[Union[str, Mapping[str, Any]]]] = None,
+        top_n: Optional[int] = None,
+        num_results: int = 10,
+        engine: str = "auto",
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Recompute missing or stale cache entries at background priority.
+
+        *queries* are strings (searched with *num_results* / *engine*) or
+        dicts with ``query`` and optional ``engine`` / ``num_results``.
+        Without them, the ``top_n`` (default ``CRAWL4AI_CACHE_WARMUP_TOP_N``)
+        most-hit cached queries are used.  Fresh entries are skipped without
+        counting as cache hits; the rest go through the same coalesced
+        background path as stale-while-revalidate refreshes, so admission,
+        bulkheads and rate limiters apply and concurrent user requests share
+        the work.  At most ``concurrency`` (default
+        ``CRAWL4AI_CACHE_WARMUP_CONCURRENCY``) queries run at once.
+
+        Returns the final status; progress is visible meanwhile through
+        :meth:`cache_warmup_status`.
+        """
+        return await self._run_warmup(
+            self._new_warmup_status(queries),
+            queries, top_n, num_results, engine, concurrency,
+        )
+
+    def _new_warmup_status(self, queries: Optional[Sequence[Any]]) -> Dict[str, Any]:
+        status: Dict[str, Any] = {
+            "state": "running",
+            "source": "queries" if queries is not None else "top_hits",
+            "total": 0,
+            "done": 0,
+            "cached": 0,
+            "warmed": 0,
+            "failed": 0,
+            "started_at": time.time(),
+            "finished_at": None,
+        }
+        self._warmup_status = status
+        return status
+
+    async def _run_warmup(
+        self,
+        status: Dict[str, Any],
+        queries: Optional[Sequence[Union[str, Mapping[str, Any]]]],
+        top_n: Optional[int],
+        num_results: int,
+        engine: str,
+        concurrency: Optional[int],
+    ) -> Dict[str, Any]:
+        settings = get_settings()
+        try:
+            if not self.cache:
+                items: List[tuple[str, str, int]] = []
+            elif queries is not None:
+                items = [
+                    (q, engine, int(num_results)) if isinstance(q, str) else (
+                        q["query"],
+                        q.get("engine") or engine,
+                        int(q.get("num_results") or num_results),
+                    )
+                    for q in queries
+                ]
+            else:
+                limit = settings.cache_warmup_top_n if top_n is None else top_n
+                items = [
+                    (row["query"], row["engine"], int(row["num_results"]))
+                    for row in await self.cache.atop_queries(limit)
+                ]
+            status["total"] = len(items)
+            logger.info("Cache warmup started: %d queries", len(items))
+
+            sem = asyncio.Semaphore(
+                max(1, concurrency or settings.cache_warmup_concurrency)
+            )
+
+            async def warm(query: str, mode: str, n: int) -> None:
+                async with sem:
+                    try:
+                        overdue = await self.cache.apeek(query, mode, n)
+                        if overdue is not None and overdue <= 0:
+                            status["cached"] += 1
+                            return
+                        task = self._schedule_refresh(query, mode, n)
+                        results, _ = await asyncio.shield(task)
+                        status["warmed" if results else "failed"] += 1
+                    except Exception as e:
+                        status["failed"] += 1
+                        logger.warning("Cache warmup failed for %r: %s", query, str(e))
+                    finally:
+                        status["done"] += 1
+
+            await asyncio.gather(*(warm(*item) for item in items))
+            status["state"] = "done"
+        except asyncio.CancelledError:
+            status["state"] = "cancelled"
+            raise
+        except Exception as e:
+            status["state"] = "failed"
+            status["error"] = str(e)
+            logger.warning("Cache warmup failed: %s", str(e))
+        finally:
+            status["finished_at"] = time.time()
+        logger.info(
+            "Cache warmup finished: %d warmed, %d cached, %d failed",
+            status["warmed"], status["cached"], status["failed"],
+        )
+        return self.cache_warmup_status()
+
+    # -- refresh-ahead --------------------------------------------------------
+
+    def start_refresh_ahead(self) -> None:
+        """Run :meth:`refresh_ahead_once` every ``CRAWL4AI_REFRESH_AHEAD_INTERVAL_S``."""
+        if self.cache and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._refresh_ahead_loop())
+
+    async def _refresh_ahead_loop(self) -> None:
+        while True:
+            await asyncio.sleep(get_settings().refresh_ahead_interval_s)
+            try:
+                await self.refresh_ahead_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Refresh-ahead cycle failed: %s", str(e))
+
+    def _refresh_plan(self, mode: str) -> tuple[Optional[List[str]], List[str]]:
+        """Engine allow-list for a refresh of *mode*, and the engines it charges.
+
+        ``auto`` refreshes use only free engines when the policy is ``free``
+        and one is configured; otherwise the engines the search would call
+        (the first ``auto_merge_max_engines`` candidates when merging).
+        """
+        settings = get_settings()
+        mode = mode.lower()
+        if mode == "auto":
+            types = [self._get_engine_type(e) for e in self._resolve_engines("auto")]
+            if settings.refresh_ahead_engines == "free":
+                free = [t for t in types if t in FREE_ENGINES]
+                if free:
+                    return free, free[: settings.auto_merge_max_engines]
+            width = settings.auto_merge_max_engines if settings.auto_merge else 1
+            return None, types[:width]
+        if mode == "all":
+            return None, [self._get_engine_type(e) for e in self._resolve_engines("all")]
+        return None, [mode]
+
+    def _refresh_affordable(self, engine_types: Sequence[str]) -> bool:
+        """Spend refresh budget for *engine_types* if the user quota has room.
+
+        The refresh must not wait on a rate limiter, so every engine also
+        needs a token available in its main limiter.
+        """
+        settings = get_settings()
+        if self._refresh_budget is None:
+            configs = {}
+            if self.rate_limiter:
+                configs = {
+                    t: limiter.config
+                    for t, limiter in self.rate_limiter.limiters.items()
+                }
+            self._refresh_budget = RefreshBudget(
+                configs, settings.refresh_ahead_quota_share
+            )
+        if self.rate_limiter:
+            for t in engine_types:
+                limiter = self.rate_limiter.limiters.get(t)
+                if limiter is not None and limiter.get_status()["available_tokens"] < 1:
+                    return False
+        return self._refresh_budget.try_spend(engine_types)
+
+    async def refresh_ahead_once(self) -> Dict[str, int]:
+        """Refresh hot cache entries that are about to expire.
+
+        Entries whose TTL ends within ``CRAWL4AI_REFRESH_AHEAD_WINDOW_S`` (or
+        that are stale but still servable) are candidates if they were hit at
+        least ``CRAWL4AI_REFRESH_AHEAD_MIN_HITS`` times since they were
+        written.  The hottest ``CRAWL4AI_REFRESH_AHEAD_MAX_PER_CYCLE`` are
+        refreshed at background priority within the refresh budget (see
+        :mod:`refresh_ahead`).  Each query is attempted at most once per
+        window, so a failing refresh does not drain the budget.
+
+        Returns counts for this cycle.
+        """
+        settings = get_settings()
+        window = settings.refresh_ahead_window_s
+        cycle = {"candidates": 0, "refreshed": 0, "failed": 0, "skipped_budget": 0}
+        if not self.cache:
+            return cycle
+        now = time.time()
+        self._refresh_attempts = {
+            k: t for k, t in self._refresh_attempts.items() if now - t < window
+        }
+        candidates = await self.cache.arefresh_candidates(
+            window, settings.refresh_ahead_min_hits,
+            settings.refresh_ahead_max_per_cycle,
+        )
+        cycle["candidates"] = len(candidates)
+
+        tasks = []
+        for row in candidates:
+            key = (row["query"], row["engine"])
+            if key in self._refresh_attempts:
+                continue
+            allowlist, charged = self._refresh_plan(row["engine"])
+            if not self._refresh_affordable(charged):
+                cycle["skipped_budget"] += 1
+                continue
+            self._refresh_attempts[key] = now
+            tasks.append(asyncio.shield(self._schedule_refresh(
+                row["query"], row["engine"], int(row["num_results"]), allowlist
+            )))
+
+        for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+            ok = not isinstance(outcome, BaseException) and bool(outcome[0])
+            cycle["refreshed" if ok else "failed"] += 1
+
+        self._refresh_stats["cycles"] += 1
+        for k in ("refreshed", "failed", "skipped_budget"):
+            self._refresh_stats[k] += cycle[k]
+        if cycle["candidates"]:
+            logger.info(
+                "Refresh-ahead: %d candidates, %d refreshed, %d failed, "
+                "%d over budget",
+                cycle["candidates"], cycle["refreshed"], cycle["failed"],
+                cycle["skipped_budget"],
+            )
+        return cycle
+
+    def refresh_ahead_status(self) -> Dict[str, Any]:
+        """Cumulative refresh-ahead counters and remaining refresh budget."""
+        return {
+            "running": self._refresh_task is not None and not self._refresh_task.done(),
+            **self._refresh_stats,
+            "budget": self._refresh_budget.snapshot() if self._refresh_budget else {},
+        }
+
+    async def _stale_fallback(
+        self, query: str, engine: str, num_results: int
+    ) -> Optional[List[Dict]]:
+        """Stale-if-error: cached results within the hard TTL, marked stale."""
+        if not self.cache:
+            return None
+        hit = await self.cache.alookup(query, engine, num_results)
+        if hit is None:
+            return None
+        results, overdue = hit
+        if overdue <= 0:
+            return results  # refreshed meanwhile
+        if overdue > get_settings().cache_stale_if_error_s or not results:
+            return None
+        logger.warning(
+            "Upstream returned no results; serving stale cache (%ss past TTL)",
+            int(overdue),
+        )
+        return [dict(r, stale=True) for r in results]
+
     async def search(
         self,
         query: str,
@@ -2061,53 +3251,67 @@ class SearchManager:
         start_time = time.time()
 
         # Cache hit (fast path)
-        if self.cache:
-            cached_results = self.cache.get(query, engine, num_results)
-            if cached_results is not None:
-                logger.info("Returning cached results")
-                if self.monitor:
-                    metrics = SearchMetrics(
-                        query=query,
-                        engine=engine,
-                        start_time=start_time,
-                        end_time=time.time(),
-                        request_id=get_request_id(),
-                        success=True,
-                        cached=True,
-                        num_results=len(cached_results),
-                        coalesced=False,
-                    )
-                    self.monitor.record_search(metrics)
-                return cached_results
-
-        # Request coalescing (in-flight dedup)
-        inflight_key = (query, engine, int(num_results))
+        cached_results = await self._cache_lookup(
+            query, engine, num_results, start_time
+        )
+        if cached_results is not None:
+            return cached_results
+
+        # Request coalescing (in-flight dedup). Any running computation for at
+        # least num_results results is shared; its ranking is truncated below.
+        num_results = int(num_results)
+        inflight_key = (query, engine)
+        keep = self._coalesce_size(num_results)
         coalesced = False
         task: Optional[asyncio.Task] = None
 
         if self.enable_request_coalescing:
             async with self._inflight_lock:
-                task = self._inflight_searches.get(inflight_key)
+                running = self._inflight_searches.setdefault(inflight_key, {})
+                task = self._covering_task(running, num_results)
                 if task is None:
                     task = asyncio.create_task(
                         self._coalesced_task(
-                            inflight_key, query, int(num_results), engine
+                            inflight_key, query, num_results, engine, keep
                         )
                     )
-                    self._inflight_searches[inflight_key] = task
+                    running[num_results] = task
                 else:
                     coalesced = True
 
         if not self.enable_request_coalescing:
             # Fall back to direct execution
             task = asyncio.create_task(
-                self._coalesced_task(inflight_key, query, int(num_results), engine)
+                self._coalesced_task(inflight_key, query, num_results, engine, keep)
             )
 
         # Await shared computation. Shield to prevent one cancelled caller from
         # cancelling the shared in-flight task.
         assert task is not None
-        results, error_msg = await asyncio.shield(task)
+        try:
+            results, error_msg = await asyncio.shield(task)
+        except AdmissionRejected as e:
+            if self.monitor:
+                self.monitor.record_search(
+                    SearchMetrics(
+                        query=query,
+                        engine=engine,
+                        start_time=start_time,
+                        end_time=time.time(),
+                        request_id=get_request_id(),
+                        success=False,
+                        cached=False,
+                        num_results=0,
+                        error=str(e),
+                        coalesced=coalesced,
+                    )
+                )
+            raise
+        results = results[:num_results]
+        if not results:
+            # All engines failed / circuits open: fall back to a stale entry.
+            stale = await self._stale_fallback(query, engine, num_results)
+            results = stale or results
         success = len(results) > 0
 
         if self.monitor:
@@ -2128,6 +3332,302 @@ class SearchManager:
         # Return a shallow copy to reduce accidental cross-request mutation.
         return list(results)
     
+    async def search_stream(
+        self,
+        query: str,
+        num_results: int = 10,
+        engine: str = "auto",
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield provisional merged rankings as engines complete, then a final one.
+
+        Each event is a dict with a ``type`` key:
+
+        - ``"partial"``: emitted after every engine that returned results;
+          ``engine`` is the engine that just finished and ``results`` the RRF
+          merge of everything received so far
+        - ``"final"``: the ranking ``search()`` would return (merged, reranked,
+          cached); always the last event
+
+        ``auto`` and ``all`` fan out concurrently (``auto`` over the first
+        ``CRAWL4AI_AUTO_MERGE_MAX_ENGINES`` candidates); a specific engine or a
+        cache hit yields only the final event.  ``CRAWL4AI_SEARCH_DEADLINE_S``
+        bounds the fan-out; engines still running at the deadline are
+        cancelled and the final ranking uses what has arrived.  The fan-out
+        holds a global admission slot; when it is not admitted the only event
+        is a final one with ``error`` and ``retry_after_s``.
+        """
+        start_time = time.time()
+        mode = engine.lower()
+
+        cached = await self._cache_lookup(query, engine, num_results, start_time)
+        if cached is not None:
+            yield {"type": "final", "engines": [], "results": list(cached), "cached": True}
+            return
+
+        if mode not in ("auto", "all"):
+            try:
+                results = await self.search(query, num_results, engine)
+            except AdmissionRejected as e:
+                yield {
+                    "type": "final",
+                    "engines": [],
+                    "results": [],
+                    "cached": False,
+                    "error": str(e),
+                    "retry_after_s": round(e.retry_after_s, 3),
+                }
+                return
+            yield {"type": "final", "engines": [mode], "results": results, "cached": False}
+            return
+
+        search_query = query
+        if self.fusion_terms.enabled:
+            search_query = self.fusion_terms.normalize_query(query)
+
+        settings = get_settings()
+        engines = self._resolve_engines(engine)
+        if mode == "auto":
+            engines = engines[: settings.auto_merge_max_engines]
+        merge_kwargs: Dict[str, Any] = dict(
+            fusion_method=settings.fusion_method,
+            rrf_k=settings.rrf_k,
+            engine_weights=settings.engine_weights,
+            scoring=ScoringPipeline(search_query),
+        )
+        fusion_state = self._new_fusion_state(**merge_kwargs)
+
+        deadline = self._new_deadline()
+        admitted_at: Optional[float] = None
+        if self._admission is not None:
+            try:
+                await self._admission.acquire(get_client_id(), get_priority(), deadline)
+            except AdmissionRejected as e:
+                yield {
+                    "type": "final",
+                    "engines": [],
+                    "results": [],
+                    "cached": False,
+                    "error": str(e),
+                    "retry_after_s": round(e.retry_after_s, 3),
+                }
+                return
+            admitted_at = time.monotonic()
+        pending = {
+            asyncio.create_task(
+                self._search_single_engine(
+                    e, search_query, num_results, deadline=deadline
+                )
+            )
+            for e in engines
+        }
+        engine_results: Dict[str, List[Dict]] = {}
+        error_msg: Optional[str] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=deadline.remaining(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    logger.warning(
+                        "Search stream deadline reached; %s engine(s) still pending",
+                        len(pending),
+                    )
+                    break
+                for task in done:
+                    try:
+                        engine_type, results, err = task.result()
+                    except Exception as e:
+                        error_msg = str(e)
+                        continue
+                    if err:
+                        error_msg = err
+                    if not results:
+                        continue
+                    engine_results[engine_type] = results
+                    if fusion_state is not None:
+                        fusion_state.add(engine_type, results)
+                    yield {
+                        "type": "partial",
+                        "engine": engine_type,
+                        "engines": list(engine_results),
+                        "results": self._merge_engine_results(
+                            engine_results,
+                            num_results,
+                            fusion_state=fusion_state,
+                            **merge_kwargs,
+                        ),
+                    }
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            if admitted_at is not None and self._admission is not None:
+                self._admission.release(time.monotonic() - admitted_at)
+
+        merged = (
+            self._merge_engine_results(
+                engine_results, num_results, fusion_state=fusion_state, **merge_kwargs
+            )
+            if engine_results
+            else []
+        )
+        final = await self._finalize_results(
+            search_query, engine, num_results, merged, scoring=merge_kwargs["scoring"]
+        )
+        stale = (
+            None if final else await self._stale_fallback(query, engine, num_results)
+        )
+        if stale:
+            final = stale
+
+        if self.monitor:
+            self.monitor.record_search(
+                SearchMetrics(
+                    query=query,
+                    engine=engine,
+                    start_time=start_time,
+                    end_time=time.time(),
+                    request_id=get_request_id(),
+                    success=bool(final),
+                    cached=False,
+                    num_results=len(final),
+                    error=error_msg if not final else None,
+                    coalesced=False,
+                )
+            )
+
+        event: Dict[str, Any] = {
+            "type": "final",
+            "engines": list(engine_results),
+            "results": final,
+            "cached": bool(stale),
+        }
+        if stale:
+            event["stale"] = True
+        if not final and error_msg:
+            event["error"] = error_msg
+        yield event
+
+    async def search_many_iter(
+        self,
+        queries: Sequence[str],
+        num_results: int = 10,
+        engine: str = "auto",
+        *,
+        max_concurrency: Optional[int] = None,
+        rejections: Optional[Dict[int, AdmissionRejected]] = None,
+    ) -> AsyncIterator[tuple[int, List[Dict]]]:
+        """Batch search yielding ``(index, results)`` as queries complete.
+
+        - identical / normalized-equal queries are searched once and fanned
+          out to every input index
+        - cache hits are yielded immediately
+        - misses are dispatched FIFO to a bounded worker pool, so engine
+          bulkheads and rate limiters serve the batch in input order instead
+          of interleaving every query at once
+        - a query refused by admission control yields ``[]`` and, when
+          *rejections* is given, its ``AdmissionRejected`` is stored there
+          under each of its indices before they are yielded
+        """
+        groups: Dict[str, List[int]] = {}
+        for i, q in enumerate(queries):
+            key = normalize_query(q)
+            if not key:
+                yield i, []
+                continue
+            groups.setdefault(key, []).append(i)
+
+        misses: List[tuple[str, List[int]]] = []
+        for indices in groups.values():
+            query = queries[indices[0]]
+            cached = await self._cache_lookup(query, engine, num_results, time.time())
+            if cached is not None:
+                for i in indices:
+                    yield i, list(cached)
+            else:
+                misses.append((query, indices))
+
+        if not misses:
+            return
+
+        limit = max_concurrency or get_settings().batch_max_concurrency
+        todo: asyncio.Queue = asyncio.Queue()
+        for item in misses:
+            todo.put_nowait(item)
+        done: asyncio.Queue = asyncio.Queue()
+
+        async def _worker() -> None:
+            # Batch work yields admission slots to interactive searches
+            # (background callers such as warmup keep their own class).
+            if get_priority() == PRIORITY_INTERACTIVE:
+                set_priority(PRIORITY_BATCH)
+            while True:
+                try:
+                    query, indices = todo.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                rejected: Optional[AdmissionRejected] = None
+                try:
+                    results = await self.search(query, num_results, engine)
+                except AdmissionRejected as e:
+                    logger.warning("Batch search not admitted for %r: %s", query, str(e))
+                    results, rejected = [], e
+                except Exception as e:
+                    logger.error("Batch search failed for %r: %s", query, str(e))
+                    results = []
+                await done.put((indices, results, rejected))
+
+        workers = [
+            asyncio.create_task(_worker())
+            for _ in range(max(1, min(int(limit), len(misses))))
+        ]
+        try:
+            for _ in range(len(misses)):
+                indices, results, rejected = await done.get()
+                for i in indices:
+                    if rejected is not None and rejections is not None:
+                        rejections[i] = rejected
+                    yield i, list(results)
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def search_many(
+        self,
+        queries: Sequence[str],
+        num_results: int = 10,
+        engine: str = "auto",
+        *,
+        max_concurrency: Optional[int] = None,
+        rejections: Optional[Dict[int, AdmissionRejected]] = None,
+    ) -> List[List[Dict]]:
+        """Batch search returning one result list per query, in input order.
+
+        Queries refused by admission control are recorded in *rejections*
+        (see :meth:`search_many_iter`).  When every non-empty query was
+        refused, the ``AdmissionRejected`` with the longest Retry-After hint
+        is raised instead, so an overloaded server is not reported as a
+        batch of empty results.
+        """
+        rejected: Dict[int, AdmissionRejected] = {} if rejections is None else rejections
+        out: List[List[Dict]] = [[] for _ in queries]
+        async for i, results in self.search_many_iter(
+            queries,
+            num_results,
+            engine,
+            max_concurrency=max_concurrency,
+            rejections=rejected,
+        ):
+            out[i] = results
+        searched = [i for i, q in enumerate(queries) if normalize_query(q)]
+        if searched and all(i in rejected for i in searched):
+            raise max(rejected.values(), key=lambda e: e.retry_after_s)
+        return out
+
     def _get_engine_type(self, search_engine: SearchEngine) -> str:
         """
         获取引擎类型标识
@@ -2151,11 +3651,39 @@ class SearchManager:
         else:
             return engine_name
     
+    def _engine_cache_get(
+        self, engine_type: str, query: str, count: int
+    ) -> Optional[List[SearchResult]]:
+        if self._engine_cache is None:
+            return None
+        return self._engine_cache.get(engine_type, query, count)
+
+    def _engine_cache_set(
+        self, engine_type: str, query: str, count: int, results: List[SearchResult]
+    ) -> None:
+        if self._engine_cache is not None:
+            self._engine_cache.set(engine_type, query, count, results)
+
+    @staticmethod
+    def _engine_result_dicts(
+        results: List[SearchResult], engine_type: str
+    ) -> List[Dict]:
+        """Fresh result dicts (tagged with the engine) for one engine's list."""
+        converted_results = [r.to_dict() for r in results]
+        # 为结果添加引擎标识
+        for result in converted_results:
+            if 'engine' not in result:
+                result['engine'] = engine_type
+        return converted_results
+
     async def _search_single_engine(
         self,
         search_engine: SearchEngine,
         query: str,
-        num_results: int
+        num_results: int,
+        *,
+        fetch_count: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
     ) -> tuple[str, List[Dict], Optional[str]]:
         """
         搜索单个引擎（用于并发搜索）
@@ -2164,6 +3692,8 @@ class SearchManager:
             search_engine: 搜索引擎实例
             query: 搜索查询
             num_results: 结果数量
+            fetch_count: 向引擎请求的候选数量（默认 max(2k, 20)）
+            deadline: 截止时间；限流等待、超时与重试都不会超过它
             
         Returns:
             (engine_type, results, error_message)
@@ -2174,8 +3704,17 @@ class SearchManager:
         breaker = self._circuit_breakers.get(engine_type)
         
         # Fetch more candidates than requested for better RRF fusion.
-        fetch_count = max(num_results * 2, 20)
+        if fetch_count is None:
+            fetch_count = max(num_results * 2, 20)
         
+        cached = self._engine_cache_get(engine_type, query, fetch_count)
+        if cached is not None:
+            return engine_type, self._engine_result_dicts(cached, engine_type), None
+
+        if deadline is not None and deadline.expired:
+            return engine_type, [], f"{engine_type}: deadline exceeded"
+
+        t0: Optional[float] = None
         try:
             # Circuit breaker: fail fast when an engine is OPEN.
             if breaker is not None:
@@ -2190,20 +3729,33 @@ class SearchManager:
 
             # 检查限流
             if self.rate_limiter:
-                await self.rate_limiter.acquire(engine_type)
+                await asyncio.wait_for(
+                    self.rate_limiter.acquire(engine_type),
+                    timeout=cap_to_deadline(deadline, None),
+                )
 
-            timeout_budget = self._engine_timeout_budget(engine_type)
+            timeout_budget = cap_to_deadline(
+                deadline, self._engine_timeout_budget(engine_type)
+            )
             async with self._bulkhead(engine_type, use_global=False, use_engine=True):
                 # 执行搜索（自动重试）
+                t0 = time.monotonic()
+                retry_call = self._search_with_retry(
+                    search_engine,
+                    query,
+                    fetch_count,
+                    deadline=deadline,
+                    engine_type=engine_type,
+                )
                 if timeout_budget is not None:
-                    results = await asyncio.wait_for(
-                        self._search_with_retry(search_engine, query, fetch_count),
-                        timeout=timeout_budget,
-                    )
+                    results = await asyncio.wait_for(retry_call, timeout=timeout_budget)
                 else:
-                    results = await self._search_with_retry(
-                        search_engine, query, fetch_count
-                    )
+                    results = await retry_call
+                self._record_engine_outcome(
+                    engine_type,
+                    latency_s=time.monotonic() - t0,
+                    num_results=len(results),
+                )
 
             if breaker is not None:
                 await breaker.record_success()
@@ -2213,19 +3765,25 @@ class SearchManager:
             )
             
             if results:
-                converted_results = [r.to_dict() for r in results]
-                
-                # 为结果添加引擎标识
-                for result in converted_results:
-                    if 'engine' not in result:
-                        result['engine'] = engine_type
-                
-                return engine_type, converted_results, None
+                self._engine_cache_set(engine_type, query, fetch_count, results)
+                return engine_type, self._engine_result_dicts(results, engine_type), None
             else:
                 logger.warning(f"No results from {engine_name}")
                 return engine_type, [], None
                 
         except Exception as e:
+            if deadline is not None and deadline.expired:
+                # Cut off by the search deadline, not an engine fault: keep
+                # the circuit breaker out of it.
+                logger.warning(
+                    "Search deadline reached while waiting for %s", engine_name
+                )
+                return engine_type, [], f"{engine_type}: deadline exceeded"
+            self._record_engine_outcome(
+                engine_type,
+                latency_s=None if t0 is None else time.monotonic() - t0,
+                error=True,
+            )
             if breaker is not None:
                 try:
                     await breaker.record_failure()
@@ -2241,7 +3799,9 @@ class SearchManager:
         self,
         engines: List[SearchEngine],
         query: str,
-        num_results: int
+        num_results: int,
+        *,
+        deadline: Optional[Deadline] = None,
     ) -> Dict[str, List[Dict]]:
         """
         并发搜索多个引擎
@@ -2250,13 +3810,14 @@ class SearchManager:
             engines: 搜索引擎列表
             query: 搜索查询
             num_results: 每个引擎的结果数量
+            deadline: 截止时间；到期仍未完成的引擎按空结果处理
             
         Returns:
             {engine_type: [results]} 字典
         """
         # 创建并发任务
         tasks = [
-            self._search_single_engine(engine, query, num_results)
+            self._search_single_engine(engine, query, num_results, deadline=deadline)
             for engine in engines
         ]
         
@@ -2297,7 +3858,10 @@ class SearchManager:
         self,
         search_engine: SearchEngine,
         query: str,
-        num_results: int
+        num_results: int,
+        *,
+        deadline: Optional[Deadline] = None,
+        engine_type: Optional[str] = None,
     ) -> List[SearchResult]:
         """
         带重试机制的搜索
@@ -2306,6 +3870,9 @@ class SearchManager:
             search_engine: 搜索引擎实例
             query: 搜索查询
             num_results: 结果数量
+            deadline: 截止时间；退避 + 一次预期耗时（EWMA 延迟，至少
+                min_attempt_s）放不进剩余时间时不再重试，直接抛出上次错误
+            engine_type: 引擎类型（用于查找延迟统计）
             
         Returns:
             搜索结果列表
@@ -2313,10 +3880,15 @@ class SearchManager:
         max_attempts = 3
         delay_s = 1.0
         exponential_base = 2.0
+        pass_deadline = deadline is not None and _accepts_deadline(search_engine)
 
         last_exc: Optional[BaseException] = None
         for attempt in range(1, max_attempts + 1):
             try:
+                if pass_deadline:
+                    return await search_engine.search(
+                        query, num_results, deadline=deadline
+                    )
                 return await search_engine.search(query, num_results)
             except EngineSearchError as e:
                 last_exc = e
@@ -2343,6 +3915,16 @@ class SearchManager:
                 last_exc = e
                 raise
 
+            if not fits_deadline(
+                deadline, delay_s + self._expected_attempt_s(engine_type, deadline)
+            ):
+                logger.warning(
+                    "Skipping retry %s/%s: backoff %.1fs does not fit the search deadline",
+                    attempt + 1,
+                    max_attempts,
+                    delay_s,
+                )
+                raise last_exc
             await asyncio.sleep(delay_s)
             delay_s *= exponential_base
 
@@ -2359,36 +3941,49 @@ class SearchManager:
             缓存统计字典，如果缓存未启用则返回空字典
         """
         if self.cache:
-            return self.cache.get_stats()
+            stats = self.cache.get_stats()
+            if self._engine_cache is not None:
+                stats["engine_cache"] = self._engine_cache.get_stats()
+            if self._refresh_task is not None or self._refresh_budget is not None:
+                stats["refresh_ahead"] = self.refresh_ahead_status()
+            return stats
         return {}
 
     def clear_cache(self) -> None:
-        """清空搜索缓存"""
+        """清空搜索缓存（含单引擎原始结果缓存）"""
         if self.cache:
             self.cache.clear()
+        if self._engine_cache is not None:
+            self._engine_cache.clear()
 
-    def export_cache(self, filepath: str) -> None:
+    def export_cache(self, filepath: str, **filters) -> int:
         """
-        导出缓存到文件
+        导出缓存到文件（流式写出，格式由扩展名决定，见 :mod:`cache_codec`）
 
         Args:
             filepath: 导出文件路径
+            **filters: engine / since（增量导出）/ max_age
+
+        Returns:
+            导出的条目数
         """
         if self.cache:
-            self.cache.export_to_file(filepath)
+            return self.cache.export_to_json(filepath, **filters)
+        return 0
 
-    def import_cache(self, filepath: str) -> int:
+    def import_cache(self, filepath: str, **filters) -> int:
         """
         从文件导入缓存
 
         Args:
             filepath: 导入文件路径
+            **filters: engine / max_age
 
         Returns:
             导入的条目数
         """
         if self.cache:
-            return self.cache.import_from_file(filepath)
+            return self.cache.import_from_json(filepath, **filters)
         return 0
     
     def get_rate_limit_status(self) -> Dict:
@@ -2422,6 +4017,10 @@ class SearchManager:
                 return self.monitor.get_overall_stats()
         return {}
     
+    def get_scoring_stats(self) -> Dict:
+        """CPU time per result-scoring stage (see :mod:`scoring`)."""
+        return SCORING_METRICS.snapshot()
+
     def get_engine_stats(self, engine: Optional[str] = None) -> Dict:
         """
         获取引擎级别的统计信息
@@ -2436,6 +4035,27 @@ class SearchManager:
             return self.monitor.get_engine_stats(engine)
         return {}
     
+    def get_hedge_stats(self) -> Dict:
+        """Hedge budget counters and per-engine latency percentiles."""
+        return {
+            "enabled": get_settings().auto_hedge,
+            "budget": self._hedge_budget.snapshot(),
+            "latency": {
+                name: window.snapshot()
+                for name, window in self._engine_latency.items()
+            },
+        }
+
+    def get_engine_health(self) -> Dict:
+        """EWMA latency / empty-rate / error-rate per engine."""
+        return self._engine_health.snapshot()
+
+    def get_admission_stats(self) -> Dict:
+        """Global admission queue state (slots, queue depth, rejections)."""
+        if self._admission is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._admission.snapshot()}
+    
     def export_performance_report(self, filepath: str) -> None:
         """
         导出性能报告到文件
@@ -0,0 +1,519 @@
+"""Process-wide runtime settings snapshot.
+
+Hot paths (search fan-out, RRF merge, HTTP middleware, read_url guards) used
+to re-read and re-parse environment variables on every request.  This module
+parses them once into an immutable :class:`Settings` object.
+
+- :func:`get_settings` returns the current snapshot (built lazily on first use)
+- :func:`reload_settings` re-reads the environment and swaps the snapshot
+  atomically; readers holding the previous object keep a consistent view
+
+Settings that are only consumed while constructing long-lived objects
+(cache backend, bulkhead sizes, circuit breaker thresholds) are still read by
+their owners at construction time.
+
+This module is stdlib-only so every other module can import it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+_TRUTHY = {"1", "true", "yes", "y", "on"}
+_FALSY = {"0", "false", "no", "n", "off"}
+
+
+def parse_bool(value: Optional[str]) -> Optional[bool]:
+    """Parse a boolean-ish env value; returns None when unset/unknown."""
+    if value is None:
+        return None
+    v = str(value).strip().lower()
+    if v in _TRUTHY:
+        return True
+    if v in _FALSY:
+        return False
+    return None
+
+
+def parse_int(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(str(value).strip())
+    except Exception:
+        return None
+
+
+def parse_float(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(str(value).strip())
+    except Exception:
+        return None
+
+
+def normalize_host(host: Optional[str]) -> Optional[str]:
+    if not host:
+        return None
+    h = host.strip().lower().rstrip(".")
+    if h.startswith("www."):
+        h = h[4:]
+    return h or None
+
+
+DEFAULT_ENGINE_WEIGHTS: Mapping[str, float] = MappingProxyType({
+    "google": 1.0,
+    "brave": 0.9,
+    "searxng": 0.7,
+    "duckduckgo": 0.4,
+})
+
+DEFAULT_DOMAIN_BOOSTS: Mapping[str, float] = MappingProxyType({
+    "iter.org": 1.35,
+    "iaea.org": 1.25,
+    "fusionforenergy.europa.eu": 1.25,
+    "euro-fusion.org": 1.2,
+    "pppl.gov": 1.15,
+    "lanl.gov": 1.15,
+    "cern.ch": 1.15,
+    "mit.edu": 1.1,
+})
+
+_DEFAULT_READ_URL_CONTENT_TYPES: Tuple[str, ...] = (
+    "text/html",
+    "application/xhtml+xml",
+    "text/plain",
+    "application/json",
+)
+
+
+def parse_engine_weights(raw: Optional[str]) -> Optional[dict[str, float]]:
+    """Parse ``CRAWL4AI_RRF_ENGINE_WEIGHTS`` (JSON object or ``k=v`` CSV).
+
+    Returns None when unset or malformed so callers can apply defaults.
+    """
+    raw = (raw or "").strip()
+    if not raw:
+        return None
+    try:
+        if raw.startswith("{"):
+            parsed = json.loads(raw)
+            if isinstance(parsed, dict):
+                return {str(k).lower(): float(v) for k, v in parsed.items()}
+            return None
+        out: dict[str, float] = {}
+        for part in raw.split(","):
+            part = part.strip()
+            if not part or "=" not in part:
+                continue
+            k, v = part.split("=", 1)
+            out[str(k).strip().lower()] = float(v)
+        return out
+    except Exception:
+        return None
+
+
+def parse_domain_boosts(raw: Optional[str]) -> Optional[dict[str, float]]:
+    """Parse a domain boost mapping (JSON object or ``domain=mult`` CSV).
+
+    Returns None when *raw* is empty so callers can apply defaults.
+    """
+    raw = (raw or "").strip()
+    if not raw:
+        return None
+
+    out: dict[str, float] = {}
+    try:
+        if raw.startswith("{"):
+            parsed = json.loads(raw)
+            if isinstance(parsed, dict):
+                for k, v in parsed.items():
+                    dom = normalize_host(str(k))
+                    if not dom:
+                        continue
+                    try:
+                        out[dom] = float(v)
+                    except Exception:
+                        continue
+                return out
+    except Exception:
+        # Fall through to CSV parsing.
+        pass
+
+    for part in raw.split(","):
+        part = part.strip()
+        if not part or "=" not in part:
+            continue
+        k, v = part.split("=", 1)
+        dom = normalize_host(k)
+        if not dom:
+            continue
+        try:
+            out[dom] = float(v)
+        except Exception:
+            continue
+    return out
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Immutable snapshot of env-driven runtime settings."""
+
+    # -- search: auto mode ------------------------------------------------
+    auto_merge: bool = True
+    auto_merge_min_engines: int = 2
+    auto_merge_max_engines: int = 3
+    auto_merge_concurrent: bool = True
+    auto_merge_early_return: bool = True
+
+    # -- search: auto mode hedging ------------------------------------------
+    auto_hedge: bool = False
+    auto_hedge_percentile: float = 95.0
+    auto_hedge_budget: float = 0.1
+    auto_hedge_min_samples: int = 20
+    auto_hedge_delay_s: float = 1.0
+
+    # -- search: adaptive engine ordering -------------------------------------
+    adaptive_engine_order: bool = True
+    engine_health_min_samples: int = 3
+    engine_prior_latency_s: float = 1.0
+
+    # -- search: admission --------------------------------------------------
+    admission_max_queue: int = 100
+
+    # -- search: coalescing -------------------------------------------------
+    coalesce_min_results: int = 10
+
+    # -- search: per-engine raw result cache ----------------------------------
+    engine_cache_ttl_s: float = 600.0
+    engine_cache_max_size: int = 2000
+
+    # -- search: stale cache serving ------------------------------------------
+    cache_stale_while_revalidate_s: float = 300.0
+    cache_stale_if_error_s: float = 3600.0
+
+    # -- search: per-entry cache TTL ------------------------------------------
+    cache_ttl_policy: str = "adaptive"
+    cache_negative_ttl_s: float = 60.0
+    cache_max_ttl_s: float = 86400.0
+
+    # -- search: persistent cache I/O -----------------------------------------
+    persistent_cache_reader_threads: int = 2
+    persistent_cache_write_batch_size: int = 100
+    persistent_cache_write_batch_ms: float = 50.0
+    persistent_cache_memory_max_mb: float = 32.0
+    persistent_cache_codec: str = "zlib"
+
+    # -- search: cache warmup -------------------------------------------------
+    cache_warmup_on_start: bool = False
+    cache_warmup_top_n: int = 200
+    cache_warmup_concurrency: int = 4
+
+    # -- search: refresh-ahead -----------------------------------------------
+    refresh_ahead: bool = False
+    refresh_ahead_interval_s: float = 30.0
+    refresh_ahead_window_s: float = 120.0
+    refresh_ahead_min_hits: int = 2
+    refresh_ahead_max_per_cycle: int = 20
+    refresh_ahead_quota_share: float = 0.1
+    refresh_ahead_engines: str = "free"
+
+    # -- search: deadline ---------------------------------------------------
+    deadline_min_attempt_s: float = 0.3
+
+    # -- search: engine pagination ------------------------------------------
+    engine_max_pages: int = 3
+
+    # -- search: batch ------------------------------------------------------
+    batch_max_queries: int = 50
+    batch_max_concurrency: int = 8
+
+    # -- search: fusion -----------------------------------------------------
+    fusion_method: str = "rrf"
+    rrf_k: int = 60
+    engine_weights: Mapping[str, float] = field(
+        default_factory=lambda: DEFAULT_ENGINE_WEIGHTS
+    )
+    domain_boosts: Mapping[str, float] = field(
+        default_factory=lambda: DEFAULT_DOMAIN_BOOSTS
+    )
+    dedup_threshold: float = 0.85
+    dedup_snippets: bool = False
+    fusion_vectorized: bool = True
+    fusion_relevance_blend: bool = False
+
+    # -- search: all mode ---------------------------------------------------
+    all_early_return: bool = False
+    all_early_return_min_engines: int = 1
+    all_early_return_grace_s: float = 0.0
+
+    # -- read_url guards ----------------------------------------------------
+    read_url_ssrf_protection: bool = True
+    read_url_allow_private: bool = False
+    read_url_allowed_hosts: frozenset = field(default_factory=frozenset)
+    read_url_max_url_length: int = 4096
+    read_url_preflight: bool = False
+    read_url_preflight_timeout_s: float = 5.0
+    read_url_max_redirects: int = 5
+    read_url_preflight_max_bytes: int = 2 * 1024 * 1024
+    read_url_allowed_content_types: Tuple[str, ...] = _DEFAULT_READ_URL_CONTENT_TYPES
+
+    # -- HTTP bridge --------------------------------------------------------
+    http_auth_tokens: Optional[Tuple[str, ...]] = None
+    http_protect_health: bool = False
+    http_max_body_bytes: int = 1 * 1024 * 1024
+    http_request_timeout_s: Optional[float] = 60.0
+    http_rate_limit_rps: Optional[float] = None
+    http_rate_limit_burst: Optional[int] = None
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Settings":
+        """Build a snapshot from *environ* (defaults to ``os.environ``)."""
+        env = os.environ if environ is None else environ
+
+        def flag(name: str, default: str) -> bool:
+            # Matches the historical "value in truthy set" semantics, where an
+            # explicitly empty value counts as disabled.
+            return str(env.get(name, default)).strip().lower() in _TRUTHY
+
+        def opt_flag(name: str, default: bool) -> bool:
+            v = parse_bool(env.get(name))
+            return default if v is None else bool(v)
+
+        def int_or(name: str, default: int) -> int:
+            v = parse_int(env.get(name, str(default)))
+            return default if v is None else v
+
+        def float_or(name: str, default: float) -> float:
+            v = parse_float(env.get(name, str(default)))
+            return default if v is None else v
+
+        def first(*names: str) -> Optional[str]:
+            for n in names:
+                v = env.get(n)
+                if v:
+                    return v
+            return None
+
+        # Search: auto mode
+        auto_min = max(1, int_or("CRAWL4AI_AUTO_MERGE_MIN_ENGINES", 2))
+        auto_max = max(auto_min, int_or("CRAWL4AI_AUTO_MERGE_MAX_ENGINES", 3))
+
+        # Search: fusion
+        fusion_method = (env.get("CRAWL4AI_FUSION_METHOD") or "").strip().lower() or "rrf"
+        weights = parse_engine_weights(env.get("CRAWL4AI_RRF_ENGINE_WEIGHTS"))
+        boosts = parse_domain_boosts(
+            (env.get("CRAWL4AI_DOMAIN_BOOSTS") or "").strip()
+            or (env.get("CRAWL4AI_OFFICIAL_DOMAIN_BOOSTS") or "").strip()
+        )
+
+        # read_url guards
+        allowed_hosts = frozenset(
+            h.strip().lower()
+            for h in (env.get("CRAWL4AI_READ_URL_ALLOWED_HOSTS") or "").split(",")
+            if h.strip()
+        )
+        ct_raw = (env.get("CRAWL4AI_READ_URL_ALLOWED_CONTENT_TYPES") or "").strip()
+        content_types = (
+            tuple(p.strip().lower() for p in ct_raw.split(",") if p.strip())
+            if ct_raw
+            else _DEFAULT_READ_URL_CONTENT_TYPES
+        )
+        max_url_len = parse_int(env.get("CRAWL4AI_READ_URL_MAX_URL_LENGTH"))
+        preflight_timeout = parse_float(env.get("CRAWL4AI_READ_URL_PREFLIGHT_TIMEOUT_S"))
+        max_redirects = parse_int(env.get("CRAWL4AI_READ_URL_MAX_REDIRECTS"))
+        preflight_max_bytes = parse_int(env.get("CRAWL4AI_READ_URL_PREFLIGHT_MAX_BYTES"))
+
+        # HTTP bridge: auth tokens (single token or comma-separated list).
+        tokens: list[str] = []
+        single = (first("CRAWL4AI_HTTP_AUTH_TOKEN", "HTTP_AUTH_TOKEN") or "").strip()
+        if single:
+            tokens.append(single)
+        for t in (env.get("CRAWL4AI_HTTP_AUTH_TOKENS") or "").split(","):
+            t = t.strip()
+            if t:
+                tokens.append(t)
+        auth_tokens = tuple(dict.fromkeys(tokens)) or None
+
+        max_body = parse_int(first("CRAWL4AI_HTTP_MAX_BODY_BYTES", "HTTP_MAX_BODY_BYTES"))
+        req_timeout = parse_float(
+            first("CRAWL4AI_HTTP_REQUEST_TIMEOUT_S", "HTTP_REQUEST_TIMEOUT_S")
+        )
+        if req_timeout is None:
+            req_timeout = 60.0
+        elif req_timeout <= 0:
+            req_timeout = None
+
+        rps = parse_float(first("CRAWL4AI_HTTP_RATE_LIMIT_RPS", "HTTP_RATE_LIMIT_RPS"))
+        burst: Optional[int] = None
+        if rps is None or rps <= 0:
+            rps = None
+        else:
+            burst = parse_int(first("CRAWL4AI_HTTP_RATE_LIMIT_BURST", "HTTP_RATE_LIMIT_BURST"))
+            burst = max(1, 5 if burst is None else burst)
+
+        return cls(
+            auto_merge=flag("CRAWL4AI_AUTO_MERGE", "1"),
+            auto_merge_min_engines=auto_min,
+            auto_merge_max_engines=auto_max,
+            auto_merge_concurrent=flag("CRAWL4AI_AUTO_MERGE_CONCURRENT", "1"),
+            auto_merge_early_return=flag("CRAWL4AI_AUTO_MERGE_EARLY_RETURN", "1"),
+            auto_hedge=flag("CRAWL4AI_AUTO_HEDGE", "0"),
+            auto_hedge_percentile=min(
+                99.9, max(50.0, float_or("CRAWL4AI_AUTO_HEDGE_PERCENTILE", 95.0))
+            ),
+            auto_hedge_budget=max(0.0, float_or("CRAWL4AI_AUTO_HEDGE_BUDGET", 0.1)),
+            auto_hedge_min_samples=max(1, int_or("CRAWL4AI_AUTO_HEDGE_MIN_SAMPLES", 20)),
+            auto_hedge_delay_s=max(0.0, float_or("CRAWL4AI_AUTO_HEDGE_DELAY_S", 1.0)),
+            adaptive_engine_order=flag("CRAWL4AI_ADAPTIVE_ENGINE_ORDER", "1"),
+            engine_health_min_samples=max(
+                1, int_or("CRAWL4AI_ENGINE_HEALTH_MIN_SAMPLES", 3)
+            ),
+            engine_prior_latency_s=max(
+                0.01, float_or("CRAWL4AI_ENGINE_PRIOR_LATENCY_S", 1.0)
+            ),
+            admission_max_queue=max(0, int_or("CRAWL4AI_ADMISSION_MAX_QUEUE", 100)),
+            coalesce_min_results=max(0, int_or("CRAWL4AI_COALESCE_MIN_RESULTS", 10)),
+            engine_cache_ttl_s=max(0.0, float_or("CRAWL4AI_ENGINE_CACHE_TTL_S", 600.0)),
+            engine_cache_max_size=max(
+                1, int_or("CRAWL4AI_ENGINE_CACHE_MAX_SIZE", 2000)
+            ),
+            cache_stale_while_revalidate_s=max(
+                0.0, float_or("CRAWL4AI_CACHE_STALE_WHILE_REVALIDATE_S", 300.0)
+            ),
+            cache_stale_if_error_s=max(
+                0.0, float_or("CRAWL4AI_CACHE_STALE_IF_ERROR_S", 3600.0)
+            ),
+            cache_ttl_policy=(
+                (env.get("CRAWL4AI_CACHE_TTL_POLICY") or "").strip().lower()
+                or "adaptive"
+            ),
+            cache_negative_ttl_s=max(
+                0.0, float_or("CRAWL4AI_CACHE_NEGATIVE_TTL_S", 60.0)
+            ),
+            cache_max_ttl_s=max(0.0, float_or("CRAWL4AI_CACHE_MAX_TTL_S", 86400.0)),
+            persistent_cache_reader_threads=max(
+                1, int_or("CRAWL4AI_PERSISTENT_CACHE_READER_THREADS", 2)
+            ),
+            persistent_cache_write_batch_size=max(
+                1, int_or("CRAWL4AI_PERSISTENT_CACHE_WRITE_BATCH_SIZE", 100)
+            ),
+            persistent_cache_write_batch_ms=max(
+                0.0, float_or("CRAWL4AI_PERSISTENT_CACHE_WRITE_BATCH_MS", 50.0)
+            ),
+            persistent_cache_memory_max_mb=max(
+                0.0, float_or("CRAWL4AI_PERSISTENT_CACHE_MEMORY_MAX_MB", 32.0)
+            ),
+            persistent_cache_codec=(
+                (env.get("CRAWL4AI_PERSISTENT_CACHE_CODEC") or "").strip().lower()
+                or "zlib"
+            ),
+            cache_warmup_on_start=opt_flag("CRAWL4AI_CACHE_WARMUP_ON_START", False),
+            cache_warmup_top_n=max(0, int_or("CRAWL4AI_CACHE_WARMUP_TOP_N", 200)),
+            cache_warmup_concurrency=max(
+                1, int_or("CRAWL4AI_CACHE_WARMUP_CONCURRENCY", 4)
+            ),
+            refresh_ahead=opt_flag("CRAWL4AI_REFRESH_AHEAD", False),
+            refresh_ahead_interval_s=max(
+                1.0, float_or("CRAWL4AI_REFRESH_AHEAD_INTERVAL_S", 30.0)
+            ),
+            refresh_ahead_window_s=max(
+                0.0, float_or("CRAWL4AI_REFRESH_AHEAD_WINDOW_S", 120.0)
+            ),
+            refresh_ahead_min_hits=max(
+                1, int_or("CRAWL4AI_REFRESH_AHEAD_MIN_HITS", 2)
+            ),
+            refresh_ahead_max_per_cycle=max(
+                0, int_or("CRAWL4AI_REFRESH_AHEAD_MAX_PER_CYCLE", 20)
+            ),
+            refresh_ahead_quota_share=min(1.0, max(
+                0.0, float_or("CRAWL4AI_REFRESH_AHEAD_QUOTA_SHARE", 0.1)
+            )),
+            refresh_ahead_engines=(
+                "any"
+                if (env.get("CRAWL4AI_REFRESH_AHEAD_ENGINES") or "").strip().lower()
+                == "any"
+                else "free"
+            ),
+            deadline_min_attempt_s=max(
+                0.0, float_or("CRAWL4AI_DEADLINE_MIN_ATTEMPT_S", 0.3)
+            ),
+            engine_max_pages=max(1, int_or("CRAWL4AI_ENGINE_MAX_PAGES", 3)),
+            batch_max_queries=max(1, int_or("CRAWL4AI_BATCH_MAX_QUERIES", 50)),
+            batch_max_concurrency=max(1, int_or("CRAWL4AI_BATCH_MAX_CONCURRENCY", 8)),
+            fusion_method=fusion_method,
+            rrf_k=int_or("CRAWL4AI_RRF_K", 60),
+            engine_weights=(
+                MappingProxyType(weights) if weights is not None else DEFAULT_ENGINE_WEIGHTS
+            ),
+            domain_boosts=(
+                MappingProxyType(boosts) if boosts is not None else DEFAULT_DOMAIN_BOOSTS
+            ),
+            dedup_threshold=min(1.0, max(0.0, float_or("CRAWL4AI_DEDUP_THRESHOLD", 0.85))),
+            dedup_snippets=opt_flag("CRAWL4AI_DEDUP_SNIPPETS", False),
+            fusion_vectorized=opt_flag("CRAWL4AI_FUSION_VECTORIZED", True),
+            fusion_relevance_blend=opt_flag("CRAWL4AI_FUSION_RELEVANCE_BLEND", False),
+            all_early_return=flag("CRAWL4AI_ALL_EARLY_RETURN", "0"),
+            all_early_return_min_engines=max(
+                1, int_or("CRAWL4AI_ALL_EARLY_RETURN_MIN_ENGINES", 1)
+            ),
+            all_early_return_grace_s=max(
+                0.0, float_or("CRAWL4AI_ALL_EARLY_RETURN_GRACE_S", 0.0)
+            ),
+            read_url_ssrf_protection=opt_flag("CRAWL4AI_READ_URL_SSRF_PROTECTION", True),
+            read_url_allow_private=opt_flag("CRAWL4AI_READ_URL_ALLOW_PRIVATE", False),
+            read_url_allowed_hosts=allowed_hosts,
+            read_url_max_url_length=4096 if max_url_len is None else max(256, max_url_len),
+            read_url_preflight=opt_flag("CRAWL4AI_READ_URL_PREFLIGHT", False),
+            read_url_preflight_timeout_s=(
+                5.0 if preflight_timeout is None else max(0.5, preflight_timeout)
+            ),
+            read_url_max_redirects=5 if max_redirects is None else max(0, max_redirects),
+            read_url_preflight_max_bytes=(
+                2 * 1024 * 1024 if preflight_max_bytes is None
+                else max(0, preflight_max_bytes)
+            ),
+            read_url_allowed_content_types=content_types,
+            http_auth_tokens=auth_tokens,
+            http_protect_health=bool(parse_bool(env.get("CRAWL4AI_HTTP_PROTECT_HEALTH"))),
+            http_max_body_bytes=1 * 1024 * 1024 if max_body is None else max(0, max_body),
+            http_request_timeout_s=req_timeout,
+            http_rate_limit_rps=rps,
+            http_rate_limit_burst=burst,
+        )
+
+
+# ── module-level snapshot ────────────────────────────────────────────────────
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """Return the current settings snapshot (built from env on first use)."""
+    s = _settings
+    if s is not None:
+        return s
+    with _settings_lock:
+        if _settings is None:
+            return _swap(Settings.from_env())
+        return _settings
+
+
+def reload_settings(environ: Optional[Mapping[str, str]] = None) -> Settings:
+    """Re-read the environment and atomically replace the snapshot."""
+    new = Settings.from_env(environ)
+    with _settings_lock:
+        return _swap(new)
+
+
+def _swap(new: Settings) -> Settings:
+    global _settings
+    _settings = new
+    return new
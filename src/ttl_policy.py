@@ -0,0 +1,183 @@
+"""Per-entry cache TTL policies.
+
+Both cache backends store a TTL with every entry; a policy picks it when an
+entry is written (an explicit ``ttl_override`` still wins):
+
+- :class:`TTLPolicy` (``fixed``): the cache's default TTL, and a short
+  negative TTL for empty results (no results almost always means the
+  upstream failed or was rate limited, so retry soon)
+- :class:`AdaptiveTTLPolicy` (``adaptive``): additionally
+  - lengthens the TTL for stable reference queries ("what is ...",
+    definitions, docs, mostly-Wikipedia results)
+  - shortens it for time-sensitive queries (news, "latest", prices, years)
+  - scales the previous entry's TTL by observed result churn: when a
+    rewrite returns mostly the same links the TTL grows, when the ranking
+    changed a lot it shrinks
+
+Memory and SQLite space then go to entries that stay valid, and volatile
+queries are refreshed more often.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_NEGATIVE_TTL_S = 60.0
+
+_REFERENCE_QUERY = re.compile(
+    r"\b(what (is|are)|define|definition|meaning of|how does|history of|"
+    r"wiki(pedia)?|documentation|docs|specification|glossary)\b"
+    r"|是什么|定义|原理|含义|历史",
+    re.IGNORECASE,
+)
+_TIME_SENSITIVE_QUERY = re.compile(
+    r"\b(latest|news|today|tonight|yesterday|breaking|now|live|price|prices|"
+    r"stock|weather|score|scores|release date|(19|20)\d\d)\b"
+    r"|最新|新闻|今天|今日|昨天|实时|价格|股价|天气",
+    re.IGNORECASE,
+)
+_REFERENCE_HOSTS = ("wikipedia.org", "britannica.com", "wiktionary.org")
+
+# Previous entry as (results, ttl_s).
+PreviousEntry = Tuple[Sequence[Dict[str, Any]], float]
+
+
+class TTLPolicy:
+    """Fixed TTL; empty results get ``negative_ttl``."""
+
+    name = "fixed"
+
+    def __init__(self, negative_ttl: float = DEFAULT_NEGATIVE_TTL_S) -> None:
+        self.negative_ttl = max(0.0, float(negative_ttl))
+
+    def ttl_for(
+        self,
+        query: str,
+        results: Sequence[Dict[str, Any]],
+        *,
+        default_ttl: float,
+        previous: Optional[PreviousEntry] = None,
+    ) -> float:
+        """TTL (seconds) for a new entry of *query* holding *results*."""
+        if not results:
+            return min(float(default_ttl), self.negative_ttl)
+        return float(default_ttl)
+
+
+class AdaptiveTTLPolicy(TTLPolicy):
+    """TTL from query kind and result churn, clamped to a sane range."""
+
+    name = "adaptive"
+
+    def __init__(
+        self,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL_S,
+        *,
+        max_ttl: float = 86400.0,
+        reference_factor: float = 4.0,
+        time_sensitive_factor: float = 0.25,
+        grow: float = 1.5,
+        shrink: float = 0.5,
+        stable_overlap: float = 0.8,
+        churn_overlap: float = 0.4,
+    ) -> None:
+        super().__init__(negative_ttl)
+        self.max_ttl = max(0.0, float(max_ttl))
+        self.reference_factor = reference_factor
+        self.time_sensitive_factor = time_sensitive_factor
+        self.grow = grow
+        self.shrink = shrink
+        self.stable_overlap = stable_overlap
+        self.churn_overlap = churn_overlap
+
+    def ttl_for(
+        self,
+        query: str,
+        results: Sequence[Dict[str, Any]],
+        *,
+        default_ttl: float,
+        previous: Optional[PreviousEntry] = None,
+    ) -> float:
+        base = float(default_ttl)
+        if not results:
+            return min(base, self.negative_ttl)
+
+        ttl = base
+        if previous is not None and previous[0]:
+            prev_results, prev_ttl = previous
+            overlap = link_overlap(prev_results, results)
+            if overlap >= self.stable_overlap:
+                ttl = prev_ttl * self.grow
+            elif overlap <= self.churn_overlap:
+                ttl = prev_ttl * self.shrink
+            else:
+                ttl = prev_ttl
+
+        if is_time_sensitive(query):
+            ttl = min(ttl, base * self.time_sensitive_factor)
+        elif is_reference(query, results):
+            ttl = max(ttl, base * self.reference_factor)
+
+        floor = min(base, max(self.negative_ttl, base * self.time_sensitive_factor))
+        return max(floor, min(ttl, max(base, self.max_ttl)))
+
+
+def is_reference(query: str, results: Sequence[Dict[str, Any]] = ()) -> bool:
+    """Definition/docs style query, or results dominated by reference sites."""
+    if _REFERENCE_QUERY.search(query or ""):
+        return True
+    if not results:
+        return False
+    hits = sum(1 for r in results if _is_reference_host(r.get("link")))
+    return hits * 2 >= len(results)
+
+
+def is_time_sensitive(query: str) -> bool:
+    return bool(_TIME_SENSITIVE_QUERY.search(query or ""))
+
+
+def link_overlap(a: Sequence[Dict[str, Any]], b: Sequence[Dict[str, Any]]) -> float:
+    """Jaccard overlap of the two result lists' links (0..1)."""
+    la = _links(a)
+    lb = _links(b)
+    if not la and not lb:
+        return 1.0
+    return len(la & lb) / len(la | lb)
+
+
+def build_ttl_policy(
+    name: str = "adaptive",
+    *,
+    negative_ttl: float = DEFAULT_NEGATIVE_TTL_S,
+    max_ttl: float = 86400.0,
+) -> TTLPolicy:
+    """Policy by name (``fixed`` or ``adaptive``; unknown names → fixed)."""
+    if (name or "").strip().lower() == "adaptive":
+        return AdaptiveTTLPolicy(negative_ttl, max_ttl=max_ttl)
+    return TTLPolicy(negative_ttl)
+
+
+def _links(results: Sequence[Dict[str, Any]]) -> set:
+    return {str(r.get("link")) for r in results if r.get("link")}
+
+
+def _is_reference_host(link: Optional[str]) -> bool:
+    if not link:
+        return False
+    try:
+        host = (urlsplit(str(link)).hostname or "").lower()
+    except Exception:
+        return False
+    return any(host == h or host.endswith("." + h) for h in _REFERENCE_HOSTS)
+
+
+__all__: List[str] = [
+    "AdaptiveTTLPolicy",
+    "TTLPolicy",
+    "build_ttl_policy",
+    "is_reference",
+    "is_time_sensitive",
+    "link_overlap",
+]
@@ -12,11 +12,30 @@ import json
 import logging
 import os
 import time
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Mapping, Optional
 from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
-from functools import wraps
+from functools import lru_cache, wraps
 from dataclasses import dataclass
 
+try:  # pragma: no cover
+    from src import vector_fusion
+    from src.near_dup import near_duplicate_mask
+    from src.settings import (
+        DEFAULT_DOMAIN_BOOSTS,
+        get_settings,
+        normalize_host as _normalize_host,
+        parse_domain_boosts,
+    )
+except Exception:  # pragma: no cover
+    import vector_fusion
+    from near_dup import near_duplicate_mask
+    from settings import (
+        DEFAULT_DOMAIN_BOOSTS,
+        get_settings,
+        normalize_host as _normalize_host,
+        parse_domain_boosts,
+    )
+
 logger = logging.getLogger(__name__)
 
 
@@ -89,6 +108,11 @@ _TRACKING_QUERY_KEYS = {
 }
 
 
+# Bound of the canonicalize_url / host_from_url memos (popular URLs recur
+# across queries and engines).
+URL_MEMO_SIZE = 16384
+
+
 def canonicalize_url(url: Optional[str]) -> Optional[str]:
     """Canonicalize URLs for deduplication.
 
@@ -98,13 +122,19 @@ def canonicalize_url(url: Optional[str]) -> Optional[str]:
     - Strip fragments
     - Remove common tracking query parameters (utm_*, gclid, fbclid, ...)
     - Normalize trailing slash for non-root paths
+
+    Results are memoized in a bounded LRU (``URL_MEMO_SIZE`` entries).
     """
     if url is None:
         return None
     raw = str(url).strip()
     if not raw:
         return None
+    return _canonicalize(raw)
 
+
+@lru_cache(maxsize=URL_MEMO_SIZE)
+def _canonicalize(raw: str) -> str:
     try:
         parts = urlsplit(raw)
     except Exception:
@@ -160,57 +190,44 @@ def canonicalize_url(url: Optional[str]) -> Optional[str]:
     return urlunsplit((scheme, netloc, path, query, fragment))
 
 
-def _relevance_score(query: str, result: Dict[str, Any]) -> float:
-    """Lightweight token-overlap relevance score for query vs result."""
-    terms = set(query.strip().lower().split())
-    if not terms:
-        return 0.0
-    title = (result.get("title") or "").lower()
-    snippet = (result.get("snippet") or "").lower()
-    score = 0.0
-    for t in terms:
-        if len(t) < 2:
-            continue
-        if t in title:
-            score += 3.0
-        if t in snippet:
-            score += 1.0
-    return score
+def _scoring_pipeline(query: str = ""):
+    """A fresh :class:`scoring.ScoringPipeline` (imported lazily: scoring uses utils)."""
+    try:
+        from src.scoring import ScoringPipeline
+    except Exception:
+        from scoring import ScoringPipeline
+    return ScoringPipeline(query)
+
+
+def _no_relevance(result: Dict[str, Any]) -> float:
+    return 0.0
 
 
 def _blend_relevance(
     results: List[Dict[str, Any]],
     scores: Dict[str, float],
-    best: Dict[str, tuple[int, int, Dict[str, Any]]],
-    canonicalize_links: bool,
+    keys: List[Optional[str]],
+    relevance: Callable[[Dict[str, Any]], float],
     alpha: float = 0.7,
 ) -> List[Dict[str, Any]]:
     """Blend RRF score with query-result relevance score.
 
     final = alpha * normalised_rrf + (1 - alpha) * normalised_relevance
+
+    Both scores are normalised by their maximum over *results*; ``keys``
+    (parallel to *results*) are the score keys.  Without query terms every
+    relevance is 0 and the RRF order is kept.
     """
     if not results:
         return results
 
-    query = ""
-    for r in results:
-        q = r.get("_query")
-        if q:
-            query = q
-            break
-
     max_rrf = max(scores.values()) if scores else 1.0
+    rels = [relevance(r) for r in results]
+    max_rel = max(rels)
     scored: List[tuple[float, Dict[str, Any]]] = []
-    for r in results:
-        link = r.get("link")
-        key = (
-            canonicalize_url(link) if canonicalize_links
-            else (str(link) if link else "")
-        )
+    for key, rel, r in zip(keys, rels, results):
         rrf = scores.get(key, 0.0) / max_rrf if max_rrf > 0 else 0.0
-        rel = _relevance_score(query, r)
-        max_rel = max(1.0, rel)
-        rel_norm = rel / max_rel
+        rel_norm = rel / max_rel if max_rel > 0 else 0.0
         final = alpha * rrf + (1.0 - alpha) * rel_norm
         scored.append((final, r))
 
@@ -218,57 +235,54 @@ def _blend_relevance(
     return [r for _, r in scored]
 
 
+def _title_dedup_mask(
+    results: List[Dict[str, Any]],
+    threshold: float = 0.85,
+    snippets: bool = False,
+) -> List[bool]:
+    """Keep-flags for :func:`_dedup_by_title` (True = not a near-duplicate).
+
+    Near-linear shingle/MinHash detection, see :mod:`near_dup`.
+    """
+    return near_duplicate_mask(results, threshold, snippets)
+
+
 def _dedup_by_title(
-    results: List[Dict[str, Any]], threshold: float = 0.85
+    results: List[Dict[str, Any]], threshold: float = 0.85, snippets: bool = False
 ) -> List[Dict[str, Any]]:
-    """Remove near-duplicate results by title similarity."""
-    from difflib import SequenceMatcher
-    deduped: List[Dict[str, Any]] = []
-    for r in results:
-        is_dup = False
-        r_title = (r.get("title") or "").lower()
-        for d in deduped:
-            d_title = (d.get("title") or "").lower()
-            if not r_title or not d_title:
-                continue
-            ratio = SequenceMatcher(None, r_title, d_title).ratio()
-            if ratio >= threshold:
-                is_dup = True
-                break
-        if not is_dup:
-            deduped.append(r)
-    return deduped
+    """Remove near-duplicate results by title (and optionally snippet) similarity."""
+    keep = _title_dedup_mask(results, threshold, snippets)
+    return [r for r, k in zip(results, keep) if k]
 
 
-def _normalize_host(host: Optional[str]) -> Optional[str]:
-    if not host:
+def host_from_url(url: Optional[str]) -> Optional[str]:
+    """Normalized host of *url* (lowercase, no ``www.``), memoized."""
+    if not url:
         return None
-    h = host.strip().lower().rstrip(".")
-    if h.startswith("www."):
-        h = h[4:]
-    return h or None
+    return _host_of(str(url))
 
 
-def _host_from_url(url: Optional[str]) -> Optional[str]:
-    if not url:
-        return None
+@lru_cache(maxsize=URL_MEMO_SIZE)
+def _host_of(url: str) -> Optional[str]:
     try:
-        parsed = urlsplit(str(url))
-        return _normalize_host(parsed.hostname)
+        return _normalize_host(urlsplit(url).hostname)
     except Exception:
         return None
 
 
-_DEFAULT_DOMAIN_BOOSTS: Dict[str, float] = {
-    "iter.org": 1.35,
-    "iaea.org": 1.25,
-    "fusionforenergy.europa.eu": 1.25,
-    "euro-fusion.org": 1.2,
-    "pppl.gov": 1.15,
-    "lanl.gov": 1.15,
-    "cern.ch": 1.15,
-    "mit.edu": 1.1,
-}
+def result_link_key(result: Mapping[str, Any], canonicalize_links: bool = True) -> str:
+    """Dedup/fusion key of *result*: its canonical URL (or raw link).
+
+    Uses a precomputed ``canonical_url`` when the result carries one and
+    otherwise the memoized :func:`canonicalize_url` of its link.
+    """
+    link = result.get("link")
+    if not canonicalize_links:
+        return str(link) if link else ""
+    return result.get("canonical_url") or canonicalize_url(link) or ""
+
+
+_DEFAULT_DOMAIN_BOOSTS = DEFAULT_DOMAIN_BOOSTS
 
 
 def _parse_domain_boosts_from_env() -> Dict[str, float]:
@@ -278,71 +292,126 @@ def _parse_domain_boosts_from_env() -> Dict[str, float]:
     - JSON: {"iter.org": 1.35, "iaea.org": 1.25}
     - CSV:  iter.org=1.35,iaea.org=1.25
 
-    Returns built-in defaults when env var is not set.
+    Returns built-in defaults when env var is not set.  The merge hot path
+    uses the compiled :func:`get_domain_boosts` index instead.
     """
 
     raw = (
         (os.environ.get("CRAWL4AI_DOMAIN_BOOSTS") or "").strip()
         or (os.environ.get("CRAWL4AI_OFFICIAL_DOMAIN_BOOSTS") or "").strip()
     )
-    if not raw:
-        return _DEFAULT_DOMAIN_BOOSTS
+    parsed = parse_domain_boosts(raw)
+    if parsed is None:
+        return dict(_DEFAULT_DOMAIN_BOOSTS)
+    return parsed
 
-    out: Dict[str, float] = {}
-    try:
-        if raw.lstrip().startswith("{"):
-            parsed = json.loads(raw)
-            if isinstance(parsed, dict):
-                for k, v in parsed.items():
-                    dom = _normalize_host(str(k))
-                    if not dom:
-                        continue
-                    try:
-                        out[dom] = float(v)
-                    except Exception:
-                        continue
-                return out
-    except Exception:
-        # Fall through to CSV parsing.
-        pass
 
-    for part in raw.split(","):
-        part = part.strip()
-        if not part or "=" not in part:
-            continue
-        k, v = part.split("=", 1)
-        dom = _normalize_host(k)
-        if not dom:
-            continue
-        try:
-            out[dom] = float(v)
-        except Exception:
-            continue
-    return out
+class DomainBoostIndex:
+    """Compiled domain boost map for the fusion hot path.
 
+    Built once from one or more ``{domain: multiplier}`` mappings (later
+    sources win per domain): domains are normalized and multipliers parsed
+    up front.  A lookup walks the host's label suffixes
+    (``a.b.iter.org`` -> ``b.iter.org`` -> ``iter.org`` -> ``org``), so it
+    costs O(labels) whatever the number of boosted domains.  As before, the
+    largest matching multiplier wins and multipliers <= 1 have no effect.
+    """
 
-def _domain_multiplier(host: Optional[str], boosts: Dict[str, float]) -> float:
-    if not host or not boosts:
-        return 1.0
-    h = _normalize_host(host)
-    if not h:
-        return 1.0
+    __slots__ = ("_boosts",)
 
-    best = 1.0
-    for dom, mult in boosts.items():
-        d = _normalize_host(dom)
-        if not d:
-            continue
+    def __init__(self, *sources: Optional[Mapping[str, Any]]) -> None:
+        boosts: Dict[str, float] = {}
+        for source in sources:
+            for dom, mult in (source or {}).items():
+                d = _normalize_host(str(dom))
+                if not d:
+                    continue
+                try:
+                    boosts[d] = float(mult)
+                except Exception:
+                    continue
+        self._boosts = {d: m for d, m in boosts.items() if m > 1.0}
+
+    def __len__(self) -> int:
+        return len(self._boosts)
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(self._boosts)
+
+    def multiplier(self, host: Optional[str]) -> float:
+        if not host or not self._boosts:
+            return 1.0
+        h = _normalize_host(host)
+        best = 1.0
+        while h:
+            m = self._boosts.get(h)
+            if m is not None and m > best:
+                best = m
+            dot = h.find(".")
+            if dot < 0:
+                break
+            h = h[dot + 1:]
+        return best
+
+
+# (settings.domain_boosts the index was built from, extra sources, index)
+_domain_boost_state: Optional[tuple] = None
+
+
+def _config_domain_boosts() -> Dict[str, float]:
+    """``domain_boosts`` from config.json (mapping or ``domain=mult`` CSV)."""
+    config_path = os.path.join(os.path.dirname(__file__), "..", "config.json")
+    if not os.path.exists(config_path):
+        return {}
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            raw = json.load(f).get("domain_boosts")
+    except Exception as e:
+        logger.warning(f"Failed to read domain_boosts from config.json: {e}")
+        return {}
+    if isinstance(raw, dict):
+        return raw
+    if isinstance(raw, str):
+        return parse_domain_boosts(raw) or {}
+    return {}
+
+
+def reload_domain_boosts() -> DomainBoostIndex:
+    """Rebuild the process-wide boost index and return it.
+
+    Sources, lowest precedence first: fusion-terms facility domains
+    (``get_facility_domains()``), ``CRAWL4AI_DOMAIN_BOOSTS`` (or the built-in
+    defaults, via the settings snapshot) and ``domain_boosts`` in config.json.
+    """
+    global _domain_boost_state
+    try:
         try:
-            m = float(mult)
+            from src.fusion_terms import get_fusion_terms_provider
         except Exception:
-            continue
-        if m <= 0:
-            continue
-        if h == d or h.endswith("." + d):
-            if m > best:
-                best = m
-    return best
+            from fusion_terms import get_fusion_terms_provider
+        facility = get_fusion_terms_provider().get_facility_domains()
+    except Exception:
+        facility = {}
+    extra = (facility, _config_domain_boosts())
+    settings_boosts = get_settings().domain_boosts
+    index = DomainBoostIndex(extra[0], settings_boosts, extra[1])
+    _domain_boost_state = (settings_boosts, extra, index)
+    return index
+
+
+def get_domain_boosts() -> DomainBoostIndex:
+    """The compiled boost index; recompiled after :func:`reload_settings`."""
+    global _domain_boost_state
+    state = _domain_boost_state
+    if state is None:
+        return reload_domain_boosts()
+    settings_boosts = get_settings().domain_boosts
+    if state[0] is not settings_boosts:
+        facility, config = state[1]
+        index = DomainBoostIndex(facility, settings_boosts, config)
+        _domain_boost_state = (settings_boosts, state[1], index)
+        return index
+    return state[2]
 
 
 def sort_results(
@@ -388,15 +457,287 @@ def sort_results(
     return sorted_results
 
 
+RRF_METHODS = frozenset({"rrf", "reciprocal_rank_fusion"})
+
+_DEFAULT_ENGINE_PRIORITY: Dict[str, int] = {
+    "google": 4,
+    "brave": 3,
+    "searxng": 2,
+    "duckduckgo": 1,
+}
+
+
+class RRFAccumulator:
+    """Incremental Reciprocal Rank Fusion state.
+
+    Engines are added one ranked list at a time (e.g. as concurrent engine
+    tasks complete).  Running RRF scores and the representative result per
+    canonical URL are kept, so:
+
+    - ``len(acc)`` (unique results so far) is O(1)
+    - each result's key and host are looked up once, when its engine is
+      added (memoized, so links seen at ingestion are not parsed again)
+    - :meth:`ranking` sorts, title-dedups and blends once per state change
+      and trims per call
+    - domain boosts come from a compiled :class:`DomainBoostIndex` (the
+      process-wide :func:`get_domain_boosts` unless *domain_boosts* is given)
+    - per-result features (key, host, boost, query-term hits) come from the
+      request's :class:`scoring.ScoringPipeline` (*scoring*), built once per
+      result and shared with reranking and fusion-term boosts
+    - with NumPy installed (*vectorized*, default ``settings.fusion_vectorized``)
+      hits are kept as rows and scores, order, blend and top-k are computed
+      with :mod:`vector_fusion`; rankings are identical to the dict path
+    - query-result relevance is blended into the ranking only with
+      ``settings.fusion_relevance_blend``; otherwise every relevance is 0
+      and the RRF order is kept
+
+    Adding engines one by one in the same order as the dict passed to
+    :func:`merge_and_deduplicate` yields exactly the same ranking.  The
+    adaptive ``k`` (``min(rrf_k, max_rank // 2)``) depends on the longest
+    list seen; when a longer list arrives the scores are rebuilt from the
+    stored per-key contributions.
+    """
+
+    def __init__(
+        self,
+        *,
+        rrf_k: int = 60,
+        engine_weights: Optional[Mapping[str, float]] = None,
+        engine_priority: Optional[Mapping[str, int]] = None,
+        canonicalize_links: bool = True,
+        domain_boosts: Optional[Mapping[str, float]] = None,
+        scoring: Any = None,
+        vectorized: Optional[bool] = None,
+    ) -> None:
+        self._rrf_k = int(rrf_k)
+        self._weights = engine_weights or {}
+        self._priority = engine_priority or _DEFAULT_ENGINE_PRIORITY
+        self._canonicalize = canonicalize_links
+        settings = get_settings()
+        if domain_boosts is None:
+            self._boosts = get_domain_boosts()
+        elif isinstance(domain_boosts, DomainBoostIndex):
+            self._boosts = domain_boosts
+        else:
+            self._boosts = DomainBoostIndex(domain_boosts)
+        self._dedup = (settings.dedup_threshold, settings.dedup_snippets)
+        self._scoring = scoring if scoring is not None else _scoring_pipeline()
+        self._relevance = (
+            self._scoring.relevance if settings.fusion_relevance_blend else _no_relevance
+        )
+        if vectorized is None:
+            vectorized = settings.fusion_vectorized
+        self._vectorized = bool(vectorized) and vector_fusion.HAVE_NUMPY
+        self._engines: List[str] = []
+        self._max_rank: Optional[int] = None
+        # key -> [(weight * domain_multiplier, rank), ...] in add order
+        self._contrib: Dict[str, List[tuple[float, int]]] = {}
+        self._scores: Dict[str, float] = {}
+        self._scores_k: Optional[int] = None
+        self._best: Dict[str, tuple[int, int, Dict[str, Any]]] = {}
+        # Keys synthesized for results without a usable link; they never
+        # match a score lookup in the relevance blend.
+        self._unlinked: set = set()
+        self._first_seen = 0
+        self._ranked: Optional[List[Dict[str, Any]]] = None
+        # Vectorized mode: key -> key index; one row per engine hit (key
+        # index, engine weight, domain multiplier, rank) in add order; and
+        # per key index the representative's priority, first-seen position,
+        # result and whether the key is a real link.
+        self._index: Dict[str, int] = {}
+        self._hits: tuple[List[int], List[float], List[float], List[int]] = (
+            [], [], [], []
+        )
+        self._reps: tuple[List[int], List[int], List[Dict[str, Any]], List[bool]] = (
+            [], [], [], []
+        )
+        self._vec_ranked: Optional[tuple[List[Dict[str, Any]], Any]] = None
+
+    def __len__(self) -> int:
+        return len(self._index) if self._vectorized else len(self._best)
+
+    @property
+    def engines(self) -> List[str]:
+        return list(self._engines)
+
+    @property
+    def vectorized(self) -> bool:
+        return self._vectorized
+
+    @property
+    def scores(self) -> Dict[str, float]:
+        if self._vectorized:
+            return dict(zip(self._index, self._vec_scores().tolist()))
+        return self._scores
+
+    def _vec_scores(self):
+        return vector_fusion.rrf_scores(
+            *self._hits, self._effective_k(), len(self._index)
+        )
+
+    def _effective_k(self) -> int:
+        max_rank = 10 if self._max_rank is None else self._max_rank
+        return min(self._rrf_k, max(1, max_rank // 2))
+
+    @staticmethod
+    def _term(contribution: float, rank: int, k: int) -> float:
+        denom = float(k + rank)
+        if denom <= 0:
+            denom = float(rank)
+        return contribution / denom
+
+    def add(self, engine: str, results: List[Dict[str, Any]]) -> None:
+        """Fold one engine's ranked list into the fused state.
+
+        Each engine is folded in once; adding an engine again raises
+        ``ValueError`` (its contributions would be counted twice).
+        """
+        if engine in self._engines:
+            raise ValueError(f"engine {engine!r} already added")
+        self._engines.append(engine)
+        self._max_rank = max(self._max_rank or 0, len(results))
+        self._ranked = None
+        self._vec_ranked = None
+
+        # Vectorized scores are computed per ranking, for the current k.
+        k = self._effective_k()
+        if not self._vectorized and self._scores_k is not None and k != self._scores_k:
+            self._scores = {
+                key: sum(self._term(c, rank, k) for c, rank in contribs)
+                for key, contribs in self._contrib.items()
+            }
+        self._scores_k = k
+
+        w = float(self._weights.get(str(engine).lower(), 1.0))
+        if w <= 0:
+            return
+        scoring = self._scoring
+        scoring.prepare(results, self._boosts)
+        hit_key, hit_weight, hit_boost, hit_rank = self._hits
+        rep_pri, rep_first, rep_result, rep_linked = self._reps
+        with scoring.stage("rrf"):
+            for rank, result in enumerate(results, start=1):
+                # Ensure engine field exists.
+                if "engine" not in result:
+                    result["engine"] = engine
+                rec = scoring.features(result)
+                if self._canonicalize:
+                    key = rec.key
+                else:
+                    key = result_link_key(result, False)
+                linked = bool(key)
+                if not linked:
+                    # If link is missing, fall back to a weak identifier.
+                    key = f"no-link:{engine}:{rank}:{self._first_seen}"
+                    self._unlinked.add(key)
+                # Representative selection (prefer higher engine priority)
+                eng = str(result.get("engine", engine)).lower()
+                pri = int(self._priority.get(eng, 0))
+
+                if self._vectorized:
+                    idx = self._index.get(key)
+                    if idx is None:
+                        idx = self._index[key] = len(rep_pri)
+                        rep_pri.append(pri)
+                        rep_first.append(self._first_seen)
+                        rep_result.append(result)
+                        rep_linked.append(linked)
+                    elif pri > rep_pri[idx]:
+                        rep_pri[idx] = pri
+                        rep_result[idx] = result
+                    hit_key.append(idx)
+                    hit_weight.append(w)
+                    hit_boost.append(rec.boost)
+                    hit_rank.append(rank)
+                    self._first_seen += 1
+                    continue
+
+                contribution = w * rec.boost
+                self._contrib.setdefault(key, []).append((contribution, rank))
+                self._scores[key] = self._scores.get(key, 0.0) + self._term(
+                    contribution, rank, k
+                )
+                prev = self._best.get(key)
+                if prev is None:
+                    self._best[key] = (pri, self._first_seen, result)
+                elif pri > prev[0]:
+                    self._best[key] = (pri, prev[1], result)
+                self._first_seen += 1
+
+    def ranking(self, num_results: int = 10) -> List[Dict[str, Any]]:
+        """Fused ranking (title-deduped, relevance-blended), trimmed."""
+        if self._vectorized:
+            return self._vec_ranking(num_results)
+        if self._ranked is None:
+            scores, best = self._scores, self._best
+            with self._scoring.stage("rrf"):
+                ranked_keys = sorted(
+                    scores.keys(),
+                    key=lambda k: (-scores[k], -best[k][0], best[k][1]),
+                )
+            reps = [best[k][2] for k in ranked_keys]
+
+            # Title-based near-duplicate removal (catches mirror sites,
+            # AMP vs non-AMP, mobile vs desktop URLs that escaped URL dedup).
+            with self._scoring.stage("dedup"):
+                keep = _title_dedup_mask(reps, *self._dedup)
+            reps = [r for r, kp in zip(reps, keep) if kp]
+            keys: List[Optional[str]] = [
+                None if k in self._unlinked else k
+                for k, kp in zip(ranked_keys, keep)
+                if kp
+            ]
+
+            # Query-result relevance scoring: boost results whose title/snippet
+            # match query terms, blended with RRF score.
+            if reps:
+                with self._scoring.stage("relevance"):
+                    reps = _blend_relevance(
+                        reps, scores, keys, self._relevance, alpha=0.7
+                    )
+            self._ranked = reps
+        return self._ranked[:num_results]
+
+    def _vec_ranking(self, num_results: int) -> List[Dict[str, Any]]:
+        """:meth:`ranking` over NumPy arrays (same scores, order and ties)."""
+        if self._vec_ranked is None:
+            vf = vector_fusion
+            rep_pri, rep_first, rep_result, rep_linked = self._reps
+            with self._scoring.stage("rrf"):
+                scores = self._vec_scores()
+                order = vf.fused_order(scores, rep_pri, rep_first)
+            reps = [rep_result[i] for i in order.tolist()]
+
+            with self._scoring.stage("dedup"):
+                keep = _title_dedup_mask(reps, *self._dedup)
+            order = order[vf.np.asarray(keep, dtype=bool)]
+            reps = [r for r, kp in zip(reps, keep) if kp]
+
+            with self._scoring.stage("relevance"):
+                final = vf.blend(
+                    scores[order],
+                    vf.np.asarray(rep_linked, dtype=bool)[order],
+                    [self._relevance(r) for r in reps],
+                    float(scores.max()) if len(scores) else 1.0,
+                    alpha=0.7,
+                )
+            self._vec_ranked = (reps, final)
+
+        reps, final = self._vec_ranked
+        return [reps[i] for i in vector_fusion.top_k(final, num_results).tolist()]
+
+
 def merge_and_deduplicate(
     all_results: Dict[str, List[Dict[str, Any]]],
     num_results: int = 10,
     engine_priority: Optional[Dict[str, int]] = None,
     fusion_method: str = "priority",
     rrf_k: int = 60,
-    engine_weights: Optional[Dict[str, float]] = None,
+    engine_weights: Optional[Mapping[str, float]] = None,
     canonicalize_links: bool = True,
-    domain_boosts: Optional[Dict[str, float]] = None,
+    domain_boosts: Optional[Mapping[str, float]] = None,
+    scoring: Any = None,
+    vectorized: Optional[bool] = None,
 ) -> List[Dict[str, Any]]:
     """
     合并多个引擎的结果，去重并排序
@@ -420,91 +761,25 @@ def merge_and_deduplicate(
             "duckduckgo": 1,
         }
 
-    if method in {"rrf", "reciprocal_rank_fusion"}:
+    if method in RRF_METHODS:
         # Reciprocal Rank Fusion across engines.
-        weights = engine_weights or {}
-        boosts = domain_boosts if domain_boosts is not None else _parse_domain_boosts_from_env()
-        scores: Dict[str, float] = {}
-        best: Dict[str, tuple[int, int, Dict[str, Any]]] = {}
-        first_seen = 0
-
-        # Adaptive k: use smaller k for small result sets to preserve
-        # score differentiation between top and bottom ranks.
-        max_rank = max(
-            (len(results) for results in all_results.values()),
-            default=10,
+        acc = RRFAccumulator(
+            rrf_k=rrf_k,
+            engine_weights=engine_weights,
+            engine_priority=engine_priority,
+            canonicalize_links=canonicalize_links,
+            domain_boosts=domain_boosts,
+            scoring=scoring,
+            vectorized=vectorized,
         )
-        effective_k = min(int(rrf_k), max(1, max_rank // 2))
-
         for engine, results in all_results.items():
-            w = float(weights.get(str(engine).lower(), 1.0))
-            if w <= 0:
-                continue
-            for rank, result in enumerate(results, start=1):
-                # Ensure engine field exists.
-                if "engine" not in result:
-                    result["engine"] = engine
-                link = result.get("link")
-                key = (
-                    canonicalize_url(link)
-                    if canonicalize_links
-                    else (str(link) if link else "")
-                )
-                if not key:
-                    # If link is missing, fall back to a weak identifier.
-                    key = f"no-link:{engine}:{rank}:{first_seen}"
-                # Score update
-                denom = float(effective_k + rank)
-                if denom <= 0:
-                    denom = float(rank)
-                host = _host_from_url(link)
-                dm = _domain_multiplier(host, boosts)
-                scores[key] = scores.get(key, 0.0) + ((w * dm) / denom)
-
-                # Representative selection (prefer higher engine priority)
-                eng = str(result.get("engine", engine)).lower()
-                pri = int(engine_priority.get(eng, 0))
-                prev = best.get(key)
-                if prev is None:
-                    best[key] = (pri, first_seen, result)
-                else:
-                    prev_pri, prev_seen, _prev_r = prev
-                    if pri > prev_pri:
-                        best[key] = (pri, prev_seen, result)
-                first_seen += 1
-
-        ranked = sorted(
-            scores.keys(),
-            key=lambda k: (
-                -scores.get(k, 0.0),
-                -best.get(k, (0, 0, {}))[0],
-                best.get(k, (0, 0, {}))[1],
-            ),
-        )
-
-        final_results: List[Dict[str, Any]] = []
-        for k in ranked:
-            _pri, _seen, r = best[k]
-            final_results.append(r)
-
-        # Title-based near-duplicate removal (catches mirror sites,
-        # AMP vs non-AMP, mobile vs desktop URLs that escaped URL dedup).
-        final_results = _dedup_by_title(final_results)
-
-        # Query-result relevance scoring: boost results whose title/snippet
-        # match query terms, blended with RRF score.
-        if final_results:
-            final_results = _blend_relevance(
-                final_results, scores, best, canonicalize_links, alpha=0.7
-            )
-
-        # Trim to requested count.
-        final_results = final_results[:num_results]
+            acc.add(engine, results)
+        final_results = acc.ranking(num_results)
 
         logger.info(
             "Merged results via RRF: engines=%s, unique=%s, final=%s",
             len(all_results),
-            len(best),
+            len(acc),
             len(final_results),
         )
         return final_results
@@ -524,8 +799,7 @@ def merge_and_deduplicate(
         # engine priority (more reliable engines) and stable within-engine order.
         best: Dict[str, tuple[int, int, Dict[str, Any]]] = {}
         for idx, r in enumerate(merged):
-            link = r.get("link")
-            key = canonicalize_url(link) or str(link or "")
+            key = result_link_key(r) or str(r.get("link") or "")
             eng = str(r.get("engine", "unknown")).lower()
             pri = int(engine_priority.get(eng, 0))
             prev = best.get(key)
@@ -0,0 +1,93 @@
+"""NumPy-vectorized RRF scoring for large candidate pools (optional).
+
+:class:`utils.RRFAccumulator` normally keeps running RRF scores in a dict,
+rebuilds them in Python when the adaptive ``k`` changes, sorts the unique
+results with a multi-key lambda and blends relevance in a loop.  With NumPy
+installed (and ``CRAWL4AI_FUSION_VECTORIZED`` not disabled) it instead keeps
+one row per engine hit - unique-URL index, engine weight, domain multiplier,
+rank - and computes, per ranking:
+
+- RRF scores per unique URL with one ``bincount`` (hits are summed in the
+  order they were added, exactly like the dict path)
+- the fused order with ``lexsort`` on (score, engine priority, first seen)
+- the relevance blend elementwise, and the top-k with ``argpartition``
+
+Every float operation is the one the Python path performs, in the same
+order, so rankings are identical; only the loops and sorts move to C.
+Without NumPy :data:`HAVE_NUMPY` is False and the Python path is used.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+HAVE_NUMPY = np is not None
+
+
+def rrf_scores(
+    key_idx: Sequence[int],
+    weights: Sequence[float],
+    boosts: Sequence[float],
+    ranks: Sequence[int],
+    k: int,
+    n_keys: int,
+):
+    """Per-key ``sum(weight * boost / (k + rank))`` over hits, in hit order."""
+    contrib = np.asarray(weights, dtype=np.float64) * np.asarray(boosts, dtype=np.float64)
+    rank = np.asarray(ranks, dtype=np.int64)
+    denom = k + rank
+    denom = np.where(denom <= 0, rank, denom).astype(np.float64)
+    return np.bincount(
+        np.asarray(key_idx, dtype=np.intp), weights=contrib / denom, minlength=n_keys
+    )
+
+
+def fused_order(scores, priority: Sequence[int], first_seen: Sequence[int]):
+    """Key indices by (-score, -priority, first_seen), as ``sorted()`` would."""
+    return np.lexsort((
+        np.asarray(first_seen, dtype=np.int64),
+        -np.asarray(priority, dtype=np.int64),
+        -scores,
+    ))
+
+
+def blend(rrf, linked, relevance, max_rrf: float, alpha: float = 0.7):
+    """``alpha * rrf / max_rrf + (1 - alpha) * relevance / max(relevance)``.
+
+    *rrf* are the scores of the ranked results; unlinked ones (``linked``
+    False) contribute no RRF share, as in ``utils._blend_relevance``.
+    """
+    rel = np.asarray(relevance, dtype=np.float64)
+    if max_rrf > 0:
+        rrf_norm = np.where(linked, rrf, 0.0) / max_rrf
+    else:
+        rrf_norm = np.zeros(len(rel))
+    max_rel = rel.max() if len(rel) else 0.0
+    rel_norm = rel / max_rel if max_rel > 0 else np.zeros(len(rel))
+    return alpha * rrf_norm + (1.0 - alpha) * rel_norm
+
+
+def top_k(final, k: int):
+    """Positions of the *k* best *final* scores, ties kept in position order.
+
+    Equivalent to a stable sort on ``-final`` truncated to *k*; only the
+    candidates at or above the k-th score are sorted.
+    """
+    n = len(final)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        cut = final[np.argpartition(-final, k - 1)[k - 1]]
+        candidates = np.flatnonzero(final >= cut)
+    else:
+        candidates = np.arange(n)
+    order = np.lexsort((candidates, -final[candidates]))
+    return candidates[order[:k]]
+
+
+__all__ = ["HAVE_NUMPY", "blend", "fused_order", "rrf_scores", "top_k"]
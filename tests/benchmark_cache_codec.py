@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+缓存存储格式基准测试 - 旧版 JSON TEXT vs cache_codec（列式 + zlib）
+
+比较：数据库文件大小、导出文件大小、数据库命中的结果解码耗时，以及内存层
+命中（保存解码后的结果，不再 json.loads）的耗时。
+用法: python tests/benchmark_cache_codec.py [条目数]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import cache_codec
+from src.persistent_cache import PersistentCache
+
+WORDS = (
+    "fusion plasma tokamak stellarator tritium deuterium magnetic confinement "
+    "divertor blanket ITER reactor energy neutron heating current density "
+    "聚变 等离子体 托卡马克 磁约束 偏滤器 包层 中子 加热 能量 反应堆"
+).split()
+SITES = ("en.wikipedia.org", "www.iter.org", "arxiv.org", "www.nature.com", "news.example.com")
+
+
+def make_results(rng: random.Random, n: int = 10):
+    results = []
+    for i in range(n):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 9)))
+        results.append({
+            "title": title.title(),
+            "link": f"https://{rng.choice(SITES)}/{'-'.join(title.split()[:4])}/{rng.randint(1, 99999)}",
+            "snippet": " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 40))),
+            "source": rng.choice(("google", "brave", "duckduckgo", "searxng")),
+            "engine": "auto",
+            "rank": i + 1,
+            "score": round(rng.random(), 6),
+        })
+    return results
+
+
+def fill(path: str, entries, legacy: bool) -> PersistentCache:
+    cache = PersistentCache(db_path=path, max_size=len(entries) + 1, enable_memory_cache=False)
+    for q, results in entries:
+        cache.set(q, "auto", len(results), results)
+    if legacy:
+        with cache._get_connection() as conn:
+            rows = conn.execute("SELECT key, results FROM search_cache").fetchall()
+            conn.executemany(
+                "UPDATE search_cache SET results = ? WHERE key = ?",
+                [
+                    (json.dumps(cache_codec.decode(r["results"]), ensure_ascii=False), r["key"])
+                    for r in rows
+                ],
+            )
+    with cache._get_connection() as conn:
+        conn.execute("VACUUM")
+    return cache
+
+
+def decode_time(values, decode, rounds: int = 3) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for v in values:
+            decode(v)
+        best = min(best, time.perf_counter() - start)
+    return best / len(values) * 1e6
+
+
+def main(n: int = 2000) -> None:
+    rng = random.Random(42)
+    entries = [(f"query {i} {rng.choice(WORDS)}", make_results(rng)) for i in range(n)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = fill(os.path.join(tmp, "legacy.db"), entries, legacy=True)
+        legacy_export = os.path.join(tmp, "legacy.json")
+        with legacy._get_connection() as conn:
+            legacy_values = [r[0] for r in conn.execute("SELECT results FROM search_cache")]
+            pretty = {
+                "entries": [
+                    {"query": q, "results": results} for q, results in entries
+                ]
+            }
+        with open(legacy_export, "w", encoding="utf-8") as f:
+            json.dump(pretty, f, ensure_ascii=False, indent=2)
+
+        compact = fill(os.path.join(tmp, "codec.db"), entries, legacy=False)
+        compact_export = os.path.join(tmp, "codec.bin")
+        compact.export_to_json(compact_export)
+        with compact._get_connection() as conn:
+            codec_values = [r[0] for r in conn.execute("SELECT results FROM search_cache")]
+
+        sizes = {
+            "db (JSON TEXT)": os.path.getsize(os.path.join(tmp, "legacy.db")),
+            "db (zlib codec)": os.path.getsize(os.path.join(tmp, "codec.db")),
+            "export (indent=2 JSON)": os.path.getsize(legacy_export),
+            "export (binary)": os.path.getsize(compact_export),
+        }
+        payload = {
+            "results JSON TEXT": sum(len(v.encode("utf-8")) for v in legacy_values),
+            "results codec BLOB": sum(len(v) for v in codec_values),
+        }
+        json_us = decode_time(legacy_values, json.loads)
+        codec_us = decode_time(codec_values, cache_codec.decode)
+
+        # 内存层命中：旧版内存层保存 JSON 字符串、每次命中 json.loads；
+        # 现在保存解码后的结果
+        warm = PersistentCache(
+            db_path=os.path.join(tmp, "codec.db"),
+            max_size=n + 1,
+            memory_max_bytes=1 << 30,
+        )
+        for q, results in entries:
+            warm.get(q, "auto", len(results))
+        start = time.perf_counter()
+        for q, results in entries:
+            warm.get(q, "auto", len(results))
+        memory_hit_us = (time.perf_counter() - start) / n * 1e6
+
+    print("=" * 60)
+    print(f"缓存存储格式基准测试（{n} 个条目，每条 10 个结果）")
+    print("=" * 60)
+    for label, size in {**sizes, **payload}.items():
+        print(f"  {label:<24} {size / 1024:>10.1f} KiB")
+    print(f"  db 缩小:      {sizes['db (JSON TEXT)'] / sizes['db (zlib codec)']:.2f}x")
+    print(f"  结果列缩小:   {payload['results JSON TEXT'] / payload['results codec BLOB']:.2f}x")
+    print(f"  导出缩小:     {sizes['export (indent=2 JSON)'] / sizes['export (binary)']:.2f}x")
+    print(f"  解码 json.loads:        {json_us:8.1f} µs/条目")
+    print(f"  解码 cache_codec.decode: {codec_us:8.1f} µs/条目")
+    print(f"  内存层命中 get()（无解码）: {memory_hit_us:8.1f} µs/条目")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+域名加权基准测试 - 逐条扫描全部加权域名 vs 编译后的后缀索引（DomainBoostIndex）
+
+每个请求约 80 个候选结果（all 模式），加权域名表从 8 条增长到 1000 条。
+用法: python tests/benchmark_domain_boosts.py [请求数]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.settings import DEFAULT_DOMAIN_BOOSTS, normalize_host
+from src.utils import DomainBoostIndex
+
+
+def linear_multiplier(host, boosts):
+    """The previous implementation (re-normalize and re-parse every entry)."""
+    if not host or not boosts:
+        return 1.0
+    h = normalize_host(host)
+    if not h:
+        return 1.0
+    best = 1.0
+    for dom, mult in boosts.items():
+        d = normalize_host(dom)
+        if not d:
+            continue
+        try:
+            m = float(mult)
+        except Exception:
+            continue
+        if m <= 0:
+            continue
+        if (h == d or h.endswith("." + d)) and m > best:
+            best = m
+    return best
+
+
+def main() -> None:
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(23)
+    tlds = ("org", "gov", "edu", "ac.cn", "go.jp", "europa.eu", "de", "fr")
+    print(f"{'域名数':>6} {'逐条扫描 ms/请求':>16} {'后缀索引 ms/请求':>16} {'加速':>8}")
+    for size in (len(DEFAULT_DOMAIN_BOOSTS), 100, 300, 1000):
+        boosts = dict(DEFAULT_DOMAIN_BOOSTS)
+        while len(boosts) < size:
+            boosts[f"lab{len(boosts)}.{rng.choice(tlds)}"] = round(rng.uniform(1.05, 1.4), 2)
+        domains = list(boosts)
+        hosts = [
+            rng.choice(("www.", "docs.", "")) + (
+                rng.choice(domains) if rng.random() < 0.3
+                else f"site{rng.randrange(10**6)}.{rng.choice(tlds)}"
+            )
+            for _ in range(80 * n_requests)
+        ]
+
+        start = time.perf_counter()
+        old = [linear_multiplier(h, boosts) for h in hosts]
+        linear = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = DomainBoostIndex(boosts)  # built once per reload, counted anyway
+        new = [index.multiplier(h) for h in hosts]
+        compiled = time.perf_counter() - start
+        assert old == new
+
+        print(f"{size:>6} {linear / n_requests * 1e3:>16.3f} "
+              f"{compiled / n_requests * 1e3:>16.3f} {linear / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+RRF 融合打分基准测试 - 纯 Python（dict 累加 + 多键 lambda 排序 + 循环混合）
+vs NumPy 向量化（bincount + lexsort + 逐元素混合 + argpartition 取 top-k）
+
+4 个引擎各返回 N 条结果（链接跨引擎部分重叠），每个请求做一次 RRF 合并并取前 10。
+分别给出完整合并（含标题去重、相关性记录构建）与其中打分/排序部分的每请求耗时，
+并校验两条路径的排名完全一致。
+用法: python tests/benchmark_fusion_vectorized.py [请求数]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import utils
+from src.scoring import ScoringMetrics, ScoringPipeline
+from src.search import SearchResult
+
+ENGINES = ("google", "brave", "searxng", "duckduckgo")
+_rng = random.Random(7)
+WORDS = (
+    "fusion plasma tokamak stellarator tritium deuterium magnetic confinement "
+    "divertor blanket reactor energy neutron heating current density iter"
+).split() + [
+    "".join(_rng.choice("etaoinshrdlucmfwypvbgk") for _ in range(_rng.randint(3, 10)))
+    for _ in range(600)
+]
+QUERY = "tokamak plasma confinement"
+
+
+def make_request(rng: random.Random, per_engine: int):
+    pool = [f"https://site{i}.example.org/p{i % 13}" for i in range(per_engine * 3)]
+    out = {}
+    for engine in ENGINES:
+        rows = []
+        for link in rng.sample(pool, per_engine):
+            title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 9)))
+            rows.append(SearchResult(title, link, "snippet " + title, engine).to_dict())
+        out[engine] = rows
+    return out
+
+
+def run(requests, vectorized: bool):
+    metrics = ScoringMetrics()
+    rankings = []
+    start = time.perf_counter()
+    for req in requests:
+        acc = utils.RRFAccumulator(
+            rrf_k=60,
+            scoring=ScoringPipeline(QUERY, metrics=metrics),
+            vectorized=vectorized,
+        )
+        for engine, results in req.items():
+            acc.add(engine, results)
+        rankings.append(acc.ranking(10))
+    elapsed = time.perf_counter() - start
+    stats = metrics.snapshot()
+    scoring_ms = sum(stats[s]["cpu_ms_total"] for s in ("rrf", "relevance"))
+    return rankings, elapsed, scoring_ms
+
+
+def main() -> None:
+    if not utils.vector_fusion.HAVE_NUMPY:
+        print("未安装 numpy，无法对比")
+        return
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rng = random.Random(25)
+    print(f"{'每引擎':>6} {'唯一结果':>8} {'完整 Python':>12} {'完整 NumPy':>11} "
+          f"{'打分 Python':>12} {'打分 NumPy':>11} {'打分加速':>8}  (ms/请求)")
+    for per_engine in (10, 25, 50, 100, 250, 500):
+        requests = [make_request(rng, per_engine) for _ in range(n_requests)]
+        unique = len({
+            utils.result_link_key(r) for req in requests[:1] for rs in req.values() for r in rs
+        })
+        old, py_s, py_score = run(requests, vectorized=False)
+        new, np_s, np_score = run(requests, vectorized=True)
+        assert old == new
+        print(f"{per_engine:>6} {unique:>8} {py_s / n_requests * 1e3:>12.3f} "
+              f"{np_s / n_requests * 1e3:>11.3f} {py_score / n_requests:>12.3f} "
+              f"{np_score / n_requests:>11.3f} {py_score / max(np_score, 1e-9):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
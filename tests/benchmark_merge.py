@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+合并路径基准测试 - 每次请求重新解析 URL vs 入库时预计算 canonical_url/host
+
+模拟一次 auto 搜索：4 个引擎各返回 N 条结果，提前返回（early return）路径
+对部分结果做多次合并，最后再做一次完整 RRF 合并。比较：
+- baseline：结果不带 canonical_url/host，canonicalize_url/host 解析不做缓存
+- precomputed：结果由 SearchResult 创建（创建时计算 canonical_url/host，预热 LRU 缓存）
+分别给出 URL 键/host 计算（合并中按链接去重与域名加权所需的部分）和完整合并
+（另含标题去重、相关性混合）的每请求耗时。
+用法: python tests/benchmark_merge.py [请求数] [每引擎结果数]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import utils
+from src.search import SearchResult
+
+ENGINES = ("google", "brave", "searxng", "duckduckgo")
+WORDS = (
+    "fusion plasma tokamak stellarator tritium deuterium magnetic confinement "
+    "divertor blanket reactor energy neutron heating current density ITER"
+).split()
+SITES = (
+    "en.wikipedia.org", "www.iter.org", "arxiv.org", "www.nature.com",
+    "www.iaea.org", "news.example.com", "www.sciencedirect.com",
+)
+TRACKING = ("", "?utm_source=feed", "?ref=nav&id=3", "#section-2", "/?gclid=abc")
+
+
+def make_request(rng: random.Random, per_engine: int, pool):
+    """One request's raw engine results; links overlap across engines."""
+    out = {}
+    for engine in ENGINES:
+        rows = []
+        for rank in range(per_engine):
+            base = rng.choice(pool)
+            link = base + rng.choice(TRACKING)
+            title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 9)))
+            rows.append((title.title(), link, "snippet " * 20, engine))
+        out[engine] = rows
+    return out
+
+
+def as_dicts(raw, precompute: bool):
+    results = {}
+    for engine, rows in raw.items():
+        if precompute:
+            results[engine] = [SearchResult(*row).to_dict() for row in rows]
+        else:
+            results[engine] = [
+                {"title": t, "link": l, "snippet": s, "source": src}
+                for t, l, s, src in rows
+            ]
+        for r in results[engine]:
+            r["engine"] = engine
+    return results
+
+
+def key_request(results):
+    # What every merge does per result: the dedup key and the boost host,
+    # once per partial merge on the early-return path.
+    for n in range(1, len(ENGINES) + 1):
+        for engine in ENGINES[:n]:
+            for r in results[engine]:
+                utils.result_link_key(r)
+                r.get("host") or utils.host_from_url(r.get("link"))
+
+
+def merge_request(results, num_results: int = 10):
+    # Early-return path: merge after each engine finishes, then the final merge.
+    partial = {}
+    for engine in ENGINES:
+        partial[engine] = results[engine]
+        utils.merge_and_deduplicate(
+            dict(partial), num_results=num_results, fusion_method="rrf"
+        )
+
+
+def run(requests, precompute: bool, stage) -> float:
+    memo = (utils._canonicalize, utils._host_of)
+    if not precompute:
+        utils._canonicalize = memo[0].__wrapped__
+        utils._host_of = memo[1].__wrapped__
+    try:
+        start = time.perf_counter()
+        for raw in requests:
+            stage(as_dicts(raw, precompute))
+        return time.perf_counter() - start
+    finally:
+        utils._canonicalize, utils._host_of = memo
+
+
+def main() -> None:
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    per_engine = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rng = random.Random(21)
+    pool = [
+        f"https://{rng.choice(SITES)}/wiki/topic-{i}/page"
+        for i in range(max(200, n_requests * per_engine // 4))
+    ]
+    requests = [make_request(rng, per_engine, pool) for _ in range(n_requests)]
+
+    run(requests[:20], True, merge_request)  # warm imports
+    print(f"请求数: {n_requests}  每引擎结果: {per_engine}  引擎: {len(ENGINES)}"
+          f"  (precomputed 含创建 SearchResult)")
+    for label, stage in (("URL 键/host", key_request), ("完整合并", merge_request)):
+        utils._canonicalize.cache_clear()
+        utils._host_of.cache_clear()
+        baseline = run(requests, False, stage)
+        precomputed = run(requests, True, stage)
+        info = utils._canonicalize.cache_info()
+        print(f"{label}: baseline {baseline / n_requests * 1e3:7.3f} ms/请求  "
+              f"precomputed {precomputed / n_requests * 1e3:7.3f} ms/请求  "
+              f"加速 {baseline / precomputed:.2f}x  "
+              f"canonicalize 缓存命中率 {info.hits / max(1, info.hits + info.misses):.0%}")
+
+
+if __name__ == "__main__":
+    main()
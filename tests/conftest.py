@@ -0,0 +1,64 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.search import SearchManager  # noqa: E402
+from src.settings import reload_settings  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_settings_snapshot():
+    """Keep the process-wide settings snapshot in sync with the test env.
+
+    Runtime settings are parsed once (see src/settings.py); tests that change
+    env vars call ``reload_settings()`` explicitly.  Rebuilding around every
+    test stops one test's env from leaking into the next via the snapshot.
+    """
+    reload_settings()
+    yield
+    reload_settings()
+
+
+@pytest.fixture
+def make_manager(monkeypatch):
+    """Factory for a ``SearchManager`` over stub engines.
+
+    Real engine initialization is skipped and monitoring is off.  ``env`` is
+    applied (and settings reloaded) before the manager is built, so
+    construction-time settings see it.  Engines may declare their type with
+    an ``_engine_type`` attribute; otherwise the manager's class-name
+    detection applies.
+    """
+    monkeypatch.setattr(SearchManager, "_initialize_engines", lambda self: None)
+    detect = SearchManager._get_engine_type
+
+    def make(
+        engines=(),
+        *,
+        fallback=(),
+        env=None,
+        enable_cache=False,
+        enable_rate_limit=False,
+        **kwargs,
+    ):
+        if env:
+            for key, value in env.items():
+                monkeypatch.setenv(key, value)
+            reload_settings()
+        sm = SearchManager(
+            enable_cache=enable_cache,
+            enable_rate_limit=enable_rate_limit,
+            enable_monitoring=False,
+            **kwargs,
+        )
+        sm._get_engine_type = (
+            lambda engine: getattr(engine, "_engine_type", None) or detect(sm, engine)
+        )
+        sm.engines = list(engines)
+        sm.fallback_engines = list(fallback)
+        return sm
+
+    return make
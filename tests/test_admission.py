@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from src.admission import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    AdmissionRejected,
+    FairScheduler,
+)
+from src.deadline import Deadline
+from src.request_context import set_client_id
+from src.search import SearchEngine, SearchResult
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _queue(sched, order, client, priority=PRIORITY_INTERACTIVE):
+    await sched.acquire(client, priority)
+    order.append(client)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_chatty_client_does_not_starve_others():
+    sched = FairScheduler(1)
+    await sched.acquire("holder")
+    order = []
+    tasks = [asyncio.create_task(_queue(sched, order, "chatty")) for _ in range(5)]
+    await _settle()
+    tasks.append(asyncio.create_task(_queue(sched, order, "quiet")))
+    await _settle()
+    assert sched.queued == 6
+
+    for _ in range(6):
+        sched.release()
+        await _settle()
+    await asyncio.gather(*tasks)
+
+    # FIFO would serve all five chatty requests first.
+    assert order[:2] == ["chatty", "quiet"]
+    assert sched.in_use == 1 and sched.queued == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_interactive_gets_weighted_share_over_batch():
+    sched = FairScheduler(1)
+    await sched.acquire("holder")
+    order = []
+    tasks = [
+        asyncio.create_task(_queue(sched, order, "bulk", PRIORITY_BATCH))
+        for _ in range(10)
+    ] + [
+        asyncio.create_task(_queue(sched, order, "user", PRIORITY_INTERACTIVE))
+        for _ in range(10)
+    ]
+    await _settle()
+
+    for _ in range(20):
+        sched.release()
+        await _settle()
+    await asyncio.gather(*tasks)
+
+    assert order[:10].count("user") == 8
+    assert sorted(order) == ["bulk"] * 10 + ["user"] * 10
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rejects_fast_when_queue_is_full():
+    sched = FairScheduler(1, max_queue=2)
+    await sched.acquire("a")
+    waiters = [asyncio.create_task(sched.acquire("a")) for _ in range(2)]
+    await _settle()
+
+    with pytest.raises(AdmissionRejected) as exc:
+        await sched.acquire("b")
+    assert exc.value.reason == "queue full"
+    assert exc.value.retry_after_s > 0
+    assert sched.snapshot()["rejected_full"] == 1
+
+    for w in waiters:
+        w.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    assert sched.queued == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rejects_when_wait_exceeds_deadline():
+    sched = FairScheduler(1)
+    await sched.acquire("a")
+    sched.release(held_s=1.0)  # observed: a search holds a slot for ~1s
+    await sched.acquire("a")
+    waiter = asyncio.create_task(sched.acquire("a"))
+    await _settle()
+
+    with pytest.raises(AdmissionRejected) as exc:
+        await sched.acquire("b", deadline=Deadline.after(0.5))
+    assert exc.value.retry_after_s >= 1.0
+
+    # Without an estimate, a queued request is rejected once its deadline passes.
+    fresh = FairScheduler(1)
+    await fresh.acquire("a")
+    with pytest.raises(AdmissionRejected, match="expired while queued"):
+        await fresh.acquire("b", deadline=Deadline.after(0.05))
+    assert fresh.queued == 0
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+
+class GoogleSlowEngine(SearchEngine):
+    _engine_type = "google"
+
+    async def search(self, query, num_results=10):
+        await asyncio.sleep(0.03)
+        return [SearchResult(title=query, link=f"https://x.test/{query}", snippet="", source="google")]
+
+
+@pytest.mark.asyncio
+async def test_search_manager_interleaves_clients(make_manager):
+    sm = make_manager(
+        [GoogleSlowEngine()], env={"CRAWL4AI_MAX_CONCURRENT_SEARCHES": "1"}
+    )
+
+    finished = []
+
+    async def run(client, query):
+        set_client_id(client)
+        await sm.search(query, num_results=1, engine="google")
+        finished.append(client)
+
+    tasks = [asyncio.create_task(run("chatty", f"q{i}")) for i in range(4)]
+    await _settle()
+    tasks.append(asyncio.create_task(run("quiet", "other")))
+    await asyncio.gather(*tasks)
+
+    # One chatty search runs, one chatty waiter is ahead; FIFO would finish quiet last.
+    assert finished == ["chatty", "chatty", "quiet", "chatty", "chatty"]
+    stats = sm.get_admission_stats()
+    assert stats["enabled"] and stats["admitted"] == 5 and stats["in_use"] == 0
@@ -5,7 +5,8 @@ import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.search import SearchManager, SearchEngine, SearchResult
+from src.search import SearchEngine, SearchResult
+from src.settings import reload_settings
 
 
 class _DummyEngine(SearchEngine):
@@ -28,22 +29,16 @@ class _DummyEngine(SearchEngine):
 
 
 @pytest.mark.asyncio
-async def test_auto_merge_opt_in_merges_and_sorts(monkeypatch):
-    # Prevent SearchManager from initializing real engines.
-    monkeypatch.setattr(SearchManager, "_initialize_engines", lambda self: None)
-
-    sm = SearchManager(enable_cache=False, enable_rate_limit=False, enable_monitoring=False)
-    # Make SearchManager treat our dummy engines as the intended engine types.
-    sm._get_engine_type = lambda engine: getattr(engine, "_engine_type", "unknown")
-    sm.engines = [
+async def test_auto_merge_opt_in_merges_and_sorts(monkeypatch, make_manager):
+    sm = make_manager([
         _DummyEngine("brave", ["brave-1", "brave-2"]),
         _DummyEngine("google", ["google-1", "google-2"]),
-    ]
-    sm.fallback_engines = []
+    ])
 
     monkeypatch.setenv("CRAWL4AI_AUTO_MERGE", "1")
     monkeypatch.setenv("CRAWL4AI_AUTO_MERGE_MIN_ENGINES", "2")
     monkeypatch.setenv("CRAWL4AI_AUTO_MERGE_MAX_ENGINES", "2")
+    reload_settings()
 
     results = await sm.search("test query", num_results=2, engine="auto")
 
@@ -53,18 +48,14 @@ async def test_auto_merge_opt_in_merges_and_sorts(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_auto_default_keeps_first_engine_order(monkeypatch):
-    monkeypatch.setattr(SearchManager, "_initialize_engines", lambda self: None)
-
-    sm = SearchManager(enable_cache=False, enable_rate_limit=False, enable_monitoring=False)
-    sm._get_engine_type = lambda engine: getattr(engine, "_engine_type", "unknown")
-    sm.engines = [
+async def test_auto_default_keeps_first_engine_order(monkeypatch, make_manager):
+    sm = make_manager([
         _DummyEngine("brave", ["brave-1", "brave-2"]),
         _DummyEngine("google", ["google-1", "google-2"]),
-    ]
-    sm.fallback_engines = []
+    ])
 
     monkeypatch.delenv("CRAWL4AI_AUTO_MERGE", raising=False)
+    reload_settings()
 
     results = await sm.search("test query", num_results=2, engine="auto")
 
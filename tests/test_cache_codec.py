@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from src import cache_codec
+from src.persistent_cache import PersistentCache
+
+
+RESULTS = [
+    {"title": "托卡马克", "link": "https://a.test/1", "snippet": "磁约束", "score": 0.5},
+    {"title": "B", "link": "https://a.test/2", "snippet": "", "score": 0.25},
+    {"link": "https://a.test/3", "title": "reordered keys"},
+    {"title": "extra", "link": "https://a.test/4", "snippet": "", "score": 1, "stale": True},
+]
+
+
+@pytest.mark.unit
+def test_codecs_round_trip_and_reject_unknown_ids():
+    for name in ("json", "zlib"):
+        blob = cache_codec.encode(RESULTS, name)
+        assert blob[0] == cache_codec.get_codec(name).codec_id
+        decoded = cache_codec.decode(blob)
+        assert decoded == RESULTS
+        assert [list(r) for r in decoded] == [list(r) for r in RESULTS]
+        assert cache_codec.decode(cache_codec.encode([], name)) == []
+
+    assert cache_codec.decode(json.dumps(RESULTS, ensure_ascii=False)) == RESULTS
+    with pytest.raises(ValueError, match="codec id"):
+        cache_codec.decode(b"\x7fxyz")
+    with pytest.raises(ValueError, match="unknown cache codec"):
+        cache_codec.get_codec("nope")
+
+    class ReversedCodec(cache_codec.Codec):
+        name = "reversed"
+        codec_id = 0x7E
+
+        def encode_payload(self, items):
+            return super().encode_payload(list(reversed(items)))
+
+        def decode_payload(self, payload):
+            return list(reversed(super().decode_payload(payload)))
+
+    cache_codec.register_codec(ReversedCodec())
+    assert cache_codec.decode(cache_codec.encode(RESULTS, "reversed")) == RESULTS
+
+
+@pytest.mark.unit
+def test_legacy_text_rows_migrate_and_exports_round_trip(tmp_path):
+    db = str(tmp_path / "codec.db")
+    cache = PersistentCache(db_path=db, enable_memory_cache=False)
+    cache.set("new", "auto", 4, RESULTS)
+    with cache._get_connection() as conn:
+        # A row as written by earlier versions: JSON TEXT.
+        conn.execute(
+            "UPDATE search_cache SET results = ? WHERE query = 'new'",
+            (json.dumps(RESULTS, ensure_ascii=False),),
+        )
+    cache.set("other", "auto", 4, RESULTS[:2])
+
+    assert cache.get("new", "auto", 4) == RESULTS
+    assert cache.migrate_storage() == 1
+    with cache._get_connection() as conn:
+        kinds = {r[0] for r in conn.execute("SELECT typeof(results) FROM search_cache")}
+    assert kinds == {"blob"}
+    assert cache.get("new", "auto", 4) == RESULTS
+
+    for name in ("dump.bin", "dump.json"):
+        path = str(tmp_path / name)
+        assert cache.export_to_json(path) == 2
+        fresh = PersistentCache(db_path=str(tmp_path / f"{name}.db"), enable_memory_cache=False)
+        assert fresh.import_from_json(path) == 2
+        assert fresh.get("other", "auto", 2) == RESULTS[:2]
+    with open(tmp_path / "dump.bin", "rb") as f:
+        assert f.read(len(cache_codec.EXPORT_MAGIC)) == cache_codec.EXPORT_MAGIC
+    assert "\n" not in (tmp_path / "dump.json").read_text(encoding="utf-8")
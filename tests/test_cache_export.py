@@ -0,0 +1,97 @@
+import gzip
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src import cache_codec, index
+from src.cache import SearchCache
+from src.persistent_cache import PersistentCache
+
+
+def _r(name):
+    return [{"title": name, "link": f"https://e.test/{name}", "snippet": ""}]
+
+
+@pytest.mark.unit
+def test_streaming_export_filters_and_batched_import(tmp_path):
+    cache = PersistentCache(db_path=str(tmp_path / "src.db"), enable_memory_cache=False)
+    for i in range(7):
+        cache.set(f"q{i}", "brave" if i % 2 else "auto", 1, _r(str(i)))
+    with cache._get_connection() as conn:
+        conn.execute("UPDATE search_cache SET timestamp = timestamp - 100")
+        cutoff = conn.execute("SELECT MAX(timestamp) FROM search_cache").fetchone()[0]
+    cache.set("late", "auto", 1, _r("late"))
+
+    full = tmp_path / "full.ndjson.gz"
+    assert cache.export_to_json(str(full)) == 8
+    with gzip.open(full, "rt", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert lines[0]["format"] == cache_codec.EXPORT_FORMAT
+    assert len(lines) == 9 and {e["query"] for e in lines[1:]} >= {"q0", "late"}
+
+    delta = tmp_path / "delta.jsonl"
+    assert cache.export_to_json(str(delta), since=cutoff) == 1
+    assert cache.export_to_json(str(tmp_path / "b.bin"), engine="brave") == 3
+    assert cache.export_to_json(str(tmp_path / "new.json"), max_age=50) == 1
+
+    target = PersistentCache(
+        db_path=str(tmp_path / "dst.db"), max_size=5, enable_memory_cache=False
+    )
+    assert target.import_from_json(str(full), engine="auto", batch_size=2) == 5
+    assert target.import_from_json(str(tmp_path / "b.bin"), batch_size=2) == 3
+    assert target.get_stats()["size"] == 5  # trimmed back to max_size
+    assert target.import_from_json(str(full), max_age=50) == 1
+    assert target.get("late", "auto", 1) == _r("late")
+
+    mem = SearchCache()
+    assert mem.import_from_json(str(full), engine="brave") == 3
+    assert mem.export_to_json(str(tmp_path / "mem.ndjson"), engine="brave") == 3
+    assert mem.get("q1", "brave", 1) == _r("1")
+
+
+@pytest.mark.unit
+def test_older_export_formats_still_import(tmp_path):
+    cache = PersistentCache(db_path=str(tmp_path / "c.db"), enable_memory_cache=False)
+    cache.set("a", "auto", 1, _r("a"))
+    cache.export_to_json(str(tmp_path / "x.ndjson"))
+    entries = list(cache_codec.iter_export(tmp_path / "x.ndjson"))
+
+    indented = tmp_path / "old.json"
+    indented.write_text(json.dumps({"ttl": 3600, "entries": entries}, indent=2))
+    v1 = tmp_path / "old.bin"
+    v1.write_bytes(b"C4AC\x01" + cache_codec.encode(entries))
+
+    for path in (indented, v1):
+        fresh = SearchCache()
+        assert fresh.import_from_json(str(path)) == 1
+        assert fresh.get("a", "auto", 1) == _r("a")
+
+
+@pytest.mark.asyncio
+async def test_manage_cache_export_and_import_run_off_the_event_loop(tmp_path, monkeypatch):
+    cache = PersistentCache(db_path=str(tmp_path / "c.db"), enable_memory_cache=False)
+    cache.set("a", "auto", 1, _r("a"))
+    threads = []
+    for name in ("export_to_json", "import_from_json"):
+        method = getattr(cache, name)
+
+        def record(*args, _method=method, **kwargs):
+            threads.append(threading.get_ident())
+            return _method(*args, **kwargs)
+
+        monkeypatch.setattr(cache, name, record)
+
+    async def fake_init():
+        return None
+
+    monkeypatch.setattr(index, "initialize_search_manager", fake_init)
+    monkeypatch.setattr(index, "search_manager", SimpleNamespace(cache=cache))
+    path = str(tmp_path / "x.ndjson")
+    exported = json.loads(await index.manage_cache("export", export_path=path))
+    imported = json.loads(await index.manage_cache("import", export_path=path))
+
+    assert exported["message"] == "Exported 1 entries"
+    assert imported["message"] == "Imported 1 entries"
+    assert len(threads) == 2 and threading.get_ident() not in threads
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from src.admission import PRIORITY_BACKGROUND
+from src.persistent_cache import PersistentCache
+from src.request_context import get_priority
+from src.search import SearchEngine, SearchResult
+
+
+class GoogleRecordingEngine(SearchEngine):
+    def __init__(self):
+        self.calls = []
+
+    async def search(self, query, num_results=10):
+        self.calls.append((query, get_priority()))
+        await asyncio.sleep(0.01)
+        return [SearchResult(title=query, link=f"https://w.test/{query}", snippet="", source="google")]
+
+
+def _manager(make_manager):
+    engine = GoogleRecordingEngine()
+    sm = make_manager(
+        [engine],
+        env={
+            "CRAWL4AI_ENGINE_CACHE_TTL_S": "0",
+            "CRAWL4AI_CACHE_STALE_WHILE_REVALIDATE_S": "300",
+            "CRAWL4AI_CACHE_TTL_POLICY": "fixed",
+        },
+        enable_cache=True,
+        cache_ttl=60,
+    )
+    return sm, engine
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_warmup_refreshes_only_missing_or_stale_entries(make_manager):
+    sm, engine = _manager(make_manager)
+    for q in ("hot", "cold"):
+        await sm.search(q, 5, "google")
+    for _ in range(3):
+        await sm.search("hot", 5, "google")
+    hits_before = sm.cache.hits
+
+    status = await sm.warm_cache(["hot", "new"], engine="google", num_results=5)
+    assert (status["state"], status["total"], status["done"]) == ("done", 2, 2)
+    assert (status["cached"], status["warmed"], status["failed"]) == (1, 1, 0)
+    assert sm.cache.hits == hits_before  # freshness checks are not hits
+    assert engine.calls[-1] == ("new", PRIORITY_BACKGROUND)
+
+    # Top-N by hit count: everything is stale, only "hot" is refreshed.
+    for entry in sm.cache._cache.values():
+        entry.timestamp -= 70
+    calls = len(engine.calls)
+    status = await sm.warm_cache(top_n=1)
+    assert (status["source"], status["total"], status["warmed"]) == ("top_hits", 1, 1)
+    assert [q for q, _ in engine.calls[calls:]] == ["hot"]
+
+    # Background start: one warmup at a time, progress visible.
+    started = sm.start_cache_warmup(["x", "y"], engine="google")
+    assert started["state"] == "running"
+    assert sm.start_cache_warmup(["z"])["started_at"] == started["started_at"]
+    await sm._warmup_task
+    assert sm.cache_warmup_status()["warmed"] == 2
+    await sm.aclose()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_persistent_top_queries_and_peek(tmp_path):
+    cache = PersistentCache(db_path=str(tmp_path / "w.db"), enable_memory_cache=False)
+    for q, hits in (("a", 1), ("b", 3), ("c", 0)):
+        cache.set(q, "auto", 5, [{"title": q, "link": f"https://w.test/{q}"}])
+        for _ in range(hits):
+            cache.get(q, "auto", 5)
+
+    assert [r["query"] for r in await cache.atop_queries(2)] == ["b", "a"]
+    assert await cache.apeek("b", "auto", 5) <= 0
+    assert await cache.apeek("b", "auto", 10) is None
+    assert await cache.apeek("missing", "auto", 5) is None
+    await cache.flush()
+    assert cache.top_queries(1)[0]["hits"] == 3  # peeking did not count
+    await cache.aclose()
@@ -14,6 +14,7 @@ import pytest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import src.index as index  # noqa: E402
+from src.settings import reload_settings  # noqa: E402
 
 
 class FakeMarkdownV2:
@@ -74,6 +75,7 @@ async def test_read_url_retries_via_proxy_and_succeeds(monkeypatch):
     # SSRF protection defaults to enabled and may require DNS; allowlist test host.
     monkeypatch.setenv("CRAWL4AI_READ_URL_SSRF_PROTECTION", "1")
     monkeypatch.setenv("CRAWL4AI_READ_URL_ALLOWED_HOSTS", "example.com")
+    reload_settings()
 
     # Reset module state
     index.crawler = None
@@ -114,6 +116,7 @@ async def test_read_url_direct_succeeds_no_proxy(monkeypatch):
     # SSRF protection defaults to enabled and may require DNS; allowlist test host.
     monkeypatch.setenv("CRAWL4AI_READ_URL_SSRF_PROTECTION", "1")
     monkeypatch.setenv("CRAWL4AI_READ_URL_ALLOWED_HOSTS", "example.com")
+    reload_settings()
 
     # Reset state
     index.crawler = None
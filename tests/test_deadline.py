@@ -0,0 +1,145 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.deadline import Deadline
+from src.search import (
+    EngineSearchError,
+    GoogleSearch,
+    SearchEngine,
+    SearchResult,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.unit
+def test_deadline_remaining_fits_and_cap():
+    clock = _Clock()
+    d = Deadline.after(2.0, min_attempt_s=0.5, clock=clock)
+    assert d.remaining() == 2.0 and d.fits() and d.cap(5.0) == 2.0 and d.cap(None) == 2.0
+
+    clock.now += 1.7
+    assert d.fits(0.2) and not d.fits()  # 0.3s left < min attempt
+    assert d.cap(0.1) == 0.1
+
+    clock.now += 1.0
+    assert d.expired and d.remaining() == 0.0 and not d.fits(0.0)
+
+    unbounded = Deadline.after(None)
+    assert unbounded.remaining() is None and unbounded.fits(1e9) and unbounded.cap(None) is None
+
+
+class _Engine(SearchEngine):
+    def __init__(self, engine_type, delay_s=0.0, titles=("a",), fail=False):
+        self._engine_type = engine_type
+        self._delay_s = delay_s
+        self._titles = titles
+        self._fail = fail
+        self.calls = 0
+
+    async def search(self, query, num_results=10):
+        self.calls += 1
+        await asyncio.sleep(self._delay_s)
+        if self._fail:
+            raise EngineSearchError("upstream 503", retriable=True, status_code=503)
+        return [
+            SearchResult(
+                title=t,
+                link=f"https://{self._engine_type}.example.com/{t}",
+                snippet=query,
+                source=self._engine_type,
+            )
+            for t in self._titles
+        ]
+
+
+def _manager(make_manager, engines, deadline_s, **env):
+    sm = make_manager(engines, env=env)
+    sm.search_deadline_s = deadline_s
+    return sm
+
+
+@pytest.mark.asyncio
+async def test_retry_skipped_when_backoff_does_not_fit(make_manager):
+    flaky = _Engine("google", fail=True)
+    sm = _manager(make_manager, [], deadline_s=None)
+
+    t0 = time.monotonic()
+    with pytest.raises(EngineSearchError):
+        await sm._search_with_retry(
+            flaky, "q", 5, deadline=Deadline.after(0.5), engine_type="google"
+        )
+    assert flaky.calls == 1
+    assert time.monotonic() - t0 < 0.3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_auto_returns_partial_merge_at_deadline(make_manager):
+    fast = _Engine("google", titles=("alpha", "beta"))
+    slow = _Engine("brave", delay_s=5.0, titles=("slow",))
+    sm = _manager(
+        make_manager,
+        [fast, slow],
+        deadline_s=0.3,
+        CRAWL4AI_AUTO_MERGE_MIN_ENGINES="2",
+    )
+
+    t0 = time.monotonic()
+    results = await sm.search("q", num_results=5, engine="auto")
+
+    assert [r["title"] for r in results] == ["alpha", "beta"]
+    assert time.monotonic() - t0 < 1.0
+    # Being cut off by the deadline is not an engine failure.
+    assert (await sm._circuit_breakers["brave"].snapshot())["consecutive_failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_serial_auto_keeps_results_from_earlier_engine(make_manager):
+    first = _Engine("google", titles=("alpha",))
+    slow = _Engine("brave", delay_s=5.0, titles=("slow",))
+    sm = _manager(make_manager, [first, slow], deadline_s=0.3, CRAWL4AI_AUTO_MERGE="0")
+
+    results = await sm.search("q", num_results=5, engine="auto")
+
+    assert [r["title"] for r in results] == ["alpha"]
+
+
+class _Pool:
+    def __init__(self):
+        self.proxies = []
+
+        def handler(request):
+            raise httpx.ConnectError("unreachable", request=request)
+
+        self._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def get_client(self, proxy_url):
+        self.proxies.append(proxy_url)
+        return self._client
+
+
+@pytest.mark.asyncio
+async def test_engine_skips_proxy_fallback_without_time_left():
+    pool = _Pool()
+    engine = GoogleSearch(
+        api_key="k", cse_id="c", proxy="http://proxy.test:8080", client_pool=pool
+    )
+
+    with pytest.raises(EngineSearchError) as exc:
+        await engine.search("q", 5, deadline=Deadline.after(0.2, min_attempt_s=1.0))
+    assert pool.proxies == [None]
+    assert exc.value.retriable is False
+
+    pool.proxies.clear()
+    with pytest.raises(EngineSearchError):
+        await engine.search("q", 5, deadline=Deadline.after(5.0))
+    assert pool.proxies == [None, "http://proxy.test:8080"]
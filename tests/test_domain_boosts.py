@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from src import fusion_terms, utils
+from src.settings import normalize_host, reload_settings
+from src.utils import DomainBoostIndex, get_domain_boosts, reload_domain_boosts
+
+
+def _linear_multiplier(host, boosts):
+    """The previous per-result scan over every boost entry."""
+    h = normalize_host(host)
+    best = 1.0
+    for dom, mult in boosts.items():
+        d = normalize_host(dom)
+        if d and (h == d or h.endswith("." + d)) and float(mult) > best:
+            best = float(mult)
+    return best
+
+
+@pytest.mark.unit
+def test_suffix_index_matches_linear_scan():
+    rng = random.Random(23)
+    labels = ["iter", "org", "gov", "www", "pppl", "cern", "ch", "a", "b", "iaea"]
+    boosts = {
+        ".".join(rng.choice(labels) for _ in range(rng.randint(1, 3))): rng.choice([0.5, 1.0, 1.1, 1.3, 2.0])
+        for _ in range(60)
+    }
+    boosts["WWW.Pppl.gov."] = 1.7
+    index = DomainBoostIndex(boosts)
+    hosts = [".".join(rng.choice(labels) for _ in range(rng.randint(1, 5))) for _ in range(500)]
+    hosts += ["pppl.gov", "docs.PPPL.gov", "notpppl.gov", "", None]
+    for host in hosts:
+        expected = _linear_multiplier(host, boosts) if host else 1.0
+        assert index.multiplier(host) == expected, host
+    assert all(m > 1.0 for m in index.as_dict().values())
+
+
+@pytest.mark.unit
+def test_boost_sources_precedence_and_reload(monkeypatch):
+    class Provider:
+        def get_facility_domains(self):
+            return {"ipp.mpg.de": 1.15, "iter.org": 1.15}
+
+    monkeypatch.setattr(fusion_terms, "get_fusion_terms_provider", lambda: Provider())
+    monkeypatch.setattr(utils, "_config_domain_boosts", lambda: {"cern.ch": 1.5})
+    monkeypatch.setenv("CRAWL4AI_DOMAIN_BOOSTS", "iter.org=1.4,cern.ch=1.2")
+    reload_settings()
+    index = reload_domain_boosts()
+    assert index.as_dict() == {"ipp.mpg.de": 1.15, "iter.org": 1.4, "cern.ch": 1.5}
+    assert get_domain_boosts() is index  # compiled once, reused by merges
+
+    # A settings reload recompiles against the new env, keeping other sources.
+    monkeypatch.setenv("CRAWL4AI_DOMAIN_BOOSTS", "iter.org=2")
+    reload_settings()
+    assert get_domain_boosts().multiplier("www.iter.org") == 2.0
+    assert get_domain_boosts().multiplier("x.ipp.mpg.de") == 1.15
+
+    monkeypatch.delenv("CRAWL4AI_DOMAIN_BOOSTS")
+    reload_settings()
+    monkeypatch.undo()
+    reload_domain_boosts()
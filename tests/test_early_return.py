@@ -3,7 +3,8 @@ import time
 
 import pytest
 
-from src.search import SearchEngine, SearchManager, SearchResult
+from src.search import SearchEngine, SearchResult
+from src.settings import reload_settings
 
 
 class _FastEngine(SearchEngine):
@@ -44,22 +45,17 @@ class _SlowEngine(SearchEngine):
 
 
 @pytest.mark.asyncio
-async def test_all_early_return_cancels_slow_engine(monkeypatch):
-    monkeypatch.setattr(SearchManager, "_initialize_engines", lambda self: None)
-
-    sm = SearchManager(enable_cache=False, enable_rate_limit=False, enable_monitoring=False)
-    sm._get_engine_type = lambda engine: getattr(engine, "_engine_type", "unknown")
-
+async def test_all_early_return_cancels_slow_engine(monkeypatch, make_manager):
     cancelled = asyncio.Event()
-    sm.engines = [
+    sm = make_manager([
         _FastEngine("google"),
         _SlowEngine("duckduckgo", cancelled, delay_s=0.5),
-    ]
-    sm.fallback_engines = []
+    ])
 
     monkeypatch.setenv("CRAWL4AI_ALL_EARLY_RETURN", "1")
     monkeypatch.setenv("CRAWL4AI_ALL_EARLY_RETURN_MIN_ENGINES", "1")
     monkeypatch.setenv("CRAWL4AI_ALL_EARLY_RETURN_GRACE_S", "0")
+    reload_settings()
     sm.search_deadline_s = 0.5  # generous; grace_s=0 keeps it fast
 
     t0 = time.monotonic()
@@ -75,24 +71,19 @@ async def test_all_early_return_cancels_slow_engine(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_auto_merge_concurrent_early_return(monkeypatch):
-    monkeypatch.setattr(SearchManager, "_initialize_engines", lambda self: None)
-
-    sm = SearchManager(enable_cache=False, enable_rate_limit=False, enable_monitoring=False)
-    sm._get_engine_type = lambda engine: getattr(engine, "_engine_type", "unknown")
-
+async def test_auto_merge_concurrent_early_return(monkeypatch, make_manager):
     cancelled = asyncio.Event()
-    sm.engines = [
+    sm = make_manager([
         _FastEngine("google"),
         _SlowEngine("brave", cancelled, delay_s=0.5),
-    ]
-    sm.fallback_engines = []
+    ])
 
     monkeypatch.setenv("CRAWL4AI_AUTO_MERGE", "1")
     monkeypatch.setenv("CRAWL4AI_AUTO_MERGE_MIN_ENGINES", "1")
     monkeypatch.setenv("CRAWL4AI_AUTO_MERGE_MAX_ENGINES", "2")
     monkeypatch.setenv("CRAWL4AI_AUTO_MERGE_CONCURRENT", "1")
     monkeypatch.setenv("CRAWL4AI_AUTO_MERGE_EARLY_RETURN", "1")
+    reload_settings()
     sm.search_deadline_s = 1.0  # generous deadline; grace_s=0 keeps it fast
 
     t0 = time.monotonic()
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from src.cache import EngineResultCache
+from src.search import SearchEngine, SearchResult
+
+
+@pytest.mark.unit
+def test_engine_cache_serves_smaller_counts_and_evicts_lru():
+    cache = EngineResultCache(ttl=60, max_size=2)
+    cache.set("brave", "Fusion  Energy", 20, list(range(20)))
+
+    assert cache.get("brave", "fusion energy", 10) == list(range(10))
+    assert cache.get("brave", "fusion energy", 21) is None
+    assert cache.get("google", "fusion energy", 10) is None
+
+    cache.set("brave", "fusion energy", 5, [0])  # does not shrink a live entry
+    assert cache.get("brave", "fusion energy", 20) == list(range(20))
+    cache.set("brave", "empty", 10, [])  # empty lists are not cached
+    assert cache.get("brave", "empty", 10) is None
+
+    cache.set("google", "a", 10, [1])
+    cache.set("google", "b", 10, [2])
+    assert cache.get("brave", "fusion energy", 10) is None  # LRU-evicted
+    assert cache.get_stats()["size"] == 2
+
+
+class GoogleCountingEngine(SearchEngine):
+    def __init__(self):
+        self.calls = []
+
+    async def search(self, query, num_results=10):
+        self.calls.append(num_results)
+        await asyncio.sleep(0)
+        return [
+            SearchResult(
+                title=f"{w} page",
+                link=f"https://{w}.example.com/",
+                snippet=query,
+                source="google",
+            )
+            for w in ("alpha", "bravo", "charlie", "delta")
+        ]
+
+
+class _CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    async def acquire(self, engine):
+        self.acquired += 1
+
+
+@pytest.mark.asyncio
+async def test_modes_share_raw_engine_results(make_manager):
+    engine = GoogleCountingEngine()
+    sm = make_manager([engine], enable_cache=True)
+    sm.rate_limiter = _CountingLimiter()
+
+    all_mode = await sm.search("fusion", 5, "all")
+    specific = await sm.search("fusion", 5, "google")
+    auto = await sm.search("Fusion", 3, "auto")
+
+    # One upstream call (and one rate-limit token) served all three modes.
+    assert engine.calls == [20]
+    assert sm.rate_limiter.acquired == 1
+    assert [r["link"] for r in specific] == [r["link"] for r in all_mode]
+    assert len(auto) == 3 and auto[0]["engine"] == "google"
+    assert sm.get_cache_stats()["engine_cache"]["hits"] == 2
+
+    sm.clear_cache()
+    await sm.search("fusion", 5, "google")
+    assert len(engine.calls) == 2
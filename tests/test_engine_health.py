@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from src.engine_health import EngineHealthTracker
+from src.search import SearchEngine, SearchResult
+
+
+@pytest.mark.unit
+def test_static_order_kept_without_samples():
+    t = EngineHealthTracker()
+    assert t.order(["brave", "google", "duckduckgo"]) == [0, 1, 2]
+
+
+@pytest.mark.unit
+def test_slow_primary_is_overtaken():
+    t = EngineHealthTracker()
+    for _ in range(3):
+        t.record("brave", latency_s=2.0, num_results=10)
+    # google has no samples -> prior latency (1.0s)
+    assert t.order(["brave", "google"], min_samples=3) == [1, 0]
+
+    healthy = EngineHealthTracker()
+    for _ in range(3):
+        healthy.record("brave", latency_s=0.2, num_results=10)
+    assert healthy.order(["brave", "google"], min_samples=3) == [0, 1]
+
+
+@pytest.mark.unit
+def test_empty_and_error_rates_raise_cost():
+    t = EngineHealthTracker()
+    for _ in range(5):
+        t.record("duckduckgo", latency_s=0.1, num_results=0)
+        t.record("searxng", latency_s=0.1, num_results=0, error=True)
+        t.record("google", latency_s=0.4, num_results=10)
+    assert t.order(["duckduckgo", "searxng", "google"]) == [2, 0, 1]
+
+    h = t.get("duckduckgo")
+    assert h is not None and h.empty_rate == 1.0 and h.error_rate == 0.0
+
+
+@pytest.mark.unit
+def test_low_quota_deprioritizes_engine():
+    t = EngineHealthTracker()
+    for _ in range(3):
+        t.record("google", latency_s=0.2, num_results=10)
+        t.record("searxng", latency_s=0.3, num_results=10)
+    types = ["google", "searxng"]
+    assert t.order(types) == [0, 1]
+    assert t.order(types, quota={"google": 0.01}) == [1, 0]
+
+
+@pytest.mark.unit
+def test_grace_window_from_latency_stats():
+    t = EngineHealthTracker()
+    assert t.grace_window(["brave"], elapsed_s=0.1, remaining_s=5.0) is None
+
+    for _ in range(10):
+        t.record("brave", latency_s=0.3, num_results=10)
+    grace = t.grace_window(["brave"], elapsed_s=0.1, remaining_s=5.0)
+    assert grace is not None and 0.15 < grace < 0.5
+
+    # Already late beyond the max grace: do not wait at all.
+    for _ in range(10):
+        t.record("google", latency_s=3.0, num_results=10)
+    assert t.grace_window(["google"], elapsed_s=0.1, remaining_s=5.0) == 0.0
+
+    # Rarely useful engines are not waited for.
+    for _ in range(10):
+        t.record("duckduckgo", latency_s=0.3, num_results=0)
+    assert t.grace_window(["duckduckgo"], elapsed_s=0.1, remaining_s=5.0) == 0.0
+
+
+class _Engine(SearchEngine):
+    def __init__(self, engine_type: str, delay_s: float):
+        self._engine_type = engine_type
+        self._delay_s = delay_s
+        self.calls = 0
+
+    async def search(self, query: str, num_results: int = 10):
+        self.calls += 1
+        await asyncio.sleep(self._delay_s)
+        return [
+            SearchResult(
+                title=f"{self._engine_type}-{i}",
+                link=f"https://{self._engine_type}.example.com/{i}",
+                snippet=query,
+                source=self._engine_type,
+            )
+            for i in range(num_results)
+        ]
+
+
+@pytest.mark.asyncio
+async def test_auto_mode_reorders_degraded_primary(make_manager):
+    slow = _Engine("brave", delay_s=0.1)
+    fast = _Engine("google", delay_s=0.0)
+    sm = make_manager(
+        [slow, fast],
+        env={
+            "CRAWL4AI_AUTO_MERGE": "0",
+            "CRAWL4AI_ENGINE_HEALTH_MIN_SAMPLES": "2",
+            "CRAWL4AI_ENGINE_PRIOR_LATENCY_S": "0.05",
+        },
+    )
+
+    for i in range(2):
+        results = await sm.search(f"q{i}", num_results=2, engine="auto")
+        assert results[0]["engine"] == "brave"
+
+    results = await sm.search("q-next", num_results=2, engine="auto")
+    assert results[0]["engine"] == "google"
+    assert slow.calls == 2 and fast.calls == 1
+    assert sm.get_engine_health()["brave"]["samples"] == 2
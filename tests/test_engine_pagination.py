@@ -0,0 +1,147 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.search import BraveSearch, GoogleSearch, SearXNGSearch
+from src.settings import reload_settings
+from src.utils import MultiRateLimiter, RateLimitConfig
+
+
+class _MockPool:
+    """Stands in for HttpClientPool; records requests and in-flight peak."""
+
+    def __init__(self, handler, delay_s: float = 0.02):
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+
+        async def _handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            try:
+                await asyncio.sleep(delay_s)
+                return handler(request)
+            finally:
+                self.in_flight -= 1
+
+        self._client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+
+    async def get_client(self, proxy_url):
+        return self._client
+
+
+def _google_page(request: httpx.Request) -> httpx.Response:
+    start = int(request.url.params.get("start", "1"))
+    num = int(request.url.params["num"])
+    items = [
+        {"title": f"g{i}", "link": f"https://g.example.com/{i}", "snippet": ""}
+        for i in range(start, start + num)
+    ]
+    return httpx.Response(200, json={"items": items})
+
+
+@pytest.mark.asyncio
+async def test_google_pages_fetched_concurrently_in_rank_order(monkeypatch):
+    monkeypatch.setenv("CRAWL4AI_ENGINE_MAX_PAGES", "5")
+    reload_settings()
+    pool = _MockPool(_google_page)
+    engine = GoogleSearch(api_key="k", cse_id="c", client_pool=pool)
+
+    results = await engine.search("q", num_results=25)
+
+    assert [r.title for r in results] == [f"g{i}" for i in range(1, 26)]
+    starts = sorted(r.url.params.get("start") or "1" for r in pool.requests)
+    assert starts == ["1", "11", "21"]
+    assert pool.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_single_page_when_within_page_size():
+    pool = _MockPool(_google_page)
+    engine = GoogleSearch(api_key="k", cse_id="c", client_pool=pool)
+
+    results = await engine.search("q", num_results=7)
+
+    assert len(results) == 7
+    assert len(pool.requests) == 1
+    assert "start" not in pool.requests[0].url.params
+
+
+@pytest.mark.asyncio
+async def test_max_pages_caps_requests(monkeypatch):
+    monkeypatch.setenv("CRAWL4AI_ENGINE_MAX_PAGES", "2")
+    reload_settings()
+    pool = _MockPool(_google_page)
+    engine = GoogleSearch(api_key="k", cse_id="c", client_pool=pool)
+
+    results = await engine.search("q", num_results=50)
+
+    assert len(pool.requests) == 2
+    assert len(results) == 20
+
+
+@pytest.mark.asyncio
+async def test_searxng_failed_deep_page_is_dropped():
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["pageno"])
+        if page == 2:
+            return httpx.Response(500)
+        items = [
+            {"title": f"s{page}-{i}", "url": f"https://s.example.com/{page}/{i}"}
+            for i in range(20)
+        ]
+        return httpx.Response(200, json={"results": items})
+
+    pool = _MockPool(handler)
+    engine = SearXNGSearch(base_url="http://searx.test", client_pool=pool)
+
+    results = await engine.search("q", num_results=50)
+
+    assert sorted(r.url.params["pageno"] for r in pool.requests) == ["1", "2", "3"]
+    assert [r.title for r in results] == [f"s1-{i}" for i in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_searxng_duplicate_links_keep_first_rank():
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["pageno"])
+        links = ["a", "b"] if page == 1 else ["b", "c"]
+        items = [{"title": x, "url": f"https://s.example.com/{x}"} for x in links]
+        return httpx.Response(200, json={"results": items})
+
+    pool = _MockPool(handler)
+    engine = SearXNGSearch(base_url="http://searx.test", client_pool=pool)
+
+    results = await engine.search("q", num_results=30)
+
+    assert [r.title for r in results] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_brave_extra_pages_respect_rate_limit(monkeypatch):
+    monkeypatch.setenv("CRAWL4AI_ENGINE_MAX_PAGES", "3")
+    reload_settings()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get("offset", "0"))
+        count = int(request.url.params["count"])
+        items = [
+            {"title": f"b{page}-{i}", "url": f"https://b.example.com/{page}/{i}"}
+            for i in range(count)
+        ]
+        return httpx.Response(200, json={"web": {"results": items}})
+
+    # One token left for extra pages: page offset=1 is fetched, offset=2 is not.
+    limiter = MultiRateLimiter({"brave": RateLimitConfig(max_requests=1, time_window=86400)})
+    pool = _MockPool(handler)
+    engine = BraveSearch(api_key="k", client_pool=pool, rate_limiter=limiter)
+
+    results = await engine.search("q", num_results=60)
+
+    assert len(pool.requests) == 2
+    assert all(r.url.params["count"] == "20" for r in pool.requests)
+    assert [r.title for r in results[:1]] == ["b0-0"]
+    assert results[20].title == "b1-0"
+    assert len(results) == 40
@@ -0,0 +1,156 @@
+import asyncio
+import time
+
+import pytest
+
+from src.hedging import HedgeBudget, LatencyWindow
+from src.search import SearchEngine, SearchResult
+
+
+class _Engine(SearchEngine):
+    def __init__(self, engine_type: str, delay_s: float = 0.0):
+        self._engine_type = engine_type
+        self._delay_s = delay_s
+        self.calls = 0
+        self.requested = []
+        self.cancelled = asyncio.Event()
+
+    async def search(self, query: str, num_results: int = 10):
+        self.calls += 1
+        self.requested.append(num_results)
+        try:
+            await asyncio.sleep(self._delay_s)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        return [
+            SearchResult(
+                title=f"{self._engine_type}-{i}",
+                link=f"https://{self._engine_type}.example.com/{i}",
+                snippet=query,
+                source=self._engine_type,
+            )
+            for i in range(num_results)
+        ]
+
+
+def _manager(make_manager, engines, **env):
+    return make_manager(
+        engines, env={"CRAWL4AI_AUTO_MERGE": "0", "CRAWL4AI_AUTO_HEDGE": "1", **env}
+    )
+
+
+@pytest.mark.unit
+def test_latency_window_percentiles():
+    w = LatencyWindow(maxlen=100)
+    assert w.percentile(95) is None
+    for i in range(1, 101):
+        w.observe(i / 100.0)
+    assert w.percentile(50) == pytest.approx(0.5)
+    assert w.percentile(95) == pytest.approx(0.95)
+
+    # Bounded window keeps only the most recent samples.
+    for _ in range(100):
+        w.observe(2.0)
+    assert len(w) == 100
+    assert w.percentile(50) == 2.0
+
+
+@pytest.mark.unit
+def test_hedge_budget_caps_extra_calls():
+    b = HedgeBudget()
+    for _ in range(8):
+        b.deposit(0.25)
+    spent = 0
+    while b.try_spend():
+        spent += 1
+    # 8 primaries at 25% => 2 hedges.
+    assert spent == 2
+
+    # The bucket is capped, so idle periods do not bank unlimited hedges.
+    for _ in range(1000):
+        b.deposit(0.25)
+    spent = 0
+    while b.try_spend():
+        spent += 1
+    assert spent == 10
+    snap = b.snapshot()
+    assert snap["primary"] == 1008 and snap["hedged"] == 12 and snap["denied"] == 2
+
+
+@pytest.mark.asyncio
+async def test_hedge_fires_when_primary_exceeds_delay(make_manager):
+    slow = _Engine("brave", delay_s=1.0)
+    fast = _Engine("duckduckgo", delay_s=0.0)
+    sm = _manager(
+        make_manager,
+        [slow, fast],
+        CRAWL4AI_AUTO_HEDGE_DELAY_S="0.05",
+        CRAWL4AI_AUTO_HEDGE_BUDGET="1.0",
+    )
+
+    t0 = time.monotonic()
+    results = await sm.search("q", num_results=3, engine="auto")
+    dt = time.monotonic() - t0
+
+    assert dt < 0.5
+    assert [r["engine"] for r in results] == ["duckduckgo"] * 3
+    await asyncio.sleep(0)
+    assert slow.cancelled.is_set()
+    assert sm.get_hedge_stats()["budget"]["hedged"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_uses_observed_percentile(make_manager):
+    sm = _manager(
+        make_manager,
+        [],
+        CRAWL4AI_AUTO_HEDGE_DELAY_S="5",
+        CRAWL4AI_AUTO_HEDGE_MIN_SAMPLES="5",
+        CRAWL4AI_AUTO_HEDGE_PERCENTILE="90",
+    )
+    for v in (0.1, 0.2, 0.3, 0.4):
+        sm._record_engine_latency("google", v)
+    # Not enough samples yet: configured default.
+    assert sm._hedge_delay("google") == 5.0
+
+    for v in (0.5, 0.6, 0.7, 0.8, 0.9, 1.0):
+        sm._record_engine_latency("google", v)
+    assert sm._hedge_delay("google") == pytest.approx(0.9)
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_budget(make_manager):
+    slow = _Engine("brave", delay_s=0.2)
+    fast = _Engine("duckduckgo", delay_s=0.0)
+    sm = _manager(
+        make_manager,
+        [slow, fast],
+        CRAWL4AI_AUTO_HEDGE_DELAY_S="0.01",
+        CRAWL4AI_AUTO_HEDGE_BUDGET="0",
+    )
+
+    results = await sm.search("q", num_results=2, engine="auto")
+
+    assert [r["engine"] for r in results] == ["brave", "brave"]
+    assert fast.calls == 0
+    assert sm.get_hedge_stats()["budget"]["denied"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_fetches_keep_results(make_manager):
+    slow = _Engine("brave", delay_s=1.0)
+    fast = _Engine("duckduckgo", delay_s=0.0)
+    sm = _manager(
+        make_manager,
+        [slow, fast],
+        CRAWL4AI_AUTO_HEDGE_DELAY_S="0.05",
+        CRAWL4AI_AUTO_HEDGE_BUDGET="1.0",
+    )
+
+    # A superset-coalesced request asks for 2 but keeps (and caches) 6.
+    results, error = await sm._search_impl("q", num_results=2, engine="auto", keep=6)
+
+    assert error is None
+    assert slow.requested == [6] and fast.requested == [6]
+    assert [r["engine"] for r in results] == ["duckduckgo"] * 6
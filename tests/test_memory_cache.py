@@ -0,0 +1,61 @@
+import pytest
+
+from src import cache as cache_module
+from src.cache import SearchCache
+
+
+def _r(name):
+    return [{"title": name, "link": f"https://m.test/{name}", "snippet": ""}]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.mark.unit
+def test_lru_eviction_and_counters(clock):
+    cache = SearchCache(ttl=100, max_size=3)
+    for q in ("a", "b", "c"):
+        cache.set(q, "auto", 1, _r(q))
+
+    assert cache.get("a", "auto", 1) == _r("a")  # a becomes most recent
+    assert cache.get("zzz", "auto", 1) is None
+    cache.set("b", "auto", 1, _r("b2"))  # overwrite: no eviction
+    cache.set("d", "auto", 1, _r("d"))  # evicts c, the least recently used
+
+    assert cache.get("c", "auto", 1) is None
+    assert [e.query for e in cache._cache.values()] == ["a", "b", "d"]
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 2, 1)
+    assert stats["hit_rate"] == pytest.approx(1 / 3, abs=1e-3)
+
+
+@pytest.mark.unit
+def test_sweep_only_reclaims_expired_entries(clock):
+    cache = SearchCache(ttl=100, max_size=1000, stale_ttl=50)
+    for i in range(10):
+        cache.set(f"short {i}", "auto", 1, _r(f"s{i}"), ttl_override=10)
+    for i in range(10):
+        cache.set(f"long {i}", "auto", 1, _r(f"l{i}"))
+
+    clock[0] += 59
+    assert cache.remove_expired() == 0
+    clock[0] += 2
+    assert cache.remove_expired() == 10
+    assert len(cache._cache) == 10
+
+    # Rewriting an entry leaves a dead heap item that must not expire it early.
+    cache.set("long 0", "auto", 1, _r("fresh"))
+    clock[0] += 100
+    assert cache.remove_expired() == 9
+    assert cache.get("long 0", "auto", 1) == _r("fresh")
+    assert cache.get_stats()["expirations"] == 19
+
+    # Repeated overwrites keep the expiry heap bounded.
+    for _ in range(500):
+        cache.set("long 0", "auto", 1, _r("fresh"), ttl_override=1000)
+    assert len(cache._expiry) <= 2 * len(cache._cache) + 65
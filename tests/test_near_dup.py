@@ -0,0 +1,55 @@
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from src.near_dup import near_duplicate_mask, normalize_text
+from src.settings import reload_settings
+from src.utils import merge_and_deduplicate
+
+
+def _pairwise_mask(results, threshold=0.85):
+    kept, keep = [], []
+    for r in results:
+        title = normalize_text(r["title"])
+        dup = any(SequenceMatcher(None, title, k).ratio() >= threshold for k in kept)
+        keep.append(not dup)
+        if not dup:
+            kept.append(title)
+    return keep
+
+
+@pytest.mark.unit
+def test_matches_pairwise_sequence_matcher():
+    rng = random.Random(3)
+    words = ["".join(rng.choice("abcdefghijklmnop") for _ in range(6)) for _ in range(200)]
+    pool = []
+    for _ in range(150):
+        if pool and rng.random() < 0.3:
+            title = rng.choice(pool)["title"] + rng.choice([" - Wikipedia", " (PDF)", "s"])
+        else:
+            title = " ".join(rng.sample(words, 7))
+        pool.append({"title": title})
+    expected = _pairwise_mask(pool)
+    assert expected.count(False) > 20
+    assert near_duplicate_mask(pool) == expected
+    assert near_duplicate_mask([{"title": ""}, {"title": ""}, {}]) == [True, True, True]
+
+
+@pytest.mark.unit
+def test_snippet_dedup_catches_mirrors(monkeypatch):
+    snippet = "The ITER tokamak will be the world's largest magnetic confinement device."
+    results = {
+        "google": [
+            {"title": "ITER - the way to new energy", "link": "https://iter.org/", "snippet": snippet},
+            {"title": "Mirror: fusion news", "link": "https://mirror.test/iter", "snippet": snippet + " ..."},
+        ]
+    }
+    monkeypatch.delenv("CRAWL4AI_DEDUP_SNIPPETS", raising=False)
+    reload_settings()
+    assert len(merge_and_deduplicate(results, fusion_method="rrf")) == 2
+
+    monkeypatch.setenv("CRAWL4AI_DEDUP_SNIPPETS", "true")
+    reload_settings()
+    merged = merge_and_deduplicate(results, fusion_method="rrf")
+    assert [r["link"] for r in merged] == ["https://iter.org/"]
@@ -302,6 +302,36 @@ def test_remove_expired():
         shutil.rmtree(temp_dir)
 
 
+def test_superset_lookup():
+    """k=N 的条目截断后服务 k≤N 的请求，且不被更小的结果覆盖"""
+    from src.cache import SearchCache
+
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, "superset_test.db")
+    results = [{"title": f"R{i}", "link": f"https://r{i}.test"} for i in range(20)]
+
+    try:
+        for cache in (
+            SearchCache(ttl=3600),
+            PersistentCache(db_path=db_path, ttl=3600, enable_memory_cache=False),
+            PersistentCache(db_path=db_path, ttl=3600, enable_memory_cache=True),
+        ):
+            query = f"superset query {type(cache).__name__} {id(cache)}"
+            cache.set(query, "auto", 20, results)
+
+            assert cache.get(query, "auto", 5) == results[:5]
+            assert cache.get(query, "auto", 20) == results
+            assert cache.get(query, "auto", 21) is None
+            assert cache.get(query, "brave", 5) is None
+
+            # A smaller result set does not replace the live superset entry.
+            cache.set(query, "auto", 5, results[:3])
+            assert cache.get(query, "auto", 20) == results
+
+    finally:
+        shutil.rmtree(temp_dir)
+
+
 def main():
     """运行所有测试"""
     print("\n🚀 开始测试持久化缓存功能...\n")
@@ -314,6 +344,7 @@ def main():
         test_max_size()
         test_memory_cache()
         test_remove_expired()
+        test_superset_lookup()
         
         print("\n" + "=" * 60)
         print("✅ 所有持久化缓存测试通过！")
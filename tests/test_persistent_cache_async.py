@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+
+from src.persistent_cache import PersistentCache
+
+
+def _r(name):
+    return [{"title": name, "link": f"https://p.test/{name}", "snippet": ""}]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_async_writes_are_batched_and_visible(tmp_path):
+    db = str(tmp_path / "async.db")
+    cache = PersistentCache(db_path=db, enable_memory_cache=False, write_batch_interval=0.05)
+    for i in range(50):
+        await cache.aset(f"query {i}", "auto", 5, _r(str(i)))
+
+    # Queued, not yet committed: still served to this instance.
+    assert await cache.aget("query 7", "auto", 5) == _r("7")
+
+    await cache.flush()
+    io = cache.get_io_stats()
+    assert io["write_ops"] == 50 and io["write_batches"] < 10
+    assert io["pending_sets"] == 0
+
+    for _ in range(3):
+        assert await cache.aget("query 7", "auto", 5) == _r("7")
+    await cache.flush()
+
+    other = PersistentCache(db_path=db, enable_memory_cache=False)
+    with other._get_connection() as conn:
+        hits = conn.execute(
+            "SELECT hits FROM search_cache WHERE query = 'query 7'"
+        ).fetchone()[0]
+    assert hits == 3
+    assert other.get_stats()["size"] == 50
+
+    await cache.aclose()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_slow_reads_do_not_block_the_event_loop(tmp_path):
+    cache = PersistentCache(db_path=str(tmp_path / "slow.db"), enable_memory_cache=False)
+    cache.set("slow query", "auto", 5, _r("s"))
+
+    read_row = cache._read_row
+
+    def slow_read(key):
+        time.sleep(0.2)  # simulated disk stall
+        return read_row(key)
+
+    cache._read_row = slow_read
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    assert await cache.aget("slow query", "auto", 5) == _r("s")
+    task.cancel()
+
+    assert ticks >= 5
+    io = cache.get_io_stats()
+    assert io["loop_calls"] >= 2 and io["loop_stall_ms_max"] < 100
+    await cache.aclose()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stale_db_row_does_not_replace_newer_memory_entry(tmp_path):
+    cache = PersistentCache(db_path=str(tmp_path / "race.db"))
+    cache.set("q", "auto", 5, _r("old"))
+    key = cache._generate_key("q", "auto")
+    cache._memory_discard(key)
+
+    read_row = cache._read_row
+
+    def racing_read(key):
+        row = read_row(key)
+        cache.set("q", "auto", 5, _r("new"))  # lands while the old row is in flight
+        return row
+
+    cache._read_row = racing_read
+    assert await cache.aget("q", "auto", 5) == _r("old")
+    cache._read_row = read_row
+
+    assert cache._memory_get(key).results == _r("new")
+    assert await cache.aget("q", "auto", 5) == _r("new")
+    await cache.aclose()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_pending_write_uses_its_ttl_override(tmp_path):
+    cache = PersistentCache(
+        db_path=str(tmp_path / "ttl.db"), ttl=3600, write_batch_interval=30
+    )
+    await cache.aset("short", "auto", 5, _r("s"), ttl_override=0)
+    assert cache.get_io_stats()["pending_sets"] == 1
+
+    hit = await cache.alookup("short", "auto", 5)
+    assert hit is not None and hit[0] == _r("s") and hit[1] > 0
+    assert await cache.aget("short", "auto", 5) is None
+    assert await cache.apeek("short", "auto", 5) > 0
+    await cache.aclose()
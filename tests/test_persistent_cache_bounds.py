@@ -0,0 +1,61 @@
+import pytest
+
+from src.persistent_cache import PersistentCache
+
+
+def _r(name, size=1):
+    return [{"title": name, "link": f"https://b.test/{name}/{i}", "snippet": ""} for i in range(size)]
+
+
+def _db_count(cache):
+    with cache._get_connection() as conn:
+        total = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        meta = conn.execute(
+            "SELECT value FROM cache_meta WHERE name = 'entry_count'"
+        ).fetchone()[0]
+    return total, meta
+
+
+@pytest.mark.unit
+def test_entry_counter_and_lru_eviction(tmp_path):
+    db = str(tmp_path / "lru.db")
+    cache = PersistentCache(db_path=db, max_size=3, enable_memory_cache=False)
+    for q in ("a", "b", "c"):
+        cache.set(q, "auto", 1, _r(q))
+    assert cache.get("a", "auto", 1) == _r("a")  # a is now the most recent
+
+    cache.set("b", "auto", 1, _r("b2"))  # rewrite: no eviction
+    cache.set("d", "auto", 1, _r("d"))  # evicts c, least recently accessed
+    assert cache.get("c", "auto", 1) is None
+    assert cache.get("a", "auto", 1) == _r("a")
+    assert _db_count(cache) == (3, 3)
+    assert cache.get_stats()["size"] == 3
+
+    # The counter survives reopening and tracks deletes.
+    reopened = PersistentCache(db_path=db, max_size=3, enable_memory_cache=False)
+    assert _db_count(reopened) == (3, 3)
+    assert reopened.clear() == 3
+    assert _db_count(reopened) == (0, 0)
+
+
+@pytest.mark.unit
+def test_memory_tier_is_byte_bounded_and_decoded(tmp_path):
+    probe = PersistentCache(db_path=str(tmp_path / "probe.db"))
+    probe.set("x", "auto", 5, _r("x", 5))
+    entry_size = probe.get_stats()["memory_cache_bytes"]
+    cache = PersistentCache(
+        db_path=str(tmp_path / "mem.db"), memory_max_bytes=int(entry_size * 2.5)
+    )
+    for q in ("a", "b", "c"):
+        cache.set(q, "auto", 5, _r(q, 5))
+
+    keys = [cache._generate_key(q, "auto") for q in ("a", "b", "c")]
+    assert list(cache._memory_cache) == keys[1:]
+    stats = cache.get_stats()
+    assert stats["memory_cache_bytes"] <= stats["memory_cache_max_bytes"]
+    assert stats["memory_cache_evictions"] == 1
+
+    key_b = keys[1]
+    assert cache._memory_cache[key_b].results == _r("b", 5)  # decoded, not JSON
+    assert cache.get("a", "auto", 5) == _r("a", 5)  # still on disk
+    assert key_b not in cache._memory_cache  # a pushed out b, the LRU entry
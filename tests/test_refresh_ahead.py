@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from src.refresh_ahead import RefreshBudget
+from src.search import SearchEngine, SearchResult
+from src.utils import RateLimitConfig
+
+
+class _Recording(SearchEngine):
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def search(self, query, num_results=10):
+        self.calls.append((type(self).__name__, query))
+        await asyncio.sleep(0.01)
+        return [SearchResult(title=query, link=f"https://r.test/{query}", snippet="", source="x")]
+
+
+class GoogleRecording(_Recording):
+    pass
+
+
+class DuckDuckGoRecording(_Recording):
+    pass
+
+
+@pytest.mark.unit
+def test_refresh_budget_is_a_share_of_each_limit():
+    budget = RefreshBudget(
+        {
+            "google": RateLimitConfig(max_requests=100, time_window=86400),
+            "duckduckgo": RateLimitConfig(max_requests=1000, time_window=60),
+        },
+        share=0.03,
+    )
+    assert all(budget.try_spend(["google", "duckduckgo"]) for _ in range(3))
+    assert not budget.try_spend(["google", "duckduckgo"])
+    assert budget.snapshot()["duckduckgo"]["available"] == 27  # all-or-nothing
+    assert budget.try_spend(["duckduckgo", "unlimited"])
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_hot_entries_are_refreshed_before_expiry_within_budget(make_manager):
+    calls = []
+    sm = make_manager(
+        [GoogleRecording(calls)],
+        fallback=[DuckDuckGoRecording(calls)],
+        env={
+            "CRAWL4AI_ENGINE_CACHE_TTL_S": "0",
+            "CRAWL4AI_CACHE_TTL_POLICY": "fixed",
+            "CRAWL4AI_AUTO_MERGE": "0",
+            "CRAWL4AI_REFRESH_AHEAD_WINDOW_S": "30",
+            "CRAWL4AI_REFRESH_AHEAD_MIN_HITS": "2",
+            "CRAWL4AI_REFRESH_AHEAD_QUOTA_SHARE": "0.01",  # 1 Google call per day
+        },
+        enable_cache=True,
+        enable_rate_limit=True,
+        cache_ttl=600,
+    )
+
+    for query, mode, hits in (
+        ("hot", "auto", 2), ("cold", "auto", 0), ("g1", "google", 3), ("g2", "google", 2),
+    ):
+        await sm.search(query, 5, mode)
+        for _ in range(hits):
+            await sm.search(query, 5, mode)
+    for entry in sm.cache._cache.values():
+        entry.timestamp -= 590  # 10s before expiry
+    del calls[:]
+
+    cycle = await sm.refresh_ahead_once()
+    assert cycle == {"candidates": 3, "refreshed": 2, "failed": 0, "skipped_budget": 1}
+    # auto refreshes go to the free engine; only one paid call fits the budget.
+    assert sorted(calls) == [("DuckDuckGoRecording", "hot"), ("GoogleRecording", "g1")]
+    assert await sm.cache.apeek("hot", "auto", 5) < -500
+
+    # Refreshed entries start over at zero hits; g2 waits for budget.
+    cycle = await sm.refresh_ahead_once()
+    assert (cycle["candidates"], cycle["skipped_budget"]) == (1, 1)
+    assert sm.get_cache_stats()["refresh_ahead"]["refreshed"] == 2
+    await sm.aclose()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_persistent_refresh_candidates(tmp_path):
+    from src.persistent_cache import PersistentCache
+
+    cache = PersistentCache(db_path=str(tmp_path / "r.db"), ttl=600, enable_memory_cache=False)
+    for q, hits in (("a", 3), ("b", 1), ("c", 2)):
+        cache.set(q, "auto", 5, [{"title": q}])
+        for _ in range(hits):
+            cache.get(q, "auto", 5)
+    rows = await cache.arefresh_candidates(700, 2, 10)
+    assert [r["query"] for r in rows] == ["a", "c"]
+    assert 590 < rows[0]["expires_in"] <= 600
+    assert await cache.arefresh_candidates(100, 2, 10) == []
+    await cache.aclose()
@@ -2,6 +2,10 @@ import asyncio
 
 import pytest
 
+_DISTINCT_TITLES = (
+    "apple banana cherry delta echo foxtrot golf hotel india juliet kilo lima"
+).split()
+
 
 @pytest.mark.unit
 @pytest.mark.asyncio
@@ -49,8 +53,8 @@ async def test_request_coalescing_same_query(monkeypatch):
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_request_coalescing_different_num_results(monkeypatch):
-    """Different num_results should not coalesce."""
+async def test_request_coalescing_serves_smaller_num_results(monkeypatch):
+    """A computation for k=N serves concurrent callers asking for k<=N."""
     monkeypatch.setenv("CRAWL4AI_ENABLE_REQUEST_COALESCING", "true")
 
     from src.search import SearchEngine, SearchManager, SearchResult
@@ -82,9 +86,52 @@ async def test_request_coalescing_different_num_results(monkeypatch):
     manager.fallback_engines = []
 
     r1, r2 = await asyncio.gather(
+        manager.search("q", num_results=4, engine="auto"),
+        manager.search("q", num_results=3, engine="auto"),
+    )
+
+    assert dummy.calls == 1
+    assert len(r1) == 4 and len(r2) == 3
+    assert r2 == r1[:3]
+    assert not manager._inflight_searches
+
+    # A smaller computation cannot serve a larger request.
+    await asyncio.gather(
         manager.search("q", num_results=3, engine="auto"),
         manager.search("q", num_results=4, engine="auto"),
     )
+    assert dummy.calls == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_small_request_is_cached_at_promoted_size(make_manager):
+    """k=5 keeps CRAWL4AI_COALESCE_MIN_RESULTS results, so k=10 hits the cache."""
+    from src.search import SearchEngine, SearchResult
+
+    class DummyEngine(SearchEngine):
+        def __init__(self):
+            self.calls = 0
+
+        async def search(self, query: str, num_results: int = 10):
+            self.calls += 1
+            return [
+                SearchResult(
+                    title=word,
+                    link=f"https://example.com/{word}",
+                    snippet="s",
+                    source="dummy",
+                )
+                for word in _DISTINCT_TITLES[:num_results]
+            ]
 
-    assert dummy.calls == 2
-    assert len(r1) == 3 and len(r2) == 4
+    dummy = DummyEngine()
+    manager = make_manager([dummy], enable_cache=True)
+
+    small = await manager.search("q", num_results=5, engine="auto")
+    ten = await manager.search("q", num_results=10, engine="auto")
+
+    assert dummy.calls == 1
+    assert len(small) == 5 and len(ten) == 10
+    assert ten[:5] == small
+    assert manager.cache.get("q", "auto", 11) is None
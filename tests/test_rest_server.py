@@ -231,3 +231,190 @@ def test_request_timeout_returns_504(monkeypatch):
         resp = client.post("/search", json=payload)
         assert resp.status_code == 504
         assert resp.headers.get("X-Request-Id")
+
+
+def test_search_batch_endpoint(client, monkeypatch):
+    async def fake_search_batch(queries, num_results, engine):
+        return json.dumps([{"query": q, "results": []} for q in queries])
+
+    monkeypatch.setattr(rest_server.index, "search_batch", fake_search_batch)
+
+    resp = client.post("/search/batch", json={"queries": ["a", "b"]})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["count"] == 2
+    assert [r["query"] for r in data["results"]] == ["a", "b"]
+
+    assert client.post("/search/batch", json={"queries": []}).status_code == 422
+    too_many = {"queries": [str(i) for i in range(51)]}
+    assert client.post("/search/batch", json=too_many).status_code == 400
+
+
+def test_search_batch_endpoint_streams_ndjson(client, monkeypatch):
+    async def fake_stream(queries, num_results, engine):
+        for i in reversed(range(len(queries))):
+            yield {"index": i, "query": queries[i], "results": []}
+
+    monkeypatch.setattr(rest_server.index, "search_batch_stream", fake_stream)
+
+    resp = client.post("/search/batch", json={"queries": ["a", "b"], "stream": True})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines() if line]
+    assert [r["index"] for r in rows] == [1, 0]
+
+
+def _fake_stream_events(monkeypatch):
+    async def fake_events(query, num_results, engine):
+        yield {"type": "partial", "engine": "google", "results": []}
+        yield {"type": "final", "results": [{"title": query}]}
+
+    monkeypatch.setattr(rest_server.index, "search_stream_events", fake_events)
+
+
+def test_search_stream_endpoint_ndjson(client, monkeypatch):
+    _fake_stream_events(monkeypatch)
+
+    resp = client.post("/search/stream", json={"query": "ai"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in resp.text.splitlines() if line]
+    assert [e["type"] for e in events] == ["partial", "final"]
+
+
+def test_search_stream_endpoint_sse(client, monkeypatch):
+    _fake_stream_events(monkeypatch)
+
+    resp = client.post(
+        "/search/stream",
+        json={"query": "ai"},
+        headers={"Accept": "text/event-stream"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    blocks = [b for b in resp.text.split("\n\n") if b.strip()]
+    assert blocks[0].startswith("event: partial\ndata: ")
+    assert json.loads(blocks[1].split("data: ", 1)[1])["results"] == [{"title": "ai"}]
+
+
+def test_search_admission_rejection_returns_503(client, monkeypatch):
+    from src.request_context import get_client_id
+
+    seen = []
+
+    async def busy_search(query: str, num_results: int, engine: str) -> str:
+        seen.append(get_client_id())
+        return json.dumps({"error": "Server busy: queue full", "retry_after_s": 2.2})
+
+    monkeypatch.setattr(rest_server.index, "search", busy_search)
+
+    resp = client.post("/search", json={"query": "ai"})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "3"
+    assert resp.json()["detail"] == "Server busy: queue full"
+    # The fair-queuing key is the rate-limit identity (client IP here).
+    assert seen and seen[0].startswith("ip:")
+
+    async def busy_batch(queries, num_results, engine) -> str:
+        return json.dumps({"error": "Server busy: queue full", "retry_after_s": 0.4})
+
+    monkeypatch.setattr(rest_server.index, "search_batch", busy_batch)
+
+    resp = client.post("/search/batch", json={"queries": ["a", "b"]})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+
+
+def test_cache_warmup_endpoints(client, monkeypatch):
+    calls = []
+
+    async def fake_manage_cache(action, **kwargs):
+        calls.append((action, kwargs))
+        return json.dumps({"success": True, "action": action, "warmup": {"state": "running"}})
+
+    monkeypatch.setattr(rest_server.index, "manage_cache", fake_manage_cache)
+
+    resp = client.post("/cache/warmup", json={"queries": ["a"], "engine": "brave"})
+    assert resp.status_code == 200 and resp.json() == {"state": "running"}
+    assert client.get("/cache/warmup").json() == {"state": "running"}
+    assert calls == [
+        ("warmup", {"engine": "brave", "queries": ["a"], "top_n": 0}),
+        ("warmup_status", {}),
+    ]
+
+
+def test_cache_warmup_requires_auth_token(monkeypatch):
+    _reset_http_rate_limiter()
+    calls = []
+
+    async def fake_init():
+        return None
+
+    async def fake_manage_cache(action, **kwargs):
+        calls.append(action)
+        return json.dumps({"success": True, "action": action, "warmup": {"state": "running"}})
+
+    monkeypatch.setenv("CRAWL4AI_HTTP_AUTH_TOKEN", "secret")
+    monkeypatch.setattr(rest_server.index, "initialize_search_manager", fake_init)
+    monkeypatch.setattr(rest_server.index, "manage_cache", fake_manage_cache)
+
+    with TestClient(rest_server.app) as client:
+        resp = client.post("/cache/warmup", json={"queries": ["a"]})
+        assert resp.status_code == 401
+        assert client.get("/cache/warmup").status_code == 401
+        assert calls == []
+
+        ok = client.post(
+            "/cache/warmup",
+            json={"queries": ["a"]},
+            headers={"Authorization": "Bearer secret"},
+        )
+        assert ok.status_code == 200
+        assert calls == ["warmup"]
+
+
+def test_batch_admission_rejections_use_real_scheduler(monkeypatch, make_manager):
+    import asyncio
+
+    from src.search import SearchEngine, SearchResult
+
+    _reset_http_rate_limiter()
+
+    class _Engine(SearchEngine):
+        async def search(self, query: str, num_results: int = 10):
+            await asyncio.sleep(0.05)
+            return [SearchResult(query, f"https://example.com/{query}", "s", "dummy")]
+
+    async def fake_init():
+        return None
+
+    # One search slot and no queue: anything beyond the slot is refused.
+    sm = make_manager(
+        [_Engine()],
+        env={
+            "CRAWL4AI_MAX_CONCURRENT_SEARCHES": "1",
+            "CRAWL4AI_ADMISSION_MAX_QUEUE": "0",
+            "CRAWL4AI_BATCH_MAX_CONCURRENCY": "2",
+        },
+    )
+    monkeypatch.setattr(rest_server.index, "search_manager", sm)
+    monkeypatch.setattr(rest_server.index, "initialize_search_manager", fake_init)
+
+    with TestClient(rest_server.app) as client:
+        # Two workers share one slot: one query runs, the other is refused
+        # and reported as such rather than as zero hits.
+        resp = client.post("/search/batch", json={"queries": ["a", "b"]})
+        assert resp.status_code == 200
+        rows = resp.json()["results"]
+        refused = [row for row in rows if "error" in row]
+        assert len(refused) == 1 and refused[0]["results"] == []
+        assert refused[0]["error"].startswith("Server busy")
+        assert "retry_after_s" in refused[0]
+        assert sum(1 for row in rows if row["results"]) == 1
+
+        # With the slot held elsewhere the whole batch is refused: 503.
+        asyncio.run(sm._admission.acquire("holder"))
+        resp = client.post("/search/batch", json={"queries": ["c", "d"]})
+        assert resp.status_code == 503
+        assert int(resp.headers["Retry-After"]) >= 1
+        sm._admission.release()
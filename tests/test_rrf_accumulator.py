@@ -0,0 +1,165 @@
+import asyncio
+import random
+
+import pytest
+
+from src.search import SearchEngine, SearchResult
+from src.utils import RRFAccumulator, merge_and_deduplicate
+
+
+def _results(engine, links, title_prefix=None):
+    return [
+        {
+            "title": f"{title_prefix or engine} {link}",
+            "link": f"https://{link}",
+            "snippet": "",
+            "engine": engine,
+        }
+        for link in links
+    ]
+
+
+@pytest.mark.unit
+def test_incremental_matches_batch_merge():
+    rng = random.Random(7)
+    pool = [f"site{i}.example.com/p{i % 5}" for i in range(40)]
+    weights = {"google": 1.2, "brave": 1.0, "duckduckgo": 0.4}
+    for _ in range(50):
+        all_results = {}
+        for engine in ("google", "brave", "duckduckgo"):
+            links = rng.sample(pool, rng.randint(0, 25))
+            all_results[engine] = _results(engine, links)
+        expected = merge_and_deduplicate(
+            all_results,
+            num_results=10,
+            fusion_method="rrf",
+            rrf_k=60,
+            engine_weights=weights,
+            canonicalize_links=True,
+        )
+
+        acc = RRFAccumulator(rrf_k=60, engine_weights=weights)
+        for engine, res in all_results.items():
+            acc.add(engine, res)
+        assert acc.ranking(10) == expected
+        assert acc.engines == list(all_results)
+
+
+@pytest.mark.unit
+def test_len_counts_unique_canonical_links():
+    acc = RRFAccumulator(rrf_k=60)
+    acc.add("google", _results("google", ["a.com/x", "b.com/y"]))
+    assert len(acc) == 2
+    acc.add("brave", _results("brave", ["www.a.com/x?utm_source=t", "c.com/z"]))
+    assert len(acc) == 3
+
+
+@pytest.mark.unit
+def test_longer_list_rescales_adaptive_k():
+    short = _results("google", ["a.com/1", "b.com/2"])
+    long = _results("brave", [f"l{i}.com/{i}" for i in range(30)] + ["b.com/2"])
+
+    acc = RRFAccumulator(rrf_k=60)
+    acc.add("google", short)
+    before = dict(acc.scores)
+    acc.add("brave", long)
+
+    # k grows from 1 to 15: earlier contributions are rescored, not reused.
+    assert acc.scores["https://a.com/1"] < before["https://a.com/1"]
+    assert acc.ranking(5) == merge_and_deduplicate(
+        {"google": short, "brave": long},
+        num_results=5,
+        fusion_method="rrf",
+        rrf_k=60,
+        canonicalize_links=True,
+    )
+
+
+class _Engine(SearchEngine):
+    def __init__(self, engine_type: str, delay_s: float, links):
+        self._engine_type = engine_type
+        self._delay_s = delay_s
+        self._links = links
+
+    async def search(self, query: str, num_results: int = 10):
+        await asyncio.sleep(self._delay_s)
+        return [
+            SearchResult(
+                title=f"{self._engine_type} {link}",
+                link=f"https://{link}",
+                snippet=query,
+                source=self._engine_type,
+            )
+            for link in self._links[:num_results]
+        ]
+
+
+@pytest.mark.asyncio
+async def test_all_mode_final_merge_uses_accumulator(monkeypatch, make_manager):
+    sm = make_manager(
+        [
+            _Engine("google", 0.0, ["a.com/1", "b.com/2", "c.com/3"]),
+            _Engine("brave", 0.01, ["b.com/2", "d.com/4"]),
+        ],
+        env={
+            "CRAWL4AI_ALL_EARLY_RETURN": "1",
+            "CRAWL4AI_ALL_EARLY_RETURN_MIN_ENGINES": "2",
+        },
+    )
+
+    calls = []
+    real_ranking = RRFAccumulator.ranking
+
+    def _spy(self, num_results=10):
+        calls.append(num_results)
+        return real_ranking(self, num_results)
+
+    monkeypatch.setattr(RRFAccumulator, "ranking", _spy)
+
+    results = await sm.search("q", num_results=3, engine="all")
+
+    # One ranking, taken at the kept size (CRAWL4AI_COALESCE_MIN_RESULTS).
+    assert calls == [10]
+    assert results[0]["link"] == "https://b.com/2"
+
+
+@pytest.mark.asyncio
+async def test_grace_window_collects_each_engine_once(monkeypatch, make_manager):
+    sm = make_manager(
+        [
+            _Engine("google", 0.0, ["a.com/1", "b.com/2", "c.com/3"]),
+            _Engine("brave", 0.05, ["b.com/2", "d.com/4"]),
+            _Engine("searxng", 5.0, ["e.com/5"]),
+        ],
+        env={
+            "CRAWL4AI_ALL_EARLY_RETURN": "1",
+            "CRAWL4AI_ALL_EARLY_RETURN_MIN_ENGINES": "1",
+            "CRAWL4AI_ALL_EARLY_RETURN_GRACE_S": "0.3",
+        },
+    )
+
+    states = []
+    real_add = RRFAccumulator.add
+
+    def _spy_add(self, engine, results):
+        if self not in states:
+            states.append(self)
+        return real_add(self, engine, results)
+
+    def _no_full_merge(*args, **kwargs):
+        raise AssertionError("final merge should reuse the accumulator")
+
+    monkeypatch.setattr(RRFAccumulator, "add", _spy_add)
+    monkeypatch.setattr("src.search.merge_and_deduplicate", _no_full_merge)
+
+    # google alone fills num_results, so the grace window opens while brave
+    # and searxng are still running; brave answers inside it, searxng not.
+    results = await sm.search("q", num_results=3, engine="all")
+
+    assert len(states) == 1 and states[0].engines == ["google", "brave"]
+    assert results[0]["link"] == "https://b.com/2"
+
+    acc = RRFAccumulator(rrf_k=60)
+    acc.add("google", _results("google", ["a.com/x"]))
+    with pytest.raises(ValueError):
+        acc.add("google", _results("google", ["a.com/x"]))
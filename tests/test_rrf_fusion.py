@@ -2,16 +2,21 @@
 """Unit tests for Reciprocal Rank Fusion merge strategy."""
 
 import os
+import random
 import sys
 
+import pytest
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from utils import merge_and_deduplicate
+import utils
+from src.settings import reload_settings
+from utils import RRFAccumulator, merge_and_deduplicate
 
 
-def test_rrf_ranks_items_supported_by_multiple_engines_higher():
+def _multi_engine_results():
     # A appears in both engines, B only in google, C only in ddg.
-    all_results = {
+    return {
         "google": [
             {"title": "A", "link": "https://example.com/a", "snippet": "", "engine": "google"},
             {"title": "B", "link": "https://example.com/b", "snippet": "", "engine": "google"},
@@ -22,6 +27,42 @@ def test_rrf_ranks_items_supported_by_multiple_engines_higher():
         ],
     }
 
+
+def _weighted_results():
+    return {
+        "google": [
+            {"title": "A", "link": "https://example.com/a", "snippet": "", "engine": "google"},
+            {"title": "B", "link": "https://example.com/b", "snippet": "", "engine": "google"},
+        ],
+        "duckduckgo": [
+            {"title": "A dup", "link": "https://example.com/a", "snippet": "", "engine": "duckduckgo"},
+        ],
+    }
+
+
+def _official_site_results():
+    return {
+        "google": [
+            {"title": "Unofficial", "link": "https://example.com/x", "snippet": "", "engine": "google"},
+            {"title": "ITER", "link": "https://www.iter.org/", "snippet": "", "engine": "google"},
+        ]
+    }
+
+
+FIXTURES = [
+    (_multi_engine_results, dict(num_results=3)),
+    (_weighted_results, dict(num_results=2, engine_weights={"duckduckgo": 0.0, "google": 1.0})),
+    (_official_site_results, dict(num_results=2, domain_boosts={"iter.org": 2.2})),
+]
+
+needs_numpy = pytest.mark.skipif(
+    not utils.vector_fusion.HAVE_NUMPY, reason="numpy not installed"
+)
+
+
+def test_rrf_ranks_items_supported_by_multiple_engines_higher():
+    all_results = _multi_engine_results()
+
     fused = merge_and_deduplicate(
         all_results,
         num_results=3,
@@ -37,15 +78,7 @@ def test_rrf_ranks_items_supported_by_multiple_engines_higher():
 
 
 def test_rrf_engine_weights_can_downweight_an_engine():
-    all_results = {
-        "google": [
-            {"title": "A", "link": "https://example.com/a", "snippet": "", "engine": "google"},
-            {"title": "B", "link": "https://example.com/b", "snippet": "", "engine": "google"},
-        ],
-        "duckduckgo": [
-            {"title": "A dup", "link": "https://example.com/a", "snippet": "", "engine": "duckduckgo"},
-        ],
-    }
+    all_results = _weighted_results()
 
     fused = merge_and_deduplicate(
         all_results,
@@ -64,12 +97,7 @@ def test_rrf_engine_weights_can_downweight_an_engine():
 def test_rrf_domain_boost_can_promote_official_site():
     # Without a domain boost, rank=1 usually beats rank=2 for k=0.
     # With an official-domain multiplier, an official link can be promoted.
-    all_results = {
-        "google": [
-            {"title": "Unofficial", "link": "https://example.com/x", "snippet": "", "engine": "google"},
-            {"title": "ITER", "link": "https://www.iter.org/", "snippet": "", "engine": "google"},
-        ]
-    }
+    all_results = _official_site_results()
 
     fused = merge_and_deduplicate(
         all_results,
@@ -81,3 +109,75 @@ def test_rrf_domain_boost_can_promote_official_site():
     )
 
     assert fused[0]["link"].rstrip("/") == "https://www.iter.org"
+
+
+@needs_numpy
+@pytest.mark.parametrize("rrf_k", [0, 60])
+@pytest.mark.parametrize("query", ["", "iter a"])
+@pytest.mark.parametrize("blend", ["false", "true"])
+def test_vectorized_rankings_identical_on_fixtures(monkeypatch, rrf_k, query, blend):
+    monkeypatch.setenv("CRAWL4AI_FUSION_RELEVANCE_BLEND", blend)
+    reload_settings()
+    for make, kwargs in FIXTURES:
+        rankings = []
+        for vectorized in (False, True):
+            all_results = make()
+            rankings.append(merge_and_deduplicate(
+                all_results,
+                fusion_method="rrf",
+                rrf_k=rrf_k,
+                canonicalize_links=True,
+                scoring=utils._scoring_pipeline(query),
+                vectorized=vectorized,
+                **kwargs,
+            ))
+        assert rankings[0] == rankings[1], make.__name__
+
+
+@needs_numpy
+def test_vectorized_matches_python_on_large_tied_pools(monkeypatch):
+    monkeypatch.setenv("CRAWL4AI_FUSION_RELEVANCE_BLEND", "true")
+    reload_settings()
+    rng = random.Random(25)
+    words = ["iter", "tokamak", "plasma", "wiki", "news", "divertor"]
+    pool = [f"site{i % 90}.example.org/p{i % 7}" for i in range(300)]
+    for trial in range(20):
+        all_results = {}
+        for engine in ("google", "brave", "searxng", "duckduckgo"):
+            links = rng.sample(pool, rng.randint(0, 120))
+            all_results[engine] = [
+                {
+                    "title": f"{rng.choice(words)} {rng.choice(words)} {link}",
+                    "link": f"https://{link}" if rng.random() > 0.05 else "",
+                    "snippet": rng.choice(words),
+                }
+                for link in links
+            ]
+        query = rng.choice(["", "iter plasma", "tokamak"])
+        rrf_k = rng.choice([0, 60])
+        accs = []
+        for vectorized in (False, True):
+            acc = RRFAccumulator(
+                rrf_k=rrf_k,
+                engine_weights={"duckduckgo": 0.5, "brave": 0.0 if trial % 5 == 0 else 1.0},
+                domain_boosts={"site1.example.org": 1.3, "example.org": 1.05},
+                scoring=utils._scoring_pipeline(query),
+                vectorized=vectorized,
+            )
+            for engine, results in all_results.items():
+                acc.add(engine, [dict(r) for r in results])
+            accs.append(acc)
+        python, numpy = accs
+        assert not python.vectorized and numpy.vectorized
+        assert python.scores == numpy.scores
+        for k in (1, 10, 50, 1000):
+            assert python.ranking(k) == numpy.ranking(k)
+
+
+def test_falls_back_to_python_without_numpy(monkeypatch):
+    monkeypatch.setattr(utils.vector_fusion, "HAVE_NUMPY", False)
+    acc = RRFAccumulator(rrf_k=0, vectorized=True)
+    assert not acc.vectorized
+    for engine, results in _multi_engine_results().items():
+        acc.add(engine, results)
+    assert acc.ranking(1)[0]["link"].rstrip("/") == "https://example.com/a"
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from src.reranker import TokenReranker
+from src.scoring import ScoringMetrics, ScoringPipeline, TermIndex, query_terms, tokenize
+from src.settings import reload_settings
+from src.utils import merge_and_deduplicate
+
+
+@pytest.mark.unit
+def test_cjk_tokenization_and_relevance():
+    assert tokenize("ITER 磁约束聚变") == ["iter", "磁约", "约束", "束聚", "聚变"]
+    assert query_terms("the ITER a 托卡马克", min_len=3, stopwords={"the"}) == (
+        "iter", "托卡", "卡马", "马克",
+    )
+
+    pipeline = ScoringPipeline("磁约束聚变 装置")
+    hit = {"title": "磁约束聚变装置简介", "snippet": "", "link": "https://a.test/1"}
+    miss = {"title": "Unrelated page", "snippet": "聚", "link": "https://a.test/2"}
+    assert pipeline.relevance(hit) > pipeline.relevance(miss) == 0
+    assert pipeline.features(hit) is pipeline.features(hit)
+
+    reranked = asyncio.run(TokenReranker().rerank("磁约束聚变", [miss, hit], 2))
+    assert reranked == [hit, miss]
+
+    index = TermIndex(["iter", "tokamak", "stellarator", "x"])
+    assert len(index) == 3
+    rec = ScoringPipeline("").features(
+        {"title": "Tokamak literature", "snippet": "ITER and W7-X stellarator"}
+    )
+    assert index.count(rec) == 3
+    assert index.count(rec, limit=2) == 2
+    # "iter" inside "literature" is not a term hit.
+    lone = ScoringPipeline("").features({"title": "literature review"})
+    assert index.count(lone) == 0
+
+
+@pytest.mark.unit
+def test_pipeline_merge_blends_query_relevance_and_records_stages(monkeypatch):
+    results = {
+        "google": [
+            {"title": "Generic landing page", "link": "https://a.test/1", "snippet": ""},
+            {"title": "Tokamak plasma confinement", "link": "https://a.test/2", "snippet": "tokamak"},
+        ],
+        "brave": [
+            {"title": "Generic landing page", "link": "https://a.test/1/", "snippet": ""},
+            {"title": "Tokamak plasma confinement", "link": "https://a.test/2", "snippet": "tokamak"},
+        ],
+    }
+    metrics = ScoringMetrics()
+    # The blend is off by default: the RRF order is kept even with a query.
+    scoring = ScoringPipeline("tokamak plasma", metrics=metrics)
+    plain = merge_and_deduplicate(results, fusion_method="rrf", scoring=scoring)
+    assert [r["link"] for r in plain] == ["https://a.test/1", "https://a.test/2"]
+
+    monkeypatch.setenv("CRAWL4AI_FUSION_RELEVANCE_BLEND", "true")
+    reload_settings()
+    scoring = ScoringPipeline("tokamak plasma", metrics=metrics)
+    merged = merge_and_deduplicate(results, fusion_method="rrf", scoring=scoring)
+    assert [r["link"] for r in merged] == ["https://a.test/2", "https://a.test/1"]
+
+    stats = metrics.snapshot()
+    assert list(stats) == ["features", "domain_boost", "rrf", "dedup", "relevance"]
+    assert stats["rrf"]["runs"] >= 2 and stats["relevance"]["runs"] == 2
+    assert all(s["cpu_ms_total"] >= 0 for s in stats.values())
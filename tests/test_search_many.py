@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from src.search import SearchEngine, SearchResult
+
+
+class _CountingEngine(SearchEngine):
+    def __init__(self, delays=None):
+        self.queries = []
+        self._delays = delays or {}
+
+    async def search(self, query: str, num_results: int = 10):
+        self.queries.append(query)
+        await asyncio.sleep(self._delays.get(query, 0.01))
+        return [
+            SearchResult(
+                title=f"{query}-{i}",
+                link=f"https://example.com/{query}/{i}",
+                snippet="s",
+                source="dummy",
+            )
+            for i in range(num_results)
+        ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_search_many_dedupes_and_keeps_input_order(make_manager):
+    engine = _CountingEngine(delays={"slow": 0.1})
+    sm = make_manager([engine])
+
+    queries = ["slow", "fast", "  FAST ", "", "slow"]
+    batch = await sm.search_many(queries, num_results=2)
+
+    assert sorted(engine.queries) == ["fast", "slow"]
+    assert [r[0]["title"] if r else None for r in batch] == [
+        "slow-0", "fast-0", "fast-0", None, "slow-0"
+    ]
+    # Each index gets its own list object.
+    assert batch[1] is not batch[2]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_search_many_iter_yields_cache_hits_first(make_manager):
+    engine = _CountingEngine()
+    sm = make_manager([engine], enable_cache=True)
+    await sm.search("cached", num_results=2)
+    engine.queries.clear()
+
+    order = [
+        i async for i, _ in sm.search_many_iter(["miss", "cached"], num_results=2)
+    ]
+
+    assert order == [1, 0]
+    assert engine.queries == ["miss"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_search_many_bounds_concurrency(make_manager):
+    active = 0
+    peak = 0
+
+    class _Engine(SearchEngine):
+        async def search(self, query: str, num_results: int = 10):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return [SearchResult(query, f"https://example.com/{query}", "s", "dummy")]
+
+    sm = make_manager([_Engine()])
+    batch = await sm.search_many(
+        [f"q{i}" for i in range(10)], num_results=1, max_concurrency=3
+    )
+
+    assert peak == 3
+    assert [r[0]["title"] for r in batch] == [f"q{i}" for i in range(10)]
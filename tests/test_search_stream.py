@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from src.search import SearchEngine, SearchResult
+
+
+class _Engine(SearchEngine):
+    def __init__(self, engine_type: str, delay_s: float, titles):
+        self._engine_type = engine_type
+        self._delay_s = delay_s
+        self._titles = titles
+
+    async def search(self, query: str, num_results: int = 10):
+        await asyncio.sleep(self._delay_s)
+        return [
+            SearchResult(
+                title=t,
+                link=f"https://example.com/{t}",
+                snippet=query,
+                source=self._engine_type,
+            )
+            for t in self._titles
+        ]
+
+
+@pytest.mark.asyncio
+async def test_search_stream_yields_partial_then_final(make_manager):
+    sm = make_manager(
+        [
+            _Engine("google", 0.0, ["alpha", "beta"]),
+            _Engine("brave", 0.1, ["beta", "gamma"]),
+        ],
+    )
+
+    events = [e async for e in sm.search_stream("q", num_results=3, engine="all")]
+
+    assert [e["type"] for e in events] == ["partial", "partial", "final"]
+    assert events[0]["engine"] == "google"
+    assert [r["title"] for r in events[0]["results"]] == ["alpha", "beta"]
+    assert set(events[1]["engines"]) == {"google", "brave"}
+    final_titles = [r["title"] for r in events[-1]["results"]]
+    assert final_titles[0] == "beta"  # found by both engines
+    assert set(final_titles) == {"alpha", "beta", "gamma"}
+
+
+@pytest.mark.asyncio
+async def test_search_stream_deadline_keeps_partial_results(make_manager):
+    sm = make_manager(
+        [
+            _Engine("google", 0.0, ["alpha"]),
+            _Engine("brave", 5.0, ["slow"]),
+        ],
+    )
+    sm.search_deadline_s = 0.2
+
+    events = [e async for e in sm.search_stream("q", num_results=3, engine="all")]
+
+    assert events[-1]["type"] == "final"
+    assert [r["title"] for r in events[-1]["results"]] == ["alpha"]
+    assert events[-1]["engines"] == ["google"]
+
+
+@pytest.mark.asyncio
+async def test_search_stream_cache_hit_is_single_final_event(make_manager):
+    sm = make_manager(
+        [_Engine("google", 0.0, ["alpha"])],
+        env={"CRAWL4AI_AUTO_MERGE_MAX_ENGINES": "2"},
+        enable_cache=True,
+    )
+
+    first = [e async for e in sm.search_stream("q", num_results=1, engine="auto")]
+    second = [e async for e in sm.search_stream("q", num_results=1, engine="auto")]
+
+    assert first[-1]["cached"] is False
+    assert len(second) == 1 and second[0]["cached"] is True
+    assert second[0]["results"] == first[-1]["results"]
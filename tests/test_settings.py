@@ -0,0 +1,67 @@
+import dataclasses
+
+import pytest
+
+from src.settings import Settings, get_settings, reload_settings
+
+
+@pytest.mark.unit
+def test_from_env_parses_search_and_http_settings():
+    s = Settings.from_env({
+        "CRAWL4AI_AUTO_MERGE": "0",
+        "CRAWL4AI_AUTO_MERGE_MIN_ENGINES": "3",
+        "CRAWL4AI_AUTO_MERGE_MAX_ENGINES": "1",
+        "CRAWL4AI_RRF_K": "bogus",
+        "CRAWL4AI_RRF_ENGINE_WEIGHTS": '{"Google": 2, "brave": 0.5}',
+        "CRAWL4AI_DOMAIN_BOOSTS": "www.Example.org=1.5",
+        "CRAWL4AI_HTTP_AUTH_TOKEN": "a",
+        "CRAWL4AI_HTTP_AUTH_TOKENS": "b, a ,c",
+        "CRAWL4AI_HTTP_REQUEST_TIMEOUT_S": "0",
+        "CRAWL4AI_HTTP_RATE_LIMIT_RPS": "2",
+        "CRAWL4AI_READ_URL_ALLOWED_HOSTS": "Example.com, foo.test",
+    })
+
+    assert s.auto_merge is False
+    # max is clamped to be >= min
+    assert (s.auto_merge_min_engines, s.auto_merge_max_engines) == (3, 3)
+    assert s.rrf_k == 60
+    assert dict(s.engine_weights) == {"google": 2.0, "brave": 0.5}
+    assert dict(s.domain_boosts) == {"example.org": 1.5}
+    assert s.http_auth_tokens == ("a", "b", "c")
+    assert s.http_request_timeout_s is None
+    assert (s.http_rate_limit_rps, s.http_rate_limit_burst) == (2.0, 5)
+    assert s.read_url_allowed_hosts == frozenset({"example.com", "foo.test"})
+
+
+@pytest.mark.unit
+def test_from_env_defaults():
+    s = Settings.from_env({})
+    assert s.auto_merge is True
+    assert s.fusion_method == "rrf"
+    assert s.engine_weights["duckduckgo"] == 0.4
+    assert s.domain_boosts["iter.org"] == 1.35
+    assert s.http_auth_tokens is None
+    assert s.http_rate_limit_rps is None and s.http_rate_limit_burst is None
+
+
+@pytest.mark.unit
+def test_settings_are_immutable():
+    s = Settings.from_env({})
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        s.rrf_k = 1  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        s.engine_weights["google"] = 9.0  # type: ignore[index]
+
+
+@pytest.mark.unit
+def test_reload_swaps_snapshot(monkeypatch):
+    before = get_settings()
+    monkeypatch.setenv("CRAWL4AI_RRF_K", "7")
+
+    # Env changes are not observed until an explicit reload.
+    assert get_settings() is before
+
+    after = reload_settings()
+    assert after is get_settings()
+    assert after.rrf_k == 7
+    assert before.rrf_k == 60
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from src.cache import SearchCache
+from src.persistent_cache import PersistentCache
+from src.search import SearchEngine, SearchResult
+
+
+class GoogleVersionedEngine(SearchEngine):
+    """Returns the current ``version`` as the only result title."""
+
+    def __init__(self):
+        self.version = "v1"
+        self.calls = 0
+        self.fail = False
+
+    async def search(self, query, num_results=10):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return [
+            SearchResult(
+                title=self.version,
+                link="https://example.com/page",
+                snippet=query,
+                source="google",
+            )
+        ]
+
+
+def _manager(make_manager, **env):
+    # Only the merged cache is aged below; keep the raw engine tier out of it.
+    engine = GoogleVersionedEngine()
+    sm = make_manager(
+        [engine],
+        env={"CRAWL4AI_ENGINE_CACHE_TTL_S": "0", **env},
+        enable_cache=True,
+        cache_ttl=60,
+    )
+    return sm, engine
+
+
+def _age(cache: SearchCache, seconds: float) -> None:
+    for entry in cache._cache.values():
+        entry.timestamp -= seconds
+
+
+async def _drain(sm):
+    while sm._inflight_searches:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_serves_and_refreshes_once(make_manager):
+    sm, engine = _manager(make_manager, CRAWL4AI_CACHE_STALE_WHILE_REVALIDATE_S="300")
+
+    assert (await sm.search("q", 5, "google"))[0]["title"] == "v1"
+    engine.version = "v2"
+    _age(sm.cache, 60 + 10)
+
+    # Stale hits return immediately; one background refresh for all of them.
+    results = await asyncio.gather(*(sm.search("q", 5, "google") for _ in range(3)))
+    assert [r[0]["title"] for r in results] == ["v1"] * 3
+
+    await _drain(sm)
+    assert engine.calls == 2
+    fresh = await sm.search("q", 5, "google")
+    assert fresh[0]["title"] == "v2" and "stale" not in fresh[0]
+    assert engine.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_if_error_serves_marked_results(make_manager):
+    sm, engine = _manager(
+        make_manager,
+        CRAWL4AI_CACHE_STALE_WHILE_REVALIDATE_S="0",
+        CRAWL4AI_CACHE_STALE_IF_ERROR_S="600",
+    )
+
+    await sm.search("q", 5, "google")
+    engine.fail = True
+    _age(sm.cache, 60 + 100)
+
+    results = await sm.search("q", 5, "google")
+    assert engine.calls >= 2  # a fresh fan-out was attempted
+    assert results[0]["title"] == "v1" and results[0]["stale"] is True
+    # The failed refresh did not replace the entry with a negative one.
+    assert sm.cache.lookup("q", "google", 5)[0][0]["title"] == "v1"
+
+    _age(sm.cache, 600)
+    assert await sm.search("q", 5, "google") == []
+
+
+@pytest.mark.unit
+def test_backends_keep_entries_until_hard_ttl(tmp_path):
+    results = [{"title": "t", "link": "https://t.test"}]
+    mem = SearchCache(ttl=60, stale_ttl=120)
+    disk = PersistentCache(
+        db_path=str(tmp_path / "stale.db"), ttl=60, stale_ttl=120, enable_memory_cache=False
+    )
+    for cache in (mem, disk):
+        cache.set("stale q", "auto", 10, results)
+        assert cache.lookup("stale q", "auto", 10)[1] <= 0
+
+    mem._cache[mem._generate_key("stale q", "auto")].timestamp -= 90
+    with disk._get_connection() as conn:
+        conn.execute("UPDATE search_cache SET timestamp = timestamp - 90")
+
+    for cache in (mem, disk):
+        assert cache.get("stale q", "auto", 10) is None
+        got, overdue = cache.lookup("stale q", "auto", 10)
+        assert got == results and 25 < overdue < 35
+        cache.set("stale q", "auto", 10, [])  # failed refresh: keep stale entry
+        assert cache.lookup("stale q", "auto", 10)[0] == results
+        assert cache.remove_expired() == 0
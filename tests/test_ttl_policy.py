@@ -0,0 +1,97 @@
+import sqlite3
+import time
+
+import pytest
+
+from src import cache as cache_module
+from src.cache import SearchCache
+from src.persistent_cache import PersistentCache
+from src.ttl_policy import AdaptiveTTLPolicy, TTLPolicy, build_ttl_policy
+
+
+def _results(*links):
+    return [{"title": l, "link": f"https://site.test/{l}", "snippet": ""} for l in links]
+
+
+@pytest.mark.unit
+def test_adaptive_policy_by_query_kind_and_churn():
+    policy = AdaptiveTTLPolicy(negative_ttl=60, max_ttl=86400)
+    ttl = lambda q, r, prev=None: policy.ttl_for(q, r, default_ttl=3600, previous=prev)
+
+    assert ttl("rust borrow checker", []) == 60
+    assert ttl("rust borrow checker", _results("a", "b")) == 3600
+    assert ttl("what is a tokamak", _results("a")) == 4 * 3600
+    wiki = [{"title": "T", "link": "https://en.wikipedia.org/wiki/Tokamak"}]
+    assert ttl("tokamak", wiki) == 4 * 3600
+    assert ttl("latest fusion news", _results("a")) == 900
+
+    # Same links again: TTL grows from the previous entry's; reshuffled: shrinks.
+    same = _results("a", "b", "c")
+    assert ttl("rust borrow checker", same, (same, 3600)) == 5400
+    assert ttl("rust borrow checker", same, (_results("x", "y", "z"), 3600)) == 1800
+    assert ttl("rust borrow checker", same, (same, 80000)) == 86400
+
+    assert isinstance(build_ttl_policy("fixed"), TTLPolicy)
+    assert build_ttl_policy("fixed").ttl_for("what is x", same, default_ttl=10) == 10
+
+
+@pytest.mark.unit
+def test_memory_cache_honours_per_entry_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = SearchCache(ttl=3600, stale_ttl=10)
+    cache.set("empty query", "auto", 5, [])
+    cache.set("short query", "auto", 5, _results("a"), ttl_override=1)
+    cache.set("normal query", "auto", 5, _results("a"))
+
+    assert cache._cache[cache._generate_key("empty query", "auto")].ttl == 60
+    now[0] += 61
+
+    assert cache.lookup("empty query", "auto", 5)[1] == pytest.approx(1)
+    assert cache.get("short query", "auto", 5) is None
+    assert cache.get("normal query", "auto", 5) is not None
+    now[0] += 20
+    assert cache.remove_expired() == 1
+    assert cache.get("normal query", "auto", 5) is not None
+    assert cache.get_stats()["ttl_policy"] == "fixed"
+
+
+@pytest.mark.unit
+def test_persistent_cache_stores_ttl_and_migrates_old_db(tmp_path):
+    db = tmp_path / "old.db"
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE search_cache (key TEXT PRIMARY KEY, query TEXT NOT NULL, "
+        "engine TEXT NOT NULL, num_results INTEGER NOT NULL, results TEXT NOT NULL, "
+        "timestamp REAL NOT NULL, hits INTEGER DEFAULT 0, created_at REAL NOT NULL, "
+        "updated_at REAL NOT NULL)"
+    )
+    now = time.time()
+    key = PersistentCache._generate_key(None, "legacy", "auto")
+    conn.execute(
+        "INSERT INTO search_cache VALUES (?, 'legacy', 'auto', 5, '[]', ?, 0, ?, ?)",
+        (key, now - 120, now, now),
+    )
+    conn.commit()
+    conn.close()
+
+    cache = PersistentCache(
+        db_path=str(db),
+        ttl=3600,
+        enable_memory_cache=False,
+        ttl_policy=AdaptiveTTLPolicy(negative_ttl=60),
+    )
+    # Legacy rows have no TTL and fall back to the default.
+    assert cache.get("legacy", "auto", 5) == []
+
+    cache.set("empty query", "auto", 5, [])
+    cache.set("latest release news", "auto", 5, _results("a"))
+    with cache._get_connection() as c:
+        ttls = dict(c.execute("SELECT query, ttl FROM search_cache").fetchall())
+        c.execute("UPDATE search_cache SET timestamp = timestamp - 120")
+    assert ttls == {"legacy": None, "empty query": 60, "latest release news": 900}
+
+    assert cache.remove_expired() == 1
+    assert cache.get("empty query", "auto", 5) is None
+    assert cache.get("latest release news", "auto", 5) is not None
+    assert cache.get("legacy", "auto", 5) == []
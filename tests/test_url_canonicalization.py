@@ -6,7 +6,14 @@ import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from utils import canonicalize_url, merge_and_deduplicate
+from search import SearchResult
+from utils import (
+    _canonicalize,
+    canonicalize_url,
+    host_from_url,
+    merge_and_deduplicate,
+    result_link_key,
+)
 
 
 def test_canonicalize_url_strips_tracking_and_normalizes():
@@ -43,3 +50,31 @@ def test_merge_and_deduplicate_prefers_higher_priority_engine_for_duplicates():
     assert len(merged) == 1
     assert merged[0]["engine"] == "google"
     assert merged[0]["title"] == "Google result"
+
+
+def test_canonicalize_url_is_memoized():
+    url = "https://www.memo.test/a/?utm_medium=x"
+    assert canonicalize_url(url) == canonicalize_url("  " + url) == "https://memo.test/a"
+    hits = _canonicalize.cache_info().hits
+    canonicalize_url(url)
+    assert _canonicalize.cache_info().hits == hits + 1
+    assert host_from_url("http://WWW.Memo.test:8080/x") == "memo.test"
+
+
+def test_merge_uses_canonical_url_attached_at_ingestion():
+    # Differing links that the ingestion-time key says are the same page.
+    a = {"title": "A", "link": "https://a.test/1", "canonical_url": "k", "engine": "google"}
+    b = {"title": "B", "link": "https://b.test/2", "canonical_url": "k", "engine": "brave"}
+    assert result_link_key(a) == "k"
+    assert result_link_key(a, canonicalize_links=False) == "https://a.test/1"
+    for method in ("priority", "rrf"):
+        merged = merge_and_deduplicate(
+            {"google": [a], "brave": [b]}, num_results=10, fusion_method=method
+        )
+        assert [r["title"] for r in merged] == ["A"]
+
+
+def test_search_result_dict_keeps_public_shape():
+    result = SearchResult("T", "https://www.a.test/x?utm_source=y", "s", "google")
+    assert result.canonical_url == "https://a.test/x" and result.host == "a.test"
+    assert set(result.to_dict()) == {"title", "link", "snippet", "source"}